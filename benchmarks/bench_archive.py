@@ -0,0 +1,210 @@
+"""Benchmark archiving aged events out of the live database.
+
+Generates 90 days of event history (events with snapshots, forensic
+captures, log entries and a tailspin tree each), then moves events older
+than --days into weekly archive files the way the daemon does: files are
+written on a worker thread, then the deletes run in batches on the
+writing connection. Reports the live database size and the daemon's write
+latency (open an event, insert its entry snapshot, commit) before, while
+files are written, while deletes are interleaved with writes, and after;
+plus the archive size and how long history and events show take to read
+from the archives.
+
+Usage:
+    uv run python benchmarks/bench_archive.py --events-per-day 200 --days 30
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from rogue_hunter.archive import (
+    get_archived_events,
+    open_archived_event,
+    remove_archived,
+    write_archives,
+)
+from rogue_hunter.storage import (
+    create_process_event,
+    get_connection,
+    get_process_snapshots,
+    init_database,
+    insert_process_snapshot,
+)
+from tests.conftest import make_process_score
+
+DAY = 86400
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: list[dict]) -> int:
+    """Insert rows, filling unspecified columns; returns the last rowid."""
+    columns, defaults = [], []
+    for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if name != "id":
+            columns.append(name)
+            defaults.append({"INTEGER": 1, "REAL": 1.0}.get(col_type, "x"))
+    placeholders = ",".join("?" * len(columns))
+    data = [[row.get(c, d) for c, d in zip(columns, defaults)] for row in rows]
+    conn.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})", data)
+    return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+
+def generate(path: Path, events_per_day: int) -> None:
+    """Build 90 days of closed events."""
+    init_database(path)
+    conn = get_connection(path)
+    rng = random.Random(0)
+    now = time.time()
+    for day in range(90):
+        for _ in range(events_per_day):
+            entry = now - (90 - day) * DAY + rng.uniform(0, DAY - 120)
+            event_id = _insert(
+                conn,
+                "process_events",
+                [{"entry_time": entry, "exit_time": entry + 60, "peak_snapshot_id": None}],
+            )
+            _insert(
+                conn,
+                "process_snapshots",
+                [{"event_id": event_id, "captured_at": entry + i, "cpu": i} for i in range(10)],
+            )
+            capture_id = _insert(
+                conn, "forensic_captures", [{"event_id": event_id, "captured_at": entry}]
+            )
+            _insert(
+                conn,
+                "log_entries",
+                [
+                    {"capture_id": capture_id, "event_message": f"message {rng.randint(0, 50)}"}
+                    for _ in range(20)
+                ],
+            )
+            process_id = _insert(conn, "tailspin_process", [{"capture_id": capture_id}])
+            _insert(
+                conn,
+                "tailspin_binary_image",
+                [{"process_id": process_id, "start_address": hex(i << 20)} for i in range(20)],
+            )
+            thread_id = _insert(conn, "tailspin_thread", [{"process_id": process_id}])
+            _insert(
+                conn,
+                "tailspin_frame",
+                [
+                    {
+                        "thread_id": thread_id,
+                        "depth": d,
+                        "address": hex(rng.randint(0, 1 << 32)),
+                        "parent_frame_id": None,
+                    }
+                    for d in range(40)
+                ],
+            )
+        conn.commit()
+    conn.close()
+
+
+def write_latencies(conn: sqlite3.Connection, count: int) -> list[float]:
+    """Milliseconds per daemon write: new event, entry snapshot, commit."""
+    score = make_process_score()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        event_id = create_process_event(conn, 1, "bench", 1, time.time(), "high", 60, "high")
+        insert_process_snapshot(conn, event_id, "entry", score)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.002)  # Roughly the daemon's spacing between writes
+    return latencies
+
+
+def db_size(conn: sqlite3.Connection, path: Path) -> int:
+    """Database file size once the WAL is checkpointed (vacuum shrinks it then)."""
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return path.stat().st_size
+
+
+def _report(label: str, size: int, latencies: list[float]) -> None:
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{label:>16}  {size / 1e6:8.1f} MB  "
+        f"p50 {statistics.median(latencies):6.2f} ms  p99 {p99:6.2f} ms  "
+        f"max {max(latencies):6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events-per-day", type=int, default=200, help="Events per day")
+    parser.add_argument("--days", type=int, default=30, help="Archive events older than this")
+    parser.add_argument("--writes", type=int, default=500, help="Writes per latency sample")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "data.db"
+        archive_dir = Path(tmp) / "archive"
+        generate(db_path, args.events_per_day)
+        conn = get_connection(db_path)
+        print(f"90 days, {args.events_per_day * 90} events; archiving older than {args.days} days")
+        _report("before", db_size(conn, db_path), write_latencies(conn, args.writes))
+
+        written: dict[str, list[int]] = {}
+
+        def run() -> None:
+            archive_conn = get_connection(db_path)
+            written.update(write_archives(archive_conn, archive_dir, args.days))
+            archive_conn.close()
+
+        start = time.perf_counter()
+        thread = threading.Thread(target=run)
+        thread.start()
+        during = []
+        while thread.is_alive():
+            during += write_latencies(conn, 50)
+        thread.join()
+        write_seconds = time.perf_counter() - start
+        _report("writing files", db_size(conn, db_path), during)
+
+        # Daemon loop: one delete step, then a sample's write, and so on
+        start = time.perf_counter()
+        steps = []
+        during = []
+        archived = None
+        removal = remove_archived(conn, archive_dir, written)
+        while True:
+            step_start = time.perf_counter()
+            result = next(removal, None)
+            if result is None:
+                break
+            steps.append((time.perf_counter() - step_start) * 1000)
+            archived = result
+            during += write_latencies(conn, 1)
+        delete_seconds = time.perf_counter() - start
+        _report("deleting", db_size(conn, db_path), during)
+        _report("after", db_size(conn, db_path), write_latencies(conn, args.writes))
+
+        assert archived is not None
+        archive_bytes = sum(p.stat().st_size for p in archive_dir.iterdir())
+        print(
+            f"archived {archived.events_archived} events into "
+            f"{len(archived.files_written)} weekly files ({archive_bytes / 1e6:.1f} MB); "
+            f"writing {write_seconds:.1f} s, deleting {delete_seconds:.1f} s in "
+            f"{len(steps)} steps, slowest {max(steps):.1f} ms"
+        )
+
+        start = time.perf_counter()
+        events = get_archived_events(archive_dir, time_cutoff=time.time() - 90 * DAY, limit=1000)
+        print(f"history (90 days, archived part): {(time.perf_counter() - start) * 1000:.0f} ms")
+        start = time.perf_counter()
+        archived_conn = open_archived_event(conn, archive_dir, events[-1]["id"])
+        assert archived_conn is not None
+        get_process_snapshots(archived_conn, events[-1]["id"])
+        print(f"events show (archived, cold): {(time.perf_counter() - start) * 1000:.0f} ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark merged call trees over a large stored tailspin capture.
+
+Generates one capture of --procs processes x --threads threads, each thread
+a call tree of --frames frames (stacks of up to 40 frames branching off
+shared prefixes, drawn from a pool of symbols so threads merge), then times
+build_call_tree() for the whole capture and for its largest process,
+folded_stacks() and flame_rows() at 200 columns.
+
+Usage:
+    uv run python benchmarks/bench_calltree.py --procs 100 --threads 10 --frames 500
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.calltree import build_call_tree, flame_rows, folded_stacks
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    create_process_event,
+    get_connection,
+    init_database,
+)
+
+SYMBOLS = [f"Module{m}::function{f}" for m in range(20) for f in range(50)]
+
+
+def thread_frames(rng: random.Random, thread_id: int, first_id: int, count: int) -> list[tuple]:
+    """Rows of one thread's call tree, callers before callees (as capture stores them)."""
+    rows: list[tuple] = []
+    stack: list[tuple[int, int]] = []  # (frame id, samples) from the top frame down
+    while len(rows) < count:
+        # Unwind to a random depth, then call down to a random leaf depth
+        del stack[rng.randint(0, max(len(stack) - 1, 0)) :]
+        for depth in range(len(stack) + 1, rng.randint(len(stack) + 1, 40) + 1):
+            if len(rows) == count:
+                break
+            samples = max(stack[-1][1] - rng.randint(0, 3), 1) if stack else rng.randint(100, 1000)
+            frame_id = first_id + len(rows)
+            parent_id = stack[-1][0] if stack else None
+            symbol = SYMBOLS[int(rng.paretovariate(1.1)) % len(SYMBOLS)]
+            rows.append((frame_id, thread_id, parent_id, depth, samples, depth > 30, symbol))
+            stack.append((frame_id, samples))
+    return rows
+
+
+def insert_capture(
+    conn: sqlite3.Connection, rng: random.Random, procs: int, threads: int, frames: int
+) -> int:
+    """Insert one capture, on its own event; returns its id."""
+    event_id = create_process_event(conn, 1, "proc", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "bench")
+    next_frame = conn.execute("SELECT coalesce(max(id), 0) + 1 FROM tailspin_frame").fetchone()[0]
+    for p in range(procs):
+        process_id = conn.execute(
+            "INSERT INTO tailspin_process (capture_id, pid, name) VALUES (?, ?, ?)",
+            (capture_id, 100 + p, f"proc{p}"),
+        ).lastrowid
+        for t in range(threads):
+            thread_id = conn.execute(
+                "INSERT INTO tailspin_thread (process_id, thread_id) VALUES (?, ?)",
+                (process_id, f"0x{t:x}"),
+            ).lastrowid
+            rows = thread_frames(rng, thread_id, next_frame, frames)
+            next_frame += len(rows)
+            conn.executemany(
+                """INSERT INTO tailspin_frame
+                   (id, thread_id, parent_frame_id, depth, sample_count, is_kernel,
+                    address, symbol_name, library_name)
+                   VALUES (?, ?, ?, ?, ?, ?, '0x1000', ?, 'libsystem')""",
+                rows,
+            )
+    conn.commit()
+    return capture_id
+
+
+def generate(path: Path, procs: int, threads: int, frames: int) -> int:
+    """Build a database with one capture; returns its id."""
+    init_database(path)
+    conn = get_connection(path)
+    capture_id = insert_capture(conn, random.Random(0), procs, threads, frames)
+    conn.close()
+    return capture_id
+
+
+def time_ms(call, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--procs", type=int, default=100, help="Processes in the capture")
+    parser.add_argument("--threads", type=int, default=10, help="Threads per process")
+    parser.add_argument("--frames", type=int, default=500, help="Frames per thread")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        capture_id = generate(path, args.procs, args.threads, args.frames)
+        conn = get_connection(path)
+
+        tree = build_call_tree(conn, capture_id)
+        nodes = sum(1 for _ in folded_stacks(tree))
+        print(
+            f"{args.procs * args.threads * args.frames} frames, "
+            f"{nodes} folded stacks, median of {args.repeat} runs"
+        )
+        whole = time_ms(lambda: build_call_tree(conn, capture_id), args.repeat)
+        one = time_ms(lambda: build_call_tree(conn, capture_id, pid=100), args.repeat)
+        folded = time_ms(lambda: sum(1 for _ in folded_stacks(tree)), args.repeat)
+        flame = time_ms(lambda: flame_rows(tree, 200), args.repeat)
+        conn.close()
+
+    print(f"build_call_tree, capture:  {whole:8.0f} ms")
+    print(f"build_call_tree, process:  {one:8.1f} ms")
+    print(f"folded_stacks, capture:    {folded:8.0f} ms")
+    print(f"flame_rows, 200 columns:   {flame:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark diff_captures() on two large stored tailspin captures.
+
+Generates two captures like bench_calltree's (--procs x --threads x
+--frames frames each, different seeds so most stacks' shares change),
+marks every 97th frame of the second as blocked, and with random CPU and
+I/O per process, then times diff_captures() and its tree alignment alone
+(diff_call_trees() on prebuilt trees).
+
+Usage:
+    uv run python benchmarks/bench_capturediff.py --procs 100 --threads 10 --frames 500
+"""
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from bench_calltree import insert_capture, time_ms
+
+from rogue_hunter.calltree import build_call_tree
+from rogue_hunter.capturediff import diff_call_trees, diff_captures
+from rogue_hunter.storage import get_connection, init_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--procs", type=int, default=100, help="Processes per capture")
+    parser.add_argument("--threads", type=int, default=10, help="Threads per process")
+    parser.add_argument("--frames", type=int, default=500, help="Frames per thread")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        init_database(path)
+        conn = get_connection(path)
+        capture_a = insert_capture(conn, random.Random(0), args.procs, args.threads, args.frames)
+        capture_b = insert_capture(conn, random.Random(1), args.procs, args.threads, args.frames)
+        conn.execute(
+            """UPDATE tailspin_frame SET blocked_on = 'wait4 on zsh [46454]'
+               WHERE id % 97 = 0 AND id > (SELECT max(id) / 2 FROM tailspin_frame)"""
+        )
+        rng = random.Random(2)
+        conn.executemany(
+            "UPDATE tailspin_process SET cpu_time_sec = ?, io_bytes = ? WHERE id = ?",
+            [
+                (rng.uniform(0, 10), rng.randint(0, 10**9), process_id)
+                for (process_id,) in conn.execute("SELECT id FROM tailspin_process").fetchall()
+            ],
+        )
+        conn.commit()
+
+        diff = diff_captures(conn, capture_a, capture_b)
+        tree_a = build_call_tree(conn, capture_a)
+        tree_b = build_call_tree(conn, capture_b)
+        print(
+            f"2 x {args.procs * args.threads * args.frames} frames, "
+            f"{len(diff.newly_blocked)} newly blocked threads, "
+            f"largest change {diff.grew[0].change:+.2%}, median of {args.repeat} runs"
+        )
+        total = time_ms(lambda: diff_captures(conn, capture_a, capture_b), args.repeat)
+        align = time_ms(lambda: diff_call_trees(tree_a, tree_b), args.repeat)
+        conn.close()
+
+    print(f"diff_captures:    {total:8.0f} ms")
+    print(f"diff_call_trees:  {align:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark culprit identification: full ring walk vs the rolling index.
+
+Pushes --samples synthetic samples of --rogues rogues each (drawn from
+--pids PIDs) through a RingBuffer of --ring samples and reports the
+per-push cost, plain and with the CulpritIndex kept up to date, then
+the capture-time cost of getting the culprits: identify_culprits()
+walking the frozen ring against the index's culprits() and top().
+
+Usage:
+    uv run python benchmarks/bench_culprits.py --ring 90 --rogues 20 --pids 200
+"""
+
+import argparse
+import random
+import time
+from dataclasses import fields
+from datetime import datetime, timedelta
+
+from bench_calltree import time_ms
+
+from rogue_hunter.collector import ProcessSamples, ProcessScore
+from rogue_hunter.forensics import identify_culprits
+from rogue_hunter.ringbuffer import BufferContents, RingBuffer
+
+# Only these fields matter to culprit identification; the rest are zeroed
+_ZERO = {f.name: 0 for f in fields(ProcessScore)}
+
+
+def make_samples(rng: random.Random, count: int, rogues: int, pids: int) -> list[ProcessSamples]:
+    """count samples, one per 1/3 s, each with rogues random PIDs and scores."""
+    start = datetime(2026, 1, 1)
+    out = []
+    for i in range(count):
+        scored = sorted(
+            (
+                ProcessScore(
+                    **_ZERO
+                    | {
+                        "pid": pid,
+                        "command": f"proc{pid}",
+                        "score": rng.randint(0, 100),
+                        "dominant_resource": "cpu",
+                    }
+                )
+                for pid in rng.sample(range(1, pids + 1), rogues)
+            ),
+            key=lambda p: p.score,
+            reverse=True,
+        )
+        out.append(
+            ProcessSamples(
+                timestamp=start + timedelta(seconds=i / 3),
+                elapsed_ms=10,
+                process_count=500,
+                max_score=scored[0].score,
+                rogues=scored,
+                all_by_pid={p.pid: p for p in scored},
+            )
+        )
+    return out
+
+
+def push_us(ring: RingBuffer, samples: list[ProcessSamples], with_index: bool) -> float:
+    """Mean microseconds per push, with or without the culprit index."""
+    push = ring.push if with_index else ring._samples.append
+    start = time.perf_counter()
+    for s in samples:
+        push(s)
+    return (time.perf_counter() - start) / len(samples) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ring", type=int, default=90, help="Ring buffer samples")
+    parser.add_argument("--rogues", type=int, default=20, help="Rogues per sample")
+    parser.add_argument("--pids", type=int, default=200, help="Distinct PIDs rogues come from")
+    parser.add_argument("--samples", type=int, default=20_000, help="Samples pushed")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per capture-time measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    samples = make_samples(rng, args.samples, args.rogues, args.pids)
+    plain = push_us(RingBuffer(max_samples=args.ring), samples, with_index=False)
+    ring = RingBuffer(max_samples=args.ring, culprit_threshold=50, sample_interval=1 / 3)
+    indexed = push_us(ring, samples, with_index=True)
+
+    frozen = BufferContents(samples=tuple(ring.samples))
+    assert list(ring.freeze().culprits) == identify_culprits(frozen)
+    walk = time_ms(lambda: identify_culprits(frozen), args.repeat)
+    index = time_ms(ring.culprits.culprits, args.repeat)
+    top = time_ms(lambda: ring.culprits.top(10.0, 20), args.repeat)
+
+    print(
+        f"{args.samples} samples x {args.rogues} rogues from {args.pids} PIDs, "
+        f"ring of {args.ring}, median of {args.repeat} runs"
+    )
+    print(f"push, deque only:          {plain:8.1f} us")
+    print(f"push, with culprit index:  {indexed:8.1f} us")
+    print(f"identify_culprits (walk):  {walk:8.3f} ms")
+    print(f"index culprits():          {index:8.3f} ms")
+    print(f"index top(10 s, 20):       {top:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
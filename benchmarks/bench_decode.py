@@ -0,0 +1,105 @@
+"""Benchmark tailspin decode and storage memory: stdout capture vs decode file.
+
+A fake spindump (a script that cats a synthetic report of each --sizes
+size, MB) stands in for the decoder. Each size runs in fresh subprocesses:
+
+- stdout: the decode as it was before, run with capture_output=True, then
+  decoded to str and parsed with parse_tailspin(). Storing is left out, so
+  this is a lower bound on that path's peak.
+- file: ForensicsCapture._process_tailspin(), which has spindump write
+  to a file in runtime_dir and stores each process block as TailspinFile
+  parses it
+
+and reports seconds and peak RSS. The file path should stay flat as the
+report grows.
+
+Usage:
+    uv run python benchmarks/bench_decode.py --sizes 30,300
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from bench_parser import write_spindump
+
+from rogue_hunter.forensics import ForensicsCapture, parse_tailspin
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    create_process_event,
+    get_connection,
+    init_database,
+)
+
+
+def peak_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # Bytes vs KiB
+
+
+def run_stdout(decoder: Path) -> None:
+    completed = subprocess.run([str(decoder)], stdin=subprocess.DEVNULL, capture_output=True)
+    parse_tailspin(completed.stdout.decode("utf-8", errors="replace"))
+
+
+def run_file(decoder: Path, tmp: Path) -> None:
+    init_database(tmp / "data.db")
+    conn = get_connection(tmp / "data.db")
+    event_id = create_process_event(conn, 1, "proc", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "bench")
+    capture = ForensicsCapture(conn, event_id, tmp)
+    real_run = subprocess.run
+
+    def fake_spindump(args, **kwargs):
+        return real_run([str(decoder), *args[1:]], **kwargs)
+
+    with patch("rogue_hunter.forensics.subprocess.run", side_effect=fake_spindump):
+        status = capture._process_tailspin(capture_id, tmp / "capture.tailspin")
+    assert status == "success", status
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default="30,300", help="Comma-separated report sizes in MB")
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "DECODER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, decoder = args.run[0], Path(args.run[1])
+        start = time.perf_counter()
+        if mode == "stdout":
+            run_stdout(decoder)
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                run_file(decoder, Path(tmp))
+        print(f"{time.perf_counter() - start} {peak_mb()}")
+        return
+
+    print(f"{'size MB':>8}  {'path':>6}  {'seconds':>8}  {'peak RSS MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in (int(s) for s in args.sizes.split(",")):
+            report = Path(tmp) / "report.txt"
+            write_spindump(report, megabytes)
+            decoder = Path(tmp) / "spindump"
+            decoder.write_text(f"#!/bin/sh\nexec cat {report}\n")
+            decoder.chmod(0o755)
+            for mode in ("stdout", "file"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--run", mode, str(decoder)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.split()
+                seconds, peak = float(output[-2]), float(output[-1])
+                print(f"{megabytes:>8}  {mode:>6}  {seconds:>8.1f}  {peak:>11.0f}")
+            report.unlink()
+
+
+if __name__ == "__main__":
+    main()
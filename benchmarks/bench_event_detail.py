@@ -0,0 +1,145 @@
+"""Benchmark loading an event's detail tree: per-row getters vs load_event_detail().
+
+Generates one event with --captures forensic captures, each with --procs
+tailspin processes (--threads threads of 20 frames each) and 500 log
+entries, then loads what `events show -f -t -l` needs two ways:
+
+- getters: get_process_event_detail(), get_process_snapshots(),
+  get_forensic_captures(), then get_buffer_context(), get_log_entries()
+  and get_tailspin_processes() per capture and get_tailspin_threads() per
+  process (the command before the bulk loader)
+- loader: load_event_detail()
+
+for the command's view (threads of the top 10 processes per capture) and
+for the whole tree (threads of every process). Frames stay lazy in both.
+
+Usage:
+    uv run python benchmarks/bench_event_detail.py --procs 800
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    create_process_event,
+    get_buffer_context,
+    get_connection,
+    get_forensic_captures,
+    get_log_entries,
+    get_process_event_detail,
+    get_process_snapshots,
+    get_tailspin_processes,
+    get_tailspin_threads,
+    init_database,
+    insert_buffer_context,
+    insert_process_snapshot,
+    load_event_detail,
+)
+from tests.conftest import make_process_score
+
+
+def generate(path: Path, captures: int, procs: int, threads: int) -> int:
+    """Build the dataset; returns the event id."""
+    init_database(path)
+    conn = get_connection(path)
+    event_id = create_process_event(conn, 1, "proc", 1, time.time(), "high", 70, "high")
+    for _ in range(30):
+        insert_process_snapshot(conn, event_id, "checkpoint", make_process_score())
+    for c in range(captures):
+        capture_id = create_forensic_capture(conn, event_id, f"capture{c}")
+        insert_buffer_context(conn, capture_id, sample_count=30, peak_score=90, culprits="[]")
+        conn.executemany(
+            "INSERT INTO log_entries (capture_id, timestamp, event_message) VALUES (?, ?, ?)",
+            [(capture_id, f"2024-01-15 10:{i // 60:02}:{i % 60:02}", "msg") for i in range(500)],
+        )
+        for p in range(procs):
+            process_id = conn.execute(
+                """INSERT INTO tailspin_process (capture_id, pid, name, cpu_time_sec)
+                   VALUES (?, ?, ?, ?)""",
+                (capture_id, 1000 + p, f"proc{p}", p * 0.1),
+            ).lastrowid
+            for t in range(threads):
+                thread_id = conn.execute(
+                    """INSERT INTO tailspin_thread (process_id, thread_id, num_samples)
+                       VALUES (?, ?, ?)""",
+                    (process_id, f"0x{t:x}", t),
+                ).lastrowid
+                conn.executemany(
+                    """INSERT INTO tailspin_frame
+                       (thread_id, depth, sample_count, is_kernel, address)
+                       VALUES (?, ?, 1, 0, '0x1000')""",
+                    [(thread_id, d) for d in range(20)],
+                )
+    conn.commit()
+    conn.close()
+    return event_id
+
+
+def load_with_getters(conn, event_id: int, process_limit: int | None) -> int:
+    """The per-row path; returns the number of queries issued."""
+    queries = 3
+    get_process_event_detail(conn, event_id)
+    get_process_snapshots(conn, event_id)
+    for capture in get_forensic_captures(conn, event_id):
+        get_buffer_context(conn, capture["id"])
+        get_log_entries(conn, capture["id"], limit=20)
+        procs = get_tailspin_processes(conn, capture["id"])
+        queries += 3
+        for proc in procs[:process_limit]:
+            get_tailspin_threads(conn, proc["id"])
+            queries += 1
+    return queries
+
+
+def time_ms(call, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--captures", type=int, default=3, help="Forensic captures")
+    parser.add_argument("--procs", type=int, default=800, help="Tailspin processes per capture")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per process")
+    parser.add_argument("--repeat", type=int, default=5, help="Loads per method")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        event_id = generate(path, args.captures, args.procs, args.threads)
+        conn = get_connection(path)
+        print(
+            f"{args.captures} captures x {args.procs} processes x {args.threads} threads, "
+            f"median of {args.repeat} loads"
+        )
+        print(f"{'view':>12}  {'getters ms':>10}  {'queries':>7}  {'loader ms':>9}  {'queries':>7}")
+        for view, process_limit in (("command", 10), ("whole tree", None)):
+            queries = load_with_getters(conn, event_id, process_limit)
+            getters = time_ms(lambda: load_with_getters(conn, event_id, process_limit), args.repeat)
+
+            statements: list[str] = []
+            conn.set_trace_callback(statements.append)
+            load_event_detail(conn, event_id, log_limit=20, process_limit=process_limit)
+            conn.set_trace_callback(None)
+            loader = time_ms(
+                lambda: load_event_detail(
+                    conn, event_id, log_limit=20, process_limit=process_limit
+                ),
+                args.repeat,
+            )
+            print(
+                f"{view:>12}  {getters:>10.1f}  {queries:>7}  {loader:>9.1f}  {len(statements):>7}"
+            )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark exporting process events: materialized list vs streaming.
+
+Generates --events closed events, then exports all of them to /dev/null
+in a fresh subprocess per method, reporting wall time and peak RSS:
+
+- list: get_process_events(limit=N) and json.dumps of the whole list
+  (the history command before streaming exporters)
+- ndjson / json / csv: iter_process_events() through write_records()
+
+Usage:
+    uv run python benchmarks/bench_export.py --events 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.export import EVENT_FIELDS, event_record, write_records
+from rogue_hunter.storage import (
+    get_connection,
+    get_process_events,
+    init_database,
+    iter_process_events,
+)
+
+METHODS = ["list", "ndjson", "json", "csv"]
+
+
+def generate(path: Path, events: int) -> None:
+    init_database(path)
+    conn = get_connection(path)
+    rng = random.Random(0)
+    now = time.time()
+    rows = []
+    for i in range(events):
+        entry = now - rng.uniform(0, 90 * 86400)
+        rows.append((i, f"proc{i % 500}", entry, entry + 60, rng.randint(0, 100)))
+        if len(rows) == 50_000:
+            _insert(conn, rows)
+            rows = []
+    _insert(conn, rows)
+    conn.close()
+
+
+def _insert(conn, rows: list[tuple]) -> None:
+    conn.executemany(
+        """INSERT INTO process_events
+           (pid, command, boot_time, entry_time, exit_time, entry_band, peak_band, peak_score)
+           VALUES (?, ?, 1, ?, ?, 'high', 'high', ?)""",
+        rows,
+    )
+    conn.commit()
+
+
+def export(path: Path, method: str) -> None:
+    """Run one export to /dev/null and print seconds and peak RSS."""
+    conn = get_connection(path)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as out:
+        if method == "list":
+            events = get_process_events(conn, limit=sys.maxsize)
+            out.write(json.dumps([event_record(e) for e in events], indent=2))
+        else:
+            write_records(map(event_record, iter_process_events(conn)), out, method, EVENT_FIELDS)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # Bytes on macOS, KiB on Linux
+    print(f"{elapsed} {peak}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events", type=int, default=1_000_000, help="Events to export")
+    parser.add_argument("--export", nargs=2, metavar=("DB", "METHOD"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.export:
+        export(Path(args.export[0]), args.export[1])
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        generate(path, args.events)
+        print(f"{args.events} events, export to /dev/null")
+        print(f"{'method':>8}  {'seconds':>8}  {'peak RSS MB':>11}")
+        for method in METHODS:
+            output = subprocess.run(
+                [sys.executable, __file__, "--export", str(path), method],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            seconds, peak_kib = float(output[-2]), int(output[-1])
+            print(f"{method:>8}  {seconds:>8.1f}  {peak_kib / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark libproc reads: per-call allocation vs ProcInfoReader.
+
+Measures calls per second for the usage, detail and PID-list reads. On
+macOS the real library is used; elsewhere (or with --fake) a function table
+that returns immediately isolates the Python-side cost, which is what
+buffer reuse changes.
+
+Usage:
+    uv run python benchmarks/bench_libproc.py --seconds 1
+"""
+
+import argparse
+import ctypes
+import os
+import platform
+import time
+from ctypes import byref, c_int
+
+from rogue_hunter.libproc import (
+    PROC_PIDTASKINFO,
+    PROC_PIDTBSDINFO,
+    RUSAGE_INFO_V4,
+    DetailCounters,
+    ProcBSDInfo,
+    ProcFunctions,
+    ProcInfoReader,
+    ProcTaskInfo,
+    RusageInfoV4,
+    UsageCounters,
+    libproc_functions,
+)
+
+
+def fake_functions(pid_count: int) -> ProcFunctions:
+    """Function table that succeeds without touching the kernel."""
+    return ProcFunctions(
+        proc_pid_rusage=lambda pid, flavor, buffer: 0,
+        proc_pidinfo=lambda pid, flavor, arg, buffer, size: size,
+        proc_listallpids=lambda buffer, size: (
+            pid_count if buffer is None else min(pid_count, size // ctypes.sizeof(c_int))
+        ),
+        proc_name=lambda pid, buffer, size: 1,
+    )
+
+
+# Per-call allocation, as the module-level get_* functions do
+
+
+def alloc_usage(fn: ProcFunctions, pid: int) -> UsageCounters | None:
+    r = RusageInfoV4()
+    if fn.proc_pid_rusage(pid, RUSAGE_INFO_V4, byref(r)) != 0:
+        return None
+    return UsageCounters(
+        cpu_time=r.ri_user_time + r.ri_system_time,
+        mem=r.ri_phys_footprint,
+        mem_peak=r.ri_lifetime_max_phys_footprint,
+        pageins=r.ri_pageins,
+        disk_io=r.ri_diskio_bytesread + r.ri_diskio_byteswritten,
+        energy=r.ri_billed_energy,
+        wakeups=r.ri_pkg_idle_wkups + r.ri_interrupt_wkups,
+        instructions=r.ri_instructions,
+        cycles=r.ri_cycles,
+        runnable_time=r.ri_runnable_time,
+        qos_interactive=r.ri_cpu_time_qos_user_interactive,
+        start_time=r.ri_proc_start_abstime,
+    )
+
+
+def alloc_detail(fn: ProcFunctions, pid: int) -> DetailCounters | None:
+    task = ProcTaskInfo()
+    if fn.proc_pidinfo(pid, PROC_PIDTASKINFO, 0, byref(task), ctypes.sizeof(task)) <= 0:
+        return None
+    bsd = ProcBSDInfo()
+    if fn.proc_pidinfo(pid, PROC_PIDTBSDINFO, 0, byref(bsd), ctypes.sizeof(bsd)) <= 0:
+        return None
+    return DetailCounters(
+        csw=task.pti_csw,
+        syscalls=task.pti_syscalls_mach + task.pti_syscalls_unix,
+        mach_msgs=task.pti_messages_sent + task.pti_messages_received,
+        faults=task.pti_faults,
+        threads=task.pti_threadnum,
+        priority=task.pti_priority,
+        status=bsd.pbi_status,
+        ppid=bsd.pbi_ppid,
+        comm=bsd.pbi_comm,
+    )
+
+
+def alloc_list_pids(fn: ProcFunctions) -> list[int]:
+    count = fn.proc_listallpids(None, 0)
+    if count <= 0:
+        return []
+    buffer = (c_int * count)()
+    actual = fn.proc_listallpids(byref(buffer), ctypes.sizeof(buffer))
+    return [pid for pid in buffer[:actual] if pid > 0]
+
+
+def rate(call, seconds: float) -> float:
+    """Calls per second of call() over roughly the given duration."""
+    batch = 1000
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        for _ in range(batch):
+            call()
+        count += batch
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duration per measurement")
+    parser.add_argument("--pids", type=int, default=800, help="PID count for --fake listing")
+    parser.add_argument("--fake", action="store_true", help="Use the no-op function table")
+    args = parser.parse_args()
+
+    live = platform.system() == "Darwin" and not args.fake
+    fn = libproc_functions() if live else fake_functions(args.pids)
+    reader = ProcInfoReader(fn)
+    pid = os.getpid()
+
+    print(f"{'libproc' if live else 'fake function table'}, {args.seconds}s per measurement")
+    print(f"{'read':<10} {'alloc/s':>12} {'reader/s':>12} {'speedup':>8}")
+    cases = [
+        ("usage", lambda: alloc_usage(fn, pid), lambda: reader.read_usage(pid)),
+        ("detail", lambda: alloc_detail(fn, pid), lambda: reader.read_detail(pid)),
+        ("list_pids", lambda: alloc_list_pids(fn), reader.list_pids),
+    ]
+    for name, alloc, reuse in cases:
+        before = rate(alloc, args.seconds)
+        after = rate(reuse, args.seconds)
+        print(f"{name:<10} {before:12,.0f} {after:12,.0f} {after / before:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
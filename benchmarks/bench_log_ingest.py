@@ -0,0 +1,148 @@
+"""Benchmark log capture ingestion: buffered per-row inserts vs streaming batches.
+
+A fake log (a script that cats --lines lines of synthetic `log show
+--style ndjson` output) stands in for /usr/bin/log. Each path runs in a
+fresh subprocess:
+
+- buffered: the capture as it was before, all of stdout read with
+  communicate(), parsed with parse_logs_ndjson() and stored with one
+  insert_log_entry() (and commit) per entry
+- stream: ForensicsCapture._capture_logs() with caps out of the way,
+  parsing lines as they are read and inserting them in batches
+- capped: the same with the default entry and byte caps
+
+and reports seconds, entries stored and peak RSS.
+
+Usage:
+    uv run python benchmarks/bench_log_ingest.py --lines 500000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from rogue_hunter.forensics import ForensicsCapture, parse_logs_ndjson
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    create_process_event,
+    get_connection,
+    init_database,
+    insert_log_entry,
+)
+
+SUBSYSTEMS = ["com.apple.kernel", "com.apple.powerd", "com.apple.windowserver"]
+IMAGES = ["/kernel", "/usr/libexec/powerd", "/System/Library/WindowServer", "/usr/sbin/mds"]
+
+
+def write_log(path: Path, lines: int) -> None:
+    """Write lines of ndjson shaped like log show's."""
+    rng = random.Random(0)
+    with path.open("w") as f:
+        for i in range(lines):
+            obj = {
+                "timestamp": f"2024-01-15 10:30:{i % 60:02d}.{i % 1000000:06d}-0800",
+                "machTimestamp": 1000000000 + i * 1000,
+                "eventMessage": f"IOSurface stall waiting {rng.randrange(10**6)} us on queue {i}",
+                "subsystem": rng.choice(SUBSYSTEMS),
+                "category": "default",
+                "processImagePath": rng.choice(IMAGES),
+                "processID": rng.randrange(1, 1000),
+                "messageType": "Default",
+                "threadID": i,
+                "formatString": "%{public}s stall waiting %llu us on queue %d",
+            }
+            f.write(json.dumps(obj) + "\n")
+
+
+def peak_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # Bytes vs KiB
+
+
+async def capture_buffered(emitter: Path, conn, capture_id: int) -> int:
+    process = await asyncio.create_subprocess_exec(
+        str(emitter), stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await process.communicate()
+    entries = parse_logs_ndjson(stdout)
+    for entry in entries:
+        insert_log_entry(
+            conn,
+            capture_id=capture_id,
+            timestamp=entry.timestamp,
+            event_message=entry.event_message,
+            mach_timestamp=entry.mach_timestamp,
+            subsystem=entry.subsystem,
+            category=entry.category,
+            process_name=entry.process_name,
+            process_id=entry.process_id,
+            message_type=entry.message_type,
+        )
+    return len(entries)
+
+
+def run(mode: str, emitter: Path, tmp: Path) -> int:
+    init_database(tmp / "data.db")
+    conn = get_connection(tmp / "data.db")
+    event_id = create_process_event(conn, 1, "proc", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "bench")
+    if mode == "buffered":
+        stored = asyncio.run(capture_buffered(emitter, conn, capture_id))
+    else:
+        caps = {} if mode == "capped" else {"log_max_entries": 10**12, "log_max_bytes": 10**15}
+        capture = ForensicsCapture(conn, event_id, tmp, **caps)
+        real_exec = asyncio.create_subprocess_exec
+
+        async def fake_log(program, *args, **kwargs):
+            return await real_exec(str(emitter), **kwargs)
+
+        with patch("rogue_hunter.forensics.asyncio.create_subprocess_exec", fake_log):
+            stored, _ = asyncio.run(capture._capture_logs(capture_id))
+    conn.close()
+    return stored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--lines", type=int, default=500_000, help="Lines the fake log writes")
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "EMITTER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, emitter = args.run[0], Path(args.run[1])
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory() as tmp:
+            stored = run(mode, emitter, Path(tmp))
+        print(f"{time.perf_counter() - start} {stored} {peak_mb()}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "log.ndjson"
+        write_log(output, args.lines)
+        emitter = Path(tmp) / "log"
+        emitter.write_text(f"#!/bin/sh\nexec cat {output}\n")
+        emitter.chmod(0o755)
+        megabytes = output.stat().st_size / 2**20
+        print(f"{args.lines} lines, {megabytes:.0f} MB")
+        print(f"{'path':>8}  {'seconds':>8}  {'entries':>8}  {'peak RSS MB':>11}")
+        for mode in ("buffered", "stream", "capped"):
+            result = subprocess.run(
+                [sys.executable, __file__, "--run", mode, str(emitter)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            seconds, stored, peak = float(result[-3]), int(result[-2]), float(result[-1])
+            print(f"{mode:>8}  {seconds:>8.1f}  {stored:>8}  {peak:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark log entry parsing: lines/sec and peak RSS by JSON decoder.
+
+Writes --lines counts of synthetic `log show --style ndjson` output (as
+bench_log_ingest does) and parses each with parse_logs_ndjson(), in a
+fresh subprocess per run, using:
+
+- before: the parser as it was, json.loads plus a Path() per entry for
+  the image basename, into a dataclass without slots
+- json, orjson, msgspec: parse_logs_ndjson() with that decoder (orjson and
+  msgspec are skipped when not installed)
+
+Peak RSS includes the output bytes, read whole as log show's stdout was.
+
+Usage:
+    uv run python benchmarks/bench_log_parse.py --lines 100000,1000000
+"""
+
+import argparse
+import importlib.util
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from bench_log_ingest import write_log
+
+from rogue_hunter.forensics import parse_logs_ndjson
+
+DECODERS = {
+    "json": lambda: json.loads,
+    "orjson": lambda: __import__("orjson").loads,
+    "msgspec": lambda: __import__("msgspec").json.Decoder().decode,
+}
+
+
+@dataclass
+class OldLogEntry:
+    timestamp: str
+    event_message: str
+    mach_timestamp: int | None = None
+    subsystem: str | None = None
+    category: str | None = None
+    process_name: str | None = None
+    process_id: int | None = None
+    message_type: str | None = None
+
+
+def parse_before(data: bytes) -> list[OldLogEntry]:
+    entries = []
+    for line in data.decode("utf-8", errors="replace").split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        process_name = None
+        if process_path := obj.get("processImagePath"):
+            process_name = Path(process_path).name
+        entries.append(
+            OldLogEntry(
+                timestamp=obj.get("timestamp", ""),
+                event_message=obj.get("eventMessage", ""),
+                mach_timestamp=obj.get("machTimestamp"),
+                subsystem=obj.get("subsystem"),
+                category=obj.get("category"),
+                process_name=process_name,
+                process_id=obj.get("processID"),
+                message_type=obj.get("messageType"),
+            )
+        )
+    return entries
+
+
+def peak_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # Bytes vs KiB
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--lines", default="100000,1000000", help="Comma-separated line counts")
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, path = args.run
+        data = Path(path).read_bytes()
+        start = time.perf_counter()
+        if mode == "before":
+            entries = parse_before(data)
+        else:
+            entries = parse_logs_ndjson(data, DECODERS[mode]())
+        print(f"{time.perf_counter() - start} {len(entries)} {peak_mb()}")
+        return
+
+    modes = ["before", "json"] + [m for m in ("orjson", "msgspec") if importlib.util.find_spec(m)]
+    print(f"{'lines':>8}  {'parser':>8}  {'lines/s':>9}  {'peak RSS MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for lines in (int(n) for n in args.lines.split(",")):
+            output = Path(tmp) / "log.ndjson"
+            write_log(output, lines)
+            for mode in modes:
+                result = subprocess.run(
+                    [sys.executable, __file__, "--run", mode, str(output)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.split()
+                seconds, parsed, peak = float(result[-3]), int(result[-2]), float(result[-1])
+                assert parsed == lines, (mode, parsed)
+                print(f"{lines:>8}  {mode:>8}  {lines / seconds:>9.0f}  {peak:>11.0f}")
+            output.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark daemon startup when the schema version changes.
+
+Generates a database in the previous schema layout (v20: one
+machine_snapshot_processes table) with event history and 12 hours of
+machine snapshots, then opens it two ways:
+
+- recreate: what init_database() did before migrations (delete, start over)
+- migrate: init_database() now (backup, schema steps in one transaction)
+
+and runs the background backfill to completion. Reports startup time,
+backfill time and the slowest backfill batch (how long one batch holds up
+sampling). Scale the flags up for a multi-GB database.
+
+Usage:
+    uv run python benchmarks/bench_migrate.py --events 5000 --procs 500
+"""
+
+import argparse
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.migrations import run_backfills
+from rogue_hunter.storage import (
+    _MACHINE_PARTITION_DDL,
+    get_connection,
+    get_machine_partitions,
+    init_database,
+)
+
+HOUR = 3600
+
+
+def _insert_many(conn: sqlite3.Connection, table: str, rows: list[dict]) -> int:
+    """Insert rows, filling unspecified columns; returns the last rowid."""
+    columns, defaults = [], []
+    for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if name != "id":
+            columns.append(name)
+            defaults.append({"INTEGER": 1, "REAL": 1.0}.get(col_type, "x"))
+    placeholders = ",".join("?" * len(columns))
+    data = [[row.get(c, d) for c, d in zip(columns, defaults)] for row in rows]
+    conn.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})", data)
+    return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+
+def generate(path: Path, args: argparse.Namespace) -> None:
+    """Build a v20 database."""
+    init_database(path)
+    conn = sqlite3.connect(path)
+    for table in get_machine_partitions(conn):
+        conn.execute(f"DROP TABLE {table}")
+    conn.execute(_MACHINE_PARTITION_DDL.format(table="machine_snapshot_processes"))
+    conn.execute("CREATE INDEX idx_msp_snapshot ON machine_snapshot_processes(snapshot_id)")
+
+    now = time.time()
+    for i in range(args.events):
+        event_id = _insert_many(
+            conn, "process_events", [{"exit_time": now - i, "peak_snapshot_id": None}]
+        )
+        _insert_many(conn, "process_snapshots", [{"event_id": event_id}] * 20)
+        if i % 500 == 0:
+            conn.commit()
+
+    for minute in range(12 * 60):
+        snapshot_id = _insert_many(
+            conn, "machine_snapshots", [{"captured_at": now - 12 * HOUR + minute * 60}]
+        )
+        _insert_many(
+            conn, "machine_snapshot_processes", [{"snapshot_id": snapshot_id}] * args.procs
+        )
+        if minute % 60 == 0:
+            conn.commit()
+
+    conn.execute("UPDATE daemon_state SET value = '20' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events", type=int, default=5000, help="Closed events")
+    parser.add_argument("--procs", type=int, default=500, help="Processes per machine snapshot")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "v20.db"
+        generate(source, args)
+        size_mb = source.stat().st_size / 1e6
+        print(f"v20 database: {size_mb:.0f} MB")
+
+        recreate = Path(tmp) / "recreate.db"
+        shutil.copy(source, recreate)
+        start = time.perf_counter()
+        recreate.unlink()
+        init_database(recreate)
+        print(f"recreate startup: {(time.perf_counter() - start) * 1000:8.1f} ms (history lost)")
+
+        migrated = Path(tmp) / "migrate.db"
+        shutil.copy(source, migrated)
+        start = time.perf_counter()
+        init_database(migrated)
+        print(f"migrate startup:  {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        conn = get_connection(migrated)
+        batches: list[float] = []
+        start = time.perf_counter()
+        backfill = run_backfills(conn)
+        while True:
+            batch_start = time.perf_counter()
+            if next(backfill, None) is None:
+                break
+            batches.append(time.perf_counter() - batch_start)
+        total = time.perf_counter() - start
+        conn.close()
+        print(
+            f"backfill:         {total * 1000:8.1f} ms in {len(batches)} batches, "
+            f"slowest {max(batches, default=0) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
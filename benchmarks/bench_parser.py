@@ -0,0 +1,180 @@
+"""Benchmark parse_tailspin_file() on synthetic spindump output.
+
+Writes spindump-format text of each --sizes size (MB): a header, process
+blocks with every metadata field, threads with 20-40 frame call trees
+(kernel frames, unsymbolicated frames, running/blocked states) and binary
+images, then the I/O histogram section. Each size is parsed with each
+--workers count in a fresh subprocess, reporting MB/s, speedup over one
+worker, and peak RSS of the parsing process and of its largest worker.
+
+Usage:
+    uv run python benchmarks/bench_parser.py --sizes 10,100,500 --workers 1,2,4
+"""
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.forensics import parse_tailspin_file
+
+HEADER = """Date/Time:        2024-01-15 10:30:45.123 -0800
+End time:         2024-01-15 10:30:55.123 -0800
+OS Version:       macOS 15.2 (Build 24C101)
+Architecture:     arm64e
+Report Version:   53
+Hardware model:   Mac16,5
+Active cpus:      16
+Memory size:      128 GB
+Duration:         10.00s
+Steps:            1000 (10ms sampling interval)
+
+"""
+
+IO_SECTION = """IO Size Histogram:
+   Begin       End     Frequency       CDF
+       0      4095          1200      1200
+    4096      8191           300      1500
+
+Tier 0 (High priority) Aggregate Stats:
+  Num IOs          1500
+  Latency Mean     120us
+"""
+
+LIBRARIES = ["libsystem_kernel.dylib", "CoreFoundation", "AppKit", "libdispatch.dylib", "Metal"]
+STATES = [
+    "",
+    "",
+    "",
+    "  (running on P-core)",
+    "  (running on E-core)",
+    "  (blocked by wait4 on pid:99)",
+]
+
+
+def synth_process(rng: random.Random, pid: int) -> str:
+    lines = [
+        f"Process:          proc{pid} [{pid}]",
+        "UUID:             6F2A7B90-1C3D-4E5F-8A9B-0C1D2E3F4A5B",
+        f"Path:             /Applications/App{pid}.app/Contents/MacOS/App{pid}",
+        f"Identifier:       com.example.app{pid}",
+        "Version:          1.2.3 (456)",
+        "Shared Cache:     11A2B3C4-D5E6-F708-192A-3B4C5D6E7F80 slid base address 0x180000000",
+        "Architecture:     arm64e",
+        "Parent:           launchd [1]",
+        "Responsible:      WindowServer [400]",
+        "RunningBoard Mgd: Yes",
+        "Sudden Term:      Tracked (allows idle exit)",
+        f"Footprint:        {rng.uniform(1, 900):.2f} MB -> "
+        f"{rng.uniform(1, 900):.2f} MB (+1.50 MB)",
+        "I/O:              120 I/Os (4.5 MB)",
+        "Time Since Fork:  86400s",
+        "Num samples:      1000 (1-1000)",
+        f"CPU Time:         {rng.uniform(0, 9):.3f}s (51.3G cycles, 87.4G instructions, 0.59c/i)",
+        "Num threads:      4",
+        "Note:             1 idle work queue thread omitted",
+        "",
+    ]
+    for t in range(4):
+        samples = rng.randint(1, 1000)
+        lines.append(
+            f'  Thread 0x{pid * 16 + t:x}    DispatchQueue "com.apple.main-thread"(1)    '
+            f"{samples} samples (1-{samples})    priority 31 (base 31)    "
+            f"cpu time 1.234s (4.5G cycles, 7.8G instructions, 0.58c/i)"
+        )
+        for depth in range(rng.randint(20, 40)):
+            kernel = "*" if depth > 15 and rng.random() < 0.5 else ""
+            library = rng.choice(LIBRARIES)
+            if rng.random() < 0.1:
+                symbol = f"??? ({library} + {rng.randint(0, 99999)})"
+            else:
+                symbol = (
+                    f"function_{rng.randint(0, 5000)} + {rng.randint(0, 999)} ({library} + 1234)"
+                )
+            state = rng.choice(STATES)
+            address = f"0x{rng.getrandbits(40):x}"
+            lines.append(f"{'  ' * (depth + 2)}{kernel}{samples}  {symbol} [{address}]{state}")
+        lines.append("")
+    lines.append("  Binary Images:")
+    for image in range(8):
+        base = 0x100000000 + image * 0x100000
+        lines.append(
+            f"         0x{base:x} -        0x{base + 0xFFFFF:x}  lib{image}.dylib 1.0 (1)  "
+            f"<6F2A7B90-1C3D-4E5F-8A9B-0C1D2E3F4A5B>  /usr/lib/lib{image}.dylib"
+        )
+    lines.append("")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_spindump(path: Path, megabytes: int) -> None:
+    rng = random.Random(megabytes)
+    target = megabytes * 2**20
+    with path.open("w") as f:
+        written = f.write(HEADER)
+        pid = 100
+        while written < target:
+            written += f.write(synth_process(rng, pid))
+            pid += 1
+        f.write(IO_SECTION)
+
+
+def peak_kib(who: int) -> int:
+    peak = resource.getrusage(who).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Bytes on macOS, KiB on Linux
+
+
+def parse(path: Path, workers: int) -> None:
+    """Parse one file; print seconds, peak RSS (KiB) self and workers, frame count."""
+    start = time.perf_counter()
+    data = parse_tailspin_file(path, workers, min_parallel_bytes=0)
+    elapsed = time.perf_counter() - start
+    frames = sum(len(t.frames) for p in data.processes for t in p.threads)
+    print(
+        f"{elapsed} {peak_kib(resource.RUSAGE_SELF)} {peak_kib(resource.RUSAGE_CHILDREN)} {frames}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default="10,100,500", help="Comma-separated sizes in MB")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--parse", metavar="FILE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.parse:
+        parse(Path(args.parse), int(args.workers))
+        return
+
+    print(
+        f"{'size MB':>8}  {'workers':>7}  {'seconds':>8}  {'MB/s':>6}  {'speedup':>7}  "
+        f"{'peak RSS MB':>11}  {'worker RSS MB':>13}  {'frames':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in (int(s) for s in args.sizes.split(",")):
+            path = Path(tmp) / f"spindump-{megabytes}.txt"
+            write_spindump(path, megabytes)
+            baseline = None
+            for workers in (int(w) for w in args.workers.split(",")):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--parse", str(path), "--workers", str(workers)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.split()
+                seconds, peak, worker_peak, frames = float(output[-4]), *map(int, output[-3:])
+                baseline = baseline or seconds
+                print(
+                    f"{megabytes:>8}  {workers:>7}  {seconds:>8.1f}  {megabytes / seconds:>6.1f}  "
+                    f"{baseline / seconds:>7.2f}  {peak / 1024:>11.0f}  "
+                    f"{worker_peak / 1024:>13.0f}  {frames:>9}"
+                )
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark machine snapshot retention: row deletes vs partition drops.
+
+Builds 24 hours of machine snapshots (one per minute, --procs process rows
+each) two ways and expires the oldest 12 hours:
+
+- single table: every process row in one table, expired with a DELETE of
+  the old rows (what the ON DELETE CASCADE from machine_snapshots did)
+- partitioned: one table per hour, expired with prune_machine_snapshots()
+
+Reports prune time and how many bytes the prune wrote to the WAL
+(autocheckpoint disabled so the WAL keeps everything).
+
+Usage:
+    uv run python benchmarks/bench_partitions.py --procs 500
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    _MACHINE_PARTITION_DDL,
+    _MACHINE_PARTITION_INDEX,
+    create_machine_partition,
+    get_connection,
+    init_database,
+    prune_machine_snapshots,
+)
+
+HOUR = 3600
+
+
+def _row_template(conn, table: str) -> tuple[str, list]:
+    """INSERT statement and placeholder values for every non-id column."""
+    columns, values = [], []
+    for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if name == "id":
+            continue
+        columns.append(name)
+        values.append({"INTEGER": 1, "REAL": 1.0}.get(col_type, "x"))
+    sql = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({','.join('?' * len(columns))})"
+    return sql, values
+
+
+def generate(path: Path, procs: int, partitioned: bool) -> float:
+    """Build a database with 24h of snapshots; returns the cutoff to prune at."""
+    init_database(path)
+    conn = get_connection(path)
+    now = time.time() // HOUR * HOUR
+    if not partitioned:
+        conn.execute(_MACHINE_PARTITION_DDL.format(table="machine_snapshot_processes"))
+        conn.execute(_MACHINE_PARTITION_INDEX.format(table="machine_snapshot_processes"))
+
+    for minute in range(24 * 60):
+        captured_at = now - 24 * HOUR + minute * 60
+        snapshot_id = conn.execute(
+            """INSERT INTO machine_snapshots (captured_at, process_count, max_score)
+               VALUES (?, ?, 0)""",
+            (captured_at, procs),
+        ).lastrowid
+        if partitioned:
+            table = create_machine_partition(conn, captured_at)
+        else:
+            table = "machine_snapshot_processes"
+        sql, values = _row_template(conn, table)
+        values[0] = snapshot_id  # snapshot_id is the first non-id column
+        conn.executemany(sql, [values] * procs)
+        if minute % 60 == 0:
+            conn.commit()
+    conn.commit()
+    conn.close()
+    return now - 12 * HOUR
+
+
+def prune(path: Path, cutoff: float, partitioned: bool) -> tuple[float, int]:
+    """Expire snapshots before cutoff; returns (seconds, WAL bytes written)."""
+    conn = get_connection(path)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    wal = path.with_suffix(".db-wal")
+
+    start = time.perf_counter()
+    if partitioned:
+        max_age_hours = (time.time() - cutoff) / HOUR
+        prune_machine_snapshots(conn, max_age_hours=max_age_hours)
+    else:
+        conn.execute(
+            """DELETE FROM machine_snapshot_processes WHERE snapshot_id IN (
+                   SELECT id FROM machine_snapshots WHERE captured_at < ?
+               )""",
+            (cutoff,),
+        )
+        conn.execute("DELETE FROM machine_snapshots WHERE captured_at < ?", (cutoff,))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+
+    wal_bytes = wal.stat().st_size if wal.exists() else 0
+    conn.close()
+    return elapsed, wal_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--procs", type=int, default=500, help="Process rows per snapshot")
+    args = parser.parse_args()
+
+    print(f"24h of snapshots, {args.procs} processes each, expiring 12h")
+    print(f"{'layout':>12}  {'prune ms':>10}  {'WAL MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for partitioned in (False, True):
+            path = Path(tmp) / f"partitioned_{partitioned}.db"
+            cutoff = generate(path, args.procs, partitioned)
+            seconds, wal_bytes = prune(path, cutoff, partitioned)
+            label = "partitioned" if partitioned else "single table"
+            print(f"{label:>12}  {seconds * 1000:>10.1f}  {wal_bytes / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Benchmark retention pruning against main-loop jitter.
+
+Generates a database with old events (snapshots, forensic captures and a
+tailspin tree each) and old machine snapshots, then prunes a copy of it two
+ways while an asyncio ticker runs at the daemon's sample rate:
+
+- unbounded: one cascading DELETE for events, as before incremental
+  pruning, then all expired machine snapshot partitions
+- incremental: prune_incremental(), yielding to the loop between batches
+
+Reports prune time and how late the ticker fired (the sampling jitter the
+pruner causes). Scale the flags up for a multi-GB database.
+
+Usage:
+    uv run python benchmarks/bench_prune.py --events 2000 --frames 300
+"""
+
+import argparse
+import asyncio
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    create_machine_partition,
+    get_connection,
+    init_database,
+    prune_incremental,
+    prune_machine_snapshots,
+)
+
+DAY = 86400
+
+
+def _template(conn: sqlite3.Connection, table: str) -> tuple[list[str], list]:
+    """Column names (minus id) and placeholder values matching their types."""
+    columns, values = [], []
+    for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if name == "id":
+            continue
+        columns.append(name)
+        values.append({"INTEGER": 1, "REAL": 1.0}.get(col_type, "x"))
+    return columns, values
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: list[dict]) -> int:
+    """Insert rows, filling unspecified columns; returns the last rowid."""
+    columns, defaults = _template(conn, table)
+    placeholders = ",".join("?" * len(columns))
+    data = [[row.get(c, d) for c, d in zip(columns, defaults)] for row in rows]
+    conn.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})", data)
+    return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+
+def generate(path: Path, args: argparse.Namespace) -> None:
+    """Build the benchmark database."""
+    init_database(path)
+    conn = get_connection(path)
+    old = time.time() - 120 * DAY
+    frames_per_thread = args.frames
+
+    for i in range(args.events):
+        event_id = _insert(
+            conn,
+            "process_events",
+            [{"exit_time": old + i, "entry_time": old + i - 60, "peak_snapshot_id": None}],
+        )
+        _insert(conn, "process_snapshots", [{"event_id": event_id}] * args.snapshots_per_event)
+        capture_id = _insert(conn, "forensic_captures", [{"event_id": event_id}])
+        process_id = _insert(conn, "tailspin_process", [{"capture_id": capture_id}])
+        _insert(conn, "tailspin_binary_image", [{"process_id": process_id}] * 20)
+        thread_id = _insert(conn, "tailspin_thread", [{"process_id": process_id}])
+        _insert(
+            conn,
+            "tailspin_frame",
+            [{"thread_id": thread_id, "parent_frame_id": None}] * frames_per_thread,
+        )
+        _insert(conn, "log_entries", [{"capture_id": capture_id}] * 20)
+        if i % 100 == 0:
+            conn.commit()
+
+    for i in range(args.machine_snapshots):
+        captured_at = old + i * 60
+        snapshot_id = _insert(conn, "machine_snapshots", [{"captured_at": captured_at}])
+        table = create_machine_partition(conn, captured_at)
+        _insert(conn, table, [{"snapshot_id": snapshot_id}] * args.procs)
+        if i % 10 == 0:
+            conn.commit()
+    conn.commit()
+    conn.close()
+
+
+def prune_unbounded(conn: sqlite3.Connection) -> None:
+    """Prune without yielding: one cascading DELETE for events, then partitions."""
+    conn.execute(
+        "DELETE FROM process_events WHERE exit_time IS NOT NULL AND exit_time < ?",
+        (time.time() - 90 * DAY,),
+    )
+    conn.commit()
+    prune_machine_snapshots(conn)
+
+
+async def run(path: Path, incremental: bool, interval: float) -> tuple[float, list[float]]:
+    """Prune with a ticker running; returns (prune seconds, tick lateness in ms)."""
+    lateness: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        loop = asyncio.get_running_loop()
+        expected = loop.time() + interval
+        while not done.is_set():
+            await asyncio.sleep(max(0.0, expected - loop.time()))
+            lateness.append((loop.time() - expected) * 1000)
+            expected += interval
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(interval)  # Let the ticker settle
+
+    conn = get_connection(path)
+    start = time.perf_counter()
+    if incremental:
+        for _ in prune_incremental(conn, events_days=90):
+            await asyncio.sleep(0)
+    else:
+        prune_unbounded(conn)
+    elapsed = time.perf_counter() - start
+    conn.close()
+
+    await asyncio.sleep(interval * 2)
+    done.set()
+    await tick_task
+    return elapsed, lateness
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--snapshots-per-event", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=300, help="Tailspin frames per event")
+    parser.add_argument("--machine-snapshots", type=int, default=720)
+    parser.add_argument("--procs", type=int, default=300, help="Processes per machine snapshot")
+    parser.add_argument("--interval", type=float, default=1 / 3, help="Ticker interval (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.db"
+        start = time.perf_counter()
+        generate(source, args)
+        size_mb = source.stat().st_size / 1e6
+        print(f"generated {size_mb:.0f} MB in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'mode':<12} {'prune s':>8} {'late p50':>9} {'late p99':>9} {'late max':>9}")
+        for mode in ("unbounded", "incremental"):
+            path = Path(tmp) / f"{mode}.db"
+            shutil.copy(source, path)
+            elapsed, late = asyncio.run(run(path, mode == "incremental", args.interval))
+            late.sort()
+            p99 = late[int(len(late) * 0.99)] if late else 0.0
+            print(
+                f"{mode:<12} {elapsed:8.2f} {statistics.median(late):8.1f}ms "
+                f"{p99:8.1f}ms {max(late):8.1f}ms  ({path.stat().st_size / 1e6:.0f} MB after)"
+            )
+
+
+if __name__ == "__main__":
+    main()
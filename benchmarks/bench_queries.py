@@ -0,0 +1,205 @@
+"""Benchmark the storage getters on a 90-day dataset, old vs new indexes.
+
+Generates 90 days of event history (events with snapshots, forensic
+captures, log entries and a tailspin tree each), then times every getter
+the CLI and TUI use, first with the schema's composite indexes and then
+with the previous single-column index set (plus its unused indexes, which
+also slow down the inserts that build the dataset).
+
+Usage:
+    uv run python benchmarks/bench_queries.py --events-per-day 200
+"""
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    get_connection,
+    get_forensic_captures,
+    get_log_entries,
+    get_process_events,
+    get_process_snapshots,
+    get_tailspin_binary_images,
+    get_tailspin_frames,
+    get_tailspin_processes,
+    get_tailspin_threads,
+    init_database,
+)
+
+DAY = 86400
+
+# Index set before the composite indexes (schema v21)
+OLD_INDEXES = """
+CREATE INDEX idx_process_events_pid_boot ON process_events(pid, boot_time);
+CREATE INDEX idx_process_events_open_v21 ON process_events(exit_time) WHERE exit_time IS NULL;
+CREATE INDEX idx_process_snapshots_event ON process_snapshots(event_id);
+CREATE INDEX idx_process_snapshots_score ON process_snapshots(score);
+CREATE INDEX idx_forensic_captures_event ON forensic_captures(event_id);
+CREATE INDEX idx_log_entries_capture ON log_entries(capture_id);
+CREATE INDEX idx_tailspin_process_capture ON tailspin_process(capture_id);
+CREATE INDEX idx_tailspin_process_pid ON tailspin_process(pid);
+CREATE INDEX idx_tailspin_thread_process ON tailspin_thread(process_id);
+CREATE INDEX idx_tailspin_frame_thread ON tailspin_frame(thread_id);
+CREATE INDEX idx_tailspin_binary_image_process ON tailspin_binary_image(process_id);
+"""
+
+NEW_INDEXES = [
+    "idx_process_events_entry",
+    "idx_process_events_boot_entry",
+    "idx_process_events_open",
+    "idx_process_snapshots_event_time",
+    "idx_forensic_captures_event_time",
+    "idx_log_entries_capture_time",
+    "idx_tailspin_process_capture_cpu",
+    "idx_tailspin_thread_process_samples",
+    "idx_tailspin_frame_thread_depth",
+    "idx_tailspin_binary_image_process_address",
+]
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: list[dict]) -> int:
+    """Insert rows, filling unspecified columns; returns the last rowid."""
+    columns, defaults = [], []
+    for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if name != "id":
+            columns.append(name)
+            defaults.append({"INTEGER": 1, "REAL": 1.0}.get(col_type, "x"))
+    placeholders = ",".join("?" * len(columns))
+    data = [[row.get(c, d) for c, d in zip(columns, defaults)] for row in rows]
+    conn.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})", data)
+    return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+
+def generate(path: Path, events_per_day: int, old: bool) -> float:
+    """Build the dataset; returns seconds spent inserting."""
+    init_database(path)
+    conn = get_connection(path)
+    if old:
+        for name in NEW_INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        conn.executescript(OLD_INDEXES)
+
+    rng = random.Random(0)
+    now = time.time()
+    start = time.perf_counter()
+    for day in range(90):
+        boot_time = int(now - (90 - day // 7 * 7) * DAY)  # Reboot weekly
+        for _ in range(events_per_day):
+            entry = now - (90 - day) * DAY + rng.uniform(0, DAY)
+            event_id = _insert(
+                conn,
+                "process_events",
+                [
+                    {
+                        "boot_time": boot_time,
+                        "entry_time": entry,
+                        "exit_time": entry + 60,
+                        "peak_snapshot_id": None,
+                    }
+                ],
+            )
+            _insert(
+                conn,
+                "process_snapshots",
+                [
+                    {"event_id": event_id, "captured_at": entry + rng.uniform(0, 60)}
+                    for _ in range(10)
+                ],
+            )
+            capture_id = _insert(
+                conn, "forensic_captures", [{"event_id": event_id, "captured_at": entry}]
+            )
+            _insert(
+                conn,
+                "log_entries",
+                [
+                    {"capture_id": capture_id, "timestamp": str(rng.uniform(0, 1))}
+                    for _ in range(20)
+                ],
+            )
+            process_id = _insert(
+                conn,
+                "tailspin_process",
+                [{"capture_id": capture_id, "cpu_time_sec": rng.uniform(0, 9)}],
+            )
+            _insert(
+                conn,
+                "tailspin_binary_image",
+                [{"process_id": process_id, "start_address": str(i)} for i in range(20)],
+            )
+            thread_id = _insert(
+                conn, "tailspin_thread", [{"process_id": process_id, "num_samples": 5}]
+            )
+            _insert(
+                conn,
+                "tailspin_frame",
+                [
+                    {"thread_id": thread_id, "depth": rng.randint(0, 30), "parent_frame_id": None}
+                    for _ in range(40)
+                ],
+            )
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    return elapsed
+
+
+def time_getters(path: Path, repeat: int) -> dict[str, float]:
+    """Mean milliseconds per call for each getter."""
+    conn = get_connection(path)
+    boot_time = conn.execute("SELECT MAX(boot_time) FROM process_events").fetchone()[0]
+    ids = [row[0] for row in conn.execute("SELECT id FROM process_events ORDER BY RANDOM()")]
+    ids = ids[:repeat]
+    week_ago = time.time() - 7 * DAY
+
+    calls = {
+        "history (all boots)": lambda i: get_process_events(conn, limit=100),
+        "history (this boot)": lambda i: get_process_events(conn, boot_time=boot_time),
+        "history (last week)": lambda i: get_process_events(conn, time_cutoff=week_ago),
+        "event snapshots": lambda i: get_process_snapshots(conn, i),
+        "forensic captures": lambda i: get_forensic_captures(conn, i),
+        "log entries": lambda i: get_log_entries(conn, i, limit=10),
+        "tailspin processes": lambda i: get_tailspin_processes(conn, i),
+        "tailspin threads": lambda i: get_tailspin_threads(conn, i),
+        "tailspin frames": lambda i: get_tailspin_frames(conn, i),
+        "binary images": lambda i: get_tailspin_binary_images(conn, i),
+    }
+    result = {}
+    for name, call in calls.items():
+        start = time.perf_counter()
+        for i in ids:
+            call(i)
+        result[name] = (time.perf_counter() - start) / len(ids) * 1000
+    conn.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events-per-day", type=int, default=200, help="Events per day")
+    parser.add_argument("--repeat", type=int, default=500, help="Calls per getter")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for old in (True, False):
+            path = Path(tmp) / f"old_{old}.db"
+            insert_seconds = generate(path, args.events_per_day, old)
+            results[old] = (insert_seconds, time_getters(path, args.repeat))
+
+    events = args.events_per_day * 90
+    print(f"90 days, {events} events; mean ms per call")
+    print(f"{'query':>20}  {'old':>8}  {'new':>8}")
+    for name in results[False][1]:
+        print(f"{name:>20}  {results[True][1][name]:>8.3f}  {results[False][1][name]:>8.3f}")
+    print(f"{'insert dataset (s)':>20}  {results[True][0]:>8.1f}  {results[False][0]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark top-offender queries: scanning process_events vs command_stats.
+
+Generates 90 days of closed events over --commands commands, then answers
+"which commands caused the most critical events in the last 30 days, and
+what is their median peak score" twice: by scanning process_events (the
+only way before the rollup) and with get_top_offenders(). Also reports
+what closing an event costs with the rollup upsert, and how long a
+rebuild takes.
+
+Usage:
+    uv run python benchmarks/bench_rollup.py --events-per-day 10000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    close_process_event,
+    create_process_event,
+    get_connection,
+    get_top_offenders,
+    init_database,
+    rebuild_command_stats,
+)
+
+DAY = 86400
+BANDS = ["medium", "elevated", "high", "critical"]
+
+
+def generate(path: Path, events_per_day: int, commands: int) -> None:
+    init_database(path)
+    conn = get_connection(path)
+    rng = random.Random(0)
+    now = time.time()
+    for day in range(90):
+        rows = []
+        for _ in range(events_per_day):
+            entry = now - (90 - day) * DAY + rng.uniform(0, DAY)
+            score = rng.randint(20, 100)
+            band = BANDS[min((score - 20) // 20, 3)]
+            command = f"proc{int(rng.paretovariate(1.2)) % commands}"
+            rows.append((command, entry, entry + rng.uniform(1, 300), band, score))
+        conn.executemany(
+            """INSERT INTO process_events
+               (pid, command, boot_time, entry_time, exit_time, entry_band, peak_band, peak_score)
+               VALUES (1, ?, 1, ?, ?, ?, ?, ?)""",
+            [(c, e, x, b, b, s) for c, e, x, b, s in rows],
+        )
+        conn.commit()
+    rebuild_command_stats(conn)
+    conn.close()
+
+
+def scan_top(conn, since: float, limit: int = 10) -> list[tuple]:
+    """Top critical commands with median peak score, from process_events.
+
+    Same window as the rollup (whole UTC days) and the same median (over
+    all of a command's events).
+    """
+    critical: dict[str, int] = {}
+    scores: dict[str, list[int]] = {}
+    for command, band, score in conn.execute(
+        "SELECT command, peak_band, peak_score FROM process_events WHERE exit_time >= ?",
+        (since // DAY * DAY,),
+    ):
+        critical[command] = critical.get(command, 0) + (band == "critical")
+        scores.setdefault(command, []).append(score)
+    ranked = sorted(critical, key=critical.get, reverse=True)[:limit]
+    return [(c, critical[c], statistics.median_low(scores[c])) for c in ranked]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events-per-day", type=int, default=10_000, help="Events per day")
+    parser.add_argument("--commands", type=int, default=500, help="Distinct commands")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        generate(path, args.events_per_day, args.commands)
+        conn = get_connection(path)
+        since = time.time() - 30 * DAY
+
+        start = time.perf_counter()
+        scanned = scan_top(conn, since)
+        scan_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        rolled = get_top_offenders(conn, since)
+        rollup_ms = (time.perf_counter() - start) * 1000
+
+        closes = []
+        for i in range(500):
+            event_id = create_process_event(
+                conn, i, f"proc{i % 50}", 1, time.time(), "high", 70, "high"
+            )
+            start = time.perf_counter()
+            close_process_event(conn, event_id, time.time())
+            closes.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        rebuilt = rebuild_command_stats(conn)
+        rebuild_s = time.perf_counter() - start
+        conn.close()
+
+    print(f"{args.events_per_day * 90} events over {args.commands} commands")
+    print(f"top critical commands, last 30 days: scan {scan_ms:.0f} ms, rollup {rollup_ms:.1f} ms")
+    print(f"  scan:   {scanned[:3]}")
+    print(
+        f"  rollup: {[(o['command'], o['critical_events'], o['median_score']) for o in rolled[:3]]}"
+    )
+    print(f"close_process_event with rollup: median {statistics.median(closes):.2f} ms")
+    print(f"rebuild of {rebuilt} events: {rebuild_s:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark full-text search over captures: LIKE scans vs the FTS5 index.
+
+Generates --captures forensic captures, each with --logs log entries and a
+tailspin tree of --procs processes x 4 threads x 20 frames, timing
+index_capture_search() per capture and per batch (each batch its own
+transaction) as it goes. Then runs a few searches
+with search_captures() (top 20 captures, as `rogue-hunter search` shows)
+and with the LIKE scans they replace, and reports what the index adds to
+the database file.
+
+Usage:
+    uv run python benchmarks/bench_search.py --captures 300
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    create_process_event,
+    get_connection,
+    index_capture_search,
+    init_database,
+    search_captures,
+)
+
+WORDS = "kernel task thread queue timeout memory pressure surface lock render draw io wait".split()
+SYMBOLS = [f"Module{m}::function{f}" for m in range(40) for f in range(50)]
+BLOCKED = ["turnstile 0x2a", "semaphore 0x90", "mutex 0x7f"]
+
+# (name, FTS5 query, sources, equivalent LIKE scan)
+SEARCHES = [
+    (
+        "log word",
+        "watchdog",
+        ["logs"],
+        """SELECT DISTINCT capture_id FROM log_entries
+           WHERE event_message LIKE '%watchdog%'""",
+    ),
+    (
+        "blocked_on",
+        "blocked_on: IOSurface",
+        ["frames"],
+        """SELECT DISTINCT p.capture_id FROM tailspin_frame f
+           JOIN tailspin_thread t ON t.id = f.thread_id
+           JOIN tailspin_process p ON p.id = t.process_id
+           WHERE f.blocked_on LIKE '%IOSurface%'""",
+    ),
+    (
+        "symbol",
+        "psynch_cvwait",
+        ["frames"],
+        """SELECT DISTINCT p.capture_id FROM tailspin_frame f
+           JOIN tailspin_thread t ON t.id = f.thread_id
+           JOIN tailspin_process p ON p.id = t.process_id
+           WHERE f.symbol_name LIKE '%psynch_cvwait%'""",
+    ),
+]
+
+
+def _blocked_on(rng: random.Random) -> str | None:
+    """Most leaf frames are not blocked; one in ten blocked ones waits on IOSurface."""
+    if rng.random() < 0.8:
+        return None
+    return "IOSurface 0x1f00" if rng.random() < 0.1 else rng.choice(BLOCKED)
+
+
+def fill_capture(conn, rng: random.Random, capture_id: int, logs: int, procs: int) -> None:
+    conn.executemany(
+        """INSERT INTO log_entries (capture_id, timestamp, event_message, subsystem, process_name)
+           VALUES (?, '2024-01-15 10:30:00', ?, 'com.apple.test', ?)""",
+        [
+            (
+                capture_id,
+                " ".join(rng.choices(WORDS, k=10))
+                + (" watchdog fired" if rng.random() < 0.01 else ""),
+                f"proc{rng.randrange(50)}",
+            )
+            for _ in range(logs)
+        ],
+    )
+    for p in range(procs):
+        process_id = conn.execute(
+            "INSERT INTO tailspin_process (capture_id, pid, name) VALUES (?, ?, ?)",
+            (capture_id, 100 + p, f"proc{p}"),
+        ).lastrowid
+        for t in range(4):
+            thread_id = conn.execute(
+                "INSERT INTO tailspin_thread (process_id, thread_id) VALUES (?, ?)",
+                (process_id, f"0x{t:x}"),
+            ).lastrowid
+            conn.executemany(
+                """INSERT INTO tailspin_frame
+                   (thread_id, depth, sample_count, is_kernel, address, symbol_name, blocked_on)
+                   VALUES (?, ?, 1, 0, '0x1000', ?, ?)""",
+                [
+                    (
+                        thread_id,
+                        d,
+                        "__psynch_cvwait" if rng.random() < 0.001 else rng.choice(SYMBOLS),
+                        _blocked_on(rng) if d == 19 else None,
+                    )
+                    for d in range(20)
+                ],
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--captures", type=int, default=300, help="Forensic captures")
+    parser.add_argument("--logs", type=int, default=1000, help="Log entries per capture")
+    parser.add_argument("--procs", type=int, default=50, help="Tailspin processes per capture")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per search")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        init_database(path)
+        conn = get_connection(path)
+        rng = random.Random(0)
+        index_ms = []
+        batch_ms = []
+        for c in range(args.captures):
+            event_id = create_process_event(conn, c, f"proc{c}", 1, time.time(), "high", 70, "high")
+            capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+            fill_capture(conn, rng, capture_id, args.logs, args.procs)
+            conn.commit()
+            start = batch_start = time.perf_counter()
+            while index_capture_search(conn, capture_id):
+                conn.commit()
+                batch_ms.append((time.perf_counter() - batch_start) * 1000)
+                batch_start = time.perf_counter()
+            conn.commit()
+            index_ms.append((time.perf_counter() - start) * 1000)
+
+        pages = conn.execute(
+            """SELECT sum(pageno IS NOT NULL) FROM dbstat
+               WHERE name LIKE 'log_search%' OR name LIKE 'frame_search%'"""
+        ).fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        total = conn.execute("PRAGMA page_count").fetchone()[0]
+
+        print(
+            f"{args.captures} captures, {args.logs} log entries and {args.procs * 80} frames each"
+        )
+        print(
+            f"index_capture_search: median {statistics.median(index_ms):.1f} ms, "
+            f"max {max(index_ms):.1f} ms per capture; "
+            f"median {statistics.median(batch_ms):.1f} ms, max {max(batch_ms):.1f} ms per batch"
+        )
+        print(
+            f"index size: {pages * page_size / 2**20:.0f} MB of {total * page_size / 2**20:.0f} MB"
+        )
+        print(f"{'search':>12}  {'LIKE ms':>8}  {'FTS5 ms':>8}  {'captures':>8}")
+        for name, query, sources, scan in SEARCHES:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                scanned = conn.execute(scan).fetchall()
+            scan_ms = (time.perf_counter() - start) / args.repeat * 1000
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                search_captures(conn, query, sources)  # Top 20, as the command shows
+            fts_ms = (time.perf_counter() - start) / args.repeat * 1000
+            found = search_captures(conn, query, sources, limit=args.captures)
+            assert len(found) == len(scanned), (name, len(found), len(scanned))
+            print(f"{name:>12}  {scan_ms:>8.1f}  {fts_ms:>8.1f}  {len(found):>8}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
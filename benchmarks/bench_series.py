@@ -0,0 +1,104 @@
+"""Benchmark per-process series reads over machine snapshots.
+
+Fills a day of machine snapshots (one every --interval seconds, --procs
+processes each), then times a 6-hour series for one command and one PID,
+first without the (command, snapshot_id)/(pid, snapshot_id) partition
+indexes and then with them.
+
+Usage:
+    uv run python benchmarks/bench_series.py --procs 150 --interval 10
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from rogue_hunter.storage import (
+    _MACHINE_PARTITION_SERIES_INDEXES,
+    get_connection,
+    get_machine_partitions,
+    get_process_series,
+    init_database,
+    insert_machine_snapshot,
+)
+from tests.conftest import make_process_score
+
+HOURS = 24
+
+
+def generate(path: Path, procs: int, interval: int) -> float:
+    """Build the dataset; returns the newest captured_at."""
+    init_database(path)
+    conn = get_connection(path)
+    now = time.time()
+    captured_at = now - HOURS * 3600
+    while captured_at < now:
+        scores = [
+            make_process_score(pid=1000 + i, command=f"proc{i}", cpu=float(i)) for i in range(procs)
+        ]
+        insert_machine_snapshot(conn, captured_at, scores)
+        captured_at += interval
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    return now
+
+
+def time_series(path: Path, now: float, repeat: int) -> dict[str, tuple[float, float]]:
+    """Mean milliseconds and peak KiB per 6-hour series read."""
+    conn = get_connection(path)
+    calls = {
+        "by command": lambda: get_process_series(
+            conn, ["cpu", "mem"], now - 6 * 3600, command="proc7"
+        ),
+        "by pid": lambda: get_process_series(conn, ["cpu", "mem"], now - 6 * 3600, pid=1007),
+    }
+    result = {}
+    for name, call in calls.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        tracemalloc.start()
+        call()
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        result[name] = (elapsed, peak)
+    conn.close()
+    return result
+
+
+def drop_series_indexes(path: Path) -> None:
+    conn = get_connection(path)
+    for table in get_machine_partitions(conn):
+        for index in _MACHINE_PARTITION_SERIES_INDEXES:
+            conn.execute(f"DROP INDEX {index.split()[5].format(table=table)}")
+    conn.commit()
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--procs", type=int, default=150, help="Processes per snapshot")
+    parser.add_argument("--interval", type=int, default=10, help="Seconds between snapshots")
+    parser.add_argument("--repeat", type=int, default=5, help="Reads per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        now = generate(path, args.procs, args.interval)
+        indexed = time_series(path, now, args.repeat)
+        drop_series_indexes(path)
+        scanned = time_series(path, now, args.repeat)
+
+    rows = HOURS * 3600 // args.interval * args.procs
+    print(f"{HOURS}h, {rows} process rows; 6h series of cpu,mem")
+    print(f"{'query':>12}  {'scan ms':>9}  {'index ms':>9}  {'peak KiB':>9}")
+    for name, (ms, peak) in indexed.items():
+        print(f"{name:>12}  {scanned[name][0]:>9.1f}  {ms:>9.1f}  {peak:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark sharded per-PID reads against thread count.
+
+Uses a SyntheticSource that sleeps for each simulated syscall. Sleeping
+releases the GIL just as a ctypes foreign call does, so the overlap between
+shards is representative of libproc reads.
+
+Usage:
+    uv run python benchmarks/bench_sharding.py --processes 800 --latency-us 20
+"""
+
+import argparse
+import statistics
+import time
+
+from rogue_hunter.collector import LibprocCollector
+from rogue_hunter.config import Config
+from rogue_hunter.sources import SyntheticSource
+
+
+def measure(threads: int, args: argparse.Namespace) -> tuple[float, float, int]:
+    """Return (mean read ms, mean collection ms, last shard count) for a thread setting."""
+    config = Config()
+    config.collection.threads = threads
+    config.collection.max_threads = args.max_threads
+    config.collection.full_sweep_samples = 1 if args.full else 15
+    source = SyntheticSource(
+        process_count=args.processes, hot_count=5, call_latency=args.latency_us / 1e6
+    )
+    collector = LibprocCollector(config, source)
+    samples = args.samples
+    if threads == 0:
+        # Let the tuner finish its trials before measuring
+        tuner = collector._reader.tuner
+        for _ in range(len(tuner.candidates) * tuner.trial_samples):
+            collector._collect_sync()
+
+    read_ms: list[float] = []
+    total_ms: list[float] = []
+    for _ in range(samples):
+        collector._collect_sync()
+        read_ms.append(collector.last_stats.read_ms)
+        total_ms.append(collector.last_stats.elapsed_ms)
+        time.sleep(args.interval)
+    shards = collector.last_stats.shards
+    collector.close()
+    return statistics.mean(read_ms), statistics.mean(total_ms), shards
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=800)
+    parser.add_argument("--latency-us", type=float, default=20.0)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.02)
+    parser.add_argument("--max-threads", type=int, default=8)
+    parser.add_argument("--full", action="store_true", help="Detail every PID every sample")
+    args = parser.parse_args()
+
+    print(
+        f"{args.processes} processes, {args.latency_us}us per call, "
+        f"{'full' if args.full else 'two-tier'} collection"
+    )
+    baseline = None
+    threads = 1
+    while threads <= args.max_threads:
+        read, total, _ = measure(threads, args)
+        baseline = baseline or read
+        print(
+            f"threads {threads:2d}  read {read:8.2f} ms  collect {total:8.2f} ms  "
+            f"speedup {baseline / read:4.2f}x"
+        )
+        threads *= 2
+    read, total, shards = measure(0, args)
+    print(f"auto -> {shards:2d}  read {read:8.2f} ms  collect {total:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark build_wait_graph() on a large stored tailspin capture.
+
+Generates a capture like bench_calltree's (--procs x --threads x --frames
+frames), then marks the last frame of --blocked of its threads as waiting:
+mostly on a thread of a lower-numbered process (turnstiles and mutexes,
+so waits form a forest of long chains), some on a whole process (wait4),
+some on nothing in particular, plus a few two-thread deadlocks, and
+times build_wait_graph().
+
+Usage:
+    uv run python benchmarks/bench_waitgraph.py --procs 2000 --threads 10 --frames 50
+"""
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from bench_calltree import insert_capture, time_ms
+
+from rogue_hunter.storage import get_connection, init_database
+from rogue_hunter.waitgraph import build_wait_graph
+
+
+def blocked_on(rng: random.Random, threads: int, pid: int) -> str:
+    """A wait for a thread of pid, on something owned by an earlier process."""
+    if pid == 100 or rng.random() < 0.05:
+        return rng.choice(["semaphore", "sleep", "mach_msg receive"])
+    owner = rng.randrange(max(100, pid - 50), pid)
+    if rng.random() < 0.2:
+        return f"proc{owner - 100} [{owner}]"
+    thread = f"0x{rng.randrange(threads):x}"
+    kind = rng.choice(["turnstile with priority 31 waiting for", "pthread mutex owned by"])
+    return f"{kind} proc{owner - 100} [{owner}] thread {thread}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--procs", type=int, default=2000, help="Processes in the capture")
+    parser.add_argument("--threads", type=int, default=10, help="Threads per process")
+    parser.add_argument("--frames", type=int, default=50, help="Frames per thread")
+    parser.add_argument("--blocked", type=float, default=0.5, help="Share of threads blocked")
+    parser.add_argument("--deadlocks", type=int, default=20, help="Two-thread deadlocks")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.db"
+        init_database(path)
+        conn = get_connection(path)
+        rng = random.Random(0)
+        capture_id = insert_capture(conn, rng, args.procs, args.threads, args.frames)
+        leaves = {
+            (pid, thread_id): frame_id
+            for pid, thread_id, frame_id in conn.execute(
+                """SELECT p.pid, t.thread_id, max(f.id) FROM tailspin_process p
+                   JOIN tailspin_thread t ON t.process_id = p.id
+                   JOIN tailspin_frame f ON f.thread_id = t.id
+                   WHERE p.capture_id = ? GROUP BY t.id""",
+                (capture_id,),
+            )
+        }
+        waits = {
+            frame_id: blocked_on(rng, args.threads, pid)
+            for (pid, _), frame_id in leaves.items()
+            if rng.random() < args.blocked
+        }
+        for _ in range(args.deadlocks):
+            a, b = rng.sample(range(100, 100 + args.procs), 2)
+            waits[leaves[a, "0x0"]] = f"turnstile waiting for proc{b - 100} [{b}] thread 0x0"
+            waits[leaves[b, "0x0"]] = f"turnstile waiting for proc{a - 100} [{a}] thread 0x0"
+        updates = [(text, frame_id) for frame_id, text in waits.items()]
+        conn.executemany("UPDATE tailspin_frame SET blocked_on = ? WHERE id = ?", updates)
+        conn.commit()
+
+        graph = build_wait_graph(conn, capture_id)
+        longest = len(graph.chains[0].nodes) if graph.chains else 0
+        print(
+            f"{args.procs * args.threads * args.frames} frames, {len(updates)} blocked, "
+            f"{len(graph.edges)} waits, {len(graph.cycles)} cycles, "
+            f"longest chain {longest}, median of {args.repeat} runs"
+        )
+        elapsed = time_ms(lambda: build_wait_graph(conn, capture_id), args.repeat)
+        conn.close()
+
+    print(f"build_wait_graph: {elapsed:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+"""Weekly archive files for aged process events.
+
+Closed events older than retention.archive_days move out of the live
+database, together with everything hanging off them (snapshots, forensic
+captures, log entries, tailspin trees), into one file per ISO week of
+their entry time:
+
+    <data_dir>/archive/events-2026-W14.zip
+
+An archive is a ZIP of LZMA-compressed members, written column-wise: a
+member holds one table's rows for one batch of events, as its column names
+plus one JSON list of values per column, which compresses far better than
+rows. Members are named <table>/<batch>.json. Runs append new batches to a
+week's file, so a week can be archived over several runs. Reading a table
+concatenates its members.
+
+The live database keeps an archived_events index (event id -> file and
+batch), so `events show` decompresses only the members it needs. `history` reads the
+process_events members of the weeks in range and merges them with the
+live rows.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import sqlite3
+import time
+import zipfile
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+
+import structlog
+
+from rogue_hunter.storage import (
+    PRUNE_VACUUM_PAGES,
+    SCHEMA,
+    _adapt_batch_size,
+    incremental_vacuum,
+)
+
+log = structlog.get_logger()
+
+ARCHIVE_EVENT_BATCH = 50  # Events per archive member batch and per delete transaction
+ARCHIVE_PREFIX = "events-"
+
+# (table, column referencing the parent, parent table), parents first
+ARCHIVE_TABLES: list[tuple[str, str | None, str | None]] = [
+    ("process_events", None, None),
+    ("process_snapshots", "event_id", "process_events"),
+    ("forensic_captures", "event_id", "process_events"),
+    ("forensic_capture_events", "capture_id", "forensic_captures"),
+    ("buffer_context", "capture_id", "forensic_captures"),
+    ("log_entries", "capture_id", "forensic_captures"),
+    ("tailspin_header", "capture_id", "forensic_captures"),
+    ("tailspin_shared_cache", "capture_id", "forensic_captures"),
+    ("tailspin_io_stats", "capture_id", "forensic_captures"),
+    ("tailspin_io_histogram", "capture_id", "forensic_captures"),
+    ("tailspin_io_aggregate", "capture_id", "forensic_captures"),
+    ("tailspin_process", "capture_id", "forensic_captures"),
+    ("tailspin_process_note", "process_id", "tailspin_process"),
+    ("tailspin_thread", "process_id", "tailspin_process"),
+    ("tailspin_binary_image", "process_id", "tailspin_process"),
+    ("tailspin_frame", "thread_id", "tailspin_thread"),
+]
+
+_IN_CHUNK = 500  # Ids per IN (...) list, well under SQLite's variable limit
+
+
+@dataclass
+class ArchiveResult:
+    """Outcome of an archive run."""
+
+    events_archived: int = 0
+    files_written: list[str] = field(default_factory=list)
+    files_expired: int = 0
+    pages_vacuumed: int = 0
+
+
+def week_name(timestamp: float) -> str:
+    """ISO week of a timestamp (local time), e.g. '2026-W14'."""
+    year, week, _ = datetime.fromtimestamp(timestamp).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def archive_path(archive_dir: Path, week: str) -> Path:
+    """File holding a week's archived events."""
+    return archive_dir / f"{ARCHIVE_PREFIX}{week}.zip"
+
+
+def week_bounds(path: Path) -> tuple[float, float]:
+    """Start and end timestamps of an archive file's week."""
+    year, week = path.stem.removeprefix(ARCHIVE_PREFIX).split("-W")
+    start = datetime.fromisocalendar(int(year), int(week), 1)
+    return start.timestamp(), (start + timedelta(days=7)).timestamp()
+
+
+def list_archives(archive_dir: Path) -> list[Path]:
+    """Archive files, newest week first."""
+    if not archive_dir.is_dir():
+        return []
+    return sorted(archive_dir.glob(f"{ARCHIVE_PREFIX}*-W*.zip"), reverse=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Writing
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def get_archivable_events(conn: sqlite3.Connection, older_than_days: int) -> list[tuple[int, str]]:
+    """Closed events that ended more than older_than_days ago, as (id, week)."""
+    cutoff = time.time() - older_than_days * 86400
+    rows = conn.execute(
+        """SELECT id, entry_time FROM process_events
+           WHERE entry_time < ? AND exit_time IS NOT NULL AND exit_time < ?
+           ORDER BY entry_time""",
+        (cutoff, cutoff),
+    ).fetchall()
+    return [(event_id, week_name(entry_time)) for event_id, entry_time in rows]
+
+
+def _select_in(
+    conn: sqlite3.Connection, table: str, column: str, ids: list[int]
+) -> tuple[list[str], list[tuple]]:
+    """All rows of table whose column is in ids, with the column names."""
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    rows: list[tuple] = []
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i : i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows += conn.execute(
+            f"SELECT * FROM {table} WHERE {column} IN ({placeholders})", chunk
+        ).fetchall()
+    return columns, rows
+
+
+def _collect(conn: sqlite3.Connection, event_ids: list[int]) -> dict[str, tuple[list, list]]:
+    """Rows of every archived table belonging to the given events."""
+    tables: dict[str, tuple[list, list]] = {}
+    ids: dict[str, list[int]] = {}
+    for table, fk_column, parent in ARCHIVE_TABLES:
+        if parent is None:
+            columns, rows = _select_in(conn, table, "id", event_ids)
+        else:
+            assert fk_column is not None
+            columns, rows = _select_in(conn, table, fk_column, ids[parent])
+        tables[table] = (columns, rows)
+        ids[table] = [row[0] for row in rows]
+    return tables
+
+
+def _member(table: str, batch: int) -> str:
+    return f"{table}/{batch:05d}.json"
+
+
+def _archive_week(
+    conn: sqlite3.Connection, path: Path, event_ids: list[int], batch_size: int
+) -> list[tuple[int, int]]:
+    """Append a week's events to its file; replaces the file atomically.
+
+    Returns:
+        (event id, batch number) for each event written
+    """
+    tmp = path.with_suffix(".tmp")
+    if path.exists():
+        shutil.copyfile(path, tmp)
+    else:
+        tmp.unlink(missing_ok=True)
+    written = []
+    with zipfile.ZipFile(tmp, "a", compression=zipfile.ZIP_LZMA) as zf:
+        batch = sum(1 for name in zf.namelist() if name.startswith("process_events/"))
+        for i in range(0, len(event_ids), batch_size):
+            chunk = event_ids[i : i + batch_size]
+            for table, (columns, rows) in _collect(conn, chunk).items():
+                if rows:
+                    values = [list(column) for column in zip(*rows)]
+                    zf.writestr(
+                        _member(table, batch), json.dumps({"columns": columns, "values": values})
+                    )
+            written += [(event_id, batch) for event_id in chunk]
+            batch += 1
+    os.replace(tmp, path)
+    return written
+
+
+def write_archives(
+    conn: sqlite3.Connection,
+    archive_dir: Path,
+    older_than_days: int,
+    batch_size: int = ARCHIVE_EVENT_BATCH,
+    should_stop: Callable[[], bool] | None = None,
+) -> dict[str, list[tuple[int, int]]]:
+    """Write closed events older than older_than_days to their weekly files.
+
+    Only reads the database, so it can run on a worker thread with its own
+    connection while the daemon writes (WAL readers never block writers).
+    Each week's rows are appended to a temporary copy of its file, which
+    then replaces the original.
+
+    Args:
+        conn: Database connection
+        archive_dir: Directory for the weekly files (created if missing)
+        older_than_days: Archive events that ended before this many days ago
+        batch_size: Events per archive member
+        should_stop: Checked between weeks; True stops writing
+
+    Returns:
+        (event id, batch) written, by archive file name; pass to
+        remove_archived()
+
+    Raises:
+        ValueError: If older_than_days < 1
+    """
+    if older_than_days < 1:
+        raise ValueError("Archive days must be >= 1")
+
+    by_week: dict[str, list[int]] = {}
+    for event_id, week in get_archivable_events(conn, older_than_days):
+        by_week.setdefault(week, []).append(event_id)
+
+    written: dict[str, list[tuple[int, int]]] = {}
+    for week, event_ids in by_week.items():
+        if should_stop is not None and should_stop():
+            break
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        path = archive_path(archive_dir, week)
+        written[path.name] = _archive_week(conn, path, event_ids, batch_size)
+    return written
+
+
+def _delete_batch(conn: sqlite3.Connection, archive: str, events: list[tuple[int, int]]) -> None:
+    """Index archived events and delete them (cascading to their rows).
+
+    The cascade needs foreign keys on, as get_connection() sets them.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO archived_events (event_id, archive, batch) VALUES (?, ?, ?)",
+        [(event_id, archive, batch) for event_id, batch in events],
+    )
+    event_ids = [event_id for event_id, _ in events]
+    placeholders = ",".join("?" * len(event_ids))
+    conn.execute(f"DELETE FROM process_events WHERE id IN ({placeholders})", event_ids)
+    conn.commit()
+
+
+def expire_archives(conn: sqlite3.Connection, archive_dir: Path, keep_days: int) -> int:
+    """Delete archive files whose week ended more than keep_days ago.
+
+    Returns:
+        Number of files deleted
+    """
+    cutoff = time.time() - keep_days * 86400
+    expired = 0
+    for path in list_archives(archive_dir):
+        if week_bounds(path)[1] >= cutoff:
+            continue
+        conn.execute("DELETE FROM archived_events WHERE archive = ?", (path.name,))
+        conn.commit()
+        path.unlink()
+        expired += 1
+    return expired
+
+
+def remove_archived(
+    conn: sqlite3.Connection,
+    archive_dir: Path,
+    written: dict[str, list[tuple[int, int]]],
+    keep_days: int = 365,
+    batch_size: int = ARCHIVE_EVENT_BATCH,
+    vacuum_pages: int = PRUNE_VACUUM_PAGES,
+) -> Generator[ArchiveResult, None, None]:
+    """Delete archived events from the database in bounded batches.
+
+    A generator like prune_incremental(): each step indexes and deletes one
+    batch of events in its own transaction, or releases vacuum_pages free
+    pages, and yields. Batches grow toward batch_size while they stay
+    under PRUNE_BATCH_TARGET seconds. The daemon runs it on its own connection and yields
+    to sampling between steps, so archiving never contends for the write
+    lock. Archive files older than keep_days are deleted at the end.
+
+    Stopping early is safe: events still in the database are archived again
+    by the next run, and readers drop the duplicate rows.
+
+    Yields:
+        A copy of the cumulative result after each step. The last one
+        yielded is final.
+    """
+    start = time.monotonic()
+    result = ArchiveResult(files_written=list(written))
+    size = 1
+    for archive, events in written.items():
+        i = 0
+        while i < len(events):
+            batch_start = time.monotonic()
+            chunk = events[i : i + size]
+            _delete_batch(conn, archive, chunk)
+            i += len(chunk)
+            result.events_archived += len(chunk)
+            yield replace(result)
+            size = _adapt_batch_size(size, time.monotonic() - batch_start, batch_size)
+
+    if result.events_archived and conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        while released := incremental_vacuum(conn, vacuum_pages):
+            result.pages_vacuumed += released
+            yield replace(result)
+
+    result.files_expired = expire_archives(conn, archive_dir, keep_days)
+    log.info(
+        "archive_complete",
+        events_archived=result.events_archived,
+        files_written=len(result.files_written),
+        files_expired=result.files_expired,
+        elapsed=round(time.monotonic() - start, 3),
+    )
+    yield result
+
+
+def archive_events(
+    conn: sqlite3.Connection,
+    archive_dir: Path,
+    older_than_days: int = 30,
+    keep_days: int = 365,
+    batch_size: int = ARCHIVE_EVENT_BATCH,
+) -> ArchiveResult:
+    """Move closed events older than older_than_days into weekly archives.
+
+    write_archives() then remove_archived() to completion, on one
+    connection. The daemon runs the two halves separately.
+
+    Raises:
+        ValueError: If older_than_days < 1
+    """
+    written = write_archives(conn, archive_dir, older_than_days, batch_size)
+    result = ArchiveResult()
+    for result in remove_archived(conn, archive_dir, written, keep_days, batch_size):
+        pass
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reading
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@lru_cache(maxsize=32)
+def _read_table_cached(
+    path: str, mtime_ns: int, table: str, batch: int | None
+) -> tuple[list[str], list[tuple]]:
+    """Rows of one table in an archive file (cached per file version)."""
+    columns: list[str] = []
+    by_id: dict[int, tuple] = {}
+    with zipfile.ZipFile(path) as zf:
+        names = sorted(n for n in zf.namelist() if n.startswith(f"{table}/"))
+        if batch is not None:
+            names = [n for n in names if n == _member(table, batch)]
+        for name in names:
+            member = json.loads(zf.read(name))
+            if not columns:
+                columns = member["columns"]
+            index = [
+                member["columns"].index(c) if c in member["columns"] else None for c in columns
+            ]
+            for row in zip(*member["values"]):
+                aligned = tuple(row[i] if i is not None else None for i in index)
+                by_id[aligned[0]] = aligned  # Re-archived rows replace earlier copies
+    return columns, list(by_id.values())
+
+
+def read_archive_table(path: Path, table: str, batch: int | None = None) -> list[dict]:
+    """Rows of one table in an archive file (or one batch of it), as dicts."""
+    columns, rows = _read_table_cached(str(path), path.stat().st_mtime_ns, table, batch)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def iter_archived_events(
+    archive_dir: Path,
+    boot_time: int | None = None,
+    time_cutoff: float | None = None,
+) -> Iterator[dict]:
+    """Stream archived process events, newest first, one week in memory at a time.
+
+    Ordered by (entry_time, id) descending like storage.iter_process_events(),
+    so the two streams merge with merge_event_streams(). Stops at the first
+    week that ends before time_cutoff.
+    """
+    for path in list_archives(archive_dir):
+        if time_cutoff is not None and week_bounds(path)[1] < time_cutoff:
+            return
+        week = [
+            {
+                "id": row["id"],
+                "pid": row["pid"],
+                "command": row["command"],
+                "entry_time": row["entry_time"],
+                "exit_time": row["exit_time"],
+                "entry_band": row["entry_band"],
+                "peak_band": row["peak_band"],
+                "peak_score": row["peak_score"],
+            }
+            for row in read_archive_table(path, "process_events")
+            if (boot_time is None or row["boot_time"] == boot_time)
+            and (time_cutoff is None or row["entry_time"] >= time_cutoff)
+        ]
+        week.sort(key=_event_order, reverse=True)
+        yield from week
+
+
+def get_archived_events(
+    archive_dir: Path,
+    boot_time: int | None = None,
+    time_cutoff: float | None = None,
+    limit: int = 100,
+) -> list[dict]:
+    """Archived process events, like storage.get_process_events().
+
+    Only reads the weeks at or after time_cutoff, newest first, and stops
+    once limit events are found (older weeks cannot hold newer events).
+    """
+    return list(islice(iter_archived_events(archive_dir, boot_time, time_cutoff), limit))
+
+
+def _event_order(event: dict) -> tuple[float, int]:
+    return event["entry_time"], event["id"]
+
+
+def merge_event_streams(live: Iterable[dict], archived: Iterable[dict]) -> Iterator[dict]:
+    """Merge two newest-first event streams; live rows win on id.
+
+    An event is in both only while an interrupted archive run is pending,
+    and both copies share (entry_time, id), so they arrive back to back.
+    """
+    previous = None
+    for event in heapq.merge(live, archived, key=_event_order, reverse=True):
+        if event["id"] != previous:
+            yield event
+        previous = event["id"]
+
+
+def merge_events(live: list[dict], archived: list[dict], limit: int) -> list[dict]:
+    """Combine live and archived events, newest first; live rows win on id."""
+    seen = {event["id"] for event in live}
+    merged = live + [event for event in archived if event["id"] not in seen]
+    merged.sort(key=lambda e: e["entry_time"], reverse=True)
+    return merged[:limit]
+
+
+def get_event_archive(conn: sqlite3.Connection, event_id: int) -> tuple[str, int] | None:
+    """Archive file name and batch holding an event, or None if not archived."""
+    row = conn.execute(
+        "SELECT archive, batch FROM archived_events WHERE event_id = ?", (event_id,)
+    ).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def open_archived_event(
+    conn: sqlite3.Connection, archive_dir: Path, event_id: int
+) -> sqlite3.Connection | None:
+    """Load one archived event into an in-memory database.
+
+    The returned connection has the live schema and holds only this event's
+    rows, so the storage getters work on it unchanged.
+
+    Returns:
+        Connection (caller closes it), or None if the event is not archived
+        or its file is gone
+    """
+    location = get_event_archive(conn, event_id)
+    if location is None or not (archive_dir / location[0]).exists():
+        return None
+
+    path, batch = archive_dir / location[0], location[1]
+    mem = sqlite3.connect(":memory:")
+    mem.executescript(SCHEMA)
+    ids: dict[str, set[int]] = {}
+    for table, fk_column, parent in ARCHIVE_TABLES:
+        rows = read_archive_table(path, table, batch)
+        if parent is None:
+            rows = [row for row in rows if row["id"] == event_id]
+        else:
+            rows = [row for row in rows if row[fk_column] in ids[parent]]
+        ids[table] = {row["id"] for row in rows}
+        if rows:
+            live = {row[1] for row in mem.execute(f"PRAGMA table_info({table})")}
+            columns = [c for c in rows[0] if c in live]
+            placeholders = ",".join("?" * len(columns))
+            mem.executemany(
+                f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})",
+                [[row[c] for c in columns] for row in rows],
+            )
+    if not ids["process_events"]:
+        mem.close()
+        return None
+    return mem
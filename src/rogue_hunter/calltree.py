@@ -0,0 +1,181 @@
+"""Merged call trees over stored tailspin frames.
+
+tailspin_frame holds one call tree per thread: each frame links to its
+caller through parent_frame_id and carries the samples it was on the stack
+for. build_call_tree() reads a capture's frames (or one process's) in a
+single query and merges the threads' trees by symbol path, so every
+distinct stack appears once with the samples of all threads that took it:
+
+    capture 12
+    └── WindowServer [400]            1800
+        ├── start                     1800
+        │   └── main                  1790
+        ...
+
+A tree exports as folded stacks (one "frame;frame;frame samples" line per
+stack, for flamegraph.pl, speedscope and similar) and lays out as an
+icicle for terminal flame views.
+"""
+
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from rogue_hunter.forensics import gc_paused
+
+
+@dataclass
+class CallNode:
+    """One merged frame: samples on the stack here, including callees."""
+
+    name: str
+    samples: int = 0
+    children: dict[str, "CallNode"] = field(default_factory=dict)
+
+    @property
+    def self_samples(self) -> int:
+        """Samples with this frame on top of the stack."""
+        return max(self.samples - sum(c.samples for c in self.children.values()), 0)
+
+    def child(self, name: str) -> "CallNode":
+        """The child named name, added if missing."""
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = CallNode(name)
+        return node
+
+
+class FlameSpan(NamedTuple):
+    """A node's cell in one row of a flame view."""
+
+    column: int
+    width: int
+    node: CallNode
+
+
+# Merge key and display name of a frame. Symbolicated frames go by symbol,
+# unsymbolicated ones by library (their offsets differ per call site), and
+# kernel frames get flamegraph.pl's "_[k]" suffix.
+_FRAME_LABEL = """
+    coalesce(symbol_name, '??? (' || library_name || ')', address)
+    || iif(is_kernel, '_[k]', '')
+"""
+
+
+def build_call_tree(conn: sqlite3.Connection, capture_id: int, pid: int | None = None) -> CallNode:
+    """Merge a capture's thread call trees into one tree.
+
+    The root's children are processes ("name [pid]"), each holding the
+    merged frames of all its threads. A capture's frames are inserted
+    together, so they are read as one rowid range (skipping any other
+    capture's frames inside it) rather than joined through their threads,
+    and in id order: a caller is inserted before its callees (the foreign
+    key requires it), so its node always exists when they are read.
+
+    Args:
+        conn: Database connection
+        capture_id: Forensic capture to read
+        pid: Only this process
+
+    Returns:
+        Root node named "capture <id>", empty if the capture has no frames
+    """
+    root = CallNode(f"capture {capture_id}")
+    where, params = "p.capture_id = ?", (capture_id,)
+    if pid is not None:
+        where, params = f"{where} AND p.pid = ?", (capture_id, pid)
+
+    thread_process: dict[int, CallNode] = {}
+    for thread_id, name, process_pid in conn.execute(
+        f"""SELECT t.id, p.name, p.pid FROM tailspin_process p
+            JOIN tailspin_thread t ON t.process_id = p.id WHERE {where}""",
+        params,
+    ):
+        thread_process[thread_id] = root.child(f"{name} [{process_pid}]")
+    first, last = conn.execute(
+        f"""SELECT min(id), max(id) FROM tailspin_frame WHERE thread_id IN (
+                SELECT t.id FROM tailspin_process p
+                JOIN tailspin_thread t ON t.process_id = p.id WHERE {where})""",
+        params,
+    ).fetchone()
+
+    nodes: dict[int, CallNode] = {}
+    rows = conn.execute(
+        f"""SELECT thread_id, id, parent_frame_id, sample_count, {_FRAME_LABEL}
+            FROM tailspin_frame WHERE id BETWEEN ? AND ?""",
+        (first, last),
+    )
+    with gc_paused():
+        for thread_id, frame_id, parent_id, samples, label in rows:
+            if parent_id is None:
+                parent = thread_process.get(thread_id)
+            else:
+                parent = nodes.get(parent_id)
+            if parent is None:
+                continue  # Another capture's frame
+            children = parent.children
+            node = children.get(label)
+            if node is None:
+                node = children[label] = CallNode(label)
+            node.samples += samples
+            nodes[frame_id] = node
+
+    for process in root.children.values():
+        process.samples = sum(c.samples for c in process.children.values())
+    root.samples = sum(p.samples for p in root.children.values())
+    return root
+
+
+def folded_stacks(root: CallNode) -> Iterator[str]:
+    """Folded-stack lines for the tree below root: "a;b;c <self samples>".
+
+    Only stacks with self samples are written; ";" inside names becomes ":".
+    """
+    path: list[str] = []
+    stack = [(0, child) for child in reversed(root.children.values())]
+    while stack:
+        depth, node = stack.pop()
+        del path[depth:]
+        path.append(node.name.replace(";", ":"))
+        if self_samples := node.self_samples:
+            yield f"{';'.join(path)} {self_samples}"
+        stack.extend((depth + 1, child) for child in reversed(node.children.values()))
+
+
+def flame_rows(root: CallNode, width: int, max_depth: int | None = None) -> list[list[FlameSpan]]:
+    """Lay out the tree as an icicle: row d holds the nodes at depth d.
+
+    Each node spans columns in proportion to its samples, children left to
+    right by samples, under their parent. Nodes narrower than a column are
+    left out with their subtrees.
+
+    Args:
+        root: Tree to lay out; it spans the whole first row
+        width: Columns available
+        max_depth: Rows to lay out (all if None)
+
+    Returns:
+        Spans per row, left to right
+    """
+    if root.samples <= 0 or width <= 0:
+        return []
+    scale = width / root.samples
+    rows: list[list[FlameSpan]] = []
+    level = [(0, root.samples, root)]  # (start, end) in samples, node
+    while level and (max_depth is None or len(rows) < max_depth):
+        spans = []
+        below = []
+        for first, end, node in level:
+            column = round(first * scale)
+            if (span_width := round(end * scale) - column) <= 0:
+                continue
+            spans.append(FlameSpan(column, span_width, node))
+            for child in sorted(node.children.values(), key=lambda c: -c.samples):
+                below.append((first, min(first + child.samples, end), child))
+                first += child.samples
+        if not spans:
+            break
+        rows.append(spans)
+        level = below
+    return rows
@@ -0,0 +1,243 @@
+"""What changed between two forensic captures.
+
+A host that pauses repeatedly leaves a series of captures; diff_captures()
+compares two of them. Their merged call trees (see calltree) are walked
+together, matching children by name, so each stack is aligned by symbol
+path through dict lookups and both trees are visited once. Each stack's
+self samples are taken as a share of its capture's samples (captures
+differ in length), and the stacks whose share grew or shrank the most are
+reported, along with threads blocked in the second capture but not the
+first and per-process CPU and I/O deltas from tailspin_process.
+"""
+
+import heapq
+import sqlite3
+from dataclasses import dataclass, field
+
+from rogue_hunter.calltree import CallNode, build_call_tree
+from rogue_hunter.forensics import gc_paused
+
+
+@dataclass
+class FrameChange:
+    """A stack whose share of its capture's samples changed."""
+
+    path: tuple[str, ...]
+    samples_a: int  # Self samples (this frame on top of the stack)
+    samples_b: int
+    share_a: float  # Self samples / capture samples
+    share_b: float
+
+    @property
+    def change(self) -> float:
+        return self.share_b - self.share_a
+
+
+@dataclass
+class BlockedThread:
+    """A thread blocked in the second capture, and not in the first."""
+
+    pid: int
+    process: str
+    thread_id: str
+    thread_name: str | None
+    blocked_on: str  # The wait it spent most samples in
+    samples: int  # Samples blocked, over all its waits
+
+
+@dataclass
+class ProcessDelta:
+    """One process's CPU and I/O in each capture (None if absent from it)."""
+
+    pid: int
+    name: str
+    cpu_a: float | None
+    cpu_b: float | None
+    io_bytes_a: int | None
+    io_bytes_b: int | None
+
+    @property
+    def cpu_change(self) -> float:
+        return (self.cpu_b or 0.0) - (self.cpu_a or 0.0)
+
+    @property
+    def io_bytes_change(self) -> int:
+        return (self.io_bytes_b or 0) - (self.io_bytes_a or 0)
+
+
+@dataclass
+class CaptureDiff:
+    """Result of diff_captures()."""
+
+    capture_a: int
+    capture_b: int
+    samples_a: int
+    samples_b: int
+    grew: list[FrameChange] = field(default_factory=list)
+    shrank: list[FrameChange] = field(default_factory=list)
+    newly_blocked: list[BlockedThread] = field(default_factory=list)
+    processes: list[ProcessDelta] = field(default_factory=list)
+
+
+def diff_call_trees(
+    a: CallNode, b: CallNode, limit: int = 10
+) -> tuple[list[FrameChange], list[FrameChange]]:
+    """The stacks whose self-sample share grew most and shrank most from a to b.
+
+    Args:
+        a: Earlier tree (from build_call_tree())
+        b: Later tree
+        limit: Stacks to return each way
+
+    Returns:
+        (grew, shrank), each largest change first
+    """
+    total_a, total_b = a.samples or 1, b.samples or 1
+    # Min-heaps of the `limit` largest changes each way. Only entries that
+    # make the cut copy their path.
+    grew: list[tuple[float, int, FrameChange]] = []
+    shrank: list[tuple[float, int, FrameChange]] = []
+    seen = 0
+
+    path: list[str] = []
+    stack: list[tuple[int, str, CallNode | None, CallNode | None]] = [(0, "", a, b)]
+    with gc_paused():
+        while stack:
+            depth, name, node_a, node_b = stack.pop()
+            del path[depth:]
+            path.append(name)
+            # Queue the children aligned by name, totalling their samples on
+            # each side for this node's self samples
+            children_a = node_a.children if node_a is not None else {}
+            children_b = node_b.children if node_b is not None else {}
+            callees_a = callees_b = 0
+            for child, child_a in children_a.items():
+                callees_a += child_a.samples
+                stack.append((depth + 1, child, child_a, children_b.get(child)))
+            for child, child_b in children_b.items():
+                callees_b += child_b.samples
+                if child not in children_a:
+                    stack.append((depth + 1, child, None, child_b))
+            samples_a = max(node_a.samples - callees_a, 0) if node_a is not None else 0
+            samples_b = max(node_b.samples - callees_b, 0) if node_b is not None else 0
+            if not depth:
+                continue  # The roots
+            share_a, share_b = samples_a / total_a, samples_b / total_b
+            change = share_b - share_a
+            if not change:
+                continue
+            heap, key = (grew, change) if change > 0 else (shrank, -change)
+            if len(heap) == limit and key <= heap[0][0]:
+                continue
+            seen += 1
+            entry = (
+                key,
+                seen,
+                FrameChange(tuple(path[1:]), samples_a, samples_b, share_a, share_b),
+            )
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+    return (
+        [change for *_, change in sorted(grew, reverse=True)],
+        [change for *_, change in sorted(shrank, reverse=True)],
+    )
+
+
+def _blocked_threads(
+    conn: sqlite3.Connection, capture_id: int, pid: int | None
+) -> dict[tuple[int, str], BlockedThread]:
+    """A capture's threads with blocked frames, by (pid, thread id)."""
+    where, params = "p.capture_id = ?", (capture_id,)
+    if pid is not None:
+        where, params = f"{where} AND p.pid = ?", (capture_id, pid)
+    threads: dict[tuple[int, str], BlockedThread] = {}
+    waits: dict[tuple[int, str], dict[str, int]] = {}
+    for process_pid, name, thread_id, thread_name, blocked_on, samples in conn.execute(
+        f"""SELECT p.pid, p.name, t.thread_id, coalesce(t.thread_name, t.dispatch_queue_name),
+                   f.blocked_on, f.sample_count
+            FROM tailspin_process p
+            JOIN tailspin_thread t ON t.process_id = p.id
+            JOIN tailspin_frame f ON f.thread_id = t.id
+            WHERE {where} AND f.blocked_on IS NOT NULL""",
+        params,
+    ):
+        key = (process_pid, thread_id)
+        thread = threads.get(key)
+        if thread is None:
+            thread = threads[key] = BlockedThread(process_pid, name, thread_id, thread_name, "", 0)
+            waits[key] = {}
+        thread.samples += samples
+        waits[key][blocked_on] = waits[key].get(blocked_on, 0) + samples
+    for key, thread in threads.items():
+        thread.blocked_on = max(waits[key].items(), key=lambda w: w[1])[0]
+    return threads
+
+
+_ABSENT = (None, None)
+
+
+def _process_usage(
+    conn: sqlite3.Connection, capture_id: int, pid: int | None
+) -> dict[tuple[int, str], tuple[float | None, int | None]]:
+    """A capture's processes' (cpu_time_sec, io_bytes), by (pid, name)."""
+    where, params = "capture_id = ?", (capture_id,)
+    if pid is not None:
+        where, params = f"{where} AND pid = ?", (capture_id, pid)
+    rows = conn.execute(
+        f"SELECT pid, name, cpu_time_sec, io_bytes FROM tailspin_process WHERE {where}", params
+    )
+    return {(r[0], r[1]): (r[2], r[3]) for r in rows}
+
+
+def diff_captures(
+    conn: sqlite3.Connection,
+    capture_a: int,
+    capture_b: int,
+    pid: int | None = None,
+    limit: int = 10,
+) -> CaptureDiff:
+    """Compare two captures' stacks, blocked threads and process usage.
+
+    Args:
+        conn: Database connection
+        capture_a: Earlier capture
+        capture_b: Later capture
+        pid: Only this process
+        limit: Stacks returned each way (all blocked threads and processes are)
+
+    Returns:
+        CaptureDiff; processes ordered by CPU change, largest first either way
+    """
+    tree_a = build_call_tree(conn, capture_a, pid)
+    tree_b = build_call_tree(conn, capture_b, pid)
+    grew, shrank = diff_call_trees(tree_a, tree_b, limit)
+
+    blocked_before = _blocked_threads(conn, capture_a, pid)
+    newly_blocked = [
+        thread
+        for key, thread in _blocked_threads(conn, capture_b, pid).items()
+        if key not in blocked_before
+    ]
+    newly_blocked.sort(key=lambda t: -t.samples)
+
+    usage_a = _process_usage(conn, capture_a, pid)
+    usage_b = _process_usage(conn, capture_b, pid)
+    processes = []
+    for key in usage_a | usage_b:
+        (cpu_a, io_a), (cpu_b, io_b) = usage_a.get(key, _ABSENT), usage_b.get(key, _ABSENT)
+        processes.append(ProcessDelta(*key, cpu_a, cpu_b, io_a, io_b))
+    processes.sort(key=lambda p: (-abs(p.cpu_change), -abs(p.io_bytes_change)))
+
+    return CaptureDiff(
+        capture_a,
+        capture_b,
+        tree_a.samples,
+        tree_b.samples,
+        grew,
+        shrank,
+        newly_blocked,
+        processes,
+    )
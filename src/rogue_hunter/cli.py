@@ -103,23 +103,30 @@ def status() -> None:
 
 
 @main.group(invoke_without_command=True)
-@click.option("--limit", "-n", default=20, help="Number of events to show")
+@click.option("--limit", "-n", default=20, help="Number of events to show (table format)")
 @click.option("--open", "open_only", is_flag=True, help="Show only open events")
+@click.option(
+    "--format", "-f", "fmt", type=click.Choice(["table", "ndjson", "json", "csv"]), default="table"
+)
+@click.option("--details", is_flag=True, help="Include snapshots and forensic captures (exports)")
 @click.pass_context
-def events(ctx, limit: int, open_only: bool) -> None:
+def events(ctx, limit: int, open_only: bool, fmt: str, details: bool) -> None:
     """List process events.
 
     Shows per-process band tracking events from the current boot.
+    Exports (--format) stream all of them, with no limit.
     Use 'events show <id>' to view event details.
     """
     import time
 
+    from rogue_hunter.archive import iter_archived_events, merge_event_streams
     from rogue_hunter.boottime import get_boot_time
     from rogue_hunter.config import Config
     from rogue_hunter.storage import (
         DatabaseNotAvailable,
         get_open_events,
         get_process_events,
+        iter_process_events,
         require_database,
     )
 
@@ -131,11 +138,24 @@ def events(ctx, limit: int, open_only: bool) -> None:
         return
 
     config = ctx.obj["config"]
+    if details and fmt == "table":
+        raise click.UsageError("--details needs --format ndjson, json or csv")
 
     try:
         with require_database(config.db_path) as conn:
             boot_time = get_boot_time()
 
+            if fmt != "table":
+                if open_only:
+                    stream = iter(get_open_events(conn, boot_time))
+                else:
+                    stream = merge_event_streams(
+                        iter_process_events(conn, boot_time=boot_time),
+                        iter_archived_events(config.archive_dir, boot_time=boot_time),
+                    )
+                _export_events(conn, config.archive_dir, stream, fmt, details)
+                return
+
             if open_only:
                 # Only show open events
                 events_list = get_open_events(conn, boot_time)
@@ -178,25 +198,33 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
     import json
     from datetime import datetime
 
-    from rogue_hunter.storage import (
-        get_buffer_context,
-        get_forensic_captures,
-        get_log_entries,
-        get_process_event_detail,
-        get_process_snapshots,
-        get_tailspin_processes,
-        get_tailspin_threads,
-        require_database,
-    )
+    from rogue_hunter.archive import get_event_archive, open_archived_event
+    from rogue_hunter.storage import load_event_detail, require_database
 
     config = ctx.obj["config"]
-
-    with require_database(config.db_path, exit_on_missing=True) as conn:
-        event = get_process_event_detail(conn, event_id)
-
-        if not event:
+    options = {
+        "forensics": forensics,
+        "threads": threads,
+        "logs": logs,
+        "log_limit": 20,
+        "process_limit": 10,
+    }
+
+    with require_database(config.db_path, exit_on_missing=True) as live_conn:
+        detail = load_event_detail(live_conn, event_id, **options)
+        archive: str | None = None
+        if detail is None:
+            # Older events may have moved to a weekly archive file
+            archived_conn = open_archived_event(live_conn, config.archive_dir, event_id)
+            if archived_conn is not None:
+                archive = get_event_archive(live_conn, event_id)[0]
+                detail = load_event_detail(archived_conn, event_id, **options)
+                archived_conn.close()  # Everything shown below is already loaded
+
+        if detail is None:
             click.echo(f"Error: Event {event_id} not found", err=True)
             raise SystemExit(1)
+        event = detail.event
 
         from rogue_hunter.formatting import format_duration_verbose
 
@@ -213,6 +241,8 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
         click.echo(f"Duration: {duration_str}")
         click.echo(f"Peak Band: {event['peak_band']}")
         click.echo(f"Peak Score: {event['peak_score']}")
+        if archive:
+            click.echo(f"Archived: {config.archive_dir / archive}")
 
         # Show peak snapshot
         if event["peak_snapshot"]:
@@ -222,7 +252,7 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
                 click.echo(f"  {key}: {val}")
 
         # Show all snapshots
-        snapshots = get_process_snapshots(conn, event_id)
+        snapshots = detail.snapshots
         if snapshots:
             click.echo(f"\nSnapshots: {len(snapshots)}")
             for snap in snapshots:
@@ -237,7 +267,7 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
                 )
 
         # Show forensic captures
-        captures = get_forensic_captures(conn, event_id)
+        captures = detail.captures
         if captures:
             click.echo(f"\nForensic Captures: {len(captures)}")
             for cap in captures:
@@ -248,7 +278,7 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
 
                 if forensics:
                     # Show buffer context
-                    context = get_buffer_context(conn, cap["id"])
+                    context = detail.buffer_context.get(cap["id"])
                     if context:
                         click.echo(
                             f"    Buffer: {context['sample_count']} samples, "
@@ -269,15 +299,16 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
 
                 if threads:
                     # Show tailspin process and thread data
-                    procs = get_tailspin_processes(conn, cap["id"])
+                    procs = detail.tailspin_processes[cap["id"]]
                     if procs:
-                        click.echo(f"    Tailspin Processes: {len(procs)}")
-                        for proc in procs[:10]:
+                        count = detail.tailspin_process_counts[cap["id"]]
+                        click.echo(f"    Tailspin Processes: {count}")
+                        for proc in procs:
                             footprint = (
                                 f"{proc['footprint_mb']:.1f}MB" if proc["footprint_mb"] else "?"
                             )
                             click.echo(f"      {proc['name']} [{proc['pid']}] ({footprint})")
-                            proc_threads = get_tailspin_threads(conn, proc["id"])
+                            proc_threads = detail.tailspin_threads[proc["id"]]
                             for t in proc_threads[:5]:
                                 samples = t["num_samples"] or 0
                                 name = t["thread_name"] or t["dispatch_queue_name"] or "unnamed"
@@ -286,7 +317,7 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
 
                 if logs:
                     # Show log entries
-                    entries = get_log_entries(conn, cap["id"], limit=20)
+                    entries = detail.log_entries[cap["id"]]
                     if entries:
                         click.echo(f"    Log Entries: {len(entries)}")
                         for entry in entries:
@@ -299,108 +330,556 @@ def events_show(ctx, event_id: int, forensics: bool, threads: bool, logs: bool)
 
 @main.command()
 @click.option("--hours", "-H", default=24, help="Hours of history to show")
-@click.option("--format", "-f", "fmt", type=click.Choice(["table", "json", "csv"]), default="table")
-def history(hours: int, fmt: str) -> None:
+@click.option(
+    "--format", "-f", "fmt", type=click.Choice(["table", "ndjson", "json", "csv"]), default="table"
+)
+@click.option("--details", is_flag=True, help="Include snapshots and forensic captures (exports)")
+def history(hours: int, fmt: str, details: bool) -> None:
     """Query historical process events.
 
-    Shows per-process band tracking history.
+    Shows per-process band tracking history. Exports stream every event
+    in the range, including events moved to archives.
     """
-    import json
+    import itertools
     import time
     from datetime import datetime
 
+    from rogue_hunter.archive import iter_archived_events, merge_event_streams
     from rogue_hunter.config import Config
-    from rogue_hunter.storage import DatabaseNotAvailable, get_process_events, require_database
+    from rogue_hunter.storage import DatabaseNotAvailable, iter_process_events, require_database
+
+    if details and fmt == "table":
+        raise click.UsageError("--details needs --format ndjson, json or csv")
 
     config = Config.load()
 
     try:
         with require_database(config.db_path) as conn:
-            # Get events from time range
+            # Get events from time range, including weeks moved to archives
             cutoff = time.time() - (hours * 3600)
-            events = get_process_events(conn, time_cutoff=cutoff, limit=1000)
+            events = merge_event_streams(
+                iter_process_events(conn, time_cutoff=cutoff),
+                iter_archived_events(config.archive_dir, time_cutoff=cutoff),
+            )
 
-            if not events:
+            first = next(events, None)
+            if first is None:
                 click.echo(f"No events in the last {hours} hour{'s' if hours != 1 else ''}.")
                 return
+            events = itertools.chain([first], events)
+
+            if fmt != "table":
+                _export_events(conn, config.archive_dir, events, fmt, details)
+                return
+
+            # Summary stats, in one pass over the stream
+            count = 0
+            min_score, max_score, total_score = first["peak_score"], first["peak_score"], 0
+            band_counts: dict[str, int] = {}
+            total_duration = 0.0
+            last_entry = first["entry_time"]
+            for event in events:
+                count += 1
+                score = event["peak_score"]
+                min_score, max_score = min(min_score, score), max(max_score, score)
+                total_score += score
+                band_counts[event["peak_band"]] = band_counts.get(event["peak_band"], 0) + 1
+                if event["exit_time"]:
+                    total_duration += event["exit_time"] - event["entry_time"]
+                first_entry = event["entry_time"]
+
+            click.echo(f"Events: {count}")
+            first_time = datetime.fromtimestamp(first_entry)
+            last_time = datetime.fromtimestamp(last_entry)
+            click.echo(
+                f"Time range: {first_time.strftime('%Y-%m-%d %H:%M')} "
+                f"to {last_time.strftime('%Y-%m-%d %H:%M')}"
+            )
+
+            # Peak score stats
+            click.echo(
+                f"Peak scores - Min: {min_score}, Max: {max_score}, Avg: {total_score / count:.1f}"
+            )
+
+            # Band breakdown
+            click.echo("\nPeak band breakdown:")
+            for band in ["low", "medium", "elevated", "high", "critical"]:
+                if band in band_counts:
+                    click.echo(f"  {band}: {band_counts[band]} events")
+
+            # Total tracked time
+            if total_duration > 0:
+                mins = total_duration / 60
+                click.echo(f"\nTotal tracked time: {total_duration:.0f}s ({mins:.1f}m)")
+    except DatabaseNotAvailable:
+        return
+
+
+def _export_events(conn, archive_dir: Path, events, fmt: str, details: bool) -> None:
+    """Stream events to stdout in an export format."""
+    import sys
+
+    from rogue_hunter.export import (
+        DETAIL_FIELDS,
+        EVENT_FIELDS,
+        event_record,
+        with_details,
+        write_records,
+    )
+
+    records = map(event_record, events)
+    fields = EVENT_FIELDS
+    if details:
+        records = with_details(conn, archive_dir, records)
+        fields = EVENT_FIELDS + DETAIL_FIELDS
+    write_records(records, sys.stdout, fmt, fields)
+
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_duration(value: str) -> float:
+    """Parse a duration like 90s, 30m, 6h or 2d into seconds."""
+    try:
+        return float(value[:-1]) * _DURATION_UNITS[value[-1:]]
+    except (KeyError, ValueError):
+        raise click.BadParameter(f"{value!r} is not a duration like 30m, 6h or 2d") from None
 
-            from rogue_hunter.formatting import calculate_duration
 
+@main.command()
+@click.argument("target")
+@click.option("--metric", "-m", default="cpu,mem", help="Comma-separated metrics to show")
+@click.option("--since", "-s", default="1h", help="How far back to read (e.g. 30m, 6h, 2d)")
+@click.option("--format", "-f", "fmt", type=click.Choice(["csv", "json"]), default="csv")
+def series(target: str, metric: str, since: str, fmt: str) -> None:
+    """Show a process's metrics over time.
+
+    TARGET is a command name, or a PID if it is numeric. Reads the
+    per-process rows of the machine snapshots, oldest first.
+    """
+    import json
+    import time
+
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import (
+        SERIES_METRICS,
+        DatabaseNotAvailable,
+        get_process_series,
+        iter_process_series,
+        require_database,
+    )
+
+    metrics = [m.strip() for m in metric.split(",") if m.strip()]
+    unknown = [m for m in metrics if m not in SERIES_METRICS]
+    if unknown or not metrics:
+        choices = ", ".join(SERIES_METRICS)
+        raise click.BadParameter(
+            f"unknown {', '.join(unknown) or 'empty list'}; choose from {choices}",
+            param_hint="'--metric'",
+        )
+    start = time.time() - _parse_duration(since)
+    selector = {"pid": int(target)} if target.isdigit() else {"command": target}
+
+    config = Config.load()
+
+    try:
+        with require_database(config.db_path) as conn:
             if fmt == "json":
-                data = []
-                for event in events:
-                    entry_time = datetime.fromtimestamp(event["entry_time"])
-                    exit_time = (
-                        datetime.fromtimestamp(event["exit_time"]) if event["exit_time"] else None
-                    )
-                    duration = calculate_duration(event["entry_time"], event["exit_time"])
-                    data.append(
-                        {
-                            "id": event["id"],
-                            "pid": event["pid"],
-                            "command": event["command"],
-                            "entry": entry_time.isoformat(),
-                            "exit": exit_time.isoformat() if exit_time else None,
-                            "duration_sec": duration,
-                            "entry_band": event["entry_band"],
-                            "peak_band": event["peak_band"],
-                            "peak_score": event["peak_score"],
-                        }
-                    )
+                result = get_process_series(conn, metrics, start, **selector)
+                data = {"timestamps": result.timestamps, "pid": result.pids, **result.values}
                 click.echo(json.dumps(data, indent=2))
-            elif fmt == "csv":
-                click.echo("id,pid,command,entry,exit,duration_sec,entry_band,peak_band,peak_score")
-                for event in events:
-                    entry_time = datetime.fromtimestamp(event["entry_time"])
-                    exit_time = (
-                        datetime.fromtimestamp(event["exit_time"]) if event["exit_time"] else None
-                    )
-                    dur = calculate_duration(event["entry_time"], event["exit_time"])
-                    duration = f"{dur:.1f}" if dur is not None else ""
-                    click.echo(
-                        f"{event['id']},{event['pid']},{event['command']},{entry_time.isoformat()},"
-                        f"{exit_time.isoformat() if exit_time else ''},"
-                        f"{duration},{event['entry_band']},{event['peak_band']},{event['peak_score']}"
-                    )
             else:
-                # Summary stats
-                click.echo(f"Events: {len(events)}")
-                first_time = datetime.fromtimestamp(events[-1]["entry_time"])
-                last_time = datetime.fromtimestamp(events[0]["entry_time"])
-                click.echo(
-                    f"Time range: {first_time.strftime('%Y-%m-%d %H:%M')} "
-                    f"to {last_time.strftime('%Y-%m-%d %H:%M')}"
-                )
+                # Rows go out as the cursor yields them
+                click.echo(",".join(["captured_at", "pid", *metrics]))
+                for row in iter_process_series(conn, metrics, start, **selector):
+                    click.echo(",".join(str(value) for value in row))
+    except DatabaseNotAvailable:
+        return
 
-                # Peak score stats
-                peak_scores = [event["peak_score"] for event in events]
-                click.echo(
-                    f"Peak scores - Min: {min(peak_scores)}, Max: {max(peak_scores)}, "
-                    f"Avg: {sum(peak_scores) / len(peak_scores):.1f}"
-                )
 
-                # Band breakdown
-                band_counts: dict[str, int] = {}
-                for event in events:
-                    band = event["peak_band"]
-                    band_counts[band] = band_counts.get(band, 0) + 1
-
-                click.echo("\nPeak band breakdown:")
-                for band in ["low", "medium", "elevated", "high", "critical"]:
-                    if band in band_counts:
-                        click.echo(f"  {band}: {band_counts[band]} events")
-
-                # Total tracked time
-                total_duration = 0.0
-                for event in events:
-                    if event["exit_time"]:
-                        total_duration += event["exit_time"] - event["entry_time"]
-                if total_duration > 0:
-                    mins = total_duration / 60
-                    click.echo(f"\nTotal tracked time: {total_duration:.0f}s ({mins:.1f}m)")
+@main.command("top-offenders")
+@click.option("--days", "-d", default=30, help="Days of events to rank (whole UTC days)")
+@click.option(
+    "--band",
+    "-b",
+    type=click.Choice(["all", "low", "medium", "elevated", "high", "critical"]),
+    default="critical",
+    help="Rank by events peaking in this band",
+)
+@click.option("--limit", "-n", default=10, help="Number of commands to show")
+@click.option("--format", "-f", "fmt", type=click.Choice(["table", "json"]), default="table")
+def top_offenders(days: int, band: str, limit: int, fmt: str) -> None:
+    """Rank commands by how many events they caused.
+
+    Reads the command_stats rollup, which is updated as events close, so it
+    answers without scanning events (and still counts pruned and archived
+    ones). Use 'rebuild-stats' if it looks wrong.
+    """
+    import json
+    import time
+    from datetime import datetime
+
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import DatabaseNotAvailable, get_top_offenders, require_database
+
+    config = Config.load()
+
+    try:
+        with require_database(config.db_path) as conn:
+            offenders = get_top_offenders(conn, time.time() - days * 86400, band, limit)
+    except DatabaseNotAvailable:
+        return
+
+    if fmt == "json":
+        click.echo(json.dumps(offenders, indent=2))
+        return
+    if not offenders:
+        label = "" if band == "all" else f"{band} "
+        click.echo(f"No {label}events in the last {days} day{'s' if days != 1 else ''}.")
+        return
+
+    click.echo(
+        f"{'Command':20}  {'Events':>6}  {'Critical':>8}  {'High':>6}  {'Median':>6}  "
+        f"{'P95':>4}  {'Peak':>4}  {'Tracked':>9}  {'Last seen':16}"
+    )
+    click.echo("-" * 96)
+    for o in offenders:
+        last_seen = datetime.fromtimestamp(o["last_seen"]).strftime("%Y-%m-%d %H:%M")
+        click.echo(
+            f"{o['command'][:20]:20}  {o['events']:>6}  {o['critical_events']:>8}  "
+            f"{o['high_events']:>6}  {o['median_score']:>6}  {o['p95_score']:>4}  "
+            f"{o['peak_score']:>4}  {o['total_duration'] / 60:>8.1f}m  {last_seen:16}"
+        )
+
+
+@main.command()
+@click.argument("query")
+@click.option(
+    "--in",
+    "source",
+    type=click.Choice(["all", "logs", "frames"]),
+    default="all",
+    help="Search log entries, stack frames, or both",
+)
+@click.option("--process", "-p", help="Only matches from this process name")
+@click.option("--limit", "-n", default=20, help="Number of captures to show")
+@click.option("--format", "-f", "fmt", type=click.Choice(["table", "json"]), default="table")
+def search(query: str, source: str, process: str | None, limit: int, fmt: str) -> None:
+    """Find forensic captures by log message or stack symbol.
+
+    QUERY is FTS5 syntax. Log entries match whole words (event_message,
+    subsystem, process_name); frames match substrings of three characters
+    or more (symbol_name, blocked_on). For example:
+
+    \b
+      rogue-hunter search watchdog --in logs
+      rogue-hunter search 'blocked_on: IOSurface' --in frames -p kernel_task
+
+    Archived events are not searched.
+    """
+    import json
+    from datetime import datetime
+
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import (
+        SEARCH_SOURCES,
+        DatabaseNotAvailable,
+        require_database,
+        search_captures,
+    )
+
+    config = Config.load()
+    sources = SEARCH_SOURCES if source == "all" else (source,)
+
+    try:
+        with require_database(config.db_path) as conn:
+            results = search_captures(conn, query, sources, process, limit)
+    except DatabaseNotAvailable:
+        return
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="QUERY") from e
+
+    if fmt == "json":
+        click.echo(json.dumps(results, indent=2))
+        return
+    if not results:
+        click.echo("No matching captures.")
+        return
+
+    click.echo(
+        f"{'Capture':>7}  {'Event':>6}  {'Command':20}  {'Captured':16}  {'Logs':>5}  "
+        f"{'Frames':>6}  {'Score':>6}  Best match"
+    )
+    click.echo("-" * 100)
+    for r in results:
+        captured = datetime.fromtimestamp(r["captured_at"]).strftime("%Y-%m-%d %H:%M")
+        click.echo(
+            f"{r['capture_id']:>7}  {r['event_id']:>6}  {r['command'][:20]:20}  {captured:16}  "
+            f"{r['matches'].get('logs', 0):>5}  {r['matches'].get('frames', 0):>6}  "
+            f"{r['score']:>6.2f}  {r['snippet']}"
+        )
+
+
+@main.group()
+def forensics() -> None:
+    """Analyze stored forensic captures."""
+    pass
+
+
+@forensics.command("flame")
+@click.argument("capture_id", type=int)
+@click.option("--pid", "-p", type=int, help="Only this process")
+@click.option(
+    "--min-pct",
+    default=1.0,
+    help="Hide frames under this percentage of samples (tree format)",
+)
+@click.option("--format", "-f", "fmt", type=click.Choice(["tree", "folded"]), default="tree")
+def forensics_flame(capture_id: int, pid: int | None, min_pct: float, fmt: str) -> None:
+    """Show a capture's tailspin stacks merged into one call tree.
+
+    Threads are merged by symbol path, under one node per process. The
+    folded format is one "frame;frame;frame samples" line per stack, for
+    flame graph tools:
+
+    \b
+      rogue-hunter forensics flame 12 -f folded | flamegraph.pl > 12.svg
+    """
+    from rogue_hunter.calltree import build_call_tree, folded_stacks
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import DatabaseNotAvailable, get_forensic_capture, require_database
+
+    config = Config.load()
+
+    try:
+        with require_database(config.db_path) as conn:
+            capture = get_forensic_capture(conn, capture_id)
+            if not capture:
+                click.echo(f"Error: Capture {capture_id} not found", err=True)
+                raise SystemExit(1)
+            root = build_call_tree(conn, capture_id, pid)
+    except DatabaseNotAvailable:
+        return
+
+    if fmt == "folded":
+        for line in folded_stacks(root):
+            click.echo(line)
+        return
+    if not root.samples:
+        click.echo(f"No tailspin frames in capture {capture_id}.")
+        return
+
+    click.echo(
+        f"Capture {capture_id}: event {capture['event_id']}, "
+        f"{capture['command']} [{capture['pid']}], {root.samples} samples"
+    )
+    click.echo(f"{'Total':>6}  {'Samples':>7}  {'Self':>7}  Frame")
+    click.echo("-" * 80)
+    min_samples = root.samples * min_pct / 100
+    stack = [(0, p) for p in sorted(root.children.values(), key=lambda n: n.samples)]
+    while stack:
+        depth, node = stack.pop()
+        if node.samples < min_samples:
+            continue
+        click.echo(
+            f"{node.samples / root.samples:>6.1%}  {node.samples:>7}  {node.self_samples:>7}  "
+            f"{'  ' * depth}{node.name}"
+        )
+        stack.extend(
+            (depth + 1, c) for c in sorted(node.children.values(), key=lambda n: n.samples)
+        )
+
+
+def _short_stack(path: tuple[str, ...], frames: int = 3) -> str:
+    """Process and innermost frames of a stack path."""
+    if len(path) <= frames + 1:
+        return " > ".join(path)
+    return f"{path[0]} > ... > {' > '.join(path[-frames:])}"
+
+
+def _optional_number(value: float | None, scale: float = 1.0) -> str:
+    """value / scale to two places, or "-" if missing."""
+    return "-" if value is None else f"{value / scale:.2f}"
+
+
+@forensics.command("diff")
+@click.argument("capture_a", type=int)
+@click.argument("capture_b", type=int)
+@click.option("--pid", "-p", type=int, help="Only this process")
+@click.option("--limit", "-n", default=10, help="Stacks to show each way")
+@click.option("--format", "-f", "fmt", type=click.Choice(["table", "json"]), default="table")
+def forensics_diff(capture_a: int, capture_b: int, pid: int | None, limit: int, fmt: str) -> None:
+    """Show what changed from CAPTURE_A to CAPTURE_B.
+
+    Stacks are aligned by symbol path and compared by their share of each
+    capture's samples (self samples: the frame on top of the stack). Also
+    lists threads blocked in CAPTURE_B but not CAPTURE_A, and each
+    process's CPU time and I/O in both.
+    """
+    import dataclasses
+    import json
+
+    from rogue_hunter.capturediff import diff_captures
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import DatabaseNotAvailable, get_forensic_capture, require_database
+
+    config = Config.load()
+
+    try:
+        with require_database(config.db_path) as conn:
+            captures = {}
+            for capture_id in (capture_a, capture_b):
+                captures[capture_id] = get_forensic_capture(conn, capture_id)
+                if not captures[capture_id]:
+                    click.echo(f"Error: Capture {capture_id} not found", err=True)
+                    raise SystemExit(1)
+            diff = diff_captures(conn, capture_a, capture_b, pid, limit)
+    except DatabaseNotAvailable:
+        return
+
+    if fmt == "json":
+        click.echo(json.dumps(dataclasses.asdict(diff), indent=2))
+        return
+
+    for capture_id, samples in ((capture_a, diff.samples_a), (capture_b, diff.samples_b)):
+        c = captures[capture_id]
+        click.echo(
+            f"Capture {capture_id}: event {c['event_id']}, {c['command']} [{c['pid']}], "
+            f"{samples} samples"
+        )
+
+    for title, changes in (("Stacks that grew", diff.grew), ("Stacks that shrank", diff.shrank)):
+        click.echo(f"\n{title}:")
+        if not changes:
+            click.echo("  (none)")
+            continue
+        click.echo(f"  {'Before':>7}  {'After':>7}  {'Change':>7}  Stack")
+        for f in changes:
+            click.echo(
+                f"  {f.share_a:>7.1%}  {f.share_b:>7.1%}  {f.change:>+7.1%}  {_short_stack(f.path)}"
+            )
+
+    click.echo("\nNewly blocked threads:")
+    if not diff.newly_blocked:
+        click.echo("  (none)")
+    for t in diff.newly_blocked:
+        process = f"{t.process} [{t.pid}]"
+        click.echo(f"  {process[:24]:24}  {t.thread_id:>10}  {t.samples:>6}  {t.blocked_on}")
+
+    click.echo("\nProcesses:")
+    click.echo(
+        f"  {'Process':24}  {'CPU before':>10}  {'after':>7}  {'change':>7}  "
+        f"{'I/O MB before':>13}  {'after':>7}  {'change':>7}"
+    )
+
+    for p in diff.processes[:limit]:
+        process = f"{p.name} [{p.pid}]"
+        cpu_a, cpu_b = _optional_number(p.cpu_a), _optional_number(p.cpu_b)
+        io_a, io_b = _optional_number(p.io_bytes_a, 1e6), _optional_number(p.io_bytes_b, 1e6)
+        click.echo(
+            f"  {process[:24]:24}  {cpu_a:>10}  {cpu_b:>7}  {p.cpu_change:>+7.2f}  "
+            f"{io_a:>13}  {io_b:>7}  {p.io_bytes_change / 1e6:>+7.2f}"
+        )
+
+
+@forensics.command("waits")
+@click.argument("capture_id", type=int)
+@click.option("--min-chain", default=3, help="Shortest wait chain to show (in waits)")
+@click.option("--limit", "-n", default=10, help="Chains and waits to show")
+@click.option("--format", "-f", "fmt", type=click.Choice(["table", "json"]), default="table")
+def forensics_waits(capture_id: int, min_chain: int, limit: int, fmt: str) -> None:
+    """Show who a capture's blocked threads wait on.
+
+    Links each blocked thread to the process or thread holding what it
+    waits on (wait4 targets, turnstile and lock owners) and ranks root
+    blockers, the owners at the ends of the chains, by the blocked samples
+    they hold up. Deadlock cycles and long chains are listed too.
+    """
+    import dataclasses
+    import json
+
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import DatabaseNotAvailable, get_forensic_capture, require_database
+    from rogue_hunter.waitgraph import build_wait_graph
+
+    config = Config.load()
+
+    try:
+        with require_database(config.db_path) as conn:
+            capture = get_forensic_capture(conn, capture_id)
+            if not capture:
+                click.echo(f"Error: Capture {capture_id} not found", err=True)
+                raise SystemExit(1)
+            graph = build_wait_graph(conn, capture_id, min_chain, limit)
     except DatabaseNotAvailable:
         return
 
+    if fmt == "json":
+        click.echo(json.dumps(dataclasses.asdict(graph), indent=2))
+        return
+    if not graph.edges and not graph.unresolved:
+        click.echo(f"No blocked threads in capture {capture_id}.")
+        return
+
+    click.echo(
+        f"Capture {capture_id}: event {capture['event_id']}, "
+        f"{capture['command']} [{capture['pid']}], {len(graph.edges)} waits"
+    )
+    if graph.unresolved:
+        click.echo(
+            f"{len(graph.unresolved)} kinds of wait with no owner "
+            f"({sum(graph.unresolved.values())} samples)"
+        )
+
+    click.echo("\nRoot blockers:")
+    click.echo(f"  {'Threads':>7}  {'Samples':>7}  Blocker")
+    for root in graph.roots:
+        blocker = ", ".join(graph.label(n) for n in root.nodes)
+        if len(root.nodes) > 1:
+            blocker = f"deadlock: {blocker}"
+        click.echo(f"  {root.threads:>7}  {root.samples:>7}  {blocker}")
+
+    if graph.cycles:
+        click.echo("\nDeadlock cycles:")
+        for cycle in graph.cycles:
+            click.echo("  " + " <-> ".join(graph.label(n) for n in cycle))
+
+    click.echo(f"\nChains of {min_chain} or more waits:")
+    if not graph.chains:
+        click.echo("  (none)")
+    for chain in graph.chains:
+        path = " -> ".join(graph.label(n) for n in chain.nodes)
+        click.echo(f"  {chain.samples:>7}  {path}")
+
+    click.echo("\nWaits:")
+    click.echo(f"  {'Samples':>7}  {'Resource':16}  Waiter -> owner")
+    for edge in graph.edges[:limit]:
+        click.echo(
+            f"  {edge.samples:>7}  {edge.resource[:16]:16}  "
+            f"{graph.label(edge.waiter)} -> {graph.label(edge.owner)}"
+        )
+
+
+@main.command("rebuild-stats")
+def rebuild_stats() -> None:
+    """Recompute the top-offenders rollup from live and archived events.
+
+    Events already deleted by pruning drop out of the rebuilt rollup.
+    """
+    from rogue_hunter.archive import iter_archived_events
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import DatabaseNotAvailable, rebuild_command_stats, require_database
+
+    config = Config.load()
+
+    try:
+        with require_database(config.db_path) as conn:
+            count = rebuild_command_stats(conn, iter_archived_events(config.archive_dir))
+    except DatabaseNotAvailable:
+        return
+
+    click.echo(f"Rebuilt command stats from {count} closed events")
+
 
 @main.command()
 @click.option("--events-days", default=None, type=int, help="Override event retention days")
@@ -441,6 +920,66 @@ def prune(events_days: int | None, dry_run: bool, force: bool) -> None:
     click.echo(f"Deleted {events_deleted} events")
 
 
+@main.command()
+@click.option("--days", default=None, type=int, help="Override archive age in days")
+@click.option("--dry-run", is_flag=True, help="Show what would be archived")
+def archive(days: int | None, dry_run: bool) -> None:
+    """Move old closed events into weekly archive files.
+
+    Archived events (with their snapshots and forensic captures) leave the
+    live database but still show up in 'history' and 'events show'.
+    """
+    from rogue_hunter.archive import archive_events, get_archivable_events
+    from rogue_hunter.config import Config
+    from rogue_hunter.storage import get_connection
+
+    config = Config.load()
+
+    if not config.db_path.exists():
+        click.echo("Database not found. Run 'rogue-hunter daemon' first.")
+        return
+
+    if days is None:
+        days = config.retention.archive_days
+        if days < 1:
+            click.echo(
+                "Archiving is disabled (retention.archive_days = 0); pass --days to run once."
+            )
+            return
+    elif days < 1:
+        raise click.BadParameter("Archive days must be >= 1", param_hint="--days")
+
+    conn = get_connection(config.db_path)
+    try:
+        if dry_run:
+            pending = get_archivable_events(conn, days)
+            weeks = len({week for _, week in pending})
+            click.echo(
+                f"Would archive {len(pending)} closed events older than {days} days "
+                f"into {weeks} weekly files"
+            )
+            return
+        size_before = config.db_path.stat().st_size
+        result = archive_events(
+            conn,
+            config.archive_dir,
+            older_than_days=days,
+            keep_days=config.retention.archive_keep_days,
+        )
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")  # Vacuumed pages leave the file here
+    finally:
+        conn.close()
+
+    size_after = config.db_path.stat().st_size
+    click.echo(
+        f"Archived {result.events_archived} events into {len(result.files_written)} "
+        f"weekly files in {config.archive_dir}"
+    )
+    if result.files_expired:
+        click.echo(f"Deleted {result.files_expired} expired archive files")
+    click.echo(f"Database size: {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+
+
 @main.group()
 def config() -> None:
     """Manage configuration."""
@@ -459,6 +998,8 @@ def config_show() -> None:
     click.echo()
     click.echo("[retention]")
     click.echo(f"  events_days = {cfg.retention.events_days}")
+    click.echo(f"  archive_days = {cfg.retention.archive_days}")
+    click.echo(f"  archive_keep_days = {cfg.retention.archive_keep_days}")
     click.echo()
     click.echo("[system]")
     click.echo(f"  ring_buffer_size = {cfg.system.ring_buffer_size}")
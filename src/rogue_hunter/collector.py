@@ -10,6 +10,10 @@ from typing import Literal
 import structlog
 
 from rogue_hunter.config import Config, ResourceWeights
+from rogue_hunter.gpu import GpuProvider, GpuSampler
+from rogue_hunter.libproc import DetailCounters, UsageCounters, abs_to_ns, get_state_name
+from rogue_hunter.sharding import ShardedReader
+from rogue_hunter.sources import LibprocSource, ProcessSource
 
 # Type alias for dominant resource values
 DominantResource = Literal["cpu", "gpu", "memory", "disk", "wakeups"]
@@ -295,6 +299,19 @@ class ProcessSamples:
         )
 
 
+# Shares for a process missing from the share calculation
+_DEFAULT_SHARES = {
+    "cpu_share": 0.0,
+    "gpu_share": 0.0,
+    "mem_share": 0.0,
+    "disk_share": 0.0,
+    "wakeups_share": 0.0,
+}
+
+# GPU sampler entry for a process with no GPU time: (gpu_time ns, ms/sec)
+_NO_GPU = (0, 0.0)
+
+
 def calculate_resource_shares(
     processes: list[dict],
     share_min_cpu: float = 0.01,
@@ -483,6 +500,114 @@ class _PrevSample:
     runnable_time: int  # Total runnable time (mach time units)
     qos_interactive: int  # Total QoS interactive time (mach time units)
     gpu_time: int  # Total GPU time (nanoseconds)
+    detail_timestamp: float = 0.0  # time.monotonic() of the last detailed read
+    start_time: int = 0  # Process start (mach units) - changes when the PID is reused
+
+
+@dataclass
+class _ProcDetail:
+    """Last detailed-tier reading for a PID.
+
+    Reused on samples where the PID is not in the detailed pass, so every
+    process still carries a state, thread count and activity rates.
+    """
+
+    state: str
+    threads: int
+    priority: int
+    csw_rate: float
+    syscalls_rate: float
+    mach_msgs_rate: float
+    faults_rate: float
+
+
+@dataclass
+class ProcessMetadata:
+    """Static fields for one process incarnation, keyed by (pid, start_time)."""
+
+    start_time: int  # ri_proc_start_abstime
+    comm: bytes  # pbi_comm at the time of caching (changes on exec)
+    command: str  # Resolved name (proc_name, falling back to pbi_comm)
+    ppid: int  # Refreshed on every detailed read (reparenting)
+
+
+@dataclass
+class MetadataCacheStats:
+    """Cumulative MetadataCache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    pid_reuses: int = 0  # Entries invalidated because the start time changed
+    execs: int = 0  # Entries invalidated because pbi_comm changed
+    evictions: int = 0  # Entries dropped because the PID left
+    syscalls_avoided: int = 0  # proc_name calls saved by hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MetadataCache:
+    """Per-process static metadata so names are resolved once per process.
+
+    An entry is only valid for the process incarnation it was created for:
+    a different start time means the PID was reused, a different pbi_comm
+    means the process exec'd. Both invalidate the entry.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, ProcessMetadata] = {}
+        self.stats = MetadataCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, pid: int, start_time: int, comm: bytes) -> ProcessMetadata | None:
+        """Return the cached entry if it still describes this process."""
+        entry = self._entries.get(pid)
+        if entry is not None:
+            if entry.start_time != start_time:
+                self.stats.pid_reuses += 1
+                entry = None
+            elif entry.comm != comm:
+                self.stats.execs += 1
+                entry = None
+            else:
+                self.stats.hits += 1
+                self.stats.syscalls_avoided += 1
+                return entry
+            del self._entries[pid]
+        self.stats.misses += 1
+        return None
+
+    def put(self, pid: int, metadata: ProcessMetadata) -> None:
+        """Store metadata for a PID."""
+        self._entries[pid] = metadata
+
+    def peek(self, pid: int) -> ProcessMetadata | None:
+        """Return the entry for a PID without validation or counting."""
+        return self._entries.get(pid)
+
+    def evict_missing(self, live_pids: set[int]) -> None:
+        """Drop entries for PIDs that are no longer running."""
+        for pid in self._entries.keys() - live_pids:
+            del self._entries[pid]
+            self.stats.evictions += 1
+
+
+@dataclass
+class CollectionStats:
+    """Cost of one collection (for heartbeat logging and benchmarks)."""
+
+    process_count: int = 0
+    detailed_count: int = 0  # PIDs that got the detailed read this sample
+    full_sweep: bool = False
+    syscalls: int = 0  # Underlying source calls made this sample
+    elapsed_ms: float = 0.0
+    read_ms: float = 0.0  # Time spent in sharded per-PID reads
+    shards: int = 1  # Reader threads used this sample
 
 
 class LibprocCollector:
@@ -491,32 +616,45 @@ class LibprocCollector:
     Uses native macOS APIs (proc_pid_rusage, proc_pidinfo) for efficient
     process monitoring. Maintains internal state for CPU% delta calculations.
 
+    Collection is two-tier (see CollectionConfig): one rusage call per PID
+    every sample, task/BSD info only for PIDs that matter. The per-PID reads
+    are sharded across reader threads (see ShardedReader). GPU time comes
+    from a GpuSampler running on its own interval. Pass a SyntheticSource to
+    run without libproc (tests, benchmarks).
+
     Performance: ~10-50ms per collection.
     """
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        source: ProcessSource | None = None,
+        gpu_provider: GpuProvider | None = None,
+    ):
         self.config = config
+        self._source: ProcessSource = source if source is not None else LibprocSource()
+        collection = config.collection
+        # GPU time is sampled on its own cadence; the daemon runs gpu.run()
+        self.gpu = GpuSampler(collection.gpu_interval, gpu_provider)
+        self._reader = ShardedReader(self._source, collection.threads, collection.max_threads)
         self._prev_samples: dict[int, _PrevSample] = {}  # pid -> previous sample
+        self._details: dict[int, _ProcDetail] = {}  # pid -> last detailed reading
+        self.metadata = MetadataCache()  # pid -> name/ppid for the current incarnation
         self._last_collect_time: float = 0.0
+        self._sample_index: int = 0  # For scheduling full sweeps
+        self.last_stats = CollectionStats()
+        # PIDs that always get the detailed read. The daemon sets this to the
+        # tracked PIDs before each collect() so their exit snapshots are fresh.
+        self.pinned_pids: frozenset[int] = frozenset()
 
         # Get timebase info once (for Apple Silicon time conversion)
-        from rogue_hunter.libproc import get_timebase_info
-
-        self._timebase = get_timebase_info()
+        self._timebase = self._source.timebase()
 
     def _collect_sync(self) -> ProcessSamples:
         """Synchronous collection - runs in executor."""
-        from rogue_hunter.iokit import get_gpu_usage
-        from rogue_hunter.libproc import (
-            abs_to_ns,
-            get_bsd_info,
-            get_process_name,
-            get_rusage,
-            get_state_name,
-            get_task_info,
-            list_all_pids,
-        )
-
+        source = self._source
+        reader = self._reader
+        calls_before = reader.calls
         start = time.monotonic()
 
         # Time delta since last collection
@@ -526,217 +664,72 @@ class LibprocCollector:
             wall_delta_ns = 0.0
         self._last_collect_time = start
 
-        # Get GPU usage for all processes (one IORegistry scan per cycle)
-        gpu_usage = get_gpu_usage()
-
-        # Collect all PIDs
-        pids = list_all_pids()
-        all_processes: list[dict] = []
-        current_pids: set[int] = set()
+        full_sweep = self._sample_index % self.config.collection.full_sweep_samples == 0
+        self._sample_index += 1
 
-        for pid in pids:
-            # Skip kernel PID 0
-            if pid == 0:
-                continue
+        # GPU time and rate from the background sampler, interpolated to now
+        gpu_usage = self.gpu.usage(start)
 
-            # Get rusage (richest single call)
-            rusage = get_rusage(pid)
-            if rusage is None:
-                continue  # Process disappeared or permission denied
+        reader.begin_sample()
 
-            # Get task info for context switches, syscalls, threads
-            task_info = get_task_info(pid)
-            if task_info is None:
-                continue
+        # Cheap pass: one usage read per PID (skip kernel PID 0). PIDs that
+        # disappeared or were denied are dropped by the reader.
+        pids = [pid for pid in source.list_pids() if pid != 0]
+        all_processes = [
+            self._usage_metrics(pid, usage, gpu_usage.get(pid, _NO_GPU), start, wall_delta_ns)
+            for pid, usage in reader.read_usage(pids)
+        ]
 
-            # Get BSD info for state
-            bsd_info = get_bsd_info(pid)
-            if bsd_info is None:
-                continue
+        # Shares only depend on the cheap-tier metrics
+        shares_by_pid = self._calculate_shares(all_processes)
 
-            # Track this PID
-            current_pids.add(pid)
-
-            # Convert CPU times from mach_absolute_time to nanoseconds
-            user_ns = abs_to_ns(rusage.ri_user_time, self._timebase)
-            system_ns = abs_to_ns(rusage.ri_system_time, self._timebase)
-            total_cpu_ns = user_ns + system_ns
-
-            # Extract cumulative values for rate calculation
-            disk_io = rusage.ri_diskio_bytesread + rusage.ri_diskio_byteswritten
-            energy = rusage.ri_billed_energy
-            instructions = rusage.ri_instructions
-            cycles = rusage.ri_cycles
-
-            # Extract cumulative values that were previously scored incorrectly
-            pageins = rusage.ri_pageins
-            csw = task_info.pti_csw
-            syscalls = task_info.pti_syscalls_mach + task_info.pti_syscalls_unix
-            mach_msgs = task_info.pti_messages_sent + task_info.pti_messages_received
-            wakeups = rusage.ri_pkg_idle_wkups + rusage.ri_interrupt_wkups
-            faults = task_info.pti_faults
-            runnable_time = rusage.ri_runnable_time
-            qos_interactive = rusage.ri_cpu_time_qos_user_interactive
-
-            # Get GPU time for this process (0 if not using GPU)
-            gpu_time = gpu_usage.get(pid, 0)
-
-            # Calculate deltas/rates from previous sample
-            cpu_percent = 0.0
-            disk_io_rate = 0.0
-            energy_rate = 0.0
-            pageins_rate = 0.0
-            csw_rate = 0.0
-            syscalls_rate = 0.0
-            mach_msgs_rate = 0.0
-            wakeups_rate = 0.0
-            faults_rate = 0.0
-            runnable_time_rate = 0.0  # ms of runnable per second
-            qos_interactive_rate = 0.0  # ms of interactive QoS per second
-            gpu_time_rate = 0.0  # ms of GPU per second
-
-            wall_delta_sec = wall_delta_ns / 1e9
-
-            if wall_delta_ns > 0 and pid in self._prev_samples:
-                prev = self._prev_samples[pid]
-                # CPU%
-                cpu_delta_ns = total_cpu_ns - prev.cpu_time_ns
-                if cpu_delta_ns > 0:
-                    cpu_percent = (cpu_delta_ns / wall_delta_ns) * 100.0
-                # Disk I/O rate (bytes/sec)
-                disk_delta = disk_io - prev.disk_io
-                if disk_delta > 0 and wall_delta_sec > 0:
-                    disk_io_rate = disk_delta / wall_delta_sec
-                # Energy rate (energy units/sec)
-                energy_delta = energy - prev.energy
-                if energy_delta > 0 and wall_delta_sec > 0:
-                    energy_rate = energy_delta / wall_delta_sec
-
-                # New rate calculations
-                if wall_delta_sec > 0:
-                    pageins_delta = pageins - prev.pageins
-                    if pageins_delta > 0:
-                        pageins_rate = pageins_delta / wall_delta_sec
-
-                    csw_delta = csw - prev.csw
-                    if csw_delta > 0:
-                        csw_rate = csw_delta / wall_delta_sec
-
-                    syscalls_delta = syscalls - prev.syscalls
-                    if syscalls_delta > 0:
-                        syscalls_rate = syscalls_delta / wall_delta_sec
-
-                    mach_msgs_delta = mach_msgs - prev.mach_msgs
-                    if mach_msgs_delta > 0:
-                        mach_msgs_rate = mach_msgs_delta / wall_delta_sec
-
-                    wakeups_delta = wakeups - prev.wakeups
-                    if wakeups_delta > 0:
-                        wakeups_rate = wakeups_delta / wall_delta_sec
-
-                    faults_delta = faults - prev.faults
-                    if faults_delta > 0:
-                        faults_rate = faults_delta / wall_delta_sec
-
-                    # runnable_time is in mach units, convert to ms/sec
-                    runnable_delta = runnable_time - prev.runnable_time
-                    if runnable_delta > 0:
-                        runnable_ns = abs_to_ns(runnable_delta, self._timebase)
-                        runnable_time_rate = (runnable_ns / 1e6) / wall_delta_sec
-
-                    # qos_interactive is in mach units, convert to ms/sec
-                    qos_delta = qos_interactive - prev.qos_interactive
-                    if qos_delta > 0:
-                        qos_ns = abs_to_ns(qos_delta, self._timebase)
-                        qos_interactive_rate = (qos_ns / 1e6) / wall_delta_sec
-
-                    # gpu_time is already in nanoseconds, convert to ms/sec
-                    gpu_delta = gpu_time - prev.gpu_time
-                    if gpu_delta > 0:
-                        gpu_time_rate = (gpu_delta / 1e6) / wall_delta_sec
-
-            # IPC (instructions per cycle) - no delta needed
-            ipc = instructions / cycles if cycles > 0 else 0.0
-
-            # Store current sample for next delta
-            self._prev_samples[pid] = _PrevSample(
-                cpu_time_ns=total_cpu_ns,
-                disk_io=disk_io,
-                energy=energy,
-                timestamp=start,
-                pageins=pageins,
-                csw=csw,
-                syscalls=syscalls,
-                mach_msgs=mach_msgs,
-                wakeups=wakeups,
-                faults=faults,
-                runnable_time=runnable_time,
-                qos_interactive=qos_interactive,
-                gpu_time=gpu_time,
-            )
+        # Detailed pass: task/BSD info for the PIDs that matter
+        if full_sweep:
+            detail_pids = {p["pid"] for p in all_processes}
+        else:
+            detail_pids = self._select_for_detail(all_processes, shares_by_pid)
 
-            # Get process name (try proc_name first, fall back to pbi_comm)
-            command = get_process_name(pid)
-            if not command:
-                command = bsd_info.pbi_comm.decode("utf-8", errors="replace")
-            if not command:
-                command = f"pid_{pid}"
+        vanished: set[int] = set()
+        for pid, detail in reader.read_detail(list(detail_pids)):
+            if detail is None:
+                vanished.add(pid)
+                continue
+            self._details[pid] = self._read_detail(pid, detail, start)
+        read_seconds = reader.end_sample()
 
-            # Map state
-            state = get_state_name(bsd_info.pbi_status)
-
-            # Build process dict with all metrics
-            proc = {
-                "pid": pid,
-                "ppid": bsd_info.pbi_ppid,  # Parent PID (for zombie counting)
-                "command": command,
-                # CPU
-                "cpu": cpu_percent,
-                # Memory
-                "mem": rusage.ri_phys_footprint,
-                "mem_peak": rusage.ri_lifetime_max_phys_footprint,
-                "pageins": pageins,
-                "pageins_rate": pageins_rate,
-                "faults": faults,
-                "faults_rate": faults_rate,
-                # Disk I/O
-                "disk_io": disk_io,
-                "disk_io_rate": disk_io_rate,
-                # Activity
-                "csw": csw,
-                "csw_rate": csw_rate,
-                "syscalls": syscalls,
-                "syscalls_rate": syscalls_rate,
-                "threads": task_info.pti_threadnum,
-                "mach_msgs": mach_msgs,
-                "mach_msgs_rate": mach_msgs_rate,
-                # Efficiency
-                "instructions": instructions,
-                "cycles": cycles,
-                "ipc": ipc,
-                # Power
-                "energy": energy,
-                "energy_rate": energy_rate,
-                "wakeups": wakeups,
-                "wakeups_rate": wakeups_rate,
-                # Contention
-                "runnable_time": runnable_time,
-                "runnable_time_rate": runnable_time_rate,
-                "qos_interactive": qos_interactive,
-                "qos_interactive_rate": qos_interactive_rate,
-                # GPU
-                "gpu_time": gpu_time,
-                "gpu_time_rate": gpu_time_rate,
-                # State
-                "state": state,
-                "priority": task_info.pti_priority,
-            }
-            all_processes.append(proc)
+        if vanished:
+            all_processes = [p for p in all_processes if p["pid"] not in vanished]
+            shares_by_pid = self._calculate_shares(all_processes)
 
-        # Prune stale PIDs from _prev_samples
-        stale_pids = set(self._prev_samples.keys()) - current_pids
-        for pid in stale_pids:
+        # Merge detail (fresh or carried forward) and remember counters for next delta
+        current_pids: set[int] = set()
+        for proc in all_processes:
+            pid = proc["pid"]
+            current_pids.add(pid)
+            detail = self._details[pid]
+            metadata = self.metadata.peek(pid)
+            proc["ppid"] = metadata.ppid  # Parent PID (for zombie counting)
+            proc["command"] = metadata.command
+            proc["csw_rate"] = detail.csw_rate
+            proc["syscalls_rate"] = detail.syscalls_rate
+            proc["threads"] = detail.threads
+            proc["mach_msgs_rate"] = detail.mach_msgs_rate
+            proc["faults_rate"] = detail.faults_rate
+            proc["state"] = detail.state
+            proc["priority"] = detail.priority
+
+            prev = self._prev_samples[pid]
+            proc["csw"] = prev.csw
+            proc["syscalls"] = prev.syscalls
+            proc["mach_msgs"] = prev.mach_msgs
+            proc["faults"] = prev.faults
+
+        # Prune stale PIDs from _prev_samples and _details
+        for pid in set(self._prev_samples.keys()) - current_pids:
             del self._prev_samples[pid]
+        for pid in set(self._details.keys()) - current_pids:
+            del self._details[pid]
+        self.metadata.evict_missing(current_pids)
 
         # Count zombie children per parent (for pressure scoring)
         # A process with many zombie children isn't reaping them = potential bug
@@ -750,17 +743,6 @@ class LibprocCollector:
         for proc in all_processes:
             proc["zombie_children"] = zombie_count.get(proc["pid"], 0)
 
-        # Calculate fair shares for resource-based scoring (per-resource active counts)
-        scoring = self.config.scoring
-        shares_by_pid = calculate_resource_shares(
-            all_processes,
-            share_min_cpu=scoring.share_min_cpu,
-            share_min_gpu=scoring.share_min_gpu,
-            share_min_memory_bytes=scoring.share_min_memory_bytes,
-            share_min_disk=scoring.share_min_disk,
-            share_min_wakeups=scoring.share_min_wakeups,
-        )
-
         # Score ALL processes first (cheap - just math), then select
         all_scored = [
             self._score_process(p, shares_by_pid.get(p["pid"], {})) for p in all_processes
@@ -772,7 +754,8 @@ class LibprocCollector:
         # Top processes for TUI display (named "rogues" for ProcessSamples compatibility)
         rogues = self._select_for_display(all_scored)
 
-        elapsed_ms = int((time.monotonic() - start) * 1000)
+        elapsed = time.monotonic() - start
+        elapsed_ms = int(elapsed * 1000)
         # Hybrid: max(peak, rms) - bad actors visible, cumulative stress can push higher
         scores = [p.score for p in rogues]
         if scores:
@@ -782,6 +765,16 @@ class LibprocCollector:
         else:
             max_score = 0
 
+        self.last_stats = CollectionStats(
+            process_count=len(all_processes),
+            detailed_count=len(detail_pids) - len(vanished),
+            full_sweep=full_sweep,
+            syscalls=reader.calls - calls_before,
+            elapsed_ms=elapsed * 1000,
+            read_ms=read_seconds * 1000,
+            shards=reader.shards,
+        )
+
         return ProcessSamples(
             timestamp=datetime.now(),
             elapsed_ms=elapsed_ms,
@@ -796,6 +789,273 @@ class LibprocCollector:
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, self._collect_sync)
 
+    def close(self) -> None:
+        """Release reader threads."""
+        self._reader.close()
+
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _usage_metrics(
+        self,
+        pid: int,
+        usage: UsageCounters,
+        gpu: tuple[int, float],
+        now: float,
+        wall_delta_ns: float,
+    ) -> dict:
+        """Build the cheap-tier process dict and update the rusage-derived deltas.
+
+        Args:
+            pid: Process ID
+            usage: Counters from the source's usage read
+            gpu: (cumulative GPU ns, GPU ms/sec) from the GPU sampler
+            now: time.monotonic() at the start of this collection
+            wall_delta_ns: Wall time since the previous collection
+
+        Returns:
+            Process dict with every metric except the detailed-tier fields.
+        """
+        (
+            cpu_time,
+            mem,
+            mem_peak,
+            pageins,
+            disk_io,
+            energy,
+            wakeups,
+            instructions,
+            cycles,
+            runnable_time,
+            qos_interactive,
+            start_time,
+        ) = usage
+
+        # Convert CPU time from mach_absolute_time to nanoseconds
+        total_cpu_ns = abs_to_ns(cpu_time, self._timebase)
+
+        # Calculate deltas/rates from previous sample
+        cpu_percent = 0.0
+        disk_io_rate = 0.0
+        energy_rate = 0.0
+        pageins_rate = 0.0
+        wakeups_rate = 0.0
+        runnable_time_rate = 0.0  # ms of runnable per second
+        qos_interactive_rate = 0.0  # ms of interactive QoS per second
+        gpu_time, gpu_time_rate = gpu  # Rate already spans GPU samples
+
+        wall_delta_sec = wall_delta_ns / 1e9
+
+        prev = self._prev_samples.get(pid)
+        if prev is not None and prev.start_time != start_time:
+            # PID reused by a new process: the old counters mean nothing
+            prev = None
+            self._details.pop(pid, None)
+
+        if wall_delta_ns > 0 and prev is not None:
+            # CPU%
+            cpu_delta_ns = total_cpu_ns - prev.cpu_time_ns
+            if cpu_delta_ns > 0:
+                cpu_percent = (cpu_delta_ns / wall_delta_ns) * 100.0
+            # Disk I/O rate (bytes/sec)
+            disk_delta = disk_io - prev.disk_io
+            if disk_delta > 0:
+                disk_io_rate = disk_delta / wall_delta_sec
+            # Energy rate (energy units/sec)
+            energy_delta = energy - prev.energy
+            if energy_delta > 0:
+                energy_rate = energy_delta / wall_delta_sec
+
+            pageins_delta = pageins - prev.pageins
+            if pageins_delta > 0:
+                pageins_rate = pageins_delta / wall_delta_sec
+
+            wakeups_delta = wakeups - prev.wakeups
+            if wakeups_delta > 0:
+                wakeups_rate = wakeups_delta / wall_delta_sec
+
+            # runnable_time is in mach units, convert to ms/sec
+            runnable_delta = runnable_time - prev.runnable_time
+            if runnable_delta > 0:
+                runnable_ns = abs_to_ns(runnable_delta, self._timebase)
+                runnable_time_rate = (runnable_ns / 1e6) / wall_delta_sec
+
+            # qos_interactive is in mach units, convert to ms/sec
+            qos_delta = qos_interactive - prev.qos_interactive
+            if qos_delta > 0:
+                qos_ns = abs_to_ns(qos_delta, self._timebase)
+                qos_interactive_rate = (qos_ns / 1e6) / wall_delta_sec
+
+        # Store current sample for next delta. Detailed-tier counters carry
+        # forward until the PID's next detailed read.
+        self._prev_samples[pid] = _PrevSample(
+            cpu_time_ns=total_cpu_ns,
+            disk_io=disk_io,
+            energy=energy,
+            timestamp=now,
+            pageins=pageins,
+            csw=prev.csw if prev else 0,
+            syscalls=prev.syscalls if prev else 0,
+            mach_msgs=prev.mach_msgs if prev else 0,
+            wakeups=wakeups,
+            faults=prev.faults if prev else 0,
+            runnable_time=runnable_time,
+            qos_interactive=qos_interactive,
+            gpu_time=gpu_time,
+            detail_timestamp=prev.detail_timestamp if prev else 0.0,
+            start_time=start_time,
+        )
+
+        return {
+            "pid": pid,
+            # CPU
+            "cpu": cpu_percent,
+            # Memory
+            "mem": mem,
+            "mem_peak": mem_peak,
+            "pageins": pageins,
+            "pageins_rate": pageins_rate,
+            # Disk I/O
+            "disk_io": disk_io,
+            "disk_io_rate": disk_io_rate,
+            # Efficiency (IPC needs no delta)
+            "instructions": instructions,
+            "cycles": cycles,
+            "ipc": instructions / cycles if cycles > 0 else 0.0,
+            # Power
+            "energy": energy,
+            "energy_rate": energy_rate,
+            "wakeups": wakeups,
+            "wakeups_rate": wakeups_rate,
+            # Contention
+            "runnable_time": runnable_time,
+            "runnable_time_rate": runnable_time_rate,
+            "qos_interactive": qos_interactive,
+            "qos_interactive_rate": qos_interactive_rate,
+            # GPU
+            "gpu_time": gpu_time,
+            "gpu_time_rate": gpu_time_rate,
+        }
+
+    def _read_detail(self, pid: int, detail: DetailCounters, now: float) -> _ProcDetail:
+        """Turn a detailed-tier reading into rates and cached fields.
+
+        Rates are computed over the time since the PID's previous detailed
+        read, which may span several samples. The name comes from the
+        metadata cache; proc_name is only called for a new incarnation.
+        """
+        csw, syscalls, mach_msgs, faults, threads, priority, status, ppid, comm = detail
+
+        csw_rate = 0.0
+        syscalls_rate = 0.0
+        mach_msgs_rate = 0.0
+        faults_rate = 0.0
+
+        prev = self._prev_samples[pid]
+        if prev.detail_timestamp > 0:
+            delta_sec = now - prev.detail_timestamp
+            if delta_sec > 0:
+                if csw > prev.csw:
+                    csw_rate = (csw - prev.csw) / delta_sec
+                if syscalls > prev.syscalls:
+                    syscalls_rate = (syscalls - prev.syscalls) / delta_sec
+                if mach_msgs > prev.mach_msgs:
+                    mach_msgs_rate = (mach_msgs - prev.mach_msgs) / delta_sec
+                if faults > prev.faults:
+                    faults_rate = (faults - prev.faults) / delta_sec
+
+        prev.csw = csw
+        prev.syscalls = syscalls
+        prev.mach_msgs = mach_msgs
+        prev.faults = faults
+        prev.detail_timestamp = now
+
+        metadata = self.metadata.get(pid, prev.start_time, comm)
+        if metadata is None:
+            # Get process name (try proc_name first, fall back to pbi_comm)
+            command = self._source.read_name(pid)
+            if not command:
+                command = comm.decode("utf-8", errors="replace")
+            if not command:
+                command = f"pid_{pid}"
+            metadata = ProcessMetadata(
+                start_time=prev.start_time, comm=comm, command=command, ppid=ppid
+            )
+            self.metadata.put(pid, metadata)
+        else:
+            metadata.ppid = ppid
+
+        return _ProcDetail(
+            state=get_state_name(status),
+            threads=threads,
+            priority=priority,
+            csw_rate=csw_rate,
+            syscalls_rate=syscalls_rate,
+            mach_msgs_rate=mach_msgs_rate,
+            faults_rate=faults_rate,
+        )
+
+    def _calculate_shares(self, processes: list[dict]) -> dict[int, dict[str, float]]:
+        """Calculate fair shares using the configured per-resource thresholds."""
+        scoring = self.config.scoring
+        return calculate_resource_shares(
+            processes,
+            share_min_cpu=scoring.share_min_cpu,
+            share_min_gpu=scoring.share_min_gpu,
+            share_min_memory_bytes=scoring.share_min_memory_bytes,
+            share_min_disk=scoring.share_min_disk,
+            share_min_wakeups=scoring.share_min_wakeups,
+        )
+
+    def _select_for_detail(
+        self,
+        processes: list[dict],
+        shares_by_pid: dict[int, dict[str, float]],
+    ) -> set[int]:
+        """Pick the PIDs that get the detailed read on a non-sweep sample.
+
+        Preliminary scores use the fresh shares with the state from the last
+        detailed read. PIDs without a previous detailed read are always included.
+        """
+        min_score = self.config.collection.detail_min_score
+        pinned_pids = self.pinned_pids
+        scoring = self.config.scoring
+        w = scoring.resource_weights
+        multipliers = scoring.state_multipliers
+        scale = scoring.score_multiplier * (scoring.score_max / 100.0)
+        score_max = scoring.score_max
+
+        selected: set[int] = set()
+        preliminary: list[tuple[float, int]] = []
+
+        for proc in processes:
+            pid = proc["pid"]
+            detail = self._details.get(pid)
+            if detail is None or pid in pinned_pids:
+                selected.add(pid)
+                continue
+            # Same arithmetic as _score_shares, minus the dominant-resource bookkeeping
+            shares = shares_by_pid.get(pid, _DEFAULT_SHARES)
+            raw = (
+                shares["cpu_share"] * w.cpu
+                + shares["gpu_share"] * w.gpu
+                + shares["mem_share"] * w.memory
+                + shares["disk_share"] * w.disk_io
+                + shares["wakeups_share"] * w.wakeups
+            )
+            score = min(raw * scale, score_max) * multipliers.get(detail.state)
+            if score >= min_score:
+                selected.add(pid)
+            else:
+                preliminary.append((score, pid))
+
+        # Top-N display rows must be fresh even when nothing is hot
+        remaining = self.config.rogue_selection.max_count - len(selected)
+        if remaining > 0:
+            preliminary.sort(reverse=True)
+            selected.update(pid for _, pid in preliminary[:remaining])
+
+        return selected
+
     # ─────────────────────────────────────────────────────────────────────────
 
     def _select_for_display(self, scored: list[ProcessScore]) -> list[ProcessScore]:
@@ -818,24 +1078,20 @@ class LibprocCollector:
         """Derive band name from score using config thresholds."""
         return self.config.bands.get_band(score)
 
-    def _score_process(self, proc: dict, shares: dict[str, float]) -> ProcessScore:
-        """Score a process using resource-based fair share analysis.
+    def _score_shares(
+        self, shares: dict[str, float], state: str
+    ) -> tuple[int, DominantResource, float]:
+        """Score resource shares with the state multiplier applied.
 
-        Uses the new scoring system based on how much of each resource
-        a process consumes relative to its fair share.
+        Returns:
+            Tuple of (final_score, dominant_resource, disproportionality)
         """
         multipliers = self.config.scoring.state_multipliers
         weights = self.config.scoring.resource_weights
 
         # Default shares if not provided (e.g., process disappeared between collect and score)
-        default_shares = {
-            "cpu_share": 0.0,
-            "gpu_share": 0.0,
-            "mem_share": 0.0,
-            "disk_share": 0.0,
-            "wakeups_share": 0.0,
-        }
-        shares = shares if shares else default_shares
+        if not shares:
+            shares = _DEFAULT_SHARES
 
         # Calculate score from resource shares
         score_multiplier = self.config.scoring.score_multiplier
@@ -845,8 +1101,19 @@ class LibprocCollector:
         )
 
         # Apply state multiplier (discount for currently-inactive processes)
-        state_mult = multipliers.get(proc["state"])
+        state_mult = multipliers.get(state)
         final_score = max(0, min(100, int(base_score * state_mult)))
+        return final_score, dominant_resource, disproportionality
+
+    def _score_process(self, proc: dict, shares: dict[str, float]) -> ProcessScore:
+        """Score a process using resource-based fair share analysis.
+
+        Uses the new scoring system based on how much of each resource
+        a process consumes relative to its fair share.
+        """
+        final_score, dominant_resource, disproportionality = self._score_shares(
+            shares, proc["state"]
+        )
 
         # Get band from config
         band = self.config.bands.get_band(final_score)
@@ -8,9 +8,21 @@ import tomlkit
 
 @dataclass
 class RetentionConfig:
-    """Data retention configuration."""
+    """Data retention configuration.
+
+    Auto-prune deletes in small batches and yields to sampling between them.
+    A run stops after prune_budget_seconds and resumes shortly after.
+
+    If archive_days is set (it is off by default), closed events older than
+    that move to weekly archive files before pruning (see rogue_hunter.archive),
+    which are kept for archive_keep_days. Archiving only takes effect below
+    events_days. Only history and events show read the archives.
+    """
 
     events_days: int = 90
+    prune_budget_seconds: float = 5.0  # Max time per auto-prune run
+    archive_days: int = 0  # Archive closed events older than this (0 = off)
+    archive_keep_days: int = 365  # Delete archive files older than this
 
 
 @dataclass
@@ -20,6 +32,10 @@ class SystemConfig:
     ring_buffer_size: int = 90  # Number of samples to keep in ring buffer
     sample_interval: float = 1 / 3  # Seconds between samples (~0.333s = 3Hz)
     forensics_debounce: float = 2.0  # Min seconds between forensics captures
+    forensics_coalesce_seconds: float = 0.5  # Triggers this close share one capture
+    forensics_cpu_budget_sec: float = 120.0  # CPU seconds of captures per hour
+    forensics_io_budget_ops: int = 500_000  # Block I/O operations of captures per hour
+    forensics_shed_fraction: float = 0.5  # Budget share past which low scores are shed
     # Daemon heartbeat and logging
     heartbeat_samples: int = 60  # Log heartbeat every N samples (~20s at 3Hz)
     log_stability_samples: int = 3  # Samples before logging band transitions
@@ -29,6 +45,9 @@ class SystemConfig:
     log_backup_count: int = 3  # Number of backup log files to keep
     # Forensics capture
     forensics_log_seconds: int = 60  # Seconds of logs to capture during forensics
+    forensics_log_max_entries: int = 100_000  # Log entries kept per capture, at most
+    forensics_log_max_bytes: int = 64 * 1024 * 1024  # log show output read per capture, at most
+    forensics_parse_workers: int = 4  # Processes parsing a large decoded tailspin (1 = serial)
 
 
 @dataclass
@@ -165,6 +184,35 @@ class RogueSelectionConfig:
     max_count: int = 20  # Maximum rogues to track
 
 
+@dataclass
+class CollectionConfig:
+    """Process collection configuration.
+
+    Collection is two-tier. Every sample reads the cheap usage counters for
+    all PIDs (enough for every resource share), then reads the detailed
+    task/BSD counters only for:
+    - Candidates whose preliminary score is at or above detail_min_score
+    - Tracked PIDs and the top-N display rows
+    - PIDs seen for the first time
+
+    Every full_sweep_samples samples, all PIDs get the detailed read so state,
+    activity rates and zombie counts stay fresh. full_sweep_samples = 1
+    disables the cheap tier.
+
+    Per-PID reads are split across reader threads. threads = 0 auto-tunes the
+    count (up to max_threads) from measured read latency.
+
+    GPU time is read from the IORegistry every gpu_interval seconds, off the
+    main sampling path; rates in between are interpolated.
+    """
+
+    detail_min_score: int = 20  # Preliminary score that earns a detailed read
+    full_sweep_samples: int = 15  # ~5s at 3 samples/sec
+    threads: int = 0  # Reader threads for per-PID syscalls (0 = auto-tune)
+    max_threads: int = 4  # Upper bound when auto-tuning
+    gpu_interval: float = 2.0  # Seconds between IORegistry GPU scans
+
+
 # =============================================================================
 # TUI Color Configuration
 # =============================================================================
@@ -342,6 +390,7 @@ class Config:
     bands: BandsConfig = field(default_factory=BandsConfig)
     scoring: ScoringConfig = field(default_factory=ScoringConfig)
     rogue_selection: RogueSelectionConfig = field(default_factory=RogueSelectionConfig)
+    collection: CollectionConfig = field(default_factory=CollectionConfig)
     tui: TUIConfig = field(default_factory=TUIConfig)
 
     @property
@@ -378,6 +427,11 @@ class Config:
         """Database path."""
         return self.data_dir / "data.db"
 
+    @property
+    def archive_dir(self) -> Path:
+        """Directory of weekly event archive files."""
+        return self.data_dir / "archive"
+
     @property
     def log_path(self) -> Path:
         """Daemon log path.
@@ -408,6 +462,7 @@ class Config:
             "bands",
             "scoring",
             "rogue_selection",
+            "collection",
             "tui",
         ]
         for name in sections:
@@ -439,44 +494,77 @@ class Config:
         bands_data = data.get("bands", {})
         scoring_data = data.get("scoring", {})
         rogue_data = data.get("rogue_selection", {})
+        collection_data = data.get("collection", {})
         tui_data = data.get("tui", {})
 
         # Use dataclass defaults for any missing values
         ret_defaults = defaults.retention
-        sys_defaults = defaults.system
 
         return cls(
             retention=RetentionConfig(
                 events_days=retention_data.get("events_days", ret_defaults.events_days),
-            ),
-            system=SystemConfig(
-                ring_buffer_size=system_data.get("ring_buffer_size", sys_defaults.ring_buffer_size),
-                sample_interval=system_data.get("sample_interval", sys_defaults.sample_interval),
-                forensics_debounce=system_data.get(
-                    "forensics_debounce", sys_defaults.forensics_debounce
-                ),
-                heartbeat_samples=system_data.get(
-                    "heartbeat_samples", sys_defaults.heartbeat_samples
-                ),
-                log_stability_samples=system_data.get(
-                    "log_stability_samples", sys_defaults.log_stability_samples
+                prune_budget_seconds=retention_data.get(
+                    "prune_budget_seconds", ret_defaults.prune_budget_seconds
                 ),
-                auto_prune_interval_hours=system_data.get(
-                    "auto_prune_interval_hours", sys_defaults.auto_prune_interval_hours
-                ),
-                log_max_bytes=system_data.get("log_max_bytes", sys_defaults.log_max_bytes),
-                log_backup_count=system_data.get("log_backup_count", sys_defaults.log_backup_count),
-                forensics_log_seconds=system_data.get(
-                    "forensics_log_seconds", sys_defaults.forensics_log_seconds
+                archive_days=retention_data.get("archive_days", ret_defaults.archive_days),
+                archive_keep_days=retention_data.get(
+                    "archive_keep_days", ret_defaults.archive_keep_days
                 ),
             ),
+            system=_load_system_config(system_data),
             bands=_load_bands_config(bands_data),
             scoring=_load_scoring_config(scoring_data),
             rogue_selection=_load_rogue_selection_config(rogue_data),
+            collection=_load_collection_config(collection_data),
             tui=_load_tui_config(tui_data),
         )
 
 
+def _load_system_config(data: dict) -> SystemConfig:
+    """Load system config from TOML data."""
+    d = SystemConfig()
+    forensics_parse_workers = data.get("forensics_parse_workers", d.forensics_parse_workers)
+    if forensics_parse_workers < 1:
+        raise ValueError(f"forensics_parse_workers must be >= 1, got {forensics_parse_workers}")
+    # The capture scheduler divides by the budgets to get the share used
+    cpu_budget = data.get("forensics_cpu_budget_sec", d.forensics_cpu_budget_sec)
+    if cpu_budget <= 0:
+        raise ValueError(f"forensics_cpu_budget_sec must be > 0, got {cpu_budget}")
+    io_budget = data.get("forensics_io_budget_ops", d.forensics_io_budget_ops)
+    if io_budget <= 0:
+        raise ValueError(f"forensics_io_budget_ops must be > 0, got {io_budget}")
+    # At 1 or more graded shedding never starts; below 0 it means nothing
+    shed_fraction = data.get("forensics_shed_fraction", d.forensics_shed_fraction)
+    if not 0 <= shed_fraction < 1:
+        raise ValueError(f"forensics_shed_fraction must be >= 0 and < 1, got {shed_fraction}")
+    coalesce_seconds = data.get("forensics_coalesce_seconds", d.forensics_coalesce_seconds)
+    if coalesce_seconds < 0:
+        raise ValueError(f"forensics_coalesce_seconds must be >= 0, got {coalesce_seconds}")
+
+    return SystemConfig(
+        ring_buffer_size=data.get("ring_buffer_size", d.ring_buffer_size),
+        sample_interval=data.get("sample_interval", d.sample_interval),
+        forensics_debounce=data.get("forensics_debounce", d.forensics_debounce),
+        forensics_coalesce_seconds=coalesce_seconds,
+        forensics_cpu_budget_sec=cpu_budget,
+        forensics_io_budget_ops=io_budget,
+        forensics_shed_fraction=shed_fraction,
+        heartbeat_samples=data.get("heartbeat_samples", d.heartbeat_samples),
+        log_stability_samples=data.get("log_stability_samples", d.log_stability_samples),
+        auto_prune_interval_hours=data.get(
+            "auto_prune_interval_hours", d.auto_prune_interval_hours
+        ),
+        log_max_bytes=data.get("log_max_bytes", d.log_max_bytes),
+        log_backup_count=data.get("log_backup_count", d.log_backup_count),
+        forensics_log_seconds=data.get("forensics_log_seconds", d.forensics_log_seconds),
+        forensics_log_max_entries=data.get(
+            "forensics_log_max_entries", d.forensics_log_max_entries
+        ),
+        forensics_log_max_bytes=data.get("forensics_log_max_bytes", d.forensics_log_max_bytes),
+        forensics_parse_workers=forensics_parse_workers,
+    )
+
+
 def _load_bands_config(data: dict) -> BandsConfig:
     """Load bands config from TOML data, using dataclass defaults for missing fields."""
     defaults = BandsConfig()
@@ -569,6 +657,31 @@ def _load_rogue_selection_config(data: dict) -> RogueSelectionConfig:
     )
 
 
+def _load_collection_config(data: dict) -> CollectionConfig:
+    """Load collection config from TOML data."""
+    d = CollectionConfig()
+    full_sweep_samples = data.get("full_sweep_samples", d.full_sweep_samples)
+    if full_sweep_samples < 1:
+        raise ValueError(f"full_sweep_samples must be >= 1, got {full_sweep_samples}")
+    threads = data.get("threads", d.threads)
+    max_threads = data.get("max_threads", d.max_threads)
+    if threads < 0:
+        raise ValueError(f"threads must be >= 0, got {threads}")
+    if max_threads < 1:
+        raise ValueError(f"max_threads must be >= 1, got {max_threads}")
+    gpu_interval = data.get("gpu_interval", d.gpu_interval)
+    if gpu_interval <= 0:
+        raise ValueError(f"gpu_interval must be > 0, got {gpu_interval}")
+
+    return CollectionConfig(
+        detail_min_score=data.get("detail_min_score", d.detail_min_score),
+        full_sweep_samples=full_sweep_samples,
+        threads=threads,
+        max_threads=max_threads,
+        gpu_interval=gpu_interval,
+    )
+
+
 def _load_tui_config(data: dict) -> TUIConfig:
     """Load TUI config from TOML data.
 
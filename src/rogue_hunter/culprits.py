@@ -0,0 +1,179 @@
+"""Rolling culprit index over the ring buffer's window of samples.
+
+identify_culprits() walks every rogue of every frozen sample when a
+capture is stored. The index reaches the same answer incrementally: each
+push adds the sample's rogues and each sample leaving the window takes
+its own back out, both in O(rogues). Per PID it keeps
+
+- the peak score, as a monotonic deque of (seq, score, rogue) whose
+  scores never increase, so the front is the earliest highest sample
+  and the first entry at or after any seq is the peak since that seq;
+- running totals of samples at or above a threshold and of max score
+  held (the sample's max_score, credited to its top rogue), so any
+  suffix of the window ("the last N seconds") is a difference of two
+  totals found by binary search.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+from rogue_hunter.collector import ProcessSamples, ProcessScore
+
+_time = itemgetter(1)
+
+
+@dataclass(slots=True)
+class _Track:
+    """One PID's samples in the window."""
+
+    # (seq, score, rogue), scores non-increasing
+    peaks: deque[tuple[int, int, ProcessScore]] = field(default_factory=deque)
+    # (seq, position in sample, samples above threshold, max score held), running totals
+    hits: deque[tuple[int, int, int, float]] = field(default_factory=deque)
+    # Totals of hits already expired
+    base_above: int = 0
+    base_held: float = 0.0
+
+
+def _culprit(rogue: ProcessScore) -> dict:
+    """The identify_culprits() entry for a rogue's peak sample."""
+    return {
+        "pid": rogue.pid,
+        "command": rogue.command,
+        "score": rogue.score,
+        "dominant_resource": rogue.dominant_resource,
+        "disproportionality": rogue.disproportionality,
+    }
+
+
+class CulpritIndex:
+    """Peak, time above threshold and max-score share per PID over recent samples.
+
+    Holds the last max_samples pushes, the same window as a RingBuffer
+    of that size pushed in lockstep, so no eviction signal is needed.
+    """
+
+    def __init__(self, max_samples: int, threshold: int = 0, interval: float = 1.0) -> None:
+        """Initialize the index.
+
+        Args:
+            max_samples: Samples in the window
+            threshold: Score at or above which a sample counts toward seconds_above
+            interval: Seconds each sample stands for
+        """
+        self._max_samples = max_samples
+        self._threshold = threshold
+        self._interval = interval
+        self._tracks: dict[int, _Track] = {}
+        # (seq, timestamp, rogue PIDs, running total of max_score)
+        self._window: deque[tuple[int, float, tuple[int, ...], float]] = deque()
+        self._base_total = 0.0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        """Return number of samples in the window."""
+        return len(self._window)
+
+    @property
+    def window_seconds(self) -> float:
+        """Seconds the samples in the window stand for."""
+        return len(self._window) * self._interval
+
+    def push(self, samples: ProcessSamples) -> None:
+        """Add a sample, expiring the oldest if the window is full."""
+        if len(self._window) == self._max_samples:
+            self._expire()
+        seq = self._seq
+        self._seq += 1
+        rogues = samples.rogues
+        top = max(rogues, key=lambda r: r.score) if rogues else None
+        for position, rogue in enumerate(rogues):
+            track = self._tracks.get(rogue.pid)
+            if track is None:
+                track = self._tracks[rogue.pid] = _Track()
+            peaks = track.peaks
+            while peaks and peaks[-1][1] < rogue.score:
+                peaks.pop()
+            peaks.append((seq, rogue.score, rogue))
+            if track.hits:
+                _, _, above, held = track.hits[-1]
+            else:
+                above, held = track.base_above, track.base_held
+            if rogue.score >= self._threshold:
+                above += 1
+            if rogue is top:
+                held += samples.max_score
+            track.hits.append((seq, position, above, held))
+        total = (self._window[-1][3] if self._window else self._base_total) + samples.max_score
+        pids = tuple(r.pid for r in rogues)
+        self._window.append((seq, samples.timestamp.timestamp(), pids, total))
+
+    def clear(self) -> None:
+        """Empty the index."""
+        self._tracks.clear()
+        self._window.clear()
+        self._base_total = 0.0
+
+    def culprits(self) -> list[dict]:
+        """Peak culprits of the whole window, exactly as identify_culprits() has them.
+
+        Sorted by score descending; ties keep the order PIDs first
+        appear in the window.
+        """
+        ranked = sorted(
+            self._tracks.values(),
+            key=lambda t: (-t.peaks[0][1], t.hits[0][0], t.hits[0][1]),
+        )
+        return [_culprit(t.peaks[0][2]) for t in ranked]
+
+    def top(self, seconds: float | None = None, limit: int = 10) -> list[dict]:
+        """Top culprits of the last seconds of the window (all of it if None).
+
+        Each entry is a culprits() entry plus seconds_above (time at or
+        above the threshold) and max_share (share of the summed max
+        score over those samples that the PID held as top rogue).
+        """
+        if not self._window:
+            return []
+        start = 0
+        if seconds is not None:
+            start = bisect_left(self._window, self._window[-1][1] - seconds, key=_time)
+            if start == len(self._window):
+                return []
+        cutoff = (self._window[start][0],)
+        before = self._window[start - 1][3] if start else self._base_total
+        total = self._window[-1][3] - before
+
+        ranked = []
+        for track in self._tracks.values():
+            hits = track.hits
+            i = bisect_left(hits, cutoff)
+            if i == len(hits):
+                continue
+            if i:
+                _, _, above_before, held_before = hits[i - 1]
+            else:
+                above_before, held_before = track.base_above, track.base_held
+            _, _, above, held = hits[-1]
+            _, score, rogue = track.peaks[bisect_left(track.peaks, cutoff)]
+            entry = _culprit(rogue)
+            entry["seconds_above"] = (above - above_before) * self._interval
+            entry["max_share"] = (held - held_before) / total if total else 0.0
+            ranked.append(((-score, hits[i][0], hits[i][1]), entry))
+        ranked.sort(key=itemgetter(0))
+        return [entry for _, entry in ranked[:limit]]
+
+    def _expire(self) -> None:
+        """Take the oldest sample's rogues back out."""
+        seq, _, pids, self._base_total = self._window.popleft()
+        for pid in pids:
+            track = self._tracks[pid]
+            _, _, track.base_above, track.base_held = track.hits.popleft()
+            if track.peaks[0][0] == seq:
+                track.peaks.popleft()
+            if not track.hits:
+                del self._tracks[pid]
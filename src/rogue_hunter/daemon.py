@@ -13,6 +13,7 @@ from datetime import datetime
 import psutil
 
 from rogue_hunter import logging as rlog
+from rogue_hunter.archive import remove_archived, write_archives
 from rogue_hunter.boottime import get_boot_time
 from rogue_hunter.collector import (
     BAND_SEVERITY,
@@ -20,14 +21,22 @@ from rogue_hunter.collector import (
 )
 from rogue_hunter.config import Config
 from rogue_hunter.forensics import ForensicsCapture
+from rogue_hunter.migrations import get_pending_backfills, run_backfills
 from rogue_hunter.ringbuffer import RingBuffer
+from rogue_hunter.scheduler import (
+    CaptureCost,
+    CaptureScheduler,
+    CaptureTrigger,
+    resource_usage,
+)
 from rogue_hunter.socket_server import SocketServer
 from rogue_hunter.storage import (
     close_stale_open_events,
+    get_connection,
     init_database,
     insert_machine_snapshot,
-    prune_machine_snapshots,
-    prune_old_data,
+    link_capture_events,
+    prune_incremental,
 )
 from rogue_hunter.tracker import ProcessTracker
 
@@ -41,6 +50,9 @@ QOS_CLASS_DEFAULT = 0x15
 QOS_CLASS_UTILITY = 0x11
 QOS_CLASS_BACKGROUND = 0x09
 
+# Delay before resuming an auto-prune run that stopped on its time budget
+PRUNE_RESUME_SECONDS = 60.0
+
 
 def _set_qos_class(qos_class: int, relative_priority: int = 0) -> bool:
     """
@@ -97,7 +109,11 @@ class Daemon:
 
         # Initialize ring buffer
         max_samples = config.system.ring_buffer_size
-        self.ring_buffer = RingBuffer(max_samples=max_samples)
+        self.ring_buffer = RingBuffer(
+            max_samples=max_samples,
+            culprit_threshold=config.bands.tracking_threshold,
+            sample_interval=config.system.sample_interval,
+        )
 
         # Boot time for process tracking (stable across daemon restarts)
         self.boot_time = get_boot_time()
@@ -110,55 +126,83 @@ class Daemon:
         self._caffeinate_proc: asyncio.subprocess.Process | None = None
         self._shutdown_event = asyncio.Event()
         self._auto_prune_task: asyncio.Task | None = None
+        self._gpu_task: asyncio.Task | None = None
+        self._backfill_task: asyncio.Task | None = None
         self._socket_server: SocketServer | None = None
-        self._last_forensics_time: float = 0.0  # For debouncing
+        self.scheduler = CaptureScheduler(
+            self._run_capture,
+            debounce=config.system.forensics_debounce,
+            coalesce_seconds=config.system.forensics_coalesce_seconds,
+            cpu_budget=config.system.forensics_cpu_budget_sec,
+            io_budget=config.system.forensics_io_budget_ops,
+            shed_fraction=config.system.forensics_shed_fraction,
+        )
         self._last_machine_snapshot: float = 0.0  # For 60s interval snapshots
 
     async def _forensics_callback(self, event_id: int, trigger: str) -> None:
         """Forensics callback for tracker band transitions.
 
         Called by ProcessTracker when a process enters high/critical band
-        or escalates into one. Captures forensic data and stores in database.
+        or escalates into one. Queues the trigger with the event's peak
+        score on the capture scheduler, which coalesces it with concurrent
+        ones and sheds it if the hourly budget is running out.
 
         Args:
             event_id: The process event ID
             trigger: What triggered this capture (e.g., 'band_entry_high')
         """
-        # Debounce: tailspin needs at least 0.5s to refill its buffer after a save
-        now = time.monotonic()
-        elapsed = now - self._last_forensics_time
-        if elapsed < self.config.system.forensics_debounce:
-            cooldown = self.config.system.forensics_debounce
-            rlog.forensics_debounced(elapsed, cooldown)
+        if self._conn is None or self.tracker is None:
+            rlog.forensics_skipped("no database")
             return
-        self._last_forensics_time = now
 
+        score = next(
+            (t.peak_score for t in self.tracker.tracked.values() if t.event_id == event_id), 0
+        )
+        self.scheduler.submit(event_id, trigger, score)
+
+    async def _run_capture(self, lead: CaptureTrigger, linked: list[CaptureTrigger]) -> CaptureCost:
+        """Capture forensics for lead's event and link the others' events to it.
+
+        Returns:
+            The capture's CPU and I/O cost, for the scheduler's budget: its
+            child processes' usage plus the CPU time of storing it, not
+            the whole daemon's
+        """
+        before = resource_usage()
         if self._conn is None:
             rlog.forensics_skipped("no database")
-            return
+            return CaptureCost()
 
+        capture = None
         try:
             contents = self.ring_buffer.freeze()
             capture = ForensicsCapture(
                 self._conn,
-                event_id,
+                lead.event_id,
                 self.config.runtime_dir,
                 log_seconds=self.config.system.forensics_log_seconds,
+                log_max_entries=self.config.system.forensics_log_max_entries,
+                log_max_bytes=self.config.system.forensics_log_max_bytes,
+                parse_workers=self.config.system.forensics_parse_workers,
             )
-            capture_id = await capture.capture_and_store(contents, trigger)
-            rlog.forensics_captured(event_id, capture_id)
+            capture_id = await capture.capture_and_store(contents, lead.trigger)
+            link_capture_events(self._conn, capture_id, [t.event_id for t in linked])
+            rlog.forensics_captured(lead.event_id, capture_id)
         except Exception:
             log.exception(
                 "forensics_callback_failed",
-                event_id=event_id,
-                trigger=trigger,
+                event_id=lead.event_id,
+                trigger=lead.trigger,
             )
+        stored = CaptureCost(capture.store_cpu_seconds) if capture else CaptureCost()
+        return resource_usage() - before + stored
 
     async def _init_database(self) -> None:
         """Initialize database connection.
 
         Extracted from start() so tests can initialize DB without full daemon startup.
-        No migrations - if schema version mismatches, init_database() deletes and recreates.
+        init_database() migrates older schemas in place; their data backfills
+        run later in the background (see _run_backfills).
         """
         # Create config file with defaults if it doesn't exist
         if not self.config.config_path.exists():
@@ -167,10 +211,12 @@ class Daemon:
 
         self.config.data_dir.mkdir(parents=True, exist_ok=True)
         db_existed = self.config.db_path.exists()
-        init_database(self.config.db_path)  # Handles version check + recreate
+        init_database(self.config.db_path)  # Handles version check + migration
 
-        # Create connection and tracker AFTER init_database validates/recreates schema
-        self._conn = sqlite3.connect(self.config.db_path)
+        # Create connection and tracker AFTER init_database validates/recreates schema.
+        # get_connection enables foreign keys, which pruning and archiving rely on
+        # to cascade event deletes to snapshots, captures and their rows.
+        self._conn = get_connection(self.config.db_path)
 
         # Close any events left open from previous daemon run
         stale_closed = close_stale_open_events(self._conn, time.time())
@@ -246,6 +292,12 @@ class Daemon:
         # Start auto-prune task
         self._auto_prune_task = asyncio.create_task(self._auto_prune())
 
+        # Start GPU sampler (IORegistry scans on their own interval)
+        self._gpu_task = asyncio.create_task(self.collector.gpu.run(self._shutdown_event))
+
+        # Finish data migrations left by a schema upgrade while sampling
+        self._backfill_task = asyncio.create_task(self._run_backfills())
+
         # Run main loop (collector -> tracker -> ring buffer)
         await self._main_loop()
 
@@ -268,6 +320,30 @@ class Daemon:
                 pass
             self._auto_prune_task = None
 
+        # Cancel a queued or running forensics capture
+        await self.scheduler.stop()
+
+        # Cancel GPU sampler task
+        if self._gpu_task:
+            self._gpu_task.cancel()
+            try:
+                await self._gpu_task
+            except asyncio.CancelledError:
+                pass
+            self._gpu_task = None
+
+        # Cancel migration backfills (they resume on the next start)
+        if self._backfill_task:
+            self._backfill_task.cancel()
+            try:
+                await self._backfill_task
+            except asyncio.CancelledError:
+                pass
+            self._backfill_task = None
+
+        # Release collector reader threads
+        self.collector.close()
+
         # Stop caffeinate
         await self._stop_caffeinate()
 
@@ -429,27 +505,94 @@ class Daemon:
             return True
 
     async def _auto_prune(self) -> None:
-        """Run automatic data pruning periodically."""
+        """Run automatic data pruning periodically.
+
+        Each run deletes in small batches and yields to the event loop after
+        every batch, so sampling keeps its cadence. A run that hits its time
+        budget is resumed after PRUNE_RESUME_SECONDS instead of a full interval.
+        """
         prune_interval_seconds = self.config.system.auto_prune_interval_hours * 3600
+        retention = self.config.retention
+        wait_seconds = prune_interval_seconds
         while not self._shutdown_event.is_set():
             try:
                 # Wait for configured interval or shutdown
                 await asyncio.wait_for(
                     self._shutdown_event.wait(),
-                    timeout=prune_interval_seconds,
+                    timeout=wait_seconds,
                 )
                 break
             except asyncio.TimeoutError:
-                # Run prune
+                # Archive aged events, then prune
+                if self._conn and retention.archive_days > 0:
+                    await self._archive_aged_events()
                 if self._conn:
                     rlog.auto_prune_started()
-                    events_deleted = prune_old_data(
+                    progress = None
+                    for progress in prune_incremental(
                         self._conn,
-                        events_days=self.config.retention.events_days,
-                    )
-                    # Also prune machine snapshots (12 hour retention)
-                    snapshots_deleted = prune_machine_snapshots(self._conn, max_age_hours=12.0)
-                    rlog.auto_prune_complete(events_deleted, snapshots_deleted)
+                        events_days=retention.events_days,
+                        budget_seconds=retention.prune_budget_seconds,
+                    ):
+                        await asyncio.sleep(0)  # Let sampling run between batches
+                        if self._shutdown_event.is_set():
+                            break
+                    if progress is not None:
+                        rlog.auto_prune_complete(
+                            progress.events_deleted, progress.snapshots_deleted, progress.complete
+                        )
+                        complete = progress.complete
+                        wait_seconds = prune_interval_seconds if complete else PRUNE_RESUME_SECONDS
+
+    async def _archive_aged_events(self) -> None:
+        """Move aged closed events to weekly archive files.
+
+        Compressing and writing the files runs on a worker thread with its
+        own read-only connection. The deletes then run here in small batches
+        like pruning, yielding to sampling between them.
+        """
+        retention = self.config.retention
+
+        def write() -> dict[str, list[int]]:
+            conn = get_connection(self.config.db_path)
+            try:
+                return write_archives(
+                    conn,
+                    self.config.archive_dir,
+                    retention.archive_days,
+                    should_stop=self._shutdown_event.is_set,
+                )
+            finally:
+                conn.close()
+
+        try:
+            written = await asyncio.to_thread(write)
+        except Exception:
+            log.exception("auto_archive_failed")
+            return
+        if self._conn is None:
+            return
+
+        result = None
+        for result in remove_archived(
+            self._conn, self.config.archive_dir, written, keep_days=retention.archive_keep_days
+        ):
+            await asyncio.sleep(0)  # Let sampling run between batches
+            if self._shutdown_event.is_set():
+                break
+        if result is not None and (result.events_archived or result.files_expired):
+            rlog.auto_archive_complete(result.events_archived, len(result.files_written))
+
+    async def _run_backfills(self) -> None:
+        """Run pending migration backfills, yielding to sampling between batches."""
+        if self._conn is None:
+            return
+        for version in get_pending_backfills(self._conn):
+            rlog.backfill_started(version)
+        for _ in run_backfills(self._conn):
+            await asyncio.sleep(0)  # Let sampling run between batches
+            if self._shutdown_event.is_set():
+                return
 
     async def _main_loop(self) -> None:
         """Main loop collecting process samples at configured interval.
@@ -488,7 +631,9 @@ class Daemon:
             try:
                 iteration_start = asyncio.get_event_loop().time()
 
-                # Collect samples
+                # Collect samples (tracked PIDs always get the detailed read)
+                if self.tracker is not None:
+                    self.collector.pinned_pids = frozenset(self.tracker.tracked)
                 samples = await self.collector.collect()
 
                 if self._shutdown_event.is_set():
@@ -608,6 +753,7 @@ class Daemon:
                     )
 
                     avg_score = round(heartbeat_score_sum / heartbeat_count)
+                    gpu_stats = self.collector.gpu.take_stats()
                     rlog.heartbeat(
                         avg_score=avg_score,
                         max_score=heartbeat_max_score,
@@ -617,6 +763,8 @@ class Daemon:
                         client_count=client_count,
                         rss_mb=rss_mb,
                         db_size_mb=db_size_mb,
+                        gpu_samples=gpu_stats.samples,
+                        gpu_ms=gpu_stats.mean_ms,
                     )
 
                     # Reset heartbeat counters
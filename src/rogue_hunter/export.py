@@ -0,0 +1,124 @@
+"""Streaming exporters for process events.
+
+`history` and `events` write their machine-readable output here, one event
+at a time as the keyset-paginated queries produce them, so exports have no
+row limit and memory stays flat however many events match:
+
+- ndjson: one JSON object per line
+- csv: a header row, then one row per event (inline details as JSON text)
+- json: a single JSON array, written element by element
+
+With details, each event also carries its snapshots and forensic captures,
+read from the live database or, for archived events, the archive file.
+"""
+
+import csv
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import TextIO
+
+from rogue_hunter.archive import open_archived_event
+from rogue_hunter.formatting import calculate_duration
+from rogue_hunter.storage import get_forensic_captures, get_process_snapshots
+
+EXPORT_FORMATS = ("ndjson", "csv", "json")
+
+EVENT_FIELDS = [
+    "id",
+    "pid",
+    "command",
+    "entry",
+    "exit",
+    "duration_sec",
+    "entry_band",
+    "peak_band",
+    "peak_score",
+]
+DETAIL_FIELDS = ["snapshots", "captures"]
+
+
+def event_record(event: dict) -> dict:
+    """Export form of an event row: ISO times and a duration."""
+    exit_time = event.get("exit_time")  # Absent on get_open_events() rows
+    return {
+        "id": event["id"],
+        "pid": event["pid"],
+        "command": event["command"],
+        "entry": datetime.fromtimestamp(event["entry_time"]).isoformat(),
+        "exit": datetime.fromtimestamp(exit_time).isoformat() if exit_time else None,
+        "duration_sec": calculate_duration(event["entry_time"], exit_time),
+        "entry_band": event["entry_band"],
+        "peak_band": event["peak_band"],
+        "peak_score": event["peak_score"],
+    }
+
+
+def with_details(
+    conn: sqlite3.Connection, archive_dir: Path, records: Iterable[dict]
+) -> Iterator[dict]:
+    """Add each event's snapshots and forensic captures to its record."""
+    for record in records:
+        archived = open_archived_event(conn, archive_dir, record["id"])
+        source = archived or conn
+        details = {
+            "snapshots": get_process_snapshots(source, record["id"]),
+            "captures": get_forensic_captures(source, record["id"]),
+        }
+        if archived is not None:
+            archived.close()
+        yield {**record, **details}
+
+
+def write_records(records: Iterable[dict], out: TextIO, fmt: str, fields: list[str]) -> int:
+    """Write records to out in fmt as they arrive.
+
+    Args:
+        records: Dicts with (at least) the keys in fields
+        out: Text stream to write to
+        fmt: One of EXPORT_FORMATS
+        fields: Keys to write, in order (CSV header and JSON key order)
+
+    Returns:
+        Number of records written
+
+    Raises:
+        ValueError: If fmt is not an export format
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(fields)
+        for record in records:
+            writer.writerow(_csv_value(record[f]) for f in fields)
+            count += 1
+        return count
+
+    if fmt == "json":
+        out.write("[")
+    for record in records:
+        line = json.dumps({f: record[f] for f in fields})
+        if fmt == "json":
+            out.write(f"{',' if count else ''}\n  {line}")
+        else:
+            out.write(f"{line}\n")
+        count += 1
+    if fmt == "json":
+        out.write("\n]\n" if count else "]\n")
+    return count
+
+
+def _csv_value(value: object) -> object:
+    """CSV cell: details as JSON text, None empty, floats to one decimal."""
+    if isinstance(value, list | dict):
+        return json.dumps(value)
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return value
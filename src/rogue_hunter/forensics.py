@@ -5,22 +5,36 @@ in the database. Raw captures go to /tmp, get parsed, results stored in DB.
 """
 
 import asyncio
+import gc
+import io
+import itertools
 import json
+import mmap
+import operator
+import os
 import re
 import shutil
 import sqlite3
 import subprocess
 import tempfile
-from dataclasses import dataclass, field
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
 from rogue_hunter.storage import (
     create_forensic_capture,
+    get_connection,
+    index_capture_search,
     insert_buffer_context,
-    insert_log_entry,
+    insert_log_entries,
     insert_tailspin_binary_image,
     insert_tailspin_frame,
     insert_tailspin_header,
@@ -43,9 +57,13 @@ log = structlog.get_logger()
 # --- Parsing Data Structures ---
 
 
-@dataclass
+@dataclass(slots=True)
 class TailspinFrame:
-    """Parsed stack frame from spindump output."""
+    """Parsed stack frame from spindump output.
+
+    Slotted: a spindump holds millions of frames, and a per-instance
+    __dict__ would roughly double the parser's peak memory.
+    """
 
     sample_count: int
     is_kernel: bool
@@ -236,9 +254,9 @@ class TailspinData:
     io_aggregates: list[TailspinIOAggregate]
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
-    """Parsed log entry from ndjson output."""
+    """Parsed log entry from ndjson output (slotted: captures hold many)."""
 
     timestamp: str
     event_message: str
@@ -252,11 +270,78 @@ class LogEntry:
 
 # --- Parsing Functions ---
 
+# parse_tailspin_file() parses files below this size serially
+PARALLEL_PARSE_MIN_BYTES = 32 * 2**20
+_CHUNKS_PER_WORKER = 4  # Several chunks each, so uneven blocks balance out
+_LINE_BLOCK_BYTES = 2**20  # TailspinFile decodes and releases this much at a time
+# Pool workers send frames as these values, positional up to the last field
+# (children, which parsed frames never have)
+_frame_values = operator.attrgetter(*(f.name for f in fields(TailspinFrame)[:-1]))
+# Log entries are streamed in from log show this much at a time, and stored
+# this many rows per transaction, as insert_log_entries() takes them
+_LOG_READ_BYTES = 2**16
+_LOG_BATCH_ROWS = 2000
+_log_values = operator.attrgetter(*(f.name for f in fields(LogEntry)))
+# Parsed tailspin process blocks are stored in transactions of about this many rows
+_TAILSPIN_BATCH_ROWS = 2000
+
+_SIZE_RE = re.compile(r"([\d.]+)\s*(KB|MB|GB|B)?", re.IGNORECASE)
+_COUNT_RE = re.compile(r"([\d.]+)([KMGT])?", re.IGNORECASE)
+_PROCESS_REF_RE = re.compile(r"(.+?)\s+\[(\d+)\]")
+
+# Process block lines. Each line is classified once, by indentation and
+# first character, before any of these run.
+_PROCESS_RE = re.compile(r"^Process:\s+(.+?)\s+\[(\d+)\]")
+_THREAD_RE = re.compile(
+    r"^\s{2}Thread\s+(0x[0-9a-f]+)"
+    r"(?:\s+DispatchQueue\s+\"([^\"]+)\"\((\d+)\))?"
+    r"(?:\s+Thread name\s+\"([^\"]+)\")?"
+    r"(?:\s+(\d+)\s+samples?\s*\((\d+)-(\d+)\))?"
+    r"(?:\s+priority\s+(\d+)\s*\(base\s+(\d+)\))?"
+    r"(?:\s+cpu time\s+([\d.]+)s\s*\(([\d.]+[KMGT]?)\s*cycles,"
+    r"\s*([\d.]+[KMGT]?)\s*instructions,\s*([\d.]+)c/i\))?"
+    r"(?:\s+(\d+)\s+I/Os?\s*\(([^)]+)\))?",
+    re.IGNORECASE,
+)
+# Matched against the line with its indentation stripped
+_FRAME_RE = re.compile(
+    r"(\*?)(\d+)\s+"  # optional kernel marker and sample count
+    r"(.+?)\s+"  # symbol info
+    r"\[(0x[0-9a-f]+)\]"  # address
+    r"(?:\s+\(([^)]+)\))?$",  # optional state
+    re.IGNORECASE,
+)
+_SYMBOL_RE = re.compile(r"(.+?)\s*\+\s*(\d+)\s*\((.+?)\s*\+\s*(\d+)\)")
+_LIBRARY_ONLY_RE = re.compile(r"\?\?\?\s*\((.+?)\s*\+\s*(\d+)\)")
+# What a blocked frame waits on: wait4 waits are stored as their target
+# ("zsh [46454]"), others as described ("turnstile waiting for mds [420]
+# thread 0x3f2a1")
+_BLOCKED_ON_RE = re.compile(r"blocked by\s+(?:wait4 on\s+)?(.+)", re.IGNORECASE)
+_BINARY_IMAGE_RE = re.compile(
+    r"^\s+(\*?)(0x[0-9a-f]+)\s*-\s*(0x[0-9a-f]+|(?:\?\?\?))\s+"
+    r"(.+?)\s+"
+    r"<([A-F0-9-]+)>"
+    r"(?:__TEXT_EXEC)?\s*"
+    r"(.*)$",
+    re.IGNORECASE,
+)
+_NAME_VERSION_RE = re.compile(r"(.+?)\s+(\d[\d.]*(?:\s*\([^)]+\))?)\s*$")
+_SHARED_CACHE_RE = re.compile(r"([A-F0-9-]+)\s+slid", re.IGNORECASE)
+_FOOTPRINT_RE = re.compile(r"([\d.]+)\s*(KB|MB|GB)")
+_FOOTPRINT_DELTA_RE = re.compile(r"\(\+?([\d.]+)\s*(KB|MB|GB)\)")
+_IO_RE = re.compile(r"(\d+)\s*I/Os?\s*\(([^)]+)\)")
+_SECONDS_INT_RE = re.compile(r"(\d+)s")
+_SAMPLE_RANGE_RE = re.compile(r"(\d+)\s*\((\d+)-(\d+)\)")
+_INT_RE = re.compile(r"(\d+)")
+_CPU_TIME_RE = re.compile(
+    r"([\d.]+)s\s*\(([\d.]+[KMGT]?)\s*cycles,\s*([\d.]+[KMGT]?)\s*instructions,\s*([\d.]+)c/i\)"
+)
+_SECONDS_RE = re.compile(r"([\d.]+)s")
+
 
 def _parse_size(s: str) -> int:
     """Parse size string like '14.83 MB' or '674.97 KB' to bytes."""
-    s = s.strip()
-    match = re.match(r"([\d.]+)\s*(KB|MB|GB|B)?", s, re.IGNORECASE)
+    match = _SIZE_RE.match(s.strip())
     if not match:
         return 0
     value = float(match.group(1))
@@ -267,8 +352,7 @@ def _parse_size(s: str) -> int:
 
 def _parse_count_suffix(s: str) -> int:
     """Parse count with optional suffix like '51.3G' or '87.4G'."""
-    s = s.strip()
-    match = re.match(r"([\d.]+)([KMGT])?", s, re.IGNORECASE)
+    match = _COUNT_RE.match(s.strip())
     if not match:
         return 0
     value = float(match.group(1))
@@ -279,7 +363,7 @@ def _parse_count_suffix(s: str) -> int:
 
 def _parse_process_ref(s: str) -> tuple[str, int] | None:
     """Parse 'name [pid]' format, return (name, pid) or None."""
-    match = re.match(r"(.+?)\s+\[(\d+)\]", s.strip())
+    match = _PROCESS_REF_RE.match(s.strip())
     if match:
         return match.group(1), int(match.group(2))
     return None
@@ -320,7 +404,8 @@ def parse_tailspin(text: str) -> TailspinData:
             break
 
     # Parse processes (between header and I/O section)
-    processes = _parse_processes(lines[process_start_idx:io_start_idx])
+    with gc_paused():
+        processes = _parse_processes(lines[process_start_idx:io_start_idx])
 
     # Parse I/O histograms and aggregates
     io_histograms, io_aggregates = _parse_io_section(lines[io_start_idx:])
@@ -333,6 +418,216 @@ def parse_tailspin(text: str) -> TailspinData:
     )
 
 
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause the cyclic GC while building a large tree of parsed frames.
+
+    Parsing (or unpickling) processes and merging call trees allocate
+    millions of objects and no reference cycles, so generation sweeps only
+    rescan the growing tree: 20% of parse time, more than half of a merge.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class TailspinFile:
+    """A decoded spindump text file, memory-mapped and read section by section.
+
+    The header is parsed on open. processes() then yields process blocks one
+    at a time, decoding the map a block of lines at a time and releasing
+    pages it has passed. A caller that stores and drops each process holds
+    one block in memory, not the report. io_section() parses the trailing
+    I/O histograms and aggregates.
+
+    Sections are found as parse_tailspin() finds them, and the parse is
+    identical to it on path.read_bytes().decode("utf-8", errors="replace").
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = path.open("rb")
+        self._mm: mmap.mmap | bytes = b""  # mmap() rejects empty files
+        if os.fstat(self._file.fileno()).st_size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+        self._start, self._end = _process_region(self._mm)
+        self.header = _parse_header(list(_iter_lines(self._mm, 0, self._start)))
+
+    def processes(
+        self, workers: int = 1, min_parallel_bytes: int = PARALLEL_PARSE_MIN_BYTES
+    ) -> Iterator[TailspinProcess]:
+        """Yield process blocks in file order.
+
+        With workers > 1, the process region is split into chunks of whole
+        process blocks at "Process:" lines (found with a byte scan, then
+        checked against the same pattern the serial parser uses) and parsed
+        in a process pool, at most workers + 1 chunks ahead of the caller.
+
+        Args:
+            workers: Worker processes; 1 parses serially in this process
+            min_parallel_bytes: Smaller regions are parsed serially, since
+                pool startup and result transfer outweigh the split below this
+        """
+        if workers <= 1 or self._end - self._start < max(min_parallel_bytes, 1):
+            yield from _iter_processes(_iter_lines(self._mm, self._start, self._end))
+            return
+
+        chunks = _process_chunks(self._mm, self._start, self._end, workers * _CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: deque[Future] = deque()
+            for start, end in chunks:
+                pending.append(pool.submit(_parse_process_chunk, str(self.path), start, end))
+                if len(pending) > workers:
+                    yield from _rebuild_frames(*pending.popleft().result())
+            while pending:
+                yield from _rebuild_frames(*pending.popleft().result())
+
+    def io_section(self) -> tuple[list[TailspinIOHistogramBucket], list[TailspinIOAggregate]]:
+        """Parse the I/O histograms and aggregate stats after the processes."""
+        return _parse_io_section(list(_iter_lines(self._mm, self._end, len(self._mm))))
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "TailspinFile":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def parse_tailspin_file(
+    path: Path,
+    workers: int = 1,
+    min_parallel_bytes: int = PARALLEL_PARSE_MIN_BYTES,
+) -> TailspinData:
+    """Parse a decoded spindump text file, optionally in parallel.
+
+    Identical to parse_tailspin() on the decoded file; see TailspinFile.
+
+    Args:
+        path: Spindump text written by `spindump -i <file> -stdout`
+        workers: Worker processes; 1 parses serially in this process
+        min_parallel_bytes: Smaller files are parsed serially
+
+    Returns:
+        TailspinData with all parsed information
+    """
+    with TailspinFile(path) as spindump, gc_paused():
+        processes = list(spindump.processes(workers, min_parallel_bytes))
+        io_histograms, io_aggregates = spindump.io_section()
+        return TailspinData(
+            header=spindump.header,
+            processes=processes,
+            io_histograms=io_histograms,
+            io_aggregates=io_aggregates,
+        )
+
+
+def _process_region(mm: mmap.mmap | bytes) -> tuple[int, int]:
+    """Byte range of the process blocks, as parse_tailspin() bounds them.
+
+    From the first "Process:" line (or the start, if there is none) to the
+    last "IO Size Histogram:" line after it (or EOF).
+    """
+    start = 0
+    if mm[:8] != b"Process:" and (newline := mm.find(b"\nProcess:")) != -1:
+        start = newline + 1
+    end = len(mm)
+    if (newline := mm.rfind(b"\nIO Size Histogram:", start)) != -1:
+        end = newline + 1
+    return start, end
+
+
+def _process_chunks(
+    mm: mmap.mmap | bytes, start: int, end: int, count: int
+) -> list[tuple[int, int]]:
+    """Split the process region into about count (start, end) byte ranges.
+
+    Every range but the first starts at a line the serial parser treats as
+    a new process, so no parser state crosses a boundary.
+    """
+    bounds = [start]
+    step = max((end - start) // count, 1)
+    while (target := bounds[-1] + step) < end:
+        while (newline := mm.find(b"\nProcess:", target, end)) != -1:
+            target = newline + 1
+            line_end = mm.find(b"\n", target, end)
+            line = mm[target : line_end if line_end != -1 else end]
+            if _PROCESS_RE.match(line.decode("utf-8", errors="replace")):
+                bounds.append(target)
+                break
+        else:
+            break
+    bounds.append(end)
+    return list(itertools.pairwise(bounds))
+
+
+def _iter_lines(
+    mm: mmap.mmap | bytes, start: int, end: int, block_size: int = _LINE_BLOCK_BYTES
+) -> Iterator[str]:
+    """Lines of mm[start:end], split as parse_tailspin() splits the whole text.
+
+    Decodes block_size bytes at a time, cut at newlines, and releases the
+    mapped pages of each block once its lines are consumed. A range ending
+    at a line start (not EOF) drops the newline before it, so no empty line
+    is added that the whole-text split would not have.
+    """
+    if start >= end:
+        return
+    stop = end - 1 if end < len(mm) else end
+    released = start - start % mmap.PAGESIZE
+    while (cut := mm.find(b"\n", min(start + block_size, stop), stop)) != -1:
+        yield from mm[start:cut].decode("utf-8", errors="replace").split("\n")
+        start = cut + 1
+        if isinstance(mm, mmap.mmap) and start - released >= block_size:
+            done = start - start % mmap.PAGESIZE
+            mm.madvise(mmap.MADV_DONTNEED, released, done - released)
+            released = done
+    yield from mm[start:stop].decode("utf-8", errors="replace").split("\n")
+
+
+def _parse_process_chunk(
+    path: str, start: int, end: int
+) -> tuple[list[TailspinProcess], list[list[tuple]]]:
+    """Pool worker: parse the process blocks in one byte range of the file.
+
+    Frames travel back as plain tuples of field values, one list per thread
+    in order, with the threads' frame lists emptied: pickling millions of
+    frame objects costs several times more than rebuilding them.
+
+    Returns:
+        (processes, frame values per thread)
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with gc_paused():
+            processes = _parse_processes(_iter_lines(mm, start, end))
+    frames = []
+    for process in processes:
+        for thread in process.threads:
+            frames.append([_frame_values(frame) for frame in thread.frames])
+            thread.frames = []
+    return processes, frames
+
+
+def _rebuild_frames(
+    processes: list[TailspinProcess], frames: list[list[tuple]]
+) -> list[TailspinProcess]:
+    """Put a pool worker's frame values back on its processes' threads."""
+    thread_frames = iter(frames)
+    for process in processes:
+        for thread in process.threads:
+            thread.frames = [TailspinFrame(*values) for values in next(thread_frames)]
+    return processes
+
+
 def _parse_header(lines: list[str]) -> TailspinHeader:
     """Parse the header section of spindump output."""
     # Required fields with defaults
@@ -513,327 +808,302 @@ def _parse_header(lines: list[str]) -> TailspinHeader:
     )
 
 
-def _parse_processes(lines: list[str]) -> list[TailspinProcess]:
+def _footprint_mb(match: re.Match[str]) -> float:
+    val = float(match.group(1))
+    unit = match.group(2).upper()
+    if unit == "KB":
+        val /= 1024
+    elif unit == "GB":
+        val *= 1024
+    return val
+
+
+def _set_footprint(process: TailspinProcess, value: str) -> None:
+    # Could be "586.69 MB" or "256 KB -> 11.52 MB (+11.27 MB)"
+    if match := _FOOTPRINT_RE.search(value):
+        process.footprint_mb = _footprint_mb(match)
+    if match := _FOOTPRINT_DELTA_RE.search(value):
+        process.footprint_delta_mb = _footprint_mb(match)
+
+
+def _set_io(process: TailspinProcess, value: str) -> None:
+    if match := _IO_RE.search(value):
+        process.io_count = int(match.group(1))
+        process.io_bytes = _parse_size(match.group(2))
+
+
+def _set_num_samples(process: TailspinProcess, value: str) -> None:
+    # "341 (1-341)" or "0 (task existed only between...)"
+    if match := _SAMPLE_RANGE_RE.search(value):
+        process.num_samples = int(match.group(1))
+        process.sample_range_start = int(match.group(2))
+        process.sample_range_end = int(match.group(3))
+    elif match := _INT_RE.search(value):
+        process.num_samples = int(match.group(1))
+
+
+def _set_cpu_time(process: TailspinProcess, value: str) -> None:
+    if match := _CPU_TIME_RE.search(value):
+        process.cpu_time_sec = float(match.group(1))
+        process.cycles = _parse_count_suffix(match.group(2))
+        process.instructions = _parse_count_suffix(match.group(3))
+        process.cpi = float(match.group(4))
+    elif match := _SECONDS_RE.search(value):
+        process.cpu_time_sec = float(match.group(1))
+
+
+def _set_end_time(process: TailspinProcess, value: str) -> None:
+    # Only for short-lived processes (has start_time)
+    if process.start_time:
+        process.end_time = value.strip()
+
+
+def _set_text(attr: str) -> Callable[[TailspinProcess, str], None]:
+    def set_text(process: TailspinProcess, value: str) -> None:
+        setattr(process, attr, value.strip())
+
+    return set_text
+
+
+def _set_ref(name_attr: str, pid_attr: str) -> Callable[[TailspinProcess, str], None]:
+    def set_ref(process: TailspinProcess, value: str) -> None:
+        if ref := _parse_process_ref(value):
+            setattr(process, name_attr, ref[0])
+            setattr(process, pid_attr, ref[1])
+
+    return set_ref
+
+
+def _set_int(attr: str, pattern: re.Pattern[str]) -> Callable[[TailspinProcess, str], None]:
+    def set_int(process: TailspinProcess, value: str) -> None:
+        if match := pattern.search(value):
+            setattr(process, attr, int(match.group(1)))
+
+    return set_int
+
+
+def _set_shared_cache(process: TailspinProcess, value: str) -> None:
+    if match := _SHARED_CACHE_RE.search(value):
+        process.shared_cache_uuid = match.group(1)
+
+
+def _set_runningboard(process: TailspinProcess, value: str) -> None:
+    process.runningboard_managed = "Yes" in value
+
+
+def _add_note(process: TailspinProcess, value: str) -> None:
+    process.notes.append(value.strip())
+
+
+# Process metadata line key (text before the first colon) -> setter of the value
+_PROCESS_FIELDS: dict[str, Callable[[TailspinProcess, str], None]] = {
+    "UUID": _set_text("uuid"),
+    "Path": _set_text("path"),
+    "Identifier": _set_text("identifier"),
+    "Version": _set_text("version"),
+    "Parent": _set_ref("parent_name", "parent_pid"),
+    "Responsible": _set_ref("responsible_name", "responsible_pid"),
+    "Execed from": _set_ref("execed_from_name", "execed_from_pid"),
+    "Execed to": _set_ref("execed_to_name", "execed_to_pid"),
+    "Architecture": _set_text("architecture"),
+    "Shared Cache": _set_shared_cache,
+    "RunningBoard Mgd": _set_runningboard,
+    "Sudden Term": _set_text("sudden_term"),
+    "Note": _add_note,
+    "Footprint": _set_footprint,
+    "I/O": _set_io,
+    "Time Since Fork": _set_int("time_since_fork_sec", _SECONDS_INT_RE),
+    "Start time": _set_text("start_time"),
+    "End time": _set_end_time,
+    "Num samples": _set_num_samples,
+    "CPU Time": _set_cpu_time,
+    "Num threads": _set_int("num_threads", _INT_RE),
+}
+
+
+def _parse_thread(match: re.Match[str]) -> TailspinThread:
+    thread = TailspinThread(thread_id=match.group(1))
+    if match.group(2):
+        thread.dispatch_queue_name = match.group(2)
+    if match.group(3):
+        thread.dispatch_queue_serial = int(match.group(3))
+    if match.group(4):
+        thread.thread_name = match.group(4)
+    if match.group(5):
+        thread.num_samples = int(match.group(5))
+    if match.group(6):
+        thread.sample_range_start = int(match.group(6))
+    if match.group(7):
+        thread.sample_range_end = int(match.group(7))
+    if match.group(8):
+        thread.priority = int(match.group(8))
+    if match.group(9):
+        thread.base_priority = int(match.group(9))
+    if match.group(10):
+        thread.cpu_time_sec = float(match.group(10))
+    if match.group(11):
+        thread.cycles = _parse_count_suffix(match.group(11))
+    if match.group(12):
+        thread.instructions = _parse_count_suffix(match.group(12))
+    if match.group(13):
+        thread.cpi = float(match.group(13))
+    if match.group(14):
+        thread.io_count = int(match.group(14))
+    if match.group(15):
+        thread.io_bytes = _parse_size(match.group(15))
+    return thread
+
+
+def _parse_frame(match: re.Match[str], indent: int) -> TailspinFrame:
+    is_kernel, sample_count, symbol_info, address, state_info = match.groups()
+
+    # Parse symbol info: "symbol + offset (library + offset)" or "??? (library + offset)"
+    # or "??? [address]" for JIT
+    symbol_name = None
+    symbol_offset = None
+    library_name = None
+    library_offset = None
+    symbol_info = symbol_info.strip()
+    if symbol_info != "???":
+        if sym_match := _SYMBOL_RE.match(symbol_info):
+            symbol_name = sym_match.group(1).strip()
+            symbol_offset = int(sym_match.group(2))
+            library_name = sym_match.group(3).strip()
+            library_offset = int(sym_match.group(4))
+        elif lib_match := _LIBRARY_ONLY_RE.match(symbol_info):
+            library_name = lib_match.group(1).strip()
+            library_offset = int(lib_match.group(2))
+
+    # Parse state
+    state = None
+    core_type = None
+    blocked_on = None
+    if state_info:
+        lowered = state_info.lower()
+        if "running" in lowered:
+            state = "running"
+            if "p-core" in lowered:
+                core_type = "p-core"
+            elif "e-core" in lowered:
+                core_type = "e-core"
+        elif "blocked by" in lowered:
+            state = "blocked"
+            if blocked_match := _BLOCKED_ON_RE.search(state_info):
+                blocked_on = blocked_match.group(1).strip()
+
+    return TailspinFrame(
+        sample_count=int(sample_count),
+        is_kernel=is_kernel == "*",
+        address=address,
+        depth=(indent - 2) // 2,  # 2 spaces per level, starting at 2
+        symbol_name=symbol_name,
+        symbol_offset=symbol_offset,
+        library_name=library_name,
+        library_offset=library_offset,
+        state=state,
+        core_type=core_type,
+        blocked_on=blocked_on,
+    )
+
+
+def _parse_binary_image(match: re.Match[str]) -> TailspinBinaryImage:
+    name_version = match.group(4).strip()
+    if nv_match := _NAME_VERSION_RE.match(name_version):
+        name = nv_match.group(1).strip()
+        version = nv_match.group(2).strip()
+    else:
+        name = name_version
+        version = None
+    return TailspinBinaryImage(
+        start_address=match.group(2),
+        end_address=match.group(3) if match.group(3) != "???" else None,
+        name=name,
+        version=version,
+        uuid=match.group(5),
+        path=match.group(6).strip() if match.group(6) else None,
+        is_kernel=match.group(1) == "*",
+    )
+
+
+def _parse_processes(lines: Iterable[str]) -> list[TailspinProcess]:
     """Parse all process blocks."""
-    processes: list[TailspinProcess] = []
+    return list(_iter_processes(lines))
+
+
+def _iter_processes(lines: Iterable[str]) -> Iterator[TailspinProcess]:
+    """Parse process blocks, yielding each once its last line is read.
+
+    Classifies each line once by its indentation and first character:
+    unindented lines are process headers or "Key: value" metadata looked
+    up in _PROCESS_FIELDS; lines indented by two are threads; deeper lines
+    starting with a digit or '*' are stack frames, the bulk of the input,
+    and go straight to the frame pattern.
+    """
     current_process: TailspinProcess | None = None
     current_thread: TailspinThread | None = None
     in_binary_images = False
 
-    # Regex patterns
-    process_pattern = re.compile(r"^Process:\s+(.+?)\s+\[(\d+)\]")
-    thread_pattern = re.compile(
-        r"^\s{2}Thread\s+(0x[0-9a-f]+)"
-        r"(?:\s+DispatchQueue\s+\"([^\"]+)\"\((\d+)\))?"
-        r"(?:\s+Thread name\s+\"([^\"]+)\")?"
-        r"(?:\s+(\d+)\s+samples?\s*\((\d+)-(\d+)\))?"
-        r"(?:\s+priority\s+(\d+)\s*\(base\s+(\d+)\))?"
-        r"(?:\s+cpu time\s+([\d.]+)s\s*\(([\d.]+[KMGT]?)\s*cycles,"
-        r"\s*([\d.]+[KMGT]?)\s*instructions,\s*([\d.]+)c/i\))?"
-        r"(?:\s+(\d+)\s+I/Os?\s*\(([^)]+)\))?",
-        re.IGNORECASE,
-    )
-    frame_pattern = re.compile(
-        r"^\s+(\*?)(\d+)\s+"  # optional kernel marker and sample count
-        r"(.+?)\s+"  # symbol info
-        r"\[(0x[0-9a-f]+)\]"  # address
-        r"(?:\s+\(([^)]+)\))?$",  # optional state
-        re.IGNORECASE,
-    )
-    binary_image_pattern = re.compile(
-        r"^\s+(\*?)(0x[0-9a-f]+)\s*-\s*(0x[0-9a-f]+|(?:\?\?\?))\s+"
-        r"(.+?)\s+"
-        r"<([A-F0-9-]+)>"
-        r"(?:__TEXT_EXEC)?\s*"
-        r"(.*)$",
-        re.IGNORECASE,
-    )
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for line in lines:
+        stripped = line.lstrip()
+        indent = len(line) - len(stripped)
+        first = stripped[:1]
+
+        # Stack frames: checked first since nearly every line is one
+        if (
+            current_thread is not None
+            and indent
+            and not in_binary_images
+            and (first.isdigit() or first == "*")
+        ):
+            if frame_match := _FRAME_RE.match(stripped):
+                current_thread.frames.append(_parse_frame(frame_match, indent))
+            continue
 
-        # Check for new process
-        proc_match = process_pattern.match(line)
-        if proc_match:
+        if not indent and first == "P" and (proc_match := _PROCESS_RE.match(line)):
             # Save previous process
             if current_process is not None:
                 if current_thread is not None:
                     current_process.threads.append(current_thread)
-                processes.append(current_process)
-
+                yield current_process
             current_process = TailspinProcess(
-                pid=int(proc_match.group(2)),
-                name=proc_match.group(1),
+                pid=int(proc_match.group(2)), name=proc_match.group(1)
             )
             current_thread = None
             in_binary_images = False
-            i += 1
             continue
 
         if current_process is None:
-            i += 1
             continue
 
-        # Check for Binary Images section
-        if line.strip() == "Binary Images:":
+        if first == "B" and stripped.rstrip() == "Binary Images:":
             if current_thread is not None:
                 current_process.threads.append(current_thread)
                 current_thread = None
             in_binary_images = True
-            i += 1
             continue
 
-        # Parse binary images
         if in_binary_images:
-            bi_match = binary_image_pattern.match(line)
-            if bi_match:
-                is_kernel = bi_match.group(1) == "*"
-                end_addr = bi_match.group(3) if bi_match.group(3) != "???" else None
-                name_version = bi_match.group(4).strip()
-                path = bi_match.group(6).strip() if bi_match.group(6) else None
-
-                # Parse name and version
-                nv_match = re.match(r"(.+?)\s+(\d[\d.]*(?:\s*\([^)]+\))?)\s*$", name_version)
-                if nv_match:
-                    name = nv_match.group(1).strip()
-                    version = nv_match.group(2).strip()
-                else:
-                    name = name_version
-                    version = None
-
-                current_process.binary_images.append(
-                    TailspinBinaryImage(
-                        start_address=bi_match.group(2),
-                        end_address=end_addr,
-                        name=name,
-                        version=version,
-                        uuid=bi_match.group(5),
-                        path=path,
-                        is_kernel=is_kernel,
-                    )
-                )
-            elif line.strip() and not line.startswith(" "):
+            if bi_match := _BINARY_IMAGE_RE.match(line):
+                current_process.binary_images.append(_parse_binary_image(bi_match))
+            elif stripped and not line.startswith(" "):
                 # Non-indented line means we've left binary images
                 in_binary_images = False
-            i += 1
             continue
 
-        # Parse process metadata
-        if line.startswith("UUID:"):
-            current_process.uuid = line.split(":", 1)[1].strip()
-        elif line.startswith("Path:"):
-            current_process.path = line.split(":", 1)[1].strip()
-        elif line.startswith("Identifier:"):
-            current_process.identifier = line.split(":", 1)[1].strip()
-        elif line.startswith("Version:"):
-            current_process.version = line.split(":", 1)[1].strip()
-        elif line.startswith("Parent:"):
-            ref = _parse_process_ref(line.split(":", 1)[1])
-            if ref:
-                current_process.parent_name, current_process.parent_pid = ref
-        elif line.startswith("Responsible:"):
-            ref = _parse_process_ref(line.split(":", 1)[1])
-            if ref:
-                current_process.responsible_name, current_process.responsible_pid = ref
-        elif line.startswith("Execed from:"):
-            ref = _parse_process_ref(line.split(":", 1)[1])
-            if ref:
-                current_process.execed_from_name, current_process.execed_from_pid = ref
-        elif line.startswith("Execed to:"):
-            ref = _parse_process_ref(line.split(":", 1)[1])
-            if ref:
-                current_process.execed_to_name, current_process.execed_to_pid = ref
-        elif line.startswith("Architecture:"):
-            current_process.architecture = line.split(":", 1)[1].strip()
-        elif line.startswith("Shared Cache:"):
-            match = re.search(r"([A-F0-9-]+)\s+slid", line, re.IGNORECASE)
-            if match:
-                current_process.shared_cache_uuid = match.group(1)
-        elif line.startswith("RunningBoard Mgd:"):
-            current_process.runningboard_managed = "Yes" in line
-        elif line.startswith("Sudden Term:"):
-            current_process.sudden_term = line.split(":", 1)[1].strip()
-        elif line.startswith("Note:"):
-            current_process.notes.append(line.split(":", 1)[1].strip())
-        elif line.startswith("Footprint:"):
-            # Could be "586.69 MB" or "256 KB -> 11.52 MB (+11.27 MB)"
-            match = re.search(r"([\d.]+)\s*(KB|MB|GB)", line)
-            if match:
-                val = float(match.group(1))
-                unit = match.group(2).upper()
-                if unit == "KB":
-                    val /= 1024
-                elif unit == "GB":
-                    val *= 1024
-                current_process.footprint_mb = val
-            # Check for delta
-            delta_match = re.search(r"\(\+?([\d.]+)\s*(KB|MB|GB)\)", line)
-            if delta_match:
-                val = float(delta_match.group(1))
-                unit = delta_match.group(2).upper()
-                if unit == "KB":
-                    val /= 1024
-                elif unit == "GB":
-                    val *= 1024
-                current_process.footprint_delta_mb = val
-        elif line.startswith("I/O:"):
-            match = re.search(r"(\d+)\s*I/Os?\s*\(([^)]+)\)", line)
-            if match:
-                current_process.io_count = int(match.group(1))
-                current_process.io_bytes = _parse_size(match.group(2))
-        elif line.startswith("Time Since Fork:"):
-            match = re.search(r"(\d+)s", line)
-            if match:
-                current_process.time_since_fork_sec = int(match.group(1))
-        elif line.startswith("Start time:"):
-            current_process.start_time = line.split(":", 1)[1].strip()
-        elif line.startswith("End time:") and current_process.start_time:
-            # Only for short-lived processes (has start_time)
-            current_process.end_time = line.split(":", 1)[1].strip()
-        elif line.startswith("Num samples:"):
-            # "341 (1-341)" or "0 (task existed only between...)"
-            match = re.search(r"(\d+)\s*\((\d+)-(\d+)\)", line)
-            if match:
-                current_process.num_samples = int(match.group(1))
-                current_process.sample_range_start = int(match.group(2))
-                current_process.sample_range_end = int(match.group(3))
-            else:
-                match = re.search(r"(\d+)", line)
-                if match:
-                    current_process.num_samples = int(match.group(1))
-        elif line.startswith("CPU Time:"):
-            match = re.search(
-                r"([\d.]+)s\s*\(([\d.]+[KMGT]?)\s*cycles,\s*([\d.]+[KMGT]?)\s*instructions,\s*([\d.]+)c/i\)",
-                line,
-            )
-            if match:
-                current_process.cpu_time_sec = float(match.group(1))
-                current_process.cycles = _parse_count_suffix(match.group(2))
-                current_process.instructions = _parse_count_suffix(match.group(3))
-                current_process.cpi = float(match.group(4))
-            else:
-                match = re.search(r"([\d.]+)s", line)
-                if match:
-                    current_process.cpu_time_sec = float(match.group(1))
-        elif line.startswith("Num threads:"):
-            match = re.search(r"(\d+)", line)
-            if match:
-                current_process.num_threads = int(match.group(1))
-
-        # Check for thread
-        elif thread_match := thread_pattern.match(line):
-            # Save previous thread
+        if not indent:
+            key, colon, value = line.partition(":")
+            if colon and (setter := _PROCESS_FIELDS.get(key)):
+                setter(current_process, value)
+        elif indent == 2 and first == "T" and (thread_match := _THREAD_RE.match(line)):
             if current_thread is not None:
                 current_process.threads.append(current_thread)
-
-            current_thread = TailspinThread(thread_id=thread_match.group(1))
-
-            if thread_match.group(2):
-                current_thread.dispatch_queue_name = thread_match.group(2)
-            if thread_match.group(3):
-                current_thread.dispatch_queue_serial = int(thread_match.group(3))
-            if thread_match.group(4):
-                current_thread.thread_name = thread_match.group(4)
-            if thread_match.group(5):
-                current_thread.num_samples = int(thread_match.group(5))
-            if thread_match.group(6):
-                current_thread.sample_range_start = int(thread_match.group(6))
-            if thread_match.group(7):
-                current_thread.sample_range_end = int(thread_match.group(7))
-            if thread_match.group(8):
-                current_thread.priority = int(thread_match.group(8))
-            if thread_match.group(9):
-                current_thread.base_priority = int(thread_match.group(9))
-            if thread_match.group(10):
-                current_thread.cpu_time_sec = float(thread_match.group(10))
-            if thread_match.group(11):
-                current_thread.cycles = _parse_count_suffix(thread_match.group(11))
-            if thread_match.group(12):
-                current_thread.instructions = _parse_count_suffix(thread_match.group(12))
-            if thread_match.group(13):
-                current_thread.cpi = float(thread_match.group(13))
-            if thread_match.group(14):
-                current_thread.io_count = int(thread_match.group(14))
-            if thread_match.group(15):
-                current_thread.io_bytes = _parse_size(thread_match.group(15))
-
-        # Check for stack frame (only if we have a current thread)
-        elif current_thread is not None and (frame_match := frame_pattern.match(line)):
-            is_kernel = frame_match.group(1) == "*"
-            sample_count = int(frame_match.group(2))
-            symbol_info = frame_match.group(3).strip()
-            address = frame_match.group(4)
-            state_info = frame_match.group(5)
-
-            # Calculate depth from indentation (2 spaces per level, starting at 2)
-            indent = len(line) - len(line.lstrip())
-            depth = (indent - 2) // 2
-
-            # Parse symbol info: "symbol + offset (library + offset)" or "??? (library + offset)"
-            # or "??? [address]" for JIT
-            symbol_name = None
-            symbol_offset = None
-            library_name = None
-            library_offset = None
-
-            if symbol_info != "???":
-                # Try to parse "symbol + offset (library + offset)"
-                sym_match = re.match(r"(.+?)\s*\+\s*(\d+)\s*\((.+?)\s*\+\s*(\d+)\)", symbol_info)
-                if sym_match:
-                    symbol_name = sym_match.group(1).strip()
-                    symbol_offset = int(sym_match.group(2))
-                    library_name = sym_match.group(3).strip()
-                    library_offset = int(sym_match.group(4))
-                else:
-                    # Try "??? (library + offset)"
-                    lib_match = re.match(r"\?\?\?\s*\((.+?)\s*\+\s*(\d+)\)", symbol_info)
-                    if lib_match:
-                        library_name = lib_match.group(1).strip()
-                        library_offset = int(lib_match.group(2))
-
-            # Parse state
-            state = None
-            core_type = None
-            blocked_on = None
-            if state_info:
-                if "running" in state_info.lower():
-                    state = "running"
-                    if "p-core" in state_info.lower():
-                        core_type = "p-core"
-                    elif "e-core" in state_info.lower():
-                        core_type = "e-core"
-                elif "blocked by wait4" in state_info.lower():
-                    state = "blocked"
-                    blocked_pattern = r"blocked by wait4 on\s+(.+)"
-                    blocked_match = re.search(blocked_pattern, state_info, re.IGNORECASE)
-                    if blocked_match:
-                        blocked_on = blocked_match.group(1).strip()
-
-            frame = TailspinFrame(
-                sample_count=sample_count,
-                is_kernel=is_kernel,
-                address=address,
-                depth=depth,
-                symbol_name=symbol_name,
-                symbol_offset=symbol_offset,
-                library_name=library_name,
-                library_offset=library_offset,
-                state=state,
-                core_type=core_type,
-                blocked_on=blocked_on,
-            )
-            current_thread.frames.append(frame)
-
-        i += 1
+            current_thread = _parse_thread(thread_match)
 
     # Don't forget the last process
     if current_process is not None:
         if current_thread is not None:
             current_process.threads.append(current_thread)
-        processes.append(current_process)
-
-    return processes
+        yield current_process
 
 
 def _parse_io_section(
@@ -935,47 +1205,102 @@ def _parse_io_section(
     return histograms, aggregates
 
 
-def parse_logs_ndjson(data: bytes) -> list[LogEntry]:
+def _fastest_json_loads() -> Callable[[bytes | str], Any]:
+    """The fastest JSON decoder installed: orjson, msgspec, else the stdlib's.
+
+    All three take bytes or str and return plain dicts and lists, and raise
+    a ValueError on bad input, so parse_log_line() treats them the same.
+    """
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return orjson.loads
+    try:
+        import msgspec
+    except ImportError:
+        return json.loads
+    return msgspec.json.Decoder().decode
+
+
+_json_loads = _fastest_json_loads()
+
+
+@lru_cache(maxsize=4096)
+def _image_name(path: str) -> str:
+    """Basename of a processImagePath; a capture has few distinct ones."""
+    return Path(path).name
+
+
+def parse_log_line(
+    line: bytes | str, loads: Callable[[bytes | str], Any] | None = None
+) -> LogEntry | None:
+    """Parse one line of `log show --style ndjson` output.
+
+    Args:
+        line: The line, with or without its newline
+        loads: JSON decoder to use (default: the fastest one installed)
+
+    Returns:
+        The entry, or None for a blank line or one that isn't a JSON object
+    """
+    loads = loads or _json_loads
+    try:
+        obj = loads(line)
+    except ValueError:
+        if not isinstance(line, bytes):
+            return None
+        # Not UTF-8: decode as the stdlib path always has, replacing bad bytes
+        try:
+            obj = loads(line.decode("utf-8", errors="replace"))
+        except ValueError:
+            return None
+    if not isinstance(obj, dict):
+        return None
+
+    get = obj.get
+    process_path = get("processImagePath")
+    return LogEntry(
+        get("timestamp", ""),
+        get("eventMessage", ""),
+        get("machTimestamp"),
+        get("subsystem"),
+        get("category"),
+        _image_name(process_path) if process_path else None,
+        get("processID"),
+        get("messageType"),
+    )
+
+
+def parse_logs_ndjson(
+    data: bytes, loads: Callable[[bytes | str], Any] | None = None
+) -> list[LogEntry]:
     """Parse ndjson log output into structured entries.
 
     The `log show --style ndjson` command outputs one JSON object per line.
 
     Args:
         data: Raw bytes from log show stdout
+        loads: JSON decoder to use (default: the fastest one installed)
 
     Returns:
         List of LogEntry objects
     """
-    entries: list[LogEntry] = []
+    # BytesIO shares data's buffer and yields lines lazily, unlike data.split()
+    return [entry for line in io.BytesIO(data) if (entry := parse_log_line(line, loads))]
 
-    for line in data.decode("utf-8", errors="replace").split("\n"):
-        line = line.strip()
-        if not line:
-            continue
 
-        try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-
-        # Extract process name from path
-        process_name = None
-        if process_path := obj.get("processImagePath"):
-            process_name = Path(process_path).name
-
-        entry = LogEntry(
-            timestamp=obj.get("timestamp", ""),
-            event_message=obj.get("eventMessage", ""),
-            mach_timestamp=obj.get("machTimestamp"),
-            subsystem=obj.get("subsystem"),
-            category=obj.get("category"),
-            process_name=process_name,
-            process_id=obj.get("processID"),
-            message_type=obj.get("messageType"),
-        )
-        entries.append(entry)
-
-    return entries
+async def _read_lines(stream: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """Lines of a stream as they arrive, without their newlines."""
+    pending = b""
+    while block := await stream.read(_LOG_READ_BYTES):
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
 
 
 def identify_culprits(contents: "BufferContents") -> list[dict]:
@@ -1028,9 +1353,10 @@ def identify_culprits(contents: "BufferContents") -> list[dict]:
 class ForensicsCapture:
     """Captures forensic data and stores in database.
 
-    Raw captures (tailspin, logs) are written to temp directory,
-    parsed for insights, and the parsed data is stored in the database.
-    Temp files are cleaned up after processing.
+    Raw tailspin captures are written to runtime_dir, parsed for insights,
+    and the parsed data is stored in the database; logs are streamed
+    straight from `log show` into it. Temp files are cleaned up after
+    processing.
     """
 
     def __init__(
@@ -1039,6 +1365,9 @@ class ForensicsCapture:
         event_id: int,
         runtime_dir: Path,
         log_seconds: int = 60,
+        log_max_entries: int = 100_000,
+        log_max_bytes: int = 64 * 1024 * 1024,
+        parse_workers: int = 1,
     ):
         """Initialize forensics capture.
 
@@ -1047,12 +1376,21 @@ class ForensicsCapture:
             event_id: The process event ID this capture is associated with
             runtime_dir: Directory for tailspin captures (must match sudoers rule)
             log_seconds: Seconds of logs to capture (default 60)
+            log_max_entries: Most log entries to store; the rest are dropped
+            log_max_bytes: Most `log show` output to read; the rest is dropped
+            parse_workers: Processes parsing the decoded tailspin, capped at the
+                CPU count (files under PARALLEL_PARSE_MIN_BYTES parse serially)
         """
         self.conn = conn
         self.event_id = event_id
         self._runtime_dir = runtime_dir
         self._log_seconds = log_seconds
+        self._log_max_entries = log_max_entries
+        self._log_max_bytes = log_max_bytes
+        self._parse_workers = min(parse_workers, os.cpu_count() or 1)
         self._temp_dir: Path | None = None
+        # CPU time of storing and indexing, for the capture scheduler's budget
+        self.store_cpu_seconds = 0.0
 
     async def capture_and_store(
         self,
@@ -1081,16 +1419,17 @@ class ForensicsCapture:
             capture_id = create_forensic_capture(self.conn, self.event_id, trigger)
 
             # Run captures in parallel (no timeouts - let them complete)
-            # Note: tailspin writes to runtime_dir, logs to _temp_dir
+            # Note: tailspin writes to runtime_dir, logs are stored as they stream in
             tailspin_result, logs_result = await asyncio.gather(
                 self._capture_tailspin(),
-                self._capture_logs(),
+                self._capture_logs(capture_id),
                 return_exceptions=True,
             )
 
-            # Parse and store each capture type
-            tailspin_status = self._process_tailspin(capture_id, tailspin_result)
-            logs_status = self._process_logs(capture_id, logs_result)
+            # Parse and store tailspin, then index logs and frames for
+            # `rogue-hunter search` (off the event loop)
+            tailspin_status = await self._store_and_index(capture_id, tailspin_result)
+            logs_status = self._logs_status(logs_result)
 
             # Store buffer context
             self._store_buffer_context(capture_id, contents)
@@ -1160,14 +1499,19 @@ class ForensicsCapture:
 
         return output_path
 
-    async def _capture_logs(self) -> bytes:
-        """Capture logs as NDJSON, return raw bytes.
+    async def _capture_logs(self, capture_id: int) -> tuple[int, bool]:
+        """Stream `log show` NDJSON into log_entries as it is written.
+
+        stdout is read a block at a time; each line is parsed as it arrives
+        and entries are inserted _LOG_BATCH_ROWS per transaction. Once
+        log_max_entries entries or log_max_bytes of output have been taken,
+        reading stops and log is killed.
 
         Returns:
-            Raw ndjson log output bytes
+            (entries stored, whether a cap cut the output short)
 
         Raises:
-            Exception on failure
+            Exception on failure (entries already stored are kept)
         """
         process = await asyncio.create_subprocess_exec(
             "/usr/bin/log",
@@ -1189,25 +1533,106 @@ class ForensicsCapture:
             start_new_session=True,  # Detach from controlling terminal
         )
 
-        stdout, _ = await process.communicate()
+        assert process.stdout is not None
+        try:
+            stored, truncated = await self._store_log_lines(capture_id, process.stdout)
+            if not truncated:
+                await process.wait()
+        finally:
+            if process.returncode is None:  # Cut short by a cap or a failure
+                with suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+
+        return stored, truncated
+
+    async def _store_log_lines(
+        self, capture_id: int, stream: asyncio.StreamReader
+    ) -> tuple[int, bool]:
+        """Parse and store NDJSON lines from stream until EOF or a cap."""
+        stored = taken = 0
+        batch: list[LogEntry] = []
+        truncated = False
+        async for line in _read_lines(stream):
+            taken += len(line) + 1
+            if taken > self._log_max_bytes or stored + len(batch) >= self._log_max_entries:
+                truncated = True
+                break
+            entry = parse_log_line(line)
+            if entry is None:
+                continue
+            batch.append(entry)
+            if len(batch) >= _LOG_BATCH_ROWS:
+                insert_log_entries(self.conn, capture_id, map(_log_values, batch))
+                stored += len(batch)
+                batch.clear()
+        if batch:
+            insert_log_entries(self.conn, capture_id, map(_log_values, batch))
+            stored += len(batch)
+        return stored, truncated
+
+    async def _store_and_index(self, capture_id: int, result: Path | BaseException) -> str:
+        """Run _process_tailspin and index_capture_search on a worker thread.
+
+        A large capture takes minutes to decode, parse, store and index, so
+        sampling goes on meanwhile; indexing commits every
+        SEARCH_INDEX_BATCH_ROWS rows, so the daemon's writes are never held
+        up for long. The thread uses its own connection to the same database
+        (sqlite3 connections stay on the thread that made them); an
+        in-memory database has no other connection to open, so it is
+        stored here instead. Either way the CPU time spent storing is added
+        to store_cpu_seconds.
 
-        return stdout
+        Returns:
+            The tailspin status
+        """
+
+        def store(conn: sqlite3.Connection) -> str:
+            start = time.thread_time()
+            try:
+                status = self._process_tailspin(capture_id, result, conn)
+                while index_capture_search(conn, capture_id):
+                    conn.commit()
+                conn.commit()
+                return status
+            finally:
+                self.store_cpu_seconds += time.thread_time() - start
+
+        db_file = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        if not db_file:
+            return store(self.conn)
+
+        def store_in_thread() -> str:
+            conn = get_connection(Path(db_file))
+            try:
+                return store(conn)
+            finally:
+                conn.close()
+
+        return await asyncio.to_thread(store_in_thread)
 
     def _process_tailspin(
         self,
         capture_id: int,
         result: Path | BaseException,
+        conn: sqlite3.Connection | None = None,
     ) -> str:
         """Decode tailspin via spindump -i and store ALL data in DB.
 
         Tailspin files are binary. We decode them using:
             spindump -i <file> -stdout
 
-        This produces text format that we fully parse and store.
+        This produces text format that we fully parse and store. The text
+        goes to a file in runtime_dir (removed afterwards) and is parsed a
+        process block at a time by TailspinFile; blocks are stored in batches
+        of about _TAILSPIN_BATCH_ROWS rows, each batch parsed in full before
+        its transaction starts.
 
         Args:
             capture_id: The forensic capture ID
             result: Path to tailspin file or exception
+            conn: Connection to store with (default: conn); _store_and_index
+                passes its worker thread's own
 
         Returns:
             Status string: 'success' or 'failed'
@@ -1215,199 +1640,114 @@ class ForensicsCapture:
         if isinstance(result, BaseException):
             log.warning("tailspin_failed", error=str(result))
             return "failed"
+        conn = conn or self.conn
 
+        # Decode next to the capture and parse from the file a process block
+        # at a time, so memory stays flat however large the report is
+        decoded_path = self._runtime_dir / f"capture_{self.event_id}.spindump"
         try:
             # Decode tailspin using spindump (no sudo needed for decode)
-            completed = subprocess.run(
-                ["/usr/sbin/spindump", "-i", str(result), "-stdout"],
-                stdin=subprocess.DEVNULL,
-                capture_output=True,
-                start_new_session=True,
-            )
+            with decoded_path.open("wb") as decoded:
+                completed = subprocess.run(
+                    ["/usr/sbin/spindump", "-i", str(result), "-stdout"],
+                    stdin=subprocess.DEVNULL,
+                    stdout=decoded,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
 
             if completed.returncode != 0:
                 log.warning("tailspin_decode_failed", returncode=completed.returncode)
                 return "failed"
 
-            text = completed.stdout.decode("utf-8", errors="replace")
-            data = parse_tailspin(text)
+            with TailspinFile(decoded_path) as spindump:
+                header = spindump.header
 
-            # Store header
-            insert_tailspin_header(
-                self.conn,
-                capture_id,
-                start_time=data.header.start_time,
-                end_time=data.header.end_time,
-                duration_sec=data.header.duration_sec,
-                steps=data.header.steps,
-                sampling_interval_ms=data.header.sampling_interval_ms,
-                os_version=data.header.os_version,
-                architecture=data.header.architecture,
-                report_version=data.header.report_version,
-                hardware_model=data.header.hardware_model,
-                active_cpus=data.header.active_cpus,
-                memory_gb=data.header.memory_gb,
-                hw_page_size=data.header.hw_page_size,
-                vm_page_size=data.header.vm_page_size,
-                time_since_boot_sec=data.header.time_since_boot_sec,
-                time_awake_since_boot_sec=data.header.time_awake_since_boot_sec,
-                total_cpu_time_sec=data.header.total_cpu_time_sec,
-                total_cycles=data.header.total_cycles,
-                total_instructions=data.header.total_instructions,
-                total_cpi=data.header.total_cpi,
-                memory_pressure_avg_pct=data.header.memory_pressure_avg_pct,
-                memory_pressure_max_pct=data.header.memory_pressure_max_pct,
-                available_memory_avg_gb=data.header.available_memory_avg_gb,
-                available_memory_min_gb=data.header.available_memory_min_gb,
-                free_disk_gb=data.header.free_disk_gb,
-                total_disk_gb=data.header.total_disk_gb,
-                advisory_battery=data.header.advisory_battery,
-                advisory_user=data.header.advisory_user,
-                advisory_thermal=data.header.advisory_thermal,
-                advisory_combined=data.header.advisory_combined,
-                shared_cache_residency_pct=data.header.shared_cache_residency_pct,
-                vnodes_available_pct=data.header.vnodes_available_pct,
-                data_source=data.header.data_source,
-                reason=data.header.reason,
-            )
-
-            # Store shared caches
-            for cache in data.header.shared_caches:
-                insert_tailspin_shared_cache(
-                    self.conn,
-                    capture_id,
-                    uuid=cache.uuid,
-                    base_address=cache.base_address,
-                    slide=cache.slide,
-                    name=cache.name,
-                )
-
-            # Store I/O stats from header
-            for io_stat in data.header.io_stats:
-                insert_tailspin_io_stats(
-                    self.conn,
+                # Store header
+                insert_tailspin_header(
+                    conn,
                     capture_id,
-                    tier=io_stat.tier,
-                    io_count=io_stat.io_count,
-                    bytes_total=io_stat.bytes_total,
-                    io_rate=io_stat.io_rate,
-                    bytes_rate=io_stat.bytes_rate,
+                    start_time=header.start_time,
+                    end_time=header.end_time,
+                    duration_sec=header.duration_sec,
+                    steps=header.steps,
+                    sampling_interval_ms=header.sampling_interval_ms,
+                    os_version=header.os_version,
+                    architecture=header.architecture,
+                    report_version=header.report_version,
+                    hardware_model=header.hardware_model,
+                    active_cpus=header.active_cpus,
+                    memory_gb=header.memory_gb,
+                    hw_page_size=header.hw_page_size,
+                    vm_page_size=header.vm_page_size,
+                    time_since_boot_sec=header.time_since_boot_sec,
+                    time_awake_since_boot_sec=header.time_awake_since_boot_sec,
+                    total_cpu_time_sec=header.total_cpu_time_sec,
+                    total_cycles=header.total_cycles,
+                    total_instructions=header.total_instructions,
+                    total_cpi=header.total_cpi,
+                    memory_pressure_avg_pct=header.memory_pressure_avg_pct,
+                    memory_pressure_max_pct=header.memory_pressure_max_pct,
+                    available_memory_avg_gb=header.available_memory_avg_gb,
+                    available_memory_min_gb=header.available_memory_min_gb,
+                    free_disk_gb=header.free_disk_gb,
+                    total_disk_gb=header.total_disk_gb,
+                    advisory_battery=header.advisory_battery,
+                    advisory_user=header.advisory_user,
+                    advisory_thermal=header.advisory_thermal,
+                    advisory_combined=header.advisory_combined,
+                    shared_cache_residency_pct=header.shared_cache_residency_pct,
+                    vnodes_available_pct=header.vnodes_available_pct,
+                    data_source=header.data_source,
+                    reason=header.reason,
                 )
 
-            # Store processes
-            total_frames = 0
-            for proc in data.processes:
-                proc_id = insert_tailspin_process(
-                    self.conn,
-                    capture_id,
-                    proc.pid,
-                    proc.name,
-                    uuid=proc.uuid,
-                    path=proc.path,
-                    identifier=proc.identifier,
-                    version=proc.version,
-                    parent_pid=proc.parent_pid,
-                    parent_name=proc.parent_name,
-                    responsible_pid=proc.responsible_pid,
-                    responsible_name=proc.responsible_name,
-                    execed_from_pid=proc.execed_from_pid,
-                    execed_from_name=proc.execed_from_name,
-                    execed_to_pid=proc.execed_to_pid,
-                    execed_to_name=proc.execed_to_name,
-                    architecture=proc.architecture,
-                    shared_cache_uuid=proc.shared_cache_uuid,
-                    runningboard_managed=proc.runningboard_managed,
-                    sudden_term=proc.sudden_term,
-                    footprint_mb=proc.footprint_mb,
-                    footprint_delta_mb=proc.footprint_delta_mb,
-                    io_count=proc.io_count,
-                    io_bytes=proc.io_bytes,
-                    time_since_fork_sec=proc.time_since_fork_sec,
-                    start_time=proc.start_time,
-                    end_time=proc.end_time,
-                    num_samples=proc.num_samples,
-                    sample_range_start=proc.sample_range_start,
-                    sample_range_end=proc.sample_range_end,
-                    cpu_time_sec=proc.cpu_time_sec,
-                    cycles=proc.cycles,
-                    instructions=proc.instructions,
-                    cpi=proc.cpi,
-                    num_threads=proc.num_threads,
-                )
-
-                # Store process notes
-                for note in proc.notes:
-                    insert_tailspin_process_note(self.conn, proc_id, note)
-
-                # Store binary images
-                for img in proc.binary_images:
-                    insert_tailspin_binary_image(
-                        self.conn,
-                        proc_id,
-                        start_address=img.start_address,
-                        name=img.name,
-                        is_kernel=img.is_kernel,
-                        end_address=img.end_address,
-                        version=img.version,
-                        uuid=img.uuid,
-                        path=img.path,
+                # Store shared caches
+                for cache in header.shared_caches:
+                    insert_tailspin_shared_cache(
+                        conn,
+                        capture_id,
+                        uuid=cache.uuid,
+                        base_address=cache.base_address,
+                        slide=cache.slide,
+                        name=cache.name,
                     )
 
-                # Store threads and frames
-                for thread in proc.threads:
-                    thread_db_id = insert_tailspin_thread(
-                        self.conn,
-                        proc_id,
-                        thread.thread_id,
-                        dispatch_queue_name=thread.dispatch_queue_name,
-                        dispatch_queue_serial=thread.dispatch_queue_serial,
-                        thread_name=thread.thread_name,
-                        num_samples=thread.num_samples,
-                        sample_range_start=thread.sample_range_start,
-                        sample_range_end=thread.sample_range_end,
-                        priority=thread.priority,
-                        base_priority=thread.base_priority,
-                        cpu_time_sec=thread.cpu_time_sec,
-                        cycles=thread.cycles,
-                        instructions=thread.instructions,
-                        cpi=thread.cpi,
-                        io_count=thread.io_count,
-                        io_bytes=thread.io_bytes,
+                # Store I/O stats from header
+                for io_stat in header.io_stats:
+                    insert_tailspin_io_stats(
+                        conn,
+                        capture_id,
+                        tier=io_stat.tier,
+                        io_count=io_stat.io_count,
+                        bytes_total=io_stat.bytes_total,
+                        io_rate=io_stat.io_rate,
+                        bytes_rate=io_stat.bytes_rate,
                     )
 
-                    # Store frames with parent tracking
-                    # Frames are in order by depth, we track parent at each depth level
-                    depth_to_frame_id: dict[int, int] = {}
-
-                    for frame in thread.frames:
-                        parent_id = (
-                            depth_to_frame_id.get(frame.depth - 1) if frame.depth > 0 else None
-                        )
-
-                        frame_id = insert_tailspin_frame(
-                            self.conn,
-                            thread_db_id,
-                            frame.depth,
-                            frame.sample_count,
-                            frame.is_kernel,
-                            frame.address,
-                            parent_frame_id=parent_id,
-                            symbol_name=frame.symbol_name,
-                            symbol_offset=frame.symbol_offset,
-                            library_name=frame.library_name,
-                            library_offset=frame.library_offset,
-                            state=frame.state,
-                            core_type=frame.core_type,
-                            blocked_on=frame.blocked_on,
-                        )
-
-                        depth_to_frame_id[frame.depth] = frame_id
-                        total_frames += 1
+                # Parse process blocks into a batch of about _TAILSPIN_BATCH_ROWS
+                # rows, then store the batch in one transaction, so the write
+                # lock is held for the inserts only, never while parsing
+                process_count = thread_count = total_frames = pending = 0
+                batch: list[TailspinProcess] = []
+                for proc in spindump.processes(self._parse_workers):
+                    process_count += 1
+                    thread_count += len(proc.threads)
+                    batch.append(proc)
+                    pending += 1 + len(proc.notes) + len(proc.binary_images)
+                    pending += sum(1 + len(t.frames) for t in proc.threads)
+                    if pending >= _TAILSPIN_BATCH_ROWS:
+                        total_frames += self._insert_tailspin_processes(conn, capture_id, batch)
+                        batch.clear()
+                        pending = 0
+                total_frames += self._insert_tailspin_processes(conn, capture_id, batch)
+
+                io_histograms, io_aggregates = spindump.io_section()
 
             # Store I/O histograms
-            for bucket in data.io_histograms:
+            for bucket in io_histograms:
                 insert_tailspin_io_histogram(
-                    self.conn,
+                    conn,
                     capture_id,
                     bucket.histogram_type,
                     bucket.begin_value,
@@ -1417,9 +1757,9 @@ class ForensicsCapture:
                 )
 
             # Store I/O aggregates
-            for agg in data.io_aggregates:
+            for agg in io_aggregates:
                 insert_tailspin_io_aggregate(
-                    self.conn,
+                    conn,
                     capture_id,
                     agg.tier,
                     agg.num_ios,
@@ -1434,8 +1774,8 @@ class ForensicsCapture:
 
             log.info(
                 "tailspin_parsed",
-                process_count=len(data.processes),
-                thread_count=sum(len(p.threads) for p in data.processes),
+                process_count=process_count,
+                thread_count=thread_count,
                 frame_count=total_frames,
             )
             return "success"
@@ -1444,48 +1784,155 @@ class ForensicsCapture:
             log.warning("tailspin_decode_failed", exc_info=True)
             return "failed"
 
-    def _process_logs(
-        self,
-        capture_id: int,
-        result: bytes | BaseException,
-    ) -> str:
-        """Parse NDJSON log lines and store in DB.
+        finally:
+            decoded_path.unlink(missing_ok=True)
 
-        Args:
-            capture_id: The forensic capture ID
-            result: Raw ndjson bytes or exception
+    def _insert_tailspin_processes(
+        self, conn: sqlite3.Connection, capture_id: int, procs: list[TailspinProcess]
+    ) -> int:
+        """Store parsed process blocks, committing once at the end.
 
         Returns:
-            Status string: 'success' or 'failed'
+            Number of frames stored
         """
-        if isinstance(result, BaseException):
-            log.warning("logs_failed", error=str(result))
-            return "failed"
+        frames = 0
+        for proc in procs:
+            proc_id = insert_tailspin_process(
+                conn,
+                capture_id,
+                proc.pid,
+                proc.name,
+                uuid=proc.uuid,
+                path=proc.path,
+                identifier=proc.identifier,
+                version=proc.version,
+                parent_pid=proc.parent_pid,
+                parent_name=proc.parent_name,
+                responsible_pid=proc.responsible_pid,
+                responsible_name=proc.responsible_name,
+                execed_from_pid=proc.execed_from_pid,
+                execed_from_name=proc.execed_from_name,
+                execed_to_pid=proc.execed_to_pid,
+                execed_to_name=proc.execed_to_name,
+                architecture=proc.architecture,
+                shared_cache_uuid=proc.shared_cache_uuid,
+                runningboard_managed=proc.runningboard_managed,
+                sudden_term=proc.sudden_term,
+                footprint_mb=proc.footprint_mb,
+                footprint_delta_mb=proc.footprint_delta_mb,
+                io_count=proc.io_count,
+                io_bytes=proc.io_bytes,
+                time_since_fork_sec=proc.time_since_fork_sec,
+                start_time=proc.start_time,
+                end_time=proc.end_time,
+                num_samples=proc.num_samples,
+                sample_range_start=proc.sample_range_start,
+                sample_range_end=proc.sample_range_end,
+                cpu_time_sec=proc.cpu_time_sec,
+                cycles=proc.cycles,
+                instructions=proc.instructions,
+                cpi=proc.cpi,
+                num_threads=proc.num_threads,
+                commit=False,
+            )
 
-        try:
-            entries = parse_logs_ndjson(result)
-
-            for entry in entries:
-                insert_log_entry(
-                    self.conn,
-                    capture_id=capture_id,
-                    timestamp=entry.timestamp,
-                    event_message=entry.event_message,
-                    mach_timestamp=entry.mach_timestamp,
-                    subsystem=entry.subsystem,
-                    category=entry.category,
-                    process_name=entry.process_name,
-                    process_id=entry.process_id,
-                    message_type=entry.message_type,
+            # Store process notes
+            for note in proc.notes:
+                insert_tailspin_process_note(conn, proc_id, note, commit=False)
+
+            # Store binary images
+            for img in proc.binary_images:
+                insert_tailspin_binary_image(
+                    conn,
+                    proc_id,
+                    start_address=img.start_address,
+                    name=img.name,
+                    is_kernel=img.is_kernel,
+                    end_address=img.end_address,
+                    version=img.version,
+                    uuid=img.uuid,
+                    path=img.path,
+                    commit=False,
                 )
 
-            log.info("logs_parsed", entry_count=len(entries))
-            return "success"
+            # Store threads and frames
+            for thread in proc.threads:
+                thread_db_id = insert_tailspin_thread(
+                    conn,
+                    proc_id,
+                    thread.thread_id,
+                    dispatch_queue_name=thread.dispatch_queue_name,
+                    dispatch_queue_serial=thread.dispatch_queue_serial,
+                    thread_name=thread.thread_name,
+                    num_samples=thread.num_samples,
+                    sample_range_start=thread.sample_range_start,
+                    sample_range_end=thread.sample_range_end,
+                    priority=thread.priority,
+                    base_priority=thread.base_priority,
+                    cpu_time_sec=thread.cpu_time_sec,
+                    cycles=thread.cycles,
+                    instructions=thread.instructions,
+                    cpi=thread.cpi,
+                    io_count=thread.io_count,
+                    io_bytes=thread.io_bytes,
+                    commit=False,
+                )
 
-        except Exception:
-            log.warning("logs_parse_failed", exc_info=True)
+                # Store frames with parent tracking
+                # Frames are in order by depth, we track parent at each depth level
+                depth_to_frame_id: dict[int, int] = {}
+
+                for frame in thread.frames:
+                    parent_id = depth_to_frame_id.get(frame.depth - 1) if frame.depth > 0 else None
+
+                    frame_id = insert_tailspin_frame(
+                        conn,
+                        thread_db_id,
+                        frame.depth,
+                        frame.sample_count,
+                        frame.is_kernel,
+                        frame.address,
+                        parent_frame_id=parent_id,
+                        symbol_name=frame.symbol_name,
+                        symbol_offset=frame.symbol_offset,
+                        library_name=frame.library_name,
+                        library_offset=frame.library_offset,
+                        state=frame.state,
+                        core_type=frame.core_type,
+                        blocked_on=frame.blocked_on,
+                        commit=False,
+                    )
+
+                    depth_to_frame_id[frame.depth] = frame_id
+                    frames += 1
+        conn.commit()
+        return frames
+
+    def _logs_status(self, result: tuple[int, bool] | BaseException) -> str:
+        """Log how the log capture went.
+
+        Args:
+            result: _capture_logs() result or exception
+
+        Returns:
+            Status string: 'success', 'truncated' (a cap was hit) or 'failed'
+        """
+        if isinstance(result, BaseException):
+            log.warning("logs_failed", error=str(result))
             return "failed"
 
+        stored, truncated = result
+        if truncated:
+            log.warning(
+                "logs_truncated",
+                entry_count=stored,
+                max_entries=self._log_max_entries,
+                max_bytes=self._log_max_bytes,
+            )
+            return "truncated"
+        log.info("logs_parsed", entry_count=stored)
+        return "success"
+
     def _store_buffer_context(
         self,
         capture_id: int,
@@ -1497,7 +1944,10 @@ class ForensicsCapture:
             capture_id: The forensic capture ID
             contents: Frozen ring buffer contents
         """
-        culprits = identify_culprits(contents)
+        if contents.culprits is not None:
+            culprits = list(contents.culprits)
+        else:
+            culprits = identify_culprits(contents)
         peak_score = max((c["score"] for c in culprits), default=0)
 
         insert_buffer_context(
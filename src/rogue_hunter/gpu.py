@@ -0,0 +1,125 @@
+"""GPU usage sampling on its own cadence.
+
+Walking the IORegistry for per-process GPU time is far more expensive than
+the per-PID libproc reads, and only a handful of processes ever use the GPU.
+GpuSampler runs the walk as a background task every gpu_interval seconds
+and keeps the last two readings. The collector asks it for each PID's GPU
+time and rate at its own sample time: the rate comes from the last two
+readings and the cumulative time is interpolated forward from the latest
+one, so GPU rates stay smooth at the main sampling rate.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import structlog
+
+from rogue_hunter.iokit import get_gpu_usage
+
+log = structlog.get_logger()
+
+GpuProvider = Callable[[], dict[int, int]]  # PID -> cumulative GPU time (ns)
+
+
+@dataclass(frozen=True)
+class _GpuReading:
+    """One provider result and when it was taken (time.monotonic())."""
+
+    timestamp: float
+    gpu_time: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class GpuSamplerStats:
+    """Provider cost since the last take_stats() call."""
+
+    samples: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean provider call time in milliseconds."""
+        return self.total_ms / self.samples if self.samples else 0.0
+
+
+class GpuSampler:
+    """Samples per-process GPU time in the background.
+
+    Args:
+        interval: Seconds between provider calls
+        provider: Returns PID -> cumulative GPU ns (default: IOKit)
+    """
+
+    def __init__(self, interval: float, provider: GpuProvider | None = None):
+        self.interval = interval
+        self._provider = provider or get_gpu_usage
+        # (previous, latest). Replaced as a whole so readers on the collector
+        # thread always see a consistent pair.
+        self._readings: tuple[_GpuReading | None, _GpuReading | None] = (None, None)
+        self._stats = GpuSamplerStats()
+
+    def sample(self) -> None:
+        """Call the provider once and record the reading (blocking)."""
+        start = time.monotonic()
+        gpu_time = self._provider()
+        end = time.monotonic()
+
+        self._readings = (self._readings[1], _GpuReading(timestamp=start, gpu_time=gpu_time))
+        elapsed_ms = (end - start) * 1000
+        self._stats.samples += 1
+        self._stats.total_ms += elapsed_ms
+        self._stats.max_ms = max(self._stats.max_ms, elapsed_ms)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Sample every interval until stop is set.
+
+        A failed provider call is logged and skipped; the last readings
+        stay in place until the next call succeeds.
+        """
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            try:
+                await loop.run_in_executor(None, self.sample)
+            except Exception:
+                log.exception("gpu_sample_failed")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def usage(self, now: float) -> dict[int, tuple[int, float]]:
+        """Return PID -> (gpu_time ns, gpu_time_rate ms/sec) at time now.
+
+        The rate is taken from the last two readings and held until the next
+        one. gpu_time is the latest reading plus that rate times the time
+        since it, extrapolated at most one interval ahead. PIDs with no GPU
+        time are absent.
+        """
+        previous, latest = self._readings
+        if latest is None:
+            return {}
+
+        if previous is None or latest.timestamp <= previous.timestamp:
+            return {pid: (ns, 0.0) for pid, ns in latest.gpu_time.items()}
+
+        span = latest.timestamp - previous.timestamp
+        ahead = min(max(0.0, now - latest.timestamp), self.interval)
+        before = previous.gpu_time
+        result = {}
+        for pid, ns in latest.gpu_time.items():
+            delta = ns - before.get(pid, ns)
+            if delta > 0:
+                ns_per_sec = delta / span
+                result[pid] = (ns + int(ns_per_sec * ahead), ns_per_sec / 1e6)
+            else:
+                result[pid] = (ns, 0.0)
+        return result
+
+    def take_stats(self) -> GpuSamplerStats:
+        """Return provider cost since the last call and reset it."""
+        stats = self._stats
+        self._stats = GpuSamplerStats()
+        return stats
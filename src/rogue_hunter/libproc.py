@@ -10,18 +10,35 @@ This module provides access to:
 - proc_name: Process name lookup
 
 All functions handle process disappearance gracefully by returning None.
+
+ProcInfoReader is the batch-oriented interface used by the collector: it
+owns one preallocated structure per flavor and a growable PID buffer, and
+returns plain counter tuples. It calls libproc through a ProcFunctions
+table, which tests replace with fakes on platforms without libproc.
+
+The structures and counter tuples are importable on any platform so that
+synthetic process sources (tests, benchmarks) can share them; the library
+functions themselves require macOS.
 """
 
 import ctypes
+from collections.abc import Callable
 from ctypes import POINTER, Structure, byref, c_char, c_int, c_int32, c_uint8, c_uint32, c_uint64
 from dataclasses import dataclass
+from typing import NamedTuple
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Library loading
 # ─────────────────────────────────────────────────────────────────────────────
 
-libproc = ctypes.CDLL("/usr/lib/libproc.dylib", use_errno=True)
-libc = ctypes.CDLL(None, use_errno=True)  # For mach_timebase_info
+try:
+    libproc = ctypes.CDLL("/usr/lib/libproc.dylib", use_errno=True)
+    libc = ctypes.CDLL(None, use_errno=True)  # For mach_timebase_info
+    _LIBPROC_AVAILABLE = True
+except OSError:
+    _LIBPROC_AVAILABLE = False
+    libproc = None
+    libc = None
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Constants
@@ -185,29 +202,100 @@ class ProcBSDInfo(Structure):
     ]
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Counter tuples
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class UsageCounters(NamedTuple):
+    """Cumulative counters from one proc_pid_rusage call.
+
+    This is the cheap tier of collection: everything needed for the CPU,
+    memory, disk and wakeup shares comes from a single syscall. Times are in
+    mach_absolute_time units.
+    """
+
+    cpu_time: int  # ri_user_time + ri_system_time
+    mem: int  # ri_phys_footprint
+    mem_peak: int  # ri_lifetime_max_phys_footprint
+    pageins: int
+    disk_io: int  # ri_diskio_bytesread + ri_diskio_byteswritten
+    energy: int  # ri_billed_energy
+    wakeups: int  # ri_pkg_idle_wkups + ri_interrupt_wkups
+    instructions: int
+    cycles: int
+    runnable_time: int
+    qos_interactive: int  # ri_cpu_time_qos_user_interactive
+    start_time: int  # ri_proc_start_abstime
+
+
+class DetailCounters(NamedTuple):
+    """Counters from the task and BSD info calls (the detailed tier)."""
+
+    csw: int
+    syscalls: int  # pti_syscalls_mach + pti_syscalls_unix
+    mach_msgs: int  # pti_messages_sent + pti_messages_received
+    faults: int
+    threads: int
+    priority: int
+    status: int  # pbi_status
+    ppid: int
+    comm: bytes  # pbi_comm (truncated to MAXCOMLEN)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Function signatures
 # ─────────────────────────────────────────────────────────────────────────────
 
-# int proc_pid_rusage(pid_t pid, int flavor, rusage_info_t *buffer)
-libproc.proc_pid_rusage.argtypes = [c_int, c_int, ctypes.c_void_p]
-libproc.proc_pid_rusage.restype = c_int
+if _LIBPROC_AVAILABLE and libproc and libc:
+    # int proc_pid_rusage(pid_t pid, int flavor, rusage_info_t *buffer)
+    libproc.proc_pid_rusage.argtypes = [c_int, c_int, ctypes.c_void_p]
+    libproc.proc_pid_rusage.restype = c_int
+
+    # int proc_pidinfo(pid_t pid, int flavor, uint64_t arg, void *buffer, int buffersize)
+    libproc.proc_pidinfo.argtypes = [c_int, c_int, c_uint64, ctypes.c_void_p, c_int]
+    libproc.proc_pidinfo.restype = c_int
+
+    # int proc_listallpids(void *buffer, int buffersize)
+    libproc.proc_listallpids.argtypes = [ctypes.c_void_p, c_int]
+    libproc.proc_listallpids.restype = c_int
+
+    # int proc_name(int pid, void *buffer, uint32_t buffersize)
+    libproc.proc_name.argtypes = [c_int, ctypes.c_void_p, c_uint32]
+    libproc.proc_name.restype = c_int
 
-# int proc_pidinfo(pid_t pid, int flavor, uint64_t arg, void *buffer, int buffersize)
-libproc.proc_pidinfo.argtypes = [c_int, c_int, c_uint64, ctypes.c_void_p, c_int]
-libproc.proc_pidinfo.restype = c_int
+    # kern_return_t mach_timebase_info(mach_timebase_info_t info)
+    libc.mach_timebase_info.argtypes = [POINTER(MachTimebaseInfo)]
+    libc.mach_timebase_info.restype = c_int
 
-# int proc_listallpids(void *buffer, int buffersize)
-libproc.proc_listallpids.argtypes = [ctypes.c_void_p, c_int]
-libproc.proc_listallpids.restype = c_int
 
-# int proc_name(int pid, void *buffer, uint32_t buffersize)
-libproc.proc_name.argtypes = [c_int, ctypes.c_void_p, c_uint32]
-libproc.proc_name.restype = c_int
+class ProcFunctions(NamedTuple):
+    """The libproc entry points ProcInfoReader calls.
 
-# kern_return_t mach_timebase_info(mach_timebase_info_t info)
-libc.mach_timebase_info.argtypes = [POINTER(MachTimebaseInfo)]
-libc.mach_timebase_info.restype = c_int
+    Buffers are passed as integer addresses, so a fake implementation can
+    fill them with ``Structure.from_address``.
+    """
+
+    proc_pid_rusage: Callable[[int, int, int], int]
+    proc_pidinfo: Callable[[int, int, int, int, int], int]
+    proc_listallpids: Callable[[int | None, int], int]
+    proc_name: Callable[[int, int, int], int]
+
+
+def libproc_functions() -> ProcFunctions:
+    """Return the function table for the real libproc.dylib.
+
+    Raises:
+        OSError: If libproc is not available on this platform.
+    """
+    if not _LIBPROC_AVAILABLE or libproc is None:
+        raise OSError("libproc is only available on macOS")
+    return ProcFunctions(
+        proc_pid_rusage=libproc.proc_pid_rusage,
+        proc_pidinfo=libproc.proc_pidinfo,
+        proc_listallpids=libproc.proc_listallpids,
+        proc_name=libproc.proc_name,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -338,6 +426,119 @@ def get_process_name(pid: int) -> str:
     return ""
 
 
+class ProcInfoReader:
+    """Reads per-PID counters into preallocated buffers.
+
+    The module-level get_* functions allocate a structure per call; a reader
+    allocates one of each up front and reuses it, copying out only the ints
+    the collector needs. The PID buffer grows with headroom and is kept
+    between samples, so the sizing call to proc_listallpids is only made
+    when the previous buffer came back full.
+
+    A reader's buffers are not shared: use one reader per thread.
+
+    Args:
+        functions: libproc function table (default: the real library)
+    """
+
+    _NAME_BUFSIZE = 256  # proc_name can return names longer than MAXCOMLEN
+
+    def __init__(self, functions: ProcFunctions | None = None) -> None:
+        self._fn = functions or libproc_functions()
+        self.calls = 0
+
+        self._rusage = RusageInfoV4()
+        self._task = ProcTaskInfo()
+        self._bsd = ProcBSDInfo()
+        self._name = ctypes.create_string_buffer(self._NAME_BUFSIZE)
+        self._rusage_addr = ctypes.addressof(self._rusage)
+        self._task_addr = ctypes.addressof(self._task)
+        self._task_size = ctypes.sizeof(self._task)
+        self._bsd_addr = ctypes.addressof(self._bsd)
+        self._bsd_size = ctypes.sizeof(self._bsd)
+        self._name_addr = ctypes.addressof(self._name)
+
+        self._pids = (c_int * 0)()
+
+    @property
+    def pid_capacity(self) -> int:
+        """Number of PIDs the current buffer holds."""
+        return len(self._pids)
+
+    def list_pids(self) -> list[int]:
+        """List all process IDs, reusing the PID buffer when it is big enough."""
+        listallpids = self._fn.proc_listallpids
+        buffer = self._pids
+        while True:
+            if len(buffer):
+                self.calls += 1
+                count = listallpids(ctypes.addressof(buffer), ctypes.sizeof(buffer))
+                if count <= 0:
+                    return []
+                if count < len(buffer):
+                    # Room to spare, so nothing was truncated
+                    return [pid for pid in buffer[:count] if pid > 0]
+
+            # Buffer missing or full: size it and retry
+            self.calls += 1
+            needed = listallpids(None, 0)
+            if needed <= 0:
+                return []
+            buffer = (c_int * (needed + needed // 4 + 64))()
+            self._pids = buffer
+
+    def read_usage(self, pid: int) -> UsageCounters | None:
+        """Read proc_pid_rusage counters, or None if the process is gone."""
+        self.calls += 1
+        if self._fn.proc_pid_rusage(pid, RUSAGE_INFO_V4, self._rusage_addr) != 0:
+            return None
+        r = self._rusage
+        return UsageCounters(
+            r.ri_user_time + r.ri_system_time,
+            r.ri_phys_footprint,
+            r.ri_lifetime_max_phys_footprint,
+            r.ri_pageins,
+            r.ri_diskio_bytesread + r.ri_diskio_byteswritten,
+            r.ri_billed_energy,
+            r.ri_pkg_idle_wkups + r.ri_interrupt_wkups,
+            r.ri_instructions,
+            r.ri_cycles,
+            r.ri_runnable_time,
+            r.ri_cpu_time_qos_user_interactive,
+            r.ri_proc_start_abstime,
+        )
+
+    def read_detail(self, pid: int) -> DetailCounters | None:
+        """Read task and BSD info counters, or None if the process is gone."""
+        pidinfo = self._fn.proc_pidinfo
+        self.calls += 1
+        if pidinfo(pid, PROC_PIDTASKINFO, 0, self._task_addr, self._task_size) <= 0:
+            return None
+        self.calls += 1
+        if pidinfo(pid, PROC_PIDTBSDINFO, 0, self._bsd_addr, self._bsd_size) <= 0:
+            return None
+        t = self._task
+        b = self._bsd
+        return DetailCounters(
+            t.pti_csw,
+            t.pti_syscalls_mach + t.pti_syscalls_unix,
+            t.pti_messages_sent + t.pti_messages_received,
+            t.pti_faults,
+            t.pti_threadnum,
+            t.pti_priority,
+            b.pbi_status,
+            b.pbi_ppid,
+            b.pbi_comm,
+        )
+
+    def read_name(self, pid: int) -> str:
+        """Read the process name, or empty string if not found."""
+        self.calls += 1
+        if self._fn.proc_name(pid, self._name_addr, self._NAME_BUFSIZE) > 0:
+            return self._name.value.decode("utf-8", errors="replace")
+        return ""
+
+
 def get_state_name(status: int) -> str:
     """Convert process status code to name.
 
@@ -175,8 +175,14 @@ def heartbeat(
     client_count: int,
     rss_mb: float,
     db_size_mb: float,
+    gpu_samples: int = 0,
+    gpu_ms: float = 0.0,
 ) -> None:
-    """Log periodic heartbeat stats."""
+    """Log periodic heartbeat stats.
+
+    gpu_samples/gpu_ms report the background GPU sampler separately: scans
+    since the last heartbeat and their mean cost.
+    """
     avg_c = score_color(avg_score)
     max_c = score_color(max_score)
     info(
@@ -184,7 +190,8 @@ def heartbeat(
         f"[cyan]{tracked_count}[/] tracked, "
         f"[dim]{buffer_size}/{buffer_capacity} buffer, "
         f"{client_count} clients, "
-        f"{round(rss_mb, 1)}MB RSS, {round(db_size_mb, 1)}MB DB[/]",
+        f"{round(rss_mb, 1)}MB RSS, {round(db_size_mb, 1)}MB DB, "
+        f"GPU {gpu_samples}×{round(gpu_ms, 1)}ms[/]",
         Icon.HEARTBEAT,
     )
 
@@ -200,11 +207,6 @@ def client_disconnected(remaining: int) -> None:
     info(f"TUI disconnected [dim]({remaining} remaining)[/]", Icon.DISCONNECTED)
 
 
-def forensics_debounced(elapsed: float, cooldown: float) -> None:
-    """Log forensics capture skipped due to debounce."""
-    info(f"Forensics debounced [dim]({round(elapsed, 1)}s < {cooldown}s)[/]", Icon.WAIT)
-
-
 def forensics_captured(event_id: int, capture_id: int) -> None:
     """Log forensics capture complete."""
     info(f"Forensics captured [dim](event {event_id}, #{capture_id})[/]", Icon.CAPTURE)
@@ -230,12 +232,20 @@ def auto_prune_started() -> None:
     info("[dim]Auto-pruning...[/]", Icon.PRUNE)
 
 
-def auto_prune_complete(events_deleted: int, snapshots_deleted: int = 0) -> None:
-    """Log auto-prune complete."""
+def auto_prune_complete(
+    events_deleted: int, snapshots_deleted: int = 0, complete: bool = True
+) -> None:
+    """Log auto-prune complete (or paused on its time budget)."""
     parts = [f"{events_deleted} events"]
     if snapshots_deleted > 0:
         parts.append(f"{snapshots_deleted} snapshots")
-    info(f"[dim]Pruned {', '.join(parts)}[/]")
+    suffix = "" if complete else ", resuming shortly"
+    info(f"[dim]Pruned {', '.join(parts)}{suffix}[/]")
+
+
+def auto_archive_complete(events_archived: int, files_written: int) -> None:
+    """Log aged events moved to weekly archive files."""
+    info(f"[dim]Archived {events_archived} events into {files_written} weekly files[/]")
 
 
 def machine_snapshot_saved(process_count: int, max_score: int) -> None:
@@ -269,6 +279,11 @@ def database_status(status: str, stale_closed: int) -> None:
         info(f"Database {status}")
 
 
+def backfill_started(version: int) -> None:
+    """Log a schema migration backfill starting in the background."""
+    info(f"[dim]Migrating data for schema v{version} in the background[/]")
+
+
 def config_created(path: str) -> None:
     """Log config file created."""
     info(f"Created config at [cyan]{path}[/]")
@@ -0,0 +1,478 @@
+"""Versioned schema migrations.
+
+Every SCHEMA_VERSION bump registers a Migration here instead of forcing a
+fresh database:
+
+- ``apply`` makes the schema change. init_database() writes a backup copy
+  of the database, then runs every pending ``apply`` in one transaction, so
+  a failed upgrade leaves the database as it was.
+- ``backfill`` (optional) moves or rewrites existing data in small batches
+  after startup. The daemon runs backfills in the background while it
+  samples. Pending backfills are recorded in daemon_state, so an
+  interrupted backfill resumes on the next start.
+
+Databases older than MIN_MIGRATABLE_VERSION are still recreated, after the
+old file has been set aside as a backup.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+import structlog
+
+from rogue_hunter.storage import (
+    _MACHINE_PARTITION_INDEX,
+    _MACHINE_PARTITION_SERIES_INDEXES,
+    _SEARCH_SCHEMA,
+    COMMAND_STATS_BACKFILL_KEY,
+    SCHEMA_VERSION,
+    create_machine_partition,
+    get_machine_partitions,
+    index_capture_search,
+    record_command_stats,
+)
+
+log = structlog.get_logger()
+
+BACKFILL_BATCH = 5  # Units (e.g. machine snapshots) per backfill batch
+PENDING_BACKFILLS_KEY = "pending_backfills"
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema version step.
+
+    Args:
+        version: Schema version after this migration
+        description: Short summary for logs
+        apply: Schema change; runs inside the upgrade transaction, must not commit
+        backfill: Moves up to batch_size units of data and returns how many
+            it moved (0 once done); must not commit
+    """
+
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+    backfill: Callable[[sqlite3.Connection, int], int] | None = None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v21: machine snapshot processes partitioned by hour
+# ─────────────────────────────────────────────────────────────────────────────
+
+_LEGACY_MACHINE_PROCESSES = "machine_snapshot_processes_legacy"
+
+
+def _apply_v21(conn: sqlite3.Connection) -> None:
+    """Keep the single process table aside until its rows are moved."""
+    conn.execute(f"ALTER TABLE machine_snapshot_processes RENAME TO {_LEGACY_MACHINE_PROCESSES}")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_process_events_peak_snapshot "
+        "ON process_events(peak_snapshot_id)"
+    )
+
+
+def _backfill_v21(conn: sqlite3.Connection, batch_size: int) -> int:
+    """Move the rows of up to batch_size snapshots into hourly partitions."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (_LEGACY_MACHINE_PROCESSES,),
+    ).fetchone()
+    if not exists:
+        return 0
+
+    snapshots = conn.execute(
+        f"""SELECT legacy.snapshot_id, s.captured_at
+            FROM (SELECT DISTINCT snapshot_id FROM {_LEGACY_MACHINE_PROCESSES}
+                  ORDER BY snapshot_id LIMIT ?) AS legacy
+            LEFT JOIN machine_snapshots s ON s.id = legacy.snapshot_id""",
+        (batch_size,),
+    ).fetchall()
+    if not snapshots:
+        conn.execute(f"DROP TABLE {_LEGACY_MACHINE_PROCESSES}")
+        return 0
+
+    for snapshot_id, captured_at in snapshots:
+        if captured_at is not None:  # Rows of a pruned header are dropped
+            table = create_machine_partition(conn, captured_at)
+            columns = ", ".join(
+                row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] != "id"
+            )
+            conn.execute(
+                f"""INSERT INTO {table} ({columns})
+                    SELECT {columns} FROM {_LEGACY_MACHINE_PROCESSES} WHERE snapshot_id = ?""",
+                (snapshot_id,),
+            )
+        conn.execute(
+            f"DELETE FROM {_LEGACY_MACHINE_PROCESSES} WHERE snapshot_id = ?", (snapshot_id,)
+        )
+    return len(snapshots)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v22: composite indexes matching getter ORDER BYs, dead indexes dropped
+# ─────────────────────────────────────────────────────────────────────────────
+
+_V22_DROPPED_INDEXES = [
+    "idx_process_events_pid_boot",
+    "idx_process_events_open",  # Recreated on boot_time
+    "idx_process_snapshots_event",
+    "idx_process_snapshots_score",
+    "idx_forensic_captures_event",
+    "idx_log_entries_capture",
+    "idx_tailspin_header_capture",
+    "idx_tailspin_process_capture",
+    "idx_tailspin_process_pid",
+    "idx_tailspin_thread_process",
+    "idx_tailspin_frame_thread",
+    "idx_tailspin_binary_image_process",
+]
+
+_V22_CREATED_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_process_events_entry
+    ON process_events(entry_time);
+CREATE INDEX IF NOT EXISTS idx_process_events_boot_entry
+    ON process_events(boot_time, entry_time);
+CREATE INDEX IF NOT EXISTS idx_process_events_open
+    ON process_events(boot_time) WHERE exit_time IS NULL;
+CREATE INDEX IF NOT EXISTS idx_process_snapshots_event_time
+    ON process_snapshots(event_id, captured_at);
+CREATE INDEX IF NOT EXISTS idx_forensic_captures_event_time
+    ON forensic_captures(event_id, captured_at);
+CREATE INDEX IF NOT EXISTS idx_log_entries_capture_time
+    ON log_entries(capture_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_tailspin_process_capture_cpu
+    ON tailspin_process(capture_id, cpu_time_sec);
+CREATE INDEX IF NOT EXISTS idx_tailspin_thread_process_samples
+    ON tailspin_thread(process_id, num_samples);
+CREATE INDEX IF NOT EXISTS idx_tailspin_frame_thread_depth
+    ON tailspin_frame(thread_id, depth);
+CREATE INDEX IF NOT EXISTS idx_tailspin_binary_image_process_address
+    ON tailspin_binary_image(process_id, start_address);
+"""
+
+
+def _apply_v22(conn: sqlite3.Connection) -> None:
+    """Swap single-column indexes for composites and drop unused ones."""
+    for name in _V22_DROPPED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    # execute() per statement: executescript() would commit mid-upgrade
+    for statement in _V22_CREATED_INDEXES.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+    for table in get_machine_partitions(conn):
+        conn.execute(f"DROP INDEX IF EXISTS idx_{table}_snapshot")
+        conn.execute(_MACHINE_PARTITION_INDEX.format(table=table))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v23: index of events moved to weekly archive files
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _apply_v23(conn: sqlite3.Connection) -> None:
+    """Add the archived_events table."""
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS archived_events (
+               event_id INTEGER PRIMARY KEY,
+               archive TEXT NOT NULL,
+               batch INTEGER NOT NULL
+           )"""
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v24: per-process series indexes on machine snapshot partitions
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _apply_v24(conn: sqlite3.Connection) -> None:
+    """Index existing partitions for command and PID timeseries reads."""
+    for table in get_machine_partitions(conn):
+        for index in _MACHINE_PARTITION_SERIES_INDEXES:
+            conn.execute(index.format(table=table))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v25: command_stats rollup of closed events
+# ─────────────────────────────────────────────────────────────────────────────
+
+_V25_EVENTS_PER_UNIT = 100  # Backfill units are blocks of this many events
+
+
+def _apply_v25(conn: sqlite3.Connection) -> None:
+    """Add command_stats; events closed from now on are rolled up as they close.
+
+    The backfill covers events closed before this point, so the two never
+    count an event twice.
+    """
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS command_stats (
+               command TEXT NOT NULL,
+               day INTEGER NOT NULL,
+               events INTEGER NOT NULL,
+               low_events INTEGER NOT NULL,
+               medium_events INTEGER NOT NULL,
+               elevated_events INTEGER NOT NULL,
+               high_events INTEGER NOT NULL,
+               critical_events INTEGER NOT NULL,
+               total_duration REAL NOT NULL,
+               peak_score INTEGER NOT NULL,
+               score_histogram TEXT NOT NULL,
+               last_seen REAL NOT NULL,
+               PRIMARY KEY (command, day)
+           ) WITHOUT ROWID"""
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_command_stats_day ON command_stats(day)")
+    _set_state(conn, COMMAND_STATS_BACKFILL_KEY, json.dumps({"until": time.time(), "after": 0}))
+
+
+def _backfill_v25(conn: sqlite3.Connection, batch_size: int) -> int:
+    """Roll up the next batch_size blocks of events closed before the upgrade."""
+    row = conn.execute(
+        "SELECT value FROM daemon_state WHERE key = ?", (COMMAND_STATS_BACKFILL_KEY,)
+    ).fetchone()
+    if row is None:
+        return 0
+    progress = json.loads(row[0])
+    events = conn.execute(
+        """SELECT id, command, peak_band, peak_score, entry_time, exit_time
+           FROM process_events WHERE id > ? AND exit_time <= ?
+           ORDER BY id LIMIT ?""",
+        (progress["after"], progress["until"], batch_size * _V25_EVENTS_PER_UNIT),
+    ).fetchall()
+    if not events:
+        conn.execute("DELETE FROM daemon_state WHERE key = ?", (COMMAND_STATS_BACKFILL_KEY,))
+        return 0
+    record_command_stats(conn, (event[1:] for event in events))
+    progress["after"] = events[-1][0]
+    _set_state(conn, COMMAND_STATS_BACKFILL_KEY, json.dumps(progress))
+    return -(-len(events) // _V25_EVENTS_PER_UNIT)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v26: full-text search over log entries and stack frames
+# ─────────────────────────────────────────────────────────────────────────────
+
+_V26_ROWS_PER_UNIT = 400  # Backfill units are this many indexed rows (BACKFILL_BATCH: 2000)
+
+
+def _apply_v26(conn: sqlite3.Connection) -> None:
+    """Add the FTS5 search tables; the backfill indexes existing captures."""
+    for statement in _SEARCH_SCHEMA:
+        conn.execute(statement)
+
+
+def _backfill_v26(conn: sqlite3.Connection, batch_size: int) -> int:
+    """Index the next batch_size blocks of rows of captures stored before the upgrade.
+
+    Steps are bounded by rows, not captures, since one capture can hold a
+    whole tailspin tree; a capture left part-indexed is finished by the
+    next step. Captures whose forensics are still being ingested (no
+    status yet) are left to the daemon, which indexes them when it
+    finishes.
+    """
+    budget = batch_size * _V26_ROWS_PER_UNIT
+    indexed = 0
+    while indexed < budget:
+        row = conn.execute(
+            """SELECT id FROM forensic_captures c
+               WHERE (tailspin_status IS NOT NULL OR logs_status IS NOT NULL)
+                 AND NOT EXISTS (
+                     SELECT 1 FROM search_indexed_captures s
+                     WHERE s.capture_id = c.id
+                       AND s.log_upto = s.log_last AND s.frame_upto = s.frame_last
+                 )
+               ORDER BY id LIMIT 1"""
+        ).fetchone()
+        if row is None:
+            break
+        indexed += index_capture_search(conn, row[0], budget - indexed)
+    return -(-indexed // _V26_ROWS_PER_UNIT)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# v27: coalesced captures linked to every triggering event
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _apply_v27(conn: sqlite3.Connection) -> None:
+    """Add forensic_capture_events; earlier captures each have one event."""
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS forensic_capture_events (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               capture_id INTEGER NOT NULL,
+               event_id INTEGER NOT NULL,
+               FOREIGN KEY (capture_id) REFERENCES forensic_captures(id) ON DELETE CASCADE,
+               FOREIGN KEY (event_id) REFERENCES process_events(id) ON DELETE CASCADE
+           )"""
+    )
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_forensic_capture_events_event
+           ON forensic_capture_events(event_id, capture_id)"""
+    )
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_forensic_capture_events_capture
+           ON forensic_capture_events(capture_id)"""
+    )
+
+
+# Oldest first; each entry upgrades from version - 1
+MIGRATIONS: list[Migration] = [
+    Migration(
+        version=21,
+        description="Partition machine snapshot processes by hour",
+        apply=_apply_v21,
+        backfill=_backfill_v21,
+    ),
+    Migration(
+        version=22,
+        description="Composite indexes for getter ORDER BYs; drop unused indexes",
+        apply=_apply_v22,
+    ),
+    Migration(
+        version=23,
+        description="Index of events moved to weekly archive files",
+        apply=_apply_v23,
+    ),
+    Migration(
+        version=24,
+        description="Command and PID series indexes on machine snapshot partitions",
+        apply=_apply_v24,
+    ),
+    Migration(
+        version=25,
+        description="command_stats rollup of closed events",
+        apply=_apply_v25,
+        backfill=_backfill_v25,
+    ),
+    Migration(
+        version=26,
+        description="Full-text search over log entries and stack frames",
+        apply=_apply_v26,
+        backfill=_backfill_v26,
+    ),
+    Migration(
+        version=27,
+        description="Coalesced captures linked to every triggering event",
+        apply=_apply_v27,
+    ),
+]
+
+MIN_MIGRATABLE_VERSION = MIGRATIONS[0].version - 1
+
+
+def can_migrate(version: int) -> bool:
+    """True if a database at version can be upgraded in place."""
+    return MIN_MIGRATABLE_VERSION <= version < SCHEMA_VERSION
+
+
+def backup_path(db_path: Path, version: int) -> Path:
+    """Where the backup of a version's database is written."""
+    return db_path.with_name(f"{db_path.stem}.v{version}.bak")
+
+
+def backup_database(conn: sqlite3.Connection, db_path: Path, version: int) -> Path:
+    """Copy the database (including WAL contents) to its backup path."""
+    target = backup_path(db_path, version)
+    target.unlink(missing_ok=True)
+    dest = sqlite3.connect(target)
+    try:
+        conn.backup(dest)
+    finally:
+        dest.close()
+    return target
+
+
+def migrate(conn: sqlite3.Connection, db_path: Path, from_version: int) -> Path:
+    """Upgrade a database from from_version to SCHEMA_VERSION.
+
+    Writes a backup first, then applies every pending schema step and
+    records pending backfills in a single transaction.
+
+    Returns:
+        Path of the backup
+
+    Raises:
+        ValueError: If from_version cannot be migrated
+    """
+    if not can_migrate(from_version):
+        raise ValueError(f"Cannot migrate schema version {from_version}")
+
+    start = time.monotonic()
+    backup = backup_database(conn, db_path, from_version)
+    backup_seconds = time.monotonic() - start
+
+    steps = [m for m in MIGRATIONS if m.version > from_version]
+    conn.execute("BEGIN")
+    try:
+        for migration in steps:
+            migration.apply(conn)
+            log.info("schema_migration_applied", version=migration.version)
+        pending = get_pending_backfills(conn) + [m.version for m in steps if m.backfill]
+        _set_state(conn, PENDING_BACKFILLS_KEY, json.dumps(pending))
+        _set_state(conn, "schema_version", str(SCHEMA_VERSION))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        log.exception("schema_migration_failed", existing=from_version, backup=str(backup))
+        raise
+
+    log.info(
+        "schema_migrated",
+        existing=from_version,
+        version=SCHEMA_VERSION,
+        backup=str(backup),
+        backup_seconds=round(backup_seconds, 3),
+        total_seconds=round(time.monotonic() - start, 3),
+    )
+    return backup
+
+
+def _set_state(conn: sqlite3.Connection, key: str, value: str) -> None:
+    """Write a daemon_state value without committing."""
+    conn.execute(
+        "INSERT OR REPLACE INTO daemon_state (key, value, updated_at) VALUES (?, ?, ?)",
+        (key, value, time.time()),
+    )
+
+
+def get_pending_backfills(conn: sqlite3.Connection) -> list[int]:
+    """Versions whose backfill has not finished, oldest first."""
+    row = conn.execute(
+        "SELECT value FROM daemon_state WHERE key = ?", (PENDING_BACKFILLS_KEY,)
+    ).fetchone()
+    return json.loads(row[0]) if row else []
+
+
+def run_backfills(
+    conn: sqlite3.Connection, batch_size: int = BACKFILL_BATCH
+) -> Generator[tuple[int, int], None, None]:
+    """Run pending backfills in batches, one transaction per batch.
+
+    A generator like prune_incremental(): the caller yields to its event
+    loop between batches. Stopping early is safe; the rest runs next time.
+
+    Yields:
+        (migration version, units moved in the batch)
+    """
+    by_version = {m.version: m for m in MIGRATIONS}
+    for version in get_pending_backfills(conn):
+        migration = by_version.get(version)
+        moved = 0
+        while migration is not None and migration.backfill is not None:
+            done = migration.backfill(conn, batch_size)
+            conn.commit()
+            if not done:
+                break
+            moved += done
+            yield version, done
+
+        pending = [v for v in get_pending_backfills(conn) if v != version]
+        _set_state(conn, PENDING_BACKFILLS_KEY, json.dumps(pending))
+        conn.commit()
+        log.info("schema_backfill_complete", version=version, moved=moved)
@@ -9,6 +9,7 @@ from collections import deque
 from dataclasses import dataclass
 
 from rogue_hunter.collector import ProcessSamples
+from rogue_hunter.culprits import CulpritIndex
 
 
 @dataclass
@@ -23,19 +24,31 @@ class RingSample:
 
 @dataclass(frozen=True)
 class BufferContents:
-    """Immutable snapshot for forensics."""
+    """Immutable snapshot for forensics.
+
+    culprits is the rolling index's identify_culprits() result at freeze
+    time (None for snapshots built without one).
+    """
 
     samples: tuple[RingSample, ...]
+    culprits: tuple[dict, ...] | None = None
 
 
 class RingBuffer:
     """Ring buffer for process samples.
 
-    Stores up to max_samples (default 30 = 3 seconds at 100ms).
+    Stores up to max_samples (default 30 = 3 seconds at 100ms), with a
+    CulpritIndex over the same window kept up to date on every push.
     """
 
-    def __init__(self, max_samples: int = 30) -> None:
+    def __init__(
+        self,
+        max_samples: int = 30,
+        culprit_threshold: int = 0,
+        sample_interval: float = 1.0,
+    ) -> None:
         self._samples: deque[RingSample] = deque(maxlen=max_samples)
+        self.culprits = CulpritIndex(max_samples, culprit_threshold, sample_interval)
 
     def __len__(self) -> int:
         """Return number of samples in buffer."""
@@ -59,11 +72,15 @@ class RingBuffer:
     def push(self, samples: ProcessSamples) -> None:
         """Add a sample to the buffer."""
         self._samples.append(RingSample(samples=samples))
+        self.culprits.push(samples)
 
     def clear(self) -> None:
         """Empty the buffer."""
         self._samples.clear()
+        self.culprits.clear()
 
     def freeze(self) -> BufferContents:
         """Return immutable copy of buffer contents."""
-        return BufferContents(samples=tuple(self._samples))
+        return BufferContents(
+            samples=tuple(self._samples), culprits=tuple(self.culprits.culprits())
+        )
@@ -0,0 +1,202 @@
+"""Forensics capture scheduling: priority, coalescing and an hourly budget.
+
+The tracker fires a trigger each time a process enters or escalates into
+the forensics band. A tailspin save covers the whole machine, so triggers
+that arrive together are one capture's worth: the scheduler queues them,
+waits a short coalescing window (and out the debounce tailspin needs
+between saves), then runs a single capture led by the highest-priority
+trigger and linked to every other trigger's event.
+
+Captures cost CPU and I/O (tailspin decode, parsing, inserts), so their
+cost over the last hour is held to a budget. Past shed_fraction of it,
+only batches led by ever higher scores run; at the full budget everything
+is shed until old captures age out of the hour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import resource
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import structlog
+
+from rogue_hunter.collector import BAND_SEVERITY
+
+log = structlog.get_logger()
+
+BUDGET_WINDOW_SECONDS = 3600.0
+
+# Escalation of an already tracked process outranks a fresh entry at the same band
+TRIGGER_RANK = {"band_entry": 0, "peak_escalation": 1}
+
+
+@dataclass(frozen=True)
+class CaptureTrigger:
+    """A request for forensics from one process event."""
+
+    event_id: int
+    trigger: str  # e.g. 'band_entry_critical', 'peak_escalation_high'
+    score: int
+    submitted_at: float
+
+    @property
+    def band(self) -> str:
+        """Band the trigger fired for (its trigger name's suffix)."""
+        return self.trigger.rpartition("_")[2]
+
+    @property
+    def priority(self) -> tuple[int, int, int]:
+        """(band severity, trigger type rank, score); higher runs first."""
+        kind = self.trigger.rpartition("_")[0]
+        return BAND_SEVERITY.get(self.band, 0), TRIGGER_RANK.get(kind, 0), self.score
+
+
+@dataclass(frozen=True)
+class CaptureCost:
+    """CPU seconds and block I/O operations a capture used."""
+
+    cpu_seconds: float = 0.0
+    io_ops: int = 0
+
+    def __add__(self, other: CaptureCost) -> CaptureCost:
+        return CaptureCost(self.cpu_seconds + other.cpu_seconds, self.io_ops + other.io_ops)
+
+    def __sub__(self, other: CaptureCost) -> CaptureCost:
+        return CaptureCost(self.cpu_seconds - other.cpu_seconds, self.io_ops - other.io_ops)
+
+
+def resource_usage() -> CaptureCost:
+    """CPU time and block I/O so far of this process's reaped children.
+
+    Children (tailspin, spindump, log, parse workers) count once they have
+    been waited on, which each capture does before returning, and captures
+    run one at a time, so the change over a capture is its children's
+    cost. The daemon's own usage is left out: sampling, archiving and
+    backfills share it. The capture adds the CPU time of the thread that
+    stores it (ForensicsCapture.store_cpu_seconds); that thread's own
+    block I/O is not measured.
+    """
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return CaptureCost(usage.ru_utime + usage.ru_stime, usage.ru_inblock + usage.ru_oublock)
+
+
+# Runs one capture for the lead trigger, linked to the others; returns its cost
+CaptureBackend = Callable[[CaptureTrigger, list[CaptureTrigger]], Awaitable[CaptureCost]]
+
+
+class CaptureScheduler:
+    """Queues capture triggers and runs them one coalesced capture at a time."""
+
+    def __init__(
+        self,
+        backend: CaptureBackend,
+        *,
+        debounce: float = 2.0,
+        coalesce_seconds: float = 0.5,
+        cpu_budget: float = 120.0,
+        io_budget: int = 500_000,
+        shed_fraction: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            backend: Runs a capture (see CaptureBackend)
+            debounce: Min seconds between capture starts
+            coalesce_seconds: How long to gather concurrent triggers
+            cpu_budget: CPU seconds of captures allowed per hour
+            io_budget: Block I/O operations of captures allowed per hour
+            shed_fraction: Share of the budget past which low-priority batches are shed
+            clock: Monotonic time source (for tests)
+        """
+        self._backend = backend
+        self._debounce = debounce
+        self._coalesce_seconds = coalesce_seconds
+        self._cpu_budget = cpu_budget
+        self._io_budget = io_budget
+        self._shed_fraction = shed_fraction
+        self._clock = clock
+        self._pending: list[CaptureTrigger] = []
+        self._spent: deque[tuple[float, CaptureCost]] = deque()
+        self._last_start = float("-inf")
+        self._task: asyncio.Task | None = None
+        self.captures = 0
+        self.shed = 0
+
+    def submit(self, event_id: int, trigger: str, score: int) -> None:
+        """Queue a trigger; it joins the next capture or is shed."""
+        self._pending.append(CaptureTrigger(event_id, trigger, score, self._clock()))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    def budget_used(self) -> float:
+        """Share of the hourly budget spent (the larger of CPU and I/O)."""
+        cutoff = self._clock() - BUDGET_WINDOW_SECONDS
+        while self._spent and self._spent[0][0] <= cutoff:
+            self._spent.popleft()
+        cpu = sum(cost.cpu_seconds for _, cost in self._spent)
+        io = sum(cost.io_ops for _, cost in self._spent)
+        return max(cpu / self._cpu_budget, io / self._io_budget)
+
+    def min_score(self) -> float:
+        """Lowest lead score that still gets a capture at the current budget use.
+
+        0 below shed_fraction, rising linearly to 100 at the full budget,
+        past which nothing runs.
+        """
+        used = self.budget_used()
+        if used < self._shed_fraction:
+            return 0.0
+        if used >= 1.0:
+            return float("inf")
+        return 100.0 * (used - self._shed_fraction) / (1.0 - self._shed_fraction)
+
+    async def stop(self) -> None:
+        """Cancel a pending or running capture; queued triggers are dropped."""
+        self._pending.clear()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _drain(self) -> None:
+        """Run captures until no triggers are left."""
+        while self._pending:
+            wait = max(self._coalesce_seconds, self._last_start + self._debounce - self._clock())
+            await asyncio.sleep(wait)
+
+            batch = sorted(self._pending, key=lambda t: t.priority, reverse=True)
+            self._pending = []
+            lead, linked = batch[0], batch[1:]
+            required = self.min_score()
+            if lead.score < required:
+                self.shed += len(batch)
+                log.warning(
+                    "forensics_shed",
+                    event_ids=[t.event_id for t in batch],
+                    lead_score=lead.score,
+                    required=required,
+                )
+                continue
+
+            self._last_start = self._clock()
+            try:
+                cost = await self._backend(lead, linked)
+            except Exception:
+                log.exception("forensics_capture_failed", event_id=lead.event_id)
+                cost = CaptureCost()
+            self._spent.append((self._clock(), cost))
+            self.captures += 1
+            if linked:
+                log.info(
+                    "forensics_coalesced",
+                    event_id=lead.event_id,
+                    linked=[t.event_id for t in linked],
+                )
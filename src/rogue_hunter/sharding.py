@@ -0,0 +1,161 @@
+"""Sharded per-PID reads across a thread pool.
+
+ctypes releases the GIL for the duration of each foreign call, so the
+per-PID libproc calls of different shards overlap. Only the raw reads are
+sharded: every shard returns plain (pid, counters) pairs, and all rate and
+score arithmetic stays on the collecting thread after the shards are merged
+back in PID-list order.
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rogue_hunter.libproc import DetailCounters, UsageCounters
+from rogue_hunter.sources import ProcessSource
+
+
+class ShardTuner:
+    """Picks a shard count from measured read latency.
+
+    Tries each candidate count (1, 2, 4, ... up to max_threads) for
+    trial_samples samples, then uses the count with the lowest median read
+    time. After retune_samples samples the trial repeats, so the choice
+    follows changes in process count and system load.
+    """
+
+    def __init__(self, max_threads: int, trial_samples: int = 5, retune_samples: int = 900):
+        candidates = [1]
+        while candidates[-1] * 2 <= max_threads:
+            candidates.append(candidates[-1] * 2)
+        if candidates[-1] != max_threads and max_threads > 1:
+            candidates.append(max_threads)
+        self.candidates = candidates
+        self.trial_samples = trial_samples
+        self.retune_samples = retune_samples
+        self.best = 1
+        self._timings: dict[int, list[float]] = {}
+        self._trial_index = 0  # Position in the trial schedule
+        self._since_tune = 0
+
+    @property
+    def tuning(self) -> bool:
+        """True while candidates are being measured."""
+        return self._trial_index < len(self.candidates) * self.trial_samples
+
+    def next_count(self) -> int:
+        """Return the shard count to use for the next sample."""
+        if self.tuning:
+            return self.candidates[self._trial_index // self.trial_samples]
+        return self.best
+
+    def record(self, count: int, seconds: float) -> None:
+        """Record the read time of a sample that used next_count() shards."""
+        if self.tuning:
+            self._timings.setdefault(count, []).append(seconds)
+            self._trial_index += 1
+            if not self.tuning:
+                self.best = min(self._timings, key=lambda c: statistics.median(self._timings[c]))
+                self._timings.clear()
+                self._since_tune = 0
+            return
+
+        self._since_tune += 1
+        if self._since_tune >= self.retune_samples:
+            self._trial_index = 0
+
+
+class ShardedReader:
+    """Reads per-PID counters in shards, one source per shard.
+
+    Each shard gets its own source (ProcessSource.worker()) so no two threads
+    share per-call buffers. Shard 0 runs on the calling thread.
+
+    Args:
+        source: Source for the calling thread (also used for shard 0)
+        threads: Fixed shard count, or 0 to auto-tune with ShardTuner
+        max_threads: Upper bound on shards (and pool size)
+    """
+
+    def __init__(self, source: ProcessSource, threads: int, max_threads: int):
+        self._sources = [source]
+        self._max_threads = max(1, max_threads)
+        self._fixed = min(threads, self._max_threads) if threads > 0 else 0
+        self.tuner = ShardTuner(self._max_threads) if threads == 0 else None
+        self._pool: ThreadPoolExecutor | None = None
+        self.shards = 1  # Shard count used for the current sample
+        self._read_time = 0.0
+
+    @property
+    def calls(self) -> int:
+        """Underlying calls made by all shard sources."""
+        return sum(s.calls for s in self._sources)
+
+    def begin_sample(self) -> None:
+        """Choose the shard count for this sample."""
+        self.shards = self._fixed or (self.tuner.next_count() if self.tuner else 1)
+        while len(self._sources) < self.shards:
+            self._sources.append(self._sources[0].worker())
+        if self.shards > 1 and self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_threads - 1, thread_name_prefix="collector-shard"
+            )
+        self._read_time = 0.0
+
+    def end_sample(self) -> float:
+        """Feed this sample's read time to the tuner and return it (seconds)."""
+        if self.tuner is not None:
+            self.tuner.record(self.shards, self._read_time)
+        return self._read_time
+
+    def read_usage(self, pids: list[int]) -> list[tuple[int, UsageCounters]]:
+        """Read usage counters for pids, skipping PIDs that vanished."""
+        return self._run(_read_usage_shard, pids)
+
+    def read_detail(self, pids: list[int]) -> list[tuple[int, DetailCounters | None]]:
+        """Read detail counters for pids (None for PIDs that vanished)."""
+        return self._run(_read_detail_shard, pids)
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _run(self, fn, pids: list[int]) -> list:
+        """Split pids into contiguous shards, run fn on each, merge in order."""
+        start = time.monotonic()
+        shards = min(self.shards, max(1, len(pids)))
+        if shards == 1 or self._pool is None:
+            result = fn(self._sources[0], pids)
+        else:
+            size = -(-len(pids) // shards)  # Ceiling division
+            chunks = [pids[i : i + size] for i in range(0, len(pids), size)]
+            futures = [
+                self._pool.submit(fn, self._sources[i], chunk)
+                for i, chunk in enumerate(chunks[1:], start=1)
+            ]
+            result = fn(self._sources[0], chunks[0])
+            for future in futures:
+                result.extend(future.result())
+        self._read_time += time.monotonic() - start
+        return result
+
+
+def _read_usage_shard(source: ProcessSource, pids: list[int]) -> list[tuple[int, UsageCounters]]:
+    """Read usage counters for one shard."""
+    read = source.read_usage
+    result = []
+    for pid in pids:
+        usage = read(pid)
+        if usage is not None:
+            result.append((pid, usage))
+    return result
+
+
+def _read_detail_shard(
+    source: ProcessSource, pids: list[int]
+) -> list[tuple[int, DetailCounters | None]]:
+    """Read detail counters for one shard."""
+    read = source.read_detail
+    return [(pid, read(pid)) for pid in pids]
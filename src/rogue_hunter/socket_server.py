@@ -31,6 +31,8 @@ class SocketServer:
     - No internal polling loop - data flows directly from daemon
     - Protocol: newline-delimited JSON messages
     - Message type: 'sample' with current ProcessSamples
+    - Requests: 'culprits' is answered with the top culprits of the last
+      N seconds, from the ring buffer's rolling culprit index
     """
 
     def __init__(
@@ -147,17 +149,48 @@ class SocketServer:
         log_method = getattr(log, level, log.info)
         log_method(event, source="tui", **extra)
 
-    def _handle_client_message(self, msg: dict) -> None:
+    def _handle_culprits_message(self, msg: dict) -> dict | None:
+        """Answer a request for the top culprits of the last N seconds.
+
+        Args:
+            msg: Request with optional seconds (default: the whole ring
+                buffer) and limit (default 10)
+
+        Returns:
+            'culprits' reply, or None if the request is malformed
+        """
+        seconds = msg.get("seconds")
+        limit = msg.get("limit", 10)
+        if (seconds is not None and not isinstance(seconds, int | float)) or not isinstance(
+            limit, int
+        ):
+            rlog.invalid_client_message()
+            return None
+
+        index = self.ring_buffer.culprits
+        return {
+            "type": "culprits",
+            "seconds": index.window_seconds if seconds is None else seconds,
+            "culprits": index.top(seconds, limit),
+        }
+
+    def _handle_client_message(self, msg: dict) -> dict | None:
         """Route incoming message to appropriate handler.
 
         Args:
             msg: Parsed JSON message from client
+
+        Returns:
+            Reply to send back to this client, if the message asks for one
         """
         msg_type = msg.get("type")
 
         if msg_type == "log":
             self._handle_log_message(msg)
+        elif msg_type == "culprits":
+            return self._handle_culprits_message(msg)
         # Add other message types here as needed
+        return None
 
     async def _handle_client(
         self,
@@ -169,6 +202,7 @@ class SocketServer:
         Bidirectional communication:
         - Daemon → TUI: broadcasts via broadcast() method
         - TUI → Daemon: receives JSON messages (type: "log", etc.)
+        - Daemon → TUI: replies to requests (type: "culprits")
         """
         self._clients.add(writer)
         rlog.client_connected(len(self._clients))
@@ -195,9 +229,13 @@ class SocketServer:
                     # Parse and handle the message
                     try:
                         msg = json.loads(line.decode())
-                        self._handle_client_message(msg)
+                        reply = self._handle_client_message(msg)
                     except json.JSONDecodeError:
                         rlog.invalid_client_message()
+                        continue
+                    if reply is not None:
+                        writer.write(json.dumps(reply).encode() + b"\n")
+                        await writer.drain()
 
                 except TimeoutError:
                     continue  # No message, check running flag and loop
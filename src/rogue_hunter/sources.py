@@ -0,0 +1,292 @@
+"""Process data sources for the collector.
+
+A source answers the per-PID questions the collector asks every sample:
+which PIDs exist, their cheap usage counters, their detailed task/BSD
+counters, and their name.
+
+- LibprocSource reads the live system through libproc (macOS only)
+- SyntheticSource generates a deterministic fake process table so the
+  collector can be tested and benchmarked on any platform
+
+Every source counts the underlying calls it makes in ``calls`` so that
+benchmarks can report syscalls per sample.
+"""
+
+import copy
+import random
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+from rogue_hunter.libproc import (
+    SRUN,
+    SSLEEP,
+    SZOMB,
+    DetailCounters,
+    ProcFunctions,
+    ProcInfoReader,
+    TimebaseInfo,
+    UsageCounters,
+)
+
+
+class ProcessSource(Protocol):
+    """Interface the collector uses to read process data."""
+
+    calls: int  # Underlying syscalls made so far (monotonic)
+
+    def timebase(self) -> TimebaseInfo:
+        """Return the timebase for converting counter times to nanoseconds."""
+        ...
+
+    def list_pids(self) -> list[int]:
+        """Return all PIDs currently on the system."""
+        ...
+
+    def read_usage(self, pid: int) -> UsageCounters | None:
+        """Read the cheap usage counters, or None if the process is gone."""
+        ...
+
+    def read_detail(self, pid: int) -> DetailCounters | None:
+        """Read the detailed task/BSD counters, or None if the process is gone."""
+        ...
+
+    def read_name(self, pid: int) -> str:
+        """Read the full process name, or empty string if unavailable."""
+        ...
+
+    def worker(self) -> "ProcessSource":
+        """Return a source for another reader thread.
+
+        The worker reads the same system but shares no per-call state
+        (buffers, counters) with this source.
+        """
+        ...
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# libproc (macOS)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class LibprocSource:
+    """Reads process data via libproc.dylib.
+
+    Costs per PID: one call for usage, two for detail (task + BSD info),
+    one for the name. Listing PIDs costs one call, or two when the PID
+    buffer has to grow.
+
+    Args:
+        functions: libproc function table (default: the real library)
+    """
+
+    def __init__(self, functions: ProcFunctions | None = None) -> None:
+        self._functions = functions
+        self._reader = ProcInfoReader(functions)
+        self.list_pids = self._reader.list_pids
+        self.read_usage = self._reader.read_usage
+        self.read_detail = self._reader.read_detail
+        self.read_name = self._reader.read_name
+
+    @property
+    def calls(self) -> int:
+        """Underlying libproc calls made so far."""
+        return self._reader.calls
+
+    def timebase(self) -> TimebaseInfo:
+        """Return mach timebase info."""
+        from rogue_hunter.libproc import get_timebase_info
+
+        return get_timebase_info()
+
+    def worker(self) -> "LibprocSource":
+        """Return a libproc source with its own reader buffers."""
+        return LibprocSource(self._functions)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Synthetic
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _SyntheticProc:
+    """Mutable counters for one fake process."""
+
+    name: str
+    ppid: int
+    status: int
+    start_time: int
+    load: float  # CPU cores consumed while running
+    mem: int
+    disk_rate: float  # Bytes per second
+    wakeup_rate: float  # Wakeups per second
+    cpu_time: int = 0
+    disk_io: int = 0
+    wakeups: int = 0
+    csw: int = 0
+    syscalls: int = 0
+
+
+class SyntheticSource:
+    """Deterministic fake process table for tests and benchmarks.
+
+    Models a typical machine: a few hot processes burning CPU, disk and
+    wakeups, a large population of idle daemons, and a handful of zombies.
+    Counters advance with real elapsed time between list_pids() calls, so
+    the collector's rate calculations behave as they would on a live system.
+    Counter times are nanoseconds (timebase 1/1).
+
+    Args:
+        process_count: Number of live processes
+        hot_count: Processes with significant CPU/disk/wakeup load
+        zombie_count: Zombie processes (children of PID 1)
+        churn: Fraction of idle processes replaced by new PIDs per sample
+        call_latency: Seconds to sleep per simulated syscall. Sleeping releases
+            the GIL the same way a ctypes foreign call does.
+        seed: Random seed for the process table
+    """
+
+    def __init__(
+        self,
+        process_count: int = 500,
+        hot_count: int = 5,
+        zombie_count: int = 2,
+        churn: float = 0.0,
+        call_latency: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.calls = 0
+        self.call_latency = call_latency
+        self.churn = churn
+        self._rng = random.Random(seed)
+        self._procs: dict[int, _SyntheticProc] = {}
+        self._next_pid = 100
+        self._last_tick = time.monotonic()
+
+        for i in range(process_count):
+            if i < hot_count:
+                self._spawn(f"hot{i}", load=self._rng.uniform(0.5, 2.0), hot=True)
+            elif i < hot_count + zombie_count:
+                self._spawn(f"zombie{i}", status=SZOMB)
+            else:
+                self._spawn(f"daemon{i}")
+
+    def _spawn(self, name: str, status: int = SSLEEP, load: float = 0.0, hot: bool = False) -> int:
+        """Add a process and return its PID."""
+        pid = self._next_pid
+        self._next_pid += 1
+        rng = self._rng
+        self._procs[pid] = _SyntheticProc(
+            name=name,
+            ppid=1,
+            status=SRUN if hot else status,
+            start_time=time.monotonic_ns(),
+            load=load if hot else rng.uniform(0.0, 0.0005),
+            mem=rng.randint(50, 800) * 1_000_000 if hot else rng.randint(1, 30) * 1_000_000,
+            disk_rate=rng.uniform(1e5, 1e7) if hot else 0.0,
+            wakeup_rate=rng.uniform(50, 500) if hot else rng.uniform(0.0, 2.0),
+        )
+        return pid
+
+    def exec(self, pid: int, name: str) -> None:
+        """Simulate exec: same PID and start time, new name."""
+        self._procs[pid].name = name
+
+    def reuse_pid(self, pid: int, name: str) -> None:
+        """Simulate PID reuse: a new process (new start time) under an old PID."""
+        old = self._procs[pid]
+        old.name = name
+        old.start_time = time.monotonic_ns()
+        old.cpu_time = old.disk_io = old.wakeups = old.csw = old.syscalls = 0
+
+    def worker(self) -> "SyntheticSource":
+        """Return a view of the same process table with its own call counter."""
+        worker = copy.copy(self)
+        worker.calls = 0
+        return worker
+
+    def _syscall(self) -> None:
+        """Account for one simulated syscall."""
+        self.calls += 1
+        if self.call_latency > 0:
+            time.sleep(self.call_latency)
+
+    def _advance(self) -> None:
+        """Advance all counters by the real time elapsed since the last tick."""
+        now = time.monotonic()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+
+        for proc in self._procs.values():
+            if proc.status == SZOMB:
+                continue
+            proc.cpu_time += int(proc.load * elapsed * 1e9)
+            proc.disk_io += int(proc.disk_rate * elapsed)
+            proc.wakeups += int(proc.wakeup_rate * elapsed)
+            proc.csw += int((proc.wakeup_rate + proc.load * 1000) * elapsed)
+            proc.syscalls += int(proc.load * 50_000 * elapsed) + 1
+
+        if self.churn > 0:
+            idle = [pid for pid, p in self._procs.items() if p.load < 0.01 and p.status != SZOMB]
+            replace = int(len(idle) * self.churn)
+            for pid in self._rng.sample(idle, replace):
+                name = self._procs.pop(pid).name
+                self._spawn(name)
+
+    def timebase(self) -> TimebaseInfo:
+        """Counters are already nanoseconds."""
+        return TimebaseInfo(numer=1, denom=1)
+
+    def list_pids(self) -> list[int]:
+        """List PIDs, advancing the simulation by one tick."""
+        self._syscall()
+        self._syscall()
+        self._advance()
+        return list(self._procs)
+
+    def read_usage(self, pid: int) -> UsageCounters | None:
+        """Return usage counters for a fake process."""
+        self._syscall()
+        p = self._procs.get(pid)
+        if p is None:
+            return None
+        return UsageCounters(
+            cpu_time=p.cpu_time,
+            mem=p.mem,
+            mem_peak=p.mem,
+            pageins=0,
+            disk_io=p.disk_io,
+            energy=p.cpu_time // 1000,
+            wakeups=p.wakeups,
+            instructions=p.cpu_time * 3,
+            cycles=p.cpu_time * 2,
+            runnable_time=p.cpu_time // 10,
+            qos_interactive=0,
+            start_time=p.start_time,
+        )
+
+    def read_detail(self, pid: int) -> DetailCounters | None:
+        """Return detail counters for a fake process (two simulated calls)."""
+        self._syscall()
+        self._syscall()
+        p = self._procs.get(pid)
+        if p is None:
+            return None
+        return DetailCounters(
+            csw=p.csw,
+            syscalls=p.syscalls,
+            mach_msgs=p.syscalls // 4,
+            faults=p.syscalls // 100,
+            threads=8 if p.load > 0.01 else 2,
+            priority=31,
+            status=p.status,
+            ppid=p.ppid,
+            comm=p.name.encode()[:16],
+        )
+
+    def read_name(self, pid: int) -> str:
+        """Return the name of a fake process."""
+        self._syscall()
+        p = self._procs.get(pid)
+        return p.name if p is not None else ""
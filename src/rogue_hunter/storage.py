@@ -1,10 +1,13 @@
 """SQLite storage layer for rogue-hunter."""
 
+import json
 import sqlite3
 import time
 from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, Generator, Iterable, Iterator, Sequence
 
 import structlog
 
@@ -13,8 +16,61 @@ if TYPE_CHECKING:
 
 log = structlog.get_logger()
 
-SCHEMA_VERSION = 20  # Full normalized tailspin schema with call stacks
-
+SCHEMA_VERSION = 27  # Coalesced captures linked to every triggering event
+
+# Retention pruning works in small batches so no single transaction holds the
+# event loop for long. A process event can cascade to thousands of tailspin
+# rows and a machine snapshot to one row per process, hence the sizes.
+PRUNE_EVENT_BATCH = 50  # process_events per batch (upper bound when adapting)
+PRUNE_VACUUM_PAGES = 256  # Pages released per incremental_vacuum step
+PRUNE_BATCH_TARGET = 0.02  # Seconds per batch that prune_incremental aims for
+
+EVENT_PAGE_SIZE = 500  # process_events per page when streaming (iter_process_events)
+SEARCH_INDEX_BATCH_ROWS = 2000  # Rows index_capture_search adds per call
+
+
+# Full-text search over log messages and frame symbols (see search_captures()),
+# appended to SCHEMA and shared with the v26 migration. External content: the
+# text stays in log_entries and tailspin_frame. A capture is indexed once
+# ingested, in id order a batch at a time; search_indexed_captures records how
+# far each table has got (rows up to *_upto are indexed, *_last is the
+# capture's last row), and the trigger unindexes exactly those rows before
+# they cascade away with it.
+_SEARCH_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS log_search USING fts5(
+        event_message, subsystem, process_name, content='log_entries', content_rowid='id'
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS frame_search USING fts5(
+        symbol_name, blocked_on, content='tailspin_frame', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TABLE IF NOT EXISTS search_indexed_captures (
+        capture_id INTEGER PRIMARY KEY REFERENCES forensic_captures(id) ON DELETE CASCADE,
+        log_upto INTEGER NOT NULL,
+        log_last INTEGER NOT NULL,
+        frame_upto INTEGER NOT NULL,
+        frame_last INTEGER NOT NULL
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS forensic_captures_search_delete
+    BEFORE DELETE ON forensic_captures
+    WHEN EXISTS (SELECT 1 FROM search_indexed_captures WHERE capture_id = old.id)
+    BEGIN
+        INSERT INTO log_search (log_search, rowid, event_message, subsystem, process_name)
+            SELECT 'delete', id, event_message, subsystem, process_name
+            FROM log_entries
+            WHERE capture_id = old.id
+              AND id <= (SELECT log_upto FROM search_indexed_captures WHERE capture_id = old.id);
+        INSERT INTO frame_search (frame_search, rowid, symbol_name, blocked_on)
+            SELECT 'delete', f.id, f.symbol_name, f.blocked_on
+            FROM tailspin_process p
+            JOIN tailspin_thread t ON t.process_id = p.id
+            JOIN tailspin_frame f ON f.thread_id = t.id
+            WHERE p.capture_id = old.id
+              AND (f.symbol_name IS NOT NULL OR f.blocked_on IS NOT NULL)
+              AND f.id <= (
+                  SELECT frame_upto FROM search_indexed_captures WHERE capture_id = old.id
+              );
+    END""",
+]
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS daemon_state (
@@ -97,14 +153,19 @@ CREATE TABLE IF NOT EXISTS process_snapshots (
     FOREIGN KEY (event_id) REFERENCES process_events(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_process_events_pid_boot
-    ON process_events(pid, boot_time);
+-- Read-path indexes end with the getter's ORDER BY column so results come
+-- straight off the index (tests/test_query_plans.py checks every getter)
+CREATE INDEX IF NOT EXISTS idx_process_events_entry
+    ON process_events(entry_time);
+CREATE INDEX IF NOT EXISTS idx_process_events_boot_entry
+    ON process_events(boot_time, entry_time);
 CREATE INDEX IF NOT EXISTS idx_process_events_open
-    ON process_events(exit_time) WHERE exit_time IS NULL;
-CREATE INDEX IF NOT EXISTS idx_process_snapshots_event
-    ON process_snapshots(event_id);
-CREATE INDEX IF NOT EXISTS idx_process_snapshots_score
-    ON process_snapshots(score);
+    ON process_events(boot_time) WHERE exit_time IS NULL;
+-- Deleting a snapshot checks process_events.peak_snapshot_id for references
+CREATE INDEX IF NOT EXISTS idx_process_events_peak_snapshot
+    ON process_events(peak_snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_process_snapshots_event_time
+    ON process_snapshots(event_id, captured_at);
 
 -- Forensic captures linked to process events
 CREATE TABLE IF NOT EXISTS forensic_captures (
@@ -362,25 +423,66 @@ CREATE TABLE IF NOT EXISTS buffer_context (
     FOREIGN KEY (capture_id) REFERENCES forensic_captures(id) ON DELETE CASCADE
 );
 
+-- Other events whose triggers a capture coalesced (its own event_id is the first)
+CREATE TABLE IF NOT EXISTS forensic_capture_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    capture_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    FOREIGN KEY (capture_id) REFERENCES forensic_captures(id) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES process_events(id) ON DELETE CASCADE
+);
+
 -- Indexes for forensic tables
-CREATE INDEX IF NOT EXISTS idx_forensic_captures_event ON forensic_captures(event_id);
-CREATE INDEX IF NOT EXISTS idx_log_entries_capture ON log_entries(capture_id);
+CREATE INDEX IF NOT EXISTS idx_forensic_captures_event_time
+    ON forensic_captures(event_id, captured_at);
+CREATE INDEX IF NOT EXISTS idx_forensic_capture_events_event
+    ON forensic_capture_events(event_id, capture_id);
+CREATE INDEX IF NOT EXISTS idx_forensic_capture_events_capture
+    ON forensic_capture_events(capture_id);
+CREATE INDEX IF NOT EXISTS idx_log_entries_capture_time ON log_entries(capture_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_buffer_context_capture ON buffer_context(capture_id);
 
 -- Indexes for tailspin tables
-CREATE INDEX IF NOT EXISTS idx_tailspin_header_capture ON tailspin_header(capture_id);
 CREATE INDEX IF NOT EXISTS idx_tailspin_shared_cache_capture ON tailspin_shared_cache(capture_id);
 CREATE INDEX IF NOT EXISTS idx_tailspin_io_stats_capture ON tailspin_io_stats(capture_id);
-CREATE INDEX IF NOT EXISTS idx_tailspin_process_capture ON tailspin_process(capture_id);
-CREATE INDEX IF NOT EXISTS idx_tailspin_process_pid ON tailspin_process(pid);
+CREATE INDEX IF NOT EXISTS idx_tailspin_process_capture_cpu
+    ON tailspin_process(capture_id, cpu_time_sec);
 CREATE INDEX IF NOT EXISTS idx_tailspin_process_note_process ON tailspin_process_note(process_id);
-CREATE INDEX IF NOT EXISTS idx_tailspin_thread_process ON tailspin_thread(process_id);
-CREATE INDEX IF NOT EXISTS idx_tailspin_frame_thread ON tailspin_frame(thread_id);
+CREATE INDEX IF NOT EXISTS idx_tailspin_thread_process_samples
+    ON tailspin_thread(process_id, num_samples);
+CREATE INDEX IF NOT EXISTS idx_tailspin_frame_thread_depth ON tailspin_frame(thread_id, depth);
 CREATE INDEX IF NOT EXISTS idx_tailspin_frame_parent ON tailspin_frame(parent_frame_id);
-CREATE INDEX IF NOT EXISTS idx_tailspin_binary_image_process ON tailspin_binary_image(process_id);
+CREATE INDEX IF NOT EXISTS idx_tailspin_binary_image_process_address
+    ON tailspin_binary_image(process_id, start_address);
 CREATE INDEX IF NOT EXISTS idx_tailspin_io_histogram_capture ON tailspin_io_histogram(capture_id);
 CREATE INDEX IF NOT EXISTS idx_tailspin_io_aggregate_capture ON tailspin_io_aggregate(capture_id);
 
+-- Closed events moved to weekly archive files (see rogue_hunter.archive)
+CREATE TABLE IF NOT EXISTS archived_events (
+    event_id INTEGER PRIMARY KEY,
+    archive TEXT NOT NULL,  -- File name in the archive directory
+    batch INTEGER NOT NULL  -- Member batch within the file
+);
+
+-- Closed events rolled up per command and UTC day, kept up to date as events close
+CREATE TABLE IF NOT EXISTS command_stats (
+    command TEXT NOT NULL,
+    day INTEGER NOT NULL,  -- exit_time // 86400
+    events INTEGER NOT NULL,
+    low_events INTEGER NOT NULL,  -- Events by peak band
+    medium_events INTEGER NOT NULL,
+    elevated_events INTEGER NOT NULL,
+    high_events INTEGER NOT NULL,
+    critical_events INTEGER NOT NULL,
+    total_duration REAL NOT NULL,  -- Seconds tracked
+    peak_score INTEGER NOT NULL,
+    score_histogram TEXT NOT NULL,  -- JSON counts of peak scores 0..100
+    last_seen REAL NOT NULL,  -- Latest exit_time
+    PRIMARY KEY (command, day)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_command_stats_day ON command_stats(day);
+
 -- Machine snapshots: periodic full-system state (every 60s, retained 12h)
 CREATE TABLE IF NOT EXISTS machine_snapshots (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -389,8 +491,20 @@ CREATE TABLE IF NOT EXISTS machine_snapshots (
     max_score INTEGER NOT NULL
 );
 
-CREATE TABLE IF NOT EXISTS machine_snapshot_processes (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+CREATE INDEX IF NOT EXISTS idx_machine_snapshots_time ON machine_snapshots(captured_at);
+
+-- Per-process rows of machine snapshots live in hourly partition tables
+-- (machine_snapshot_processes_<unix hour>), created on first insert
+""" + "".join(f"{statement};\n" for statement in _SEARCH_SCHEMA)
+
+# Machine snapshot process rows: ~1 row per process per minute. Each hour gets
+# its own table so retention drops whole tables instead of deleting rows.
+MACHINE_PARTITION_SECONDS = 3600
+MACHINE_PARTITION_PREFIX = "machine_snapshot_processes_"
+
+_MACHINE_PARTITION_DDL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY,
     snapshot_id INTEGER NOT NULL,
     pid INTEGER NOT NULL,
     command TEXT NOT NULL,
@@ -445,56 +559,113 @@ CREATE TABLE IF NOT EXISTS machine_snapshot_processes (
     disk_share REAL NOT NULL,
     wakeups_share REAL NOT NULL,
     disproportionality REAL NOT NULL,
-    dominant_resource TEXT NOT NULL,
-    FOREIGN KEY (snapshot_id) REFERENCES machine_snapshots(id) ON DELETE CASCADE
-);
-
-CREATE INDEX IF NOT EXISTS idx_machine_snapshots_time ON machine_snapshots(captured_at);
-CREATE INDEX IF NOT EXISTS idx_msp_snapshot ON machine_snapshot_processes(snapshot_id);
-"""
+    dominant_resource TEXT NOT NULL
+)"""
+_MACHINE_PARTITION_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_{table}_snapshot_score ON {table}(snapshot_id, score DESC)"
+)
+# Per-process timeseries reads (iter_process_series), in time order
+_MACHINE_PARTITION_SERIES_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_{table}_command_snapshot ON {table}(command, snapshot_id)",
+    "CREATE INDEX IF NOT EXISTS idx_{table}_pid_snapshot ON {table}(pid, snapshot_id)",
+]
+
+# Partition columns iter_process_series() can return
+SERIES_METRICS = (
+    "cpu",
+    "mem",
+    "mem_peak",
+    "pageins",
+    "pageins_rate",
+    "faults",
+    "faults_rate",
+    "disk_io",
+    "disk_io_rate",
+    "csw",
+    "csw_rate",
+    "syscalls",
+    "syscalls_rate",
+    "threads",
+    "mach_msgs",
+    "mach_msgs_rate",
+    "instructions",
+    "cycles",
+    "ipc",
+    "energy",
+    "energy_rate",
+    "wakeups",
+    "wakeups_rate",
+    "runnable_time",
+    "runnable_time_rate",
+    "qos_interactive",
+    "qos_interactive_rate",
+    "gpu_time",
+    "gpu_time_rate",
+    "zombie_children",
+    "state",
+    "priority",
+    "score",
+    "band",
+    "cpu_share",
+    "gpu_share",
+    "mem_share",
+    "disk_share",
+    "wakeups_share",
+    "disproportionality",
+    "dominant_resource",
+)
 
 
 def init_database(db_path: Path) -> None:
     """Initialize database with WAL mode and schema.
 
-    If the database exists with a different schema version, it is deleted
-    and recreated. No migrations - schema mismatch means fresh start.
+    An existing database at an older schema version is upgraded in place
+    (see rogue_hunter.migrations). One too old to migrate, newer than this
+    code, or unreadable is moved to a backup file and recreated.
     """
+    from rogue_hunter.migrations import backup_path, can_migrate, migrate
+
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Check existing database schema version
     if db_path.exists():
         conn = sqlite3.connect(db_path)
         try:
-            existing_version = _get_schema_version_raw(conn)
-            if existing_version != SCHEMA_VERSION:
-                log.info(
-                    "schema_mismatch",
-                    existing=existing_version,
-                    expected=SCHEMA_VERSION,
-                    action="recreate",
-                )
-                conn.close()
-                db_path.unlink()
-                # Also remove WAL and SHM files if they exist
-                wal_path = db_path.with_suffix(".db-wal")
-                shm_path = db_path.with_suffix(".db-shm")
-                if wal_path.exists():
-                    wal_path.unlink()
-                if shm_path.exists():
-                    shm_path.unlink()
-            else:
-                # Schema matches, nothing to do
-                conn.close()
+            try:
+                existing_version = _get_schema_version_raw(conn)
+            except sqlite3.OperationalError:
+                existing_version = None  # Corrupted or incompatible DB
+            if existing_version == SCHEMA_VERSION:
                 return
-        except sqlite3.OperationalError:
-            # Corrupted or incompatible DB - delete and recreate
+            if existing_version is not None and can_migrate(existing_version):
+                migrate(conn, db_path, existing_version)
+                return
+            log.info(
+                "schema_mismatch",
+                existing=existing_version,
+                expected=SCHEMA_VERSION,
+                action="recreate",
+            )
+            if existing_version is not None:
+                # Fold the WAL into the file before moving it aside
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
             conn.close()
-            db_path.unlink()
+
+        db_path.replace(backup_path(db_path, existing_version or 0))
+        # Also remove WAL and SHM files if they exist
+        wal_path = db_path.with_suffix(".db-wal")
+        shm_path = db_path.with_suffix(".db-shm")
+        if wal_path.exists():
+            wal_path.unlink()
+        if shm_path.exists():
+            shm_path.unlink()
 
     # Create fresh database
     conn = sqlite3.connect(db_path)
     try:
+        # Must precede table creation; lets pruning release pages incrementally
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
         # WAL mode for concurrent reads
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=NORMAL")
@@ -603,6 +774,9 @@ def prune_old_data(
 ) -> int:
     """Delete old closed process events (cascades to forensic data).
 
+    Deletes in batches of PRUNE_EVENT_BATCH events, one transaction each,
+    until nothing is left. The daemon uses prune_incremental() instead.
+
     Args:
         conn: Database connection
         events_days: Delete closed process_events older than this
@@ -618,21 +792,229 @@ def prune_old_data(
 
     cutoff_events = time.time() - (events_days * 86400)
 
-    # Delete old closed process events (cascades to snapshots and forensic captures)
+    events_deleted = 0
+    cursor = 0
+    while True:
+        deleted, cursor = _prune_event_batch(conn, cutoff_events, cursor, PRUNE_EVENT_BATCH)
+        conn.commit()
+        if not deleted:
+            break
+        events_deleted += deleted
+
+    log.info("prune_complete", events_deleted=events_deleted)
+
+    return events_deleted
+
+
+@dataclass
+class PruneProgress:
+    """Progress of an incremental prune run.
+
+    Saved to daemon_state (key "prune_progress") after every batch. A run
+    that stops on its time budget leaves complete = False and the event
+    cursor, and the next run resumes from there.
+    """
+
+    started_at: float
+    events_deleted: int = 0
+    snapshots_deleted: int = 0
+    pages_vacuumed: int = 0
+    batches: int = 0
+    event_cursor: int = 0  # Highest process_events.id already examined
+    elapsed: float = 0.0  # Seconds spent in this run
+    complete: bool = False
+
+
+def get_prune_progress(conn: sqlite3.Connection) -> PruneProgress | None:
+    """Get the progress record of the last prune run, if any."""
+    value = get_daemon_state(conn, "prune_progress")
+    if value is None:
+        return None
+    return PruneProgress(**json.loads(value))
+
+
+def _save_prune_progress(conn: sqlite3.Connection, progress: PruneProgress) -> None:
+    """Write the progress record (committed with the caller's batch)."""
+    conn.execute(
+        "INSERT OR REPLACE INTO daemon_state (key, value, updated_at) VALUES (?, ?, ?)",
+        ("prune_progress", json.dumps(asdict(progress)), time.time()),
+    )
+
+
+def _prune_event_batch(
+    conn: sqlite3.Connection, cutoff: float, after_id: int, batch_size: int
+) -> tuple[int, int]:
+    """Delete up to batch_size closed events older than cutoff with id > after_id.
+
+    Does not commit. Returns (events deleted, new cursor).
+    """
+    ids = [
+        row[0]
+        for row in conn.execute(
+            """SELECT id FROM process_events
+               WHERE id > ? AND exit_time IS NOT NULL AND exit_time < ?
+               ORDER BY id LIMIT ?""",
+            (after_id, cutoff, batch_size),
+        )
+    ]
+    if not ids:
+        return 0, after_id
+    placeholders = ",".join("?" * len(ids))
+    conn.execute(f"DELETE FROM process_events WHERE id IN ({placeholders})", ids)
+    return len(ids), ids[-1]
+
+
+def _drop_machine_partition(conn: sqlite3.Connection, cutoff: float) -> int | None:
+    """Drop the oldest machine snapshot partition that ends before cutoff.
+
+    Also deletes the snapshot headers of that hour and any older ones. Does
+    not commit. Returns the number of headers deleted, or None if no
+    partition has expired.
+    """
+    expired = [
+        table
+        for table in get_machine_partitions(conn)
+        if (_partition_hour(table) + 1) * MACHINE_PARTITION_SECONDS <= cutoff
+    ]
+    if not expired:
+        return None
+    table = expired[0]
+    # Builds with secure_delete on would zero (and log to the WAL) every
+    # freed page, turning the drop back into a write of the whole partition
+    secure_delete = conn.execute("PRAGMA secure_delete").fetchone()[0]
+    conn.execute("PRAGMA secure_delete=FAST")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"PRAGMA secure_delete={('OFF', 'ON', 'FAST')[secure_delete]}")
     cursor = conn.execute(
-        """
-        DELETE FROM process_events
-        WHERE exit_time IS NOT NULL AND exit_time < ?
-        """,
-        (cutoff_events,),
+        "DELETE FROM machine_snapshots WHERE captured_at < ?",
+        ((_partition_hour(table) + 1) * MACHINE_PARTITION_SECONDS,),
     )
-    events_deleted = cursor.rowcount
+    return cursor.rowcount
 
-    conn.commit()
 
-    log.info("prune_complete", events_deleted=events_deleted)
+def incremental_vacuum(conn: sqlite3.Connection, pages: int) -> int:
+    """Release up to pages free pages to the filesystem; returns how many.
+
+    Commits any open transaction first. Runs through executescript() since
+    the pragma frees one page per step and execute() only steps once.
+    """
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if free:
+        conn.executescript(f"PRAGMA incremental_vacuum({pages})")
+    return free - conn.execute("PRAGMA freelist_count").fetchone()[0]
 
-    return events_deleted
+
+def _adapt_batch_size(size: int, seconds: float, maximum: int) -> int:
+    """Halve the batch size above PRUNE_BATCH_TARGET, double it well below."""
+    if seconds > PRUNE_BATCH_TARGET:
+        return max(1, size // 2)
+    if seconds < PRUNE_BATCH_TARGET / 2:
+        return min(maximum, size * 2)
+    return size
+
+
+def prune_incremental(
+    conn: sqlite3.Connection,
+    events_days: int = 90,
+    snapshots_hours: float = 12.0,
+    budget_seconds: float | None = None,
+    event_batch: int = PRUNE_EVENT_BATCH,
+    vacuum_pages: int = PRUNE_VACUUM_PAGES,
+) -> Generator[PruneProgress, None, None]:
+    """Prune old events and machine snapshots in bounded batches.
+
+    A generator: each step deletes one batch (ordered by primary key) in its
+    own transaction, records progress, and yields it. The caller yields to
+    its event loop between steps, so sampling is delayed by at most one
+    batch. Batch sizes adapt toward PRUNE_BATCH_TARGET seconds per batch,
+    since the cascade behind one event varies from a few rows to a whole
+    tailspin tree. Machine snapshots expire a whole hourly partition per
+    step (DROP TABLE), so they are pruned at hour granularity. Once both
+    are pruned, free pages are released with PRAGMA incremental_vacuum,
+    also in steps.
+
+    Args:
+        conn: Database connection
+        events_days: Delete closed process_events older than this
+        snapshots_hours: Delete machine snapshots older than this
+        budget_seconds: Stop after this much time (None = run to completion);
+            the next run resumes from the recorded cursor
+        event_batch: Maximum events per batch
+        vacuum_pages: Pages released per vacuum step
+
+    Yields:
+        A copy of the cumulative progress after each step. The last one
+        yielded is final.
+
+    Raises:
+        ValueError: If retention days < 1
+    """
+    if events_days < 1:
+        raise ValueError("Retention days must be >= 1")
+
+    start = time.monotonic()
+    now = time.time()
+    events_cutoff = now - events_days * 86400
+    snapshots_cutoff = now - snapshots_hours * 3600
+
+    previous = get_prune_progress(conn)
+    progress = PruneProgress(started_at=now)
+    if previous is not None and not previous.complete:
+        progress.event_cursor = previous.event_cursor
+
+    def out_of_budget() -> bool:
+        return budget_seconds is not None and time.monotonic() - start >= budget_seconds
+
+    def step() -> PruneProgress:
+        progress.batches += 1
+        progress.elapsed = time.monotonic() - start
+        _save_prune_progress(conn, progress)
+        conn.commit()
+        return replace(progress)
+
+    size = 1  # Grows toward event_batch while batches stay fast
+    while not out_of_budget():
+        batch_start = time.monotonic()
+        deleted, progress.event_cursor = _prune_event_batch(
+            conn, events_cutoff, progress.event_cursor, size
+        )
+        if not deleted:
+            break
+        progress.events_deleted += deleted
+        yield step()
+        size = _adapt_batch_size(size, time.monotonic() - batch_start, event_batch)
+
+    while not out_of_budget():
+        deleted = _drop_machine_partition(conn, snapshots_cutoff)
+        if deleted is None:
+            break
+        progress.snapshots_deleted += deleted
+        yield step()
+
+    # auto_vacuum is INCREMENTAL for databases created since it was enabled
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        while not out_of_budget():
+            released = incremental_vacuum(conn, vacuum_pages)
+            if not released:
+                break
+            progress.pages_vacuumed += released
+            yield step()
+
+    progress.complete = not out_of_budget()
+    if progress.complete:
+        progress.event_cursor = 0  # Events closed since may sit below the cursor
+    progress.elapsed = time.monotonic() - start
+    _save_prune_progress(conn, progress)
+    conn.commit()
+    log.info(
+        "prune_incremental_complete" if progress.complete else "prune_incremental_paused",
+        events_deleted=progress.events_deleted,
+        snapshots_deleted=progress.snapshots_deleted,
+        pages_vacuumed=progress.pages_vacuumed,
+        batches=progress.batches,
+        elapsed=round(progress.elapsed, 3),
+    )
+    yield progress
 
 
 # --- Process Event CRUD Functions ---
@@ -701,12 +1083,14 @@ def close_stale_open_events(conn: sqlite3.Connection, exit_time: float) -> int:
     Returns:
         Number of events closed
     """
-    cursor = conn.execute(
-        "UPDATE process_events SET exit_time = ? WHERE exit_time IS NULL",
+    closed = conn.execute(
+        """UPDATE process_events SET exit_time = ? WHERE exit_time IS NULL
+           RETURNING command, peak_band, peak_score, entry_time, exit_time""",
         (exit_time,),
-    )
-    count = cursor.rowcount
+    ).fetchall()
+    count = len(closed)
     if count > 0:
+        record_command_stats(conn, closed)
         conn.commit()
         log.info("stale_events_closed", count=count)
     return count
@@ -766,6 +1150,63 @@ def get_process_events(
     ]
 
 
+def iter_process_events(
+    conn: sqlite3.Connection,
+    boot_time: int | None = None,
+    time_cutoff: float | None = None,
+    page_size: int = EVENT_PAGE_SIZE,
+) -> Iterator[dict]:
+    """Stream process events, newest first, without a row limit.
+
+    Reads page_size rows at a time, each page continuing after the last
+    (entry_time, id) seen, so no read transaction stays open between pages
+    and memory does not grow with the result.
+
+    Args:
+        conn: Database connection
+        boot_time: Filter to events from this boot (if None, gets all boots)
+        time_cutoff: Filter to events with entry_time >= this value
+        page_size: Rows per query
+
+    Yields:
+        Event dicts as returned by get_process_events()
+    """
+    conditions = []
+    params: list = []
+    if boot_time is not None:
+        conditions.append("boot_time = ?")
+        params.append(boot_time)
+    if time_cutoff is not None:
+        conditions.append("entry_time >= ?")
+        params.append(time_cutoff)
+
+    after: tuple[float, int] | None = None
+    while True:
+        page_conditions = conditions + (["(entry_time, id) < (?, ?)"] if after else [])
+        where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+        rows = conn.execute(
+            f"""SELECT id, pid, command, entry_time, exit_time,
+                       entry_band, peak_band, peak_score
+                FROM process_events {where}
+                ORDER BY entry_time DESC, id DESC LIMIT ?""",
+            [*params, *(after or ()), page_size],
+        ).fetchall()
+        for r in rows:
+            yield {
+                "id": r[0],
+                "pid": r[1],
+                "command": r[2],
+                "entry_time": r[3],
+                "exit_time": r[4],
+                "entry_band": r[5],
+                "peak_band": r[6],
+                "peak_score": r[7],
+            }
+        if len(rows) < page_size:
+            return
+        after = (rows[-1][3], rows[-1][0])
+
+
 def get_process_event_detail(conn: sqlite3.Connection, event_id: int) -> dict | None:
     """Get detailed information for a single process event.
 
@@ -811,11 +1252,14 @@ def get_process_event_detail(conn: sqlite3.Connection, event_id: int) -> dict |
 
 
 def close_process_event(conn: sqlite3.Connection, event_id: int, exit_time: float) -> None:
-    """Close an event by setting exit_time."""
-    conn.execute(
-        "UPDATE process_events SET exit_time = ? WHERE id = ?",
+    """Close an event by setting exit_time, and add it to command_stats."""
+    row = conn.execute(
+        """UPDATE process_events SET exit_time = ? WHERE id = ? AND exit_time IS NULL
+           RETURNING command, peak_band, peak_score, entry_time, exit_time""",
         (exit_time, event_id),
-    )
+    ).fetchone()
+    if row is not None:
+        record_command_stats(conn, [row])
     conn.commit()
 
 
@@ -1097,6 +1541,216 @@ def get_process_snapshots(conn: sqlite3.Connection, event_id: int) -> list[dict]
     ]
 
 
+# --- Command Stats Rollup ---
+
+COMMAND_STATS_BANDS = ("low", "medium", "elevated", "high", "critical")
+COMMAND_STATS_BACKFILL_KEY = "command_stats_backfill"  # daemon_state: v25 backfill progress
+_SCORE_BUCKETS = 101  # Histogram slots for peak scores 0..100
+
+_COMMAND_STATS_UPSERT = """
+INSERT INTO command_stats (command, day, events, low_events, medium_events, elevated_events,
+                           high_events, critical_events, total_duration, peak_score,
+                           score_histogram, last_seen)
+VALUES (:command, :day, 1, :low, :medium, :elevated, :high, :critical, :duration, :score,
+        :histogram, :exit_time)
+ON CONFLICT (command, day) DO UPDATE SET
+    events = events + 1,
+    low_events = low_events + excluded.low_events,
+    medium_events = medium_events + excluded.medium_events,
+    elevated_events = elevated_events + excluded.elevated_events,
+    high_events = high_events + excluded.high_events,
+    critical_events = critical_events + excluded.critical_events,
+    total_duration = total_duration + excluded.total_duration,
+    peak_score = max(peak_score, excluded.peak_score),
+    score_histogram = json_set(score_histogram, :slot, json_extract(score_histogram, :slot) + 1),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+
+
+def _command_stats_params(event: Sequence) -> dict:
+    """Upsert parameters for one closed event."""
+    command, peak_band, peak_score, entry_time, exit_time = event
+    bucket = min(max(int(peak_score), 0), _SCORE_BUCKETS - 1)
+    histogram = [0] * _SCORE_BUCKETS
+    histogram[bucket] = 1
+    return {
+        "command": command,
+        "day": int(exit_time // 86400),
+        **{band: int(peak_band == band) for band in COMMAND_STATS_BANDS},
+        "duration": exit_time - entry_time,
+        "score": peak_score,
+        "histogram": json.dumps(histogram),
+        "slot": f"$[{bucket}]",
+        "exit_time": exit_time,
+    }
+
+
+def record_command_stats(conn: sqlite3.Connection, events: Iterable[Sequence]) -> None:
+    """Add closed events to the command_stats rollup (does not commit).
+
+    Args:
+        conn: Database connection
+        events: (command, peak_band, peak_score, entry_time, exit_time) per event
+    """
+    conn.executemany(_COMMAND_STATS_UPSERT, map(_command_stats_params, events))
+
+
+def rebuild_command_stats(conn: sqlite3.Connection, archived: Iterable[dict] = ()) -> int:
+    """Recompute command_stats from every closed event, in one transaction.
+
+    Events deleted by pruning are gone from the rebuilt rollup.
+
+    Args:
+        conn: Database connection
+        archived: Archived event dicts to include (archive.iter_archived_events())
+
+    Returns:
+        Number of events rolled up
+    """
+    archived_rows = (
+        (e["command"], e["peak_band"], e["peak_score"], e["entry_time"], e["exit_time"])
+        for e in archived
+        if e["exit_time"] is not None
+    )
+    live_rows = conn.execute(
+        """SELECT command, peak_band, peak_score, entry_time, exit_time
+           FROM process_events WHERE exit_time IS NOT NULL"""
+    )
+
+    # Aggregate in memory (one row per command and day), then insert once:
+    # far cheaper than an upsert per event
+    band_slot = {band: i for i, band in enumerate(COMMAND_STATS_BANDS)}
+    stats: dict[tuple[str, int], dict] = {}
+    count = 0
+    for command, peak_band, peak_score, entry_time, exit_time in chain(live_rows, archived_rows):
+        key = (command, int(exit_time // 86400))
+        row = stats.get(key)
+        if row is None:
+            row = stats[key] = {
+                "bands": [0] * len(COMMAND_STATS_BANDS),
+                "duration": 0.0,
+                "score": peak_score,
+                "histogram": [0] * _SCORE_BUCKETS,
+                "exit_time": exit_time,
+            }
+        if peak_band in band_slot:
+            row["bands"][band_slot[peak_band]] += 1
+        row["duration"] += exit_time - entry_time
+        row["score"] = max(row["score"], peak_score)
+        row["histogram"][min(max(int(peak_score), 0), _SCORE_BUCKETS - 1)] += 1
+        row["exit_time"] = max(row["exit_time"], exit_time)
+        count += 1
+
+    try:
+        conn.execute("DELETE FROM command_stats")
+        conn.executemany(
+            """INSERT INTO command_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                (
+                    command,
+                    day,
+                    sum(row["histogram"]),
+                    *row["bands"],
+                    row["duration"],
+                    row["score"],
+                    json.dumps(row["histogram"]),
+                    row["exit_time"],
+                )
+                for (command, day), row in stats.items()
+            ),
+        )
+        # A pending migration backfill would count these events again
+        conn.execute("DELETE FROM daemon_state WHERE key = ?", (COMMAND_STATS_BACKFILL_KEY,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    log.info("command_stats_rebuilt", events=count, rows=len(stats))
+    return count
+
+
+def score_percentile(histogram: Sequence[int], fraction: float) -> int | None:
+    """Peak score at a fraction (0-1) of a score histogram; None if empty."""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for score, n in enumerate(histogram):
+        seen += n
+        if n and seen >= target:
+            return score
+    return len(histogram) - 1
+
+
+def get_top_offenders(
+    conn: sqlite3.Connection,
+    since: float,
+    band: str = "critical",
+    limit: int = 10,
+) -> list[dict]:
+    """Commands with the most events in a band since a time, from command_stats.
+
+    Days are whole UTC days, so the window starts at the start of since's day.
+
+    Args:
+        conn: Database connection
+        since: Include days from this timestamp on
+        band: Rank by events peaking in this band (or "all" for every event)
+        limit: Number of commands to return
+
+    Returns:
+        Dicts with command, events, <band>_events for each band, total_duration,
+        peak_score, median_score, p95_score and last_seen, most events first
+
+    Raises:
+        ValueError: If band is not a band name or "all"
+    """
+    if band != "all" and band not in COMMAND_STATS_BANDS:
+        raise ValueError(f"Unknown band: {band}")
+    rank = "events" if band == "all" else f"{band}_events"
+    counters = ["events", *(f"{b}_events" for b in COMMAND_STATS_BANDS), "total_duration"]
+    since_day = int(since // 86400)
+
+    totals: dict[str, dict] = {}
+    for command, *values, peak, last_seen in conn.execute(
+        f"""SELECT command, {", ".join(counters)}, peak_score, last_seen
+            FROM command_stats WHERE day >= ?""",
+        (since_day,),
+    ):
+        entry = totals.get(command)
+        if entry is None:
+            totals[command] = {
+                "command": command,
+                **dict(zip(counters, values)),
+                "peak_score": peak,
+                "last_seen": last_seen,
+            }
+            continue
+        for name, value in zip(counters, values):
+            entry[name] += value
+        entry["peak_score"] = max(entry["peak_score"], peak)
+        entry["last_seen"] = max(entry["last_seen"], last_seen)
+
+    ranked = sorted(
+        (e for e in totals.values() if e[rank]),
+        key=lambda e: (e[rank], e["events"], e["peak_score"]),
+        reverse=True,
+    )[:limit]
+    # Histograms are only decoded for the commands returned
+    for entry in ranked:
+        histogram = [0] * _SCORE_BUCKETS
+        for (days_histogram,) in conn.execute(
+            "SELECT score_histogram FROM command_stats WHERE command = ? AND day >= ?",
+            (entry["command"], since_day),
+        ):
+            for i, n in enumerate(json.loads(days_histogram)):
+                histogram[i] += n
+        entry["median_score"] = score_percentile(histogram, 0.5)
+        entry["p95_score"] = score_percentile(histogram, 0.95)
+    return ranked
+
+
 # --- Forensic Capture Functions ---
 
 
@@ -1117,6 +1771,19 @@ def create_forensic_capture(
     return result
 
 
+def link_capture_events(
+    conn: sqlite3.Connection,
+    capture_id: int,
+    event_ids: Iterable[int],
+) -> None:
+    """Link a capture to other events it was taken for (coalesced triggers)."""
+    conn.executemany(
+        "INSERT INTO forensic_capture_events (capture_id, event_id) VALUES (?, ?)",
+        ((capture_id, event_id) for event_id in event_ids),
+    )
+    conn.commit()
+
+
 def update_forensic_capture_status(
     conn: sqlite3.Connection,
     capture_id: int,
@@ -1309,8 +1976,12 @@ def insert_tailspin_process(
     instructions: int | None = None,
     cpi: float | None = None,
     num_threads: int | None = None,
+    commit: bool = True,
 ) -> int:
-    """Insert tailspin process record, return process_id."""
+    """Insert tailspin process record, return process_id.
+
+    commit=False leaves the row to the caller's transaction.
+    """
     cursor = conn.execute(
         """INSERT INTO tailspin_process
            (capture_id, pid, name, uuid, path, identifier, version,
@@ -1359,7 +2030,8 @@ def insert_tailspin_process(
             num_threads,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     result = cursor.lastrowid
     assert result is not None
     return result
@@ -1369,13 +2041,19 @@ def insert_tailspin_process_note(
     conn: sqlite3.Connection,
     process_id: int,
     note: str,
+    *,
+    commit: bool = True,
 ) -> int:
-    """Insert tailspin process note."""
+    """Insert tailspin process note.
+
+    commit=False leaves the row to the caller's transaction.
+    """
     cursor = conn.execute(
         """INSERT INTO tailspin_process_note (process_id, note) VALUES (?, ?)""",
         (process_id, note),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     result = cursor.lastrowid
     assert result is not None
     return result
@@ -1400,8 +2078,12 @@ def insert_tailspin_thread(
     cpi: float | None = None,
     io_count: int | None = None,
     io_bytes: int | None = None,
+    commit: bool = True,
 ) -> int:
-    """Insert tailspin thread record, return thread_id."""
+    """Insert tailspin thread record, return thread_id.
+
+    commit=False leaves the row to the caller's transaction.
+    """
     cursor = conn.execute(
         """INSERT INTO tailspin_thread
            (process_id, thread_id, dispatch_queue_name, dispatch_queue_serial,
@@ -1428,7 +2110,8 @@ def insert_tailspin_thread(
             io_bytes,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     result = cursor.lastrowid
     assert result is not None
     return result
@@ -1450,8 +2133,12 @@ def insert_tailspin_frame(
     state: str | None = None,
     core_type: str | None = None,
     blocked_on: str | None = None,
+    commit: bool = True,
 ) -> int:
-    """Insert tailspin stack frame record, return frame_id."""
+    """Insert tailspin stack frame record, return frame_id.
+
+    commit=False leaves the row to the caller's transaction.
+    """
     cursor = conn.execute(
         """INSERT INTO tailspin_frame
            (thread_id, parent_frame_id, depth, sample_count, is_kernel,
@@ -1474,7 +2161,8 @@ def insert_tailspin_frame(
             blocked_on,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     result = cursor.lastrowid
     assert result is not None
     return result
@@ -1491,15 +2179,20 @@ def insert_tailspin_binary_image(
     version: str | None = None,
     uuid: str | None = None,
     path: str | None = None,
+    commit: bool = True,
 ) -> int:
-    """Insert tailspin binary image record."""
+    """Insert tailspin binary image record.
+
+    commit=False leaves the row to the caller's transaction.
+    """
     cursor = conn.execute(
         """INSERT INTO tailspin_binary_image
            (process_id, start_address, end_address, name, version, uuid, path, is_kernel)
            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
         (process_id, start_address, end_address, name, version, uuid, path, 1 if is_kernel else 0),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     result = cursor.lastrowid
     assert result is not None
     return result
@@ -1599,6 +2292,27 @@ def insert_log_entry(
     conn.commit()
 
 
+def insert_log_entries(
+    conn: sqlite3.Connection,
+    capture_id: int,
+    entries: Iterable[Sequence],
+) -> None:
+    """Insert a batch of log entry records in one transaction.
+
+    Each entry is (timestamp, event_message, mach_timestamp, subsystem,
+    category, process_name, process_id, message_type), as insert_log_entry()
+    takes them.
+    """
+    conn.executemany(
+        """INSERT INTO log_entries
+           (capture_id, timestamp, event_message, mach_timestamp,
+            subsystem, category, process_name, process_id, message_type)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        ((capture_id, *entry) for entry in entries),
+    )
+    conn.commit()
+
+
 def insert_buffer_context(
     conn: sqlite3.Connection,
     capture_id: int,
@@ -1617,14 +2331,27 @@ def insert_buffer_context(
 
 
 def get_forensic_captures(conn: sqlite3.Connection, event_id: int) -> list[dict]:
-    """Get all forensic captures for an event."""
-    cursor = conn.execute(
+    """Get all forensic captures for an event.
+
+    Includes captures linked to it by coalescing, whose event_id is the
+    event that led the capture.
+    """
+    rows = conn.execute(
         """SELECT id, event_id, captured_at, trigger,
                   spindump_status, tailspin_status, logs_status
            FROM forensic_captures WHERE event_id = ?
            ORDER BY captured_at""",
         (event_id,),
-    )
+    ).fetchall()
+    linked = conn.execute(
+        """SELECT c.id, c.event_id, c.captured_at, c.trigger,
+                  c.spindump_status, c.tailspin_status, c.logs_status
+           FROM forensic_capture_events l JOIN forensic_captures c ON c.id = l.capture_id
+           WHERE l.event_id = ?""",
+        (event_id,),
+    ).fetchall()
+    if linked:
+        rows = sorted(rows + linked, key=lambda r: r[2])
     return [
         {
             "id": r[0],
@@ -1635,19 +2362,61 @@ def get_forensic_captures(conn: sqlite3.Connection, event_id: int) -> list[dict]
             "tailspin_status": r[5],
             "logs_status": r[6],
         }
-        for r in cursor.fetchall()
+        for r in rows
     ]
 
 
+def get_forensic_capture(conn: sqlite3.Connection, capture_id: int) -> dict | None:
+    """Get one forensic capture with its event's process."""
+    row = conn.execute(
+        """SELECT c.id, c.event_id, c.captured_at, c.trigger,
+                  c.spindump_status, c.tailspin_status, c.logs_status, e.pid, e.command
+           FROM forensic_captures c JOIN process_events e ON e.id = c.event_id
+           WHERE c.id = ?""",
+        (capture_id,),
+    ).fetchone()
+    if not row:
+        return None
+    return {
+        "id": row[0],
+        "event_id": row[1],
+        "captured_at": row[2],
+        "trigger": row[3],
+        "spindump_status": row[4],
+        "tailspin_status": row[5],
+        "logs_status": row[6],
+        "pid": row[7],
+        "command": row[8],
+    }
+
+
+def get_adjacent_capture_id(
+    conn: sqlite3.Connection, capture_id: int | None = None, newer: bool = False
+) -> int | None:
+    """Get the capture before (or after) capture_id, or the latest if None."""
+    if capture_id is None:
+        row = conn.execute("SELECT max(id) FROM forensic_captures").fetchone()
+    elif newer:
+        row = conn.execute(
+            "SELECT min(id) FROM forensic_captures WHERE id > ?", (capture_id,)
+        ).fetchone()
+    else:
+        row = conn.execute(
+            "SELECT max(id) FROM forensic_captures WHERE id < ?", (capture_id,)
+        ).fetchone()
+    return row[0]
+
+
 def get_tailspin_header(conn: sqlite3.Connection, capture_id: int) -> dict | None:
     """Get tailspin header for a capture."""
-    row = conn.execute(
+    cursor = conn.execute(
         """SELECT * FROM tailspin_header WHERE capture_id = ?""",
         (capture_id,),
-    ).fetchone()
+    )
+    row = cursor.fetchone()
     if not row:
         return None
-    columns = [d[0] for d in conn.execute("SELECT * FROM tailspin_header LIMIT 0").description]
+    columns = [d[0] for d in cursor.description]
     return dict(zip(columns, row))
 
 
@@ -1745,6 +2514,430 @@ def get_buffer_context(conn: sqlite3.Connection, capture_id: int) -> dict | None
     }
 
 
+# --- Bulk Event Detail ---
+
+_DETAIL_IN_CHUNK = 500  # Ids per IN (...) list, well under SQLite's variable limit
+
+
+@dataclass
+class EventDetail:
+    """An event and everything hanging off it, from load_event_detail().
+
+    Each value has the shape the matching single-row getter returns, keyed
+    by parent id. Stack frames are not loaded up front: frames() fetches a
+    thread's on first use and caches them.
+    """
+
+    event: dict  # get_process_event_detail()
+    snapshots: list[dict]  # get_process_snapshots()
+    captures: list[dict]  # get_forensic_captures()
+    buffer_context: dict[int, dict]  # capture id -> get_buffer_context()
+    tailspin_processes: dict[int, list[dict]]  # capture id -> get_tailspin_processes()
+    tailspin_process_counts: dict[int, int]  # capture id -> processes, loaded or not
+    tailspin_threads: dict[int, list[dict]]  # tailspin process id -> get_tailspin_threads()
+    log_entries: dict[int, list[dict]]  # capture id -> get_log_entries()
+    conn: sqlite3.Connection = field(repr=False, compare=False)
+    _frames: dict[int, list[dict]] = field(default_factory=dict, repr=False, compare=False)
+
+    def frames(self, thread_id: int) -> list[dict]:
+        """Stack frames of a tailspin thread (get_tailspin_frames()), loaded lazily."""
+        if thread_id not in self._frames:
+            self.load_frames([thread_id])
+        return self._frames[thread_id]
+
+    def load_frames(self, thread_ids: Sequence[int]) -> None:
+        """Fetch the frames of several threads at once, for frames() to return."""
+        wanted = [t for t in thread_ids if t not in self._frames]
+        for thread_id in wanted:
+            self._frames[thread_id] = []
+        for rows in _select_in(self.conn, "SELECT * FROM tailspin_frame", "thread_id", wanted):
+            for row in rows:
+                self._frames[row["thread_id"]].append(row)
+        for thread_id in wanted:
+            self._frames[thread_id].sort(key=lambda f: (f["depth"], f["id"]))
+
+
+def _select_in(
+    conn: sqlite3.Connection, select: str, column: str, ids: Sequence[int], order: str = ""
+) -> Iterator[list[dict]]:
+    """Run select with WHERE column IN (ids), a chunk of ids per query, as dict rows."""
+    for start in range(0, len(ids), _DETAIL_IN_CHUNK):
+        chunk = ids[start : start + _DETAIL_IN_CHUNK]
+        cursor = conn.execute(
+            f"{select} WHERE {column} IN ({','.join('?' * len(chunk))}) {order}", chunk
+        )
+        columns = [d[0] for d in cursor.description]
+        yield [dict(zip(columns, r)) for r in cursor.fetchall()]
+
+
+def load_event_detail(
+    conn: sqlite3.Connection,
+    event_id: int,
+    *,
+    forensics: bool = True,
+    threads: bool = True,
+    logs: bool = True,
+    log_limit: int = 100,
+    process_limit: int | None = None,
+) -> EventDetail | None:
+    """Load an event's whole detail tree in a few set-based queries.
+
+    Replaces calling the getters per capture and per tailspin process: one
+    query per table for the event (the peak snapshot comes from the
+    snapshot list), capture-level tables are read for all captures at once,
+    and threads for all loaded processes at once.
+
+    Args:
+        conn: Database connection
+        event_id: Event to load
+        forensics: Load buffer context
+        threads: Load tailspin processes and their threads
+        logs: Load up to log_limit log entries per capture
+        log_limit: Log entries per capture, earliest first
+        process_limit: Tailspin processes (with threads) per capture,
+            highest CPU first; None for all
+
+    Returns:
+        EventDetail, or None if the event does not exist
+    """
+    row = conn.execute(
+        """SELECT id, pid, command, boot_time, entry_time, exit_time,
+                  entry_band, peak_band, peak_score, peak_snapshot_id
+           FROM process_events WHERE id = ?""",
+        (event_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    snapshots = get_process_snapshots(conn, event_id)
+    peak_id = row[9]
+    peak = next((s for s in snapshots if s["id"] == peak_id), None)
+    if peak is None and peak_id is not None:
+        peak = get_snapshot(conn, peak_id)
+    event = dict(
+        zip(
+            [
+                "id",
+                "pid",
+                "command",
+                "boot_time",
+                "entry_time",
+                "exit_time",
+                "entry_band",
+                "peak_band",
+                "peak_score",
+                "peak_snapshot_id",
+            ],
+            row,
+        )
+    )
+    event["peak_snapshot"] = peak
+
+    captures = get_forensic_captures(conn, event_id)
+    capture_ids = [c["id"] for c in captures]
+    detail = EventDetail(
+        event=event,
+        snapshots=snapshots,
+        captures=captures,
+        buffer_context={},
+        tailspin_processes={},
+        tailspin_process_counts={},
+        tailspin_threads={},
+        log_entries={},
+        conn=conn,
+    )
+    if not capture_ids:
+        return detail
+
+    if forensics:
+        for rows in _select_in(
+            conn,
+            "SELECT id, capture_id, sample_count, peak_score, culprits FROM buffer_context",
+            "capture_id",
+            capture_ids,
+        ):
+            detail.buffer_context.update((r["capture_id"], r) for r in rows)
+
+    if threads:
+        # Rank from the (capture_id, cpu_time_sec) index alone, then read only
+        # the wide rows that will be kept
+        ranked: dict[int, list[int]] = {capture_id: [] for capture_id in capture_ids}
+        for rows in _select_in(
+            conn,
+            "SELECT capture_id, id FROM tailspin_process",
+            "capture_id",
+            capture_ids,
+            "ORDER BY capture_id DESC, cpu_time_sec DESC NULLS LAST",
+        ):
+            for r in rows:
+                ranked[r["capture_id"]].append(r["id"])
+        process_ids = [i for ids in ranked.values() for i in ids[:process_limit]]
+        processes: dict[int, dict] = {}
+        for rows in _select_in(conn, "SELECT * FROM tailspin_process", "id", process_ids):
+            processes.update((r["id"], r) for r in rows)
+        for capture_id, ids in ranked.items():
+            detail.tailspin_process_counts[capture_id] = len(ids)
+            detail.tailspin_processes[capture_id] = [processes[i] for i in ids[:process_limit]]
+
+        detail.tailspin_threads = {process_id: [] for process_id in process_ids}
+        for rows in _select_in(
+            conn,
+            "SELECT * FROM tailspin_thread",
+            "process_id",
+            process_ids,
+            "ORDER BY process_id DESC, num_samples DESC NULLS LAST",
+        ):
+            for r in rows:
+                detail.tailspin_threads[r["process_id"]].append(r)
+
+    if logs:
+        for capture_id in capture_ids:
+            detail.log_entries[capture_id] = []
+        placeholders = ",".join("?" * len(capture_ids))
+        cursor = conn.execute(
+            f"""SELECT id, capture_id, timestamp, mach_timestamp, subsystem,
+                       category, process_name, process_id, message_type, event_message
+                FROM (SELECT *, row_number() OVER (
+                          PARTITION BY capture_id ORDER BY timestamp) AS n
+                      FROM log_entries WHERE capture_id IN ({placeholders}))
+                WHERE n <= ?""",
+            [*capture_ids, log_limit],
+        )
+        columns = [d[0] for d in cursor.description]
+        for r in cursor.fetchall():
+            detail.log_entries[r[1]].append(dict(zip(columns, r)))
+
+    return detail
+
+
+# --- Full-Text Search ---
+
+SEARCH_SOURCES = ("logs", "frames")
+
+# source -> (capture id column, matching rows of :query from process :process
+# (any if NULL), snippet of one row)
+_SEARCH_QUERIES = {
+    "logs": (
+        "l.capture_id",
+        """FROM log_search s JOIN log_entries l ON l.id = s.rowid
+           WHERE log_search MATCH :query AND (:process IS NULL OR l.process_name = :process)""",
+        """SELECT snippet(log_search, -1, '[', ']', '...', 12)
+           FROM log_search WHERE log_search MATCH ? AND rowid = ?""",
+    ),
+    "frames": (
+        "p.capture_id",
+        """FROM frame_search s
+           JOIN tailspin_frame f ON f.id = s.rowid
+           JOIN tailspin_thread t ON t.id = f.thread_id
+           JOIN tailspin_process p ON p.id = t.process_id
+           WHERE frame_search MATCH :query AND (:process IS NULL OR p.name = :process)""",
+        """SELECT snippet(frame_search, -1, '[', ']', '...', 12)
+           FROM frame_search WHERE frame_search MATCH ? AND rowid = ?""",
+    ),
+}
+
+
+# Indexable rows of one capture per table: (index, indexed columns, rows with
+# ids in (:after, :upto] of capture :capture). The capture filters are kept off
+# the indexes (unary +), so each batch walks the table's rowid range rather
+# than every row of the capture.
+_SEARCH_INDEX_ROWS = {
+    "log": (
+        "log_search",
+        "event_message, subsystem, process_name",
+        """FROM log_entries
+           WHERE id > :after AND id <= :upto AND +capture_id = :capture""",
+    ),
+    "frame": (
+        "frame_search",
+        "symbol_name, blocked_on",
+        """FROM tailspin_frame
+           WHERE id > :after AND id <= :upto
+             AND (symbol_name IS NOT NULL OR blocked_on IS NOT NULL)
+             AND +thread_id IN (
+                 SELECT t.id FROM tailspin_process p
+                 JOIN tailspin_thread t ON t.process_id = p.id
+                 WHERE p.capture_id = :capture
+             )""",
+    ),
+}
+
+
+def index_capture_search(
+    conn: sqlite3.Connection, capture_id: int, max_rows: int = SEARCH_INDEX_BATCH_ROWS
+) -> int:
+    """Add up to max_rows more of a capture's log entries and frames to the full-text index.
+
+    Call once the capture's logs and tailspin data are stored, then again
+    until it returns 0, committing in between so no write transaction
+    grows with the capture (a tailspin can hold hundreds of thousands of
+    frames). Rows are indexed in id order and search_indexed_captures
+    records how far each table has got, so indexing resumes where it
+    stopped. Does not commit.
+
+    Returns:
+        Rows indexed, 0 once the capture is fully indexed
+    """
+    row = conn.execute(
+        """SELECT log_upto, log_last, frame_upto, frame_last
+           FROM search_indexed_captures WHERE capture_id = ?""",
+        (capture_id,),
+    ).fetchone()
+    if row is None:
+        # First and last indexable row of each table
+        log_first, log_last = conn.execute(
+            "SELECT min(id), max(id) FROM log_entries WHERE capture_id = ?", (capture_id,)
+        ).fetchone()
+        frame_first, frame_last = conn.execute(
+            """SELECT min(f.id), max(f.id)
+               FROM tailspin_process p
+               JOIN tailspin_thread t ON t.process_id = p.id
+               JOIN tailspin_frame f ON f.thread_id = t.id
+               WHERE p.capture_id = ?
+                 AND (f.symbol_name IS NOT NULL OR f.blocked_on IS NOT NULL)""",
+            (capture_id,),
+        ).fetchone()
+        row = ((log_first or 1) - 1, log_last or 0, (frame_first or 1) - 1, frame_last or 0)
+        conn.execute(
+            """INSERT INTO search_indexed_captures
+               (capture_id, log_upto, log_last, frame_upto, frame_last) VALUES (?, ?, ?, ?, ?)""",
+            (capture_id, *row),
+        )
+
+    indexed = 0
+    for (name, (fts, columns, rows)), after, last in zip(
+        _SEARCH_INDEX_ROWS.items(), row[::2], row[1::2], strict=True
+    ):
+        if after >= last or indexed >= max_rows:
+            continue
+        params = {"capture": capture_id, "after": after, "upto": last}
+        count, upto = conn.execute(
+            f"""SELECT count(*), max(id) FROM (
+                    SELECT id {rows} ORDER BY id LIMIT :limit
+                )""",
+            params | {"limit": max_rows - indexed},
+        ).fetchone()
+        if count:
+            conn.execute(
+                f"INSERT INTO {fts} (rowid, {columns}) SELECT id, {columns} {rows}",
+                params | {"upto": upto},
+            )
+            indexed += count
+        conn.execute(
+            f"UPDATE search_indexed_captures SET {name}_upto = ? WHERE capture_id = ?",
+            (upto if count else last, capture_id),
+        )
+    return indexed
+
+
+def search_captures(
+    conn: sqlite3.Connection,
+    query: str,
+    sources: Sequence[str] = SEARCH_SOURCES,
+    process: str | None = None,
+    limit: int = 20,
+) -> list[dict]:
+    """Find forensic captures whose log entries or stack frames match a query.
+
+    Log entries match on event_message, subsystem and process_name as
+    words; frames match on symbol_name and blocked_on as substrings (three
+    characters or more). The query is FTS5 syntax, so `watchdog`,
+    `"stack overflow"`, `blocked_on: IOSurface` and `a AND NOT b` all work.
+
+    Matches are grouped per capture in SQL, each source ranking its own
+    best `limit` captures. BM25 depends on the corpus, so log and frame
+    ranks are not on one scale: each capture's score is its best rank
+    relative to the best of the same source (1.0 is that source's best
+    match), and the sources merge on that.
+
+    Args:
+        conn: Database connection
+        query: FTS5 query
+        sources: Which of SEARCH_SOURCES to search
+        process: Only count matches from this process (log process_name,
+            tailspin process name)
+        limit: Maximum captures to return
+
+    Returns:
+        Best first (by score, then match count), dicts with capture_id,
+        event_id, command, captured_at, trigger, matches (per source),
+        score and snippet (the best match, with matched text in brackets)
+
+    Raises:
+        ValueError: If a source is unknown or the query is not valid FTS5
+            for the searched tables
+    """
+    unknown = set(sources) - set(SEARCH_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown search source: {', '.join(sorted(unknown))}")
+
+    params = {"query": query, "process": process, "limit": limit}
+    # capture_id -> (score, source, rowid of the best match)
+    best: dict[int, tuple[float, str, int]] = {}
+    matches: dict[int, dict[str, int]] = {}
+    for source in sources:
+        capture_column, rows, _ = _SEARCH_QUERIES[source]
+        try:
+            ranked = conn.execute(
+                f"""SELECT {capture_column}, min(s.rank) AS best, s.rowid, count(*)
+                    {rows} GROUP BY 1 ORDER BY best, count(*) DESC LIMIT :limit""",
+                params,
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query for {source}: {e}") from e
+        # Ranks are negative, lower is better; the first is the source's best
+        top = ranked[0][1] if ranked else 0.0
+        for capture_id, rank, rowid, count in ranked:
+            score = rank / top if top < 0 else 1.0
+            if capture_id not in best or score > best[capture_id][0]:
+                best[capture_id] = (score, source, rowid)
+            matches.setdefault(capture_id, dict.fromkeys(sources, 0))[source] = count
+
+    shown = sorted(best, key=lambda c: (-best[c][0], -sum(matches[c].values())))[:limit]
+    captures = {}
+    for start in range(0, len(shown), _DETAIL_IN_CHUNK):
+        chunk = shown[start : start + _DETAIL_IN_CHUNK]
+        in_chunk = ",".join("?" * len(chunk))
+        captures.update(
+            (row[0], row[1:])
+            for row in conn.execute(
+                f"""SELECT c.id, c.event_id, e.command, c.captured_at, c.trigger
+                    FROM forensic_captures c JOIN process_events e ON e.id = c.event_id
+                    WHERE c.id IN ({in_chunk})""",
+                chunk,
+            )
+        )
+        # Match counts of sources where the capture was outside the top `limit`
+        for source in sources:
+            capture_column, rows, _ = _SEARCH_QUERIES[source]
+            missing = [c for c in chunk if not matches[c][source]]
+            if not missing:
+                continue
+            ids = {f"c{i}": capture_id for i, capture_id in enumerate(missing)}
+            counts = conn.execute(
+                f"""SELECT {capture_column}, count(*) {rows}
+                    AND {capture_column} IN ({",".join(f":{k}" for k in ids)}) GROUP BY 1""",
+                params | ids,
+            )
+            for capture_id, count in counts:
+                matches[capture_id][source] = count
+    return [
+        {
+            "capture_id": capture_id,
+            "event_id": captures[capture_id][0],
+            "command": captures[capture_id][1],
+            "captured_at": captures[capture_id][2],
+            "trigger": captures[capture_id][3],
+            "matches": matches[capture_id],
+            "score": round(best[capture_id][0], 3),
+            # Snippets only for the rows shown, not every match
+            "snippet": conn.execute(
+                _SEARCH_QUERIES[best[capture_id][1]][2], (query, best[capture_id][2])
+            ).fetchone()[0],
+        }
+        for capture_id in shown
+    ]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Machine Snapshots (periodic full-system state)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1776,9 +2969,10 @@ def insert_machine_snapshot(
     snapshot_id = cursor.lastrowid
     assert snapshot_id is not None
 
-    # Insert all processes
+    # Insert all processes into this hour's partition
+    table = create_machine_partition(conn, captured_at)
     conn.executemany(
-        """INSERT INTO machine_snapshot_processes
+        f"""INSERT INTO {table}
            (snapshot_id, pid, command,
             cpu, mem, mem_peak, pageins, pageins_rate, faults, faults_rate,
             disk_io, disk_io_rate,
@@ -1878,6 +3072,10 @@ def insert_machine_snapshot(
 def prune_machine_snapshots(conn: sqlite3.Connection, max_age_hours: float = 12.0) -> int:
     """Delete machine snapshots older than max_age_hours.
 
+    Drops expired hourly partitions one per transaction, so snapshots are
+    removed at hour granularity: up to an hour past max_age_hours may be
+    kept. The daemon uses prune_incremental() instead.
+
     Args:
         conn: Database connection
         max_age_hours: Maximum age in hours (default 12)
@@ -1887,19 +3085,15 @@ def prune_machine_snapshots(conn: sqlite3.Connection, max_age_hours: float = 12.
     """
     cutoff = time.time() - (max_age_hours * 3600)
 
-    # Get count before deletion
-    count = conn.execute(
-        "SELECT COUNT(*) FROM machine_snapshots WHERE captured_at < ?",
-        (cutoff,),
-    ).fetchone()[0]
+    count = 0
+    while True:
+        deleted = _drop_machine_partition(conn, cutoff)
+        conn.commit()
+        if deleted is None:
+            break
+        count += deleted
 
     if count > 0:
-        # CASCADE will delete associated processes
-        conn.execute(
-            "DELETE FROM machine_snapshots WHERE captured_at < ?",
-            (cutoff,),
-        )
-        conn.commit()
         log.info("machine_snapshots_pruned", count=count, max_age_hours=max_age_hours)
 
     return count
@@ -1908,3 +3102,149 @@ def prune_machine_snapshots(conn: sqlite3.Connection, max_age_hours: float = 12.
 def get_machine_snapshot_count(conn: sqlite3.Connection) -> int:
     """Get the number of machine snapshots in the database."""
     return conn.execute("SELECT COUNT(*) FROM machine_snapshots").fetchone()[0]
+
+
+def machine_partition_table(captured_at: float) -> str:
+    """Return the partition table name for a snapshot taken at captured_at."""
+    return f"{MACHINE_PARTITION_PREFIX}{int(captured_at // MACHINE_PARTITION_SECONDS)}"
+
+
+def create_machine_partition(conn: sqlite3.Connection, captured_at: float) -> str:
+    """Create the partition for captured_at if missing; returns its name.
+
+    Does not commit, so it can share a transaction with the rows it holds.
+    """
+    table = machine_partition_table(captured_at)
+    conn.execute(_MACHINE_PARTITION_DDL.format(table=table))
+    conn.execute(_MACHINE_PARTITION_INDEX.format(table=table))
+    for index in _MACHINE_PARTITION_SERIES_INDEXES:
+        conn.execute(index.format(table=table))
+    return table
+
+
+def _partition_hour(table: str) -> int:
+    """Return the hour number (unix time // 3600) encoded in a partition name."""
+    return int(table.removeprefix(MACHINE_PARTITION_PREFIX))
+
+
+def get_machine_partitions(conn: sqlite3.Connection) -> list[str]:
+    """Return the machine snapshot partition tables, oldest first."""
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+        (MACHINE_PARTITION_PREFIX + "[0-9]*",),
+    ).fetchall()
+    return sorted((row[0] for row in rows), key=_partition_hour)
+
+
+def get_machine_snapshot_processes(conn: sqlite3.Connection, snapshot_id: int) -> list[dict]:
+    """Get the process rows of one machine snapshot, highest score first.
+
+    Returns an empty list if the snapshot or its partition no longer exists.
+    """
+    row = conn.execute(
+        "SELECT captured_at FROM machine_snapshots WHERE id = ?", (snapshot_id,)
+    ).fetchone()
+    if row is None:
+        return []
+    table = machine_partition_table(row[0])
+    if table not in get_machine_partitions(conn):
+        return []
+    cursor = conn.execute(
+        f"SELECT * FROM {table} WHERE snapshot_id = ? ORDER BY score DESC, id", (snapshot_id,)
+    )
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, values)) for values in cursor.fetchall()]
+
+
+@dataclass
+class ProcessSeries:
+    """A process timeseries as aligned columns: index i of each list is one sample.
+
+    A command can match several PIDs at once (or over time), so pids holds
+    the PID of each sample.
+    """
+
+    metrics: tuple[str, ...]
+    timestamps: list[float]
+    pids: list[int]
+    values: dict[str, list]
+
+
+def iter_process_series(
+    conn: sqlite3.Connection,
+    metrics: Sequence[str],
+    since: float,
+    until: float | None = None,
+    command: str | None = None,
+    pid: int | None = None,
+) -> Iterator[tuple]:
+    """Stream one process's machine snapshot rows, oldest first.
+
+    Reads only the hourly partitions overlapping [since, until), each via
+    its (command, snapshot_id) or (pid, snapshot_id) index, and yields rows
+    as the cursor produces them.
+
+    Args:
+        conn: Database connection
+        metrics: Columns to return, from SERIES_METRICS
+        since: Start of the range (captured_at >= since)
+        until: End of the range (captured_at < until); None for no end
+        command: Match this command name (exactly one of command and pid)
+        pid: Match this PID
+
+    Yields:
+        (captured_at, pid, *metric values) tuples
+
+    Raises:
+        ValueError: If a metric is unknown or not exactly one of command
+            and pid is given
+    """
+    if (command is None) == (pid is None):
+        raise ValueError("Give exactly one of command and pid")
+    unknown = [m for m in metrics if m not in SERIES_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+
+    column, key = ("command", command) if command is not None else ("pid", pid)
+    first_hour = int(since // MACHINE_PARTITION_SECONDS)
+    last_hour = None if until is None else int(until // MACHINE_PARTITION_SECONDS)
+    selected = "".join(f", p.{m}" for m in metrics)
+    time_clause, params = "s.captured_at >= ?", [key, since]
+    if until is not None:
+        time_clause += " AND s.captured_at < ?"
+        params.append(until)
+    for table in get_machine_partitions(conn):
+        hour = _partition_hour(table)
+        if hour < first_hour or (last_hour is not None and hour > last_hour):
+            continue
+        # CROSS JOIN keeps the partition outermost, so rows come off its index in order
+        yield from conn.execute(
+            f"""SELECT s.captured_at, p.pid{selected}
+                FROM {table} p CROSS JOIN machine_snapshots s ON s.id = p.snapshot_id
+                WHERE p.{column} = ? AND {time_clause}
+                ORDER BY p.snapshot_id""",
+            params,
+        )
+
+
+def get_process_series(
+    conn: sqlite3.Connection,
+    metrics: Sequence[str],
+    since: float,
+    until: float | None = None,
+    command: str | None = None,
+    pid: int | None = None,
+) -> ProcessSeries:
+    """Collect iter_process_series() into aligned columns."""
+    series = ProcessSeries(
+        metrics=tuple(metrics), timestamps=[], pids=[], values={m: [] for m in metrics}
+    )
+    columns = [series.values[m] for m in metrics]
+    for captured_at, row_pid, *values in iter_process_series(
+        conn, metrics, since, until, command=command, pid=pid
+    ):
+        series.timestamps.append(captured_at)
+        series.pids.append(row_pid)
+        for column, value in zip(columns, values):
+            column.append(value)
+    return series
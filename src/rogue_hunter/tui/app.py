@@ -3,7 +3,8 @@
 Philosophy: TUI = Real-time window into daemon state. Nothing more.
 - Display what the daemon sends via socket — no contrived data
 - CLI is for investigation; TUI is for "what's happening now"
-- Single-screen dashboard — no page switching for real-time monitoring
+- Single-screen dashboard — no page switching for real-time monitoring (the
+  flame and wait views of the latest capture, f and w, are overlays)
 """
 
 import asyncio
@@ -25,12 +26,15 @@ from rogue_hunter.storage import (
     get_forensic_captures,
     get_process_events,
 )
+from rogue_hunter.tui.culprits import CULPRIT_LIMIT, CULPRIT_SECONDS, CulpritsScreen
+from rogue_hunter.tui.flame import FlameScreen
 from rogue_hunter.tui.sparkline import (
     GradientColor,
     Sparkline,
     SparklineDirection,
     SparklineOrientation,
 )
+from rogue_hunter.tui.waitgraph import WaitGraphScreen
 
 
 def get_tier_name(score: int, elevated: int, critical: int) -> str:
@@ -1040,6 +1044,9 @@ class RogueHunterApp(App):
 
     BINDINGS = [
         ("q", "quit", "Quit"),
+        ("f", "flame", "Flame"),
+        ("w", "waits", "Waits"),
+        ("c", "culprits", "Culprits"),
     ]
 
     def __init__(self, config: Config | None = None):
@@ -1071,6 +1078,40 @@ class RogueHunterApp(App):
         self.sub_title = "Real-time Dashboard"
         asyncio.create_task(self._initial_connect())
 
+    def action_flame(self) -> None:
+        """Show the latest capture's call tree."""
+        self.push_screen(FlameScreen())
+
+    def action_waits(self) -> None:
+        """Show what the latest capture's blocked threads wait on."""
+        self.push_screen(WaitGraphScreen())
+
+    def action_culprits(self) -> None:
+        """Show the top culprits of the last CULPRIT_SECONDS."""
+        self.push_screen(CulpritsScreen())
+
+    def request_culprits(self) -> None:
+        """Ask the daemon for the top culprits; the reply comes through the read loop."""
+        if self._use_socket and self._socket_client:
+            asyncio.create_task(self._request_culprits(self._socket_client))
+
+    def _culprits_screen(self) -> CulpritsScreen | None:
+        """The culprits view, if it is the screen showing."""
+        try:
+            screen = self.screen
+        except ScreenStackError:
+            return None
+        return screen if isinstance(screen, CulpritsScreen) else None
+
+    async def _request_culprits(self, client: SocketClient) -> None:
+        """Send a culprits request (best-effort, like connection logging)."""
+        try:
+            await client.send_message(
+                {"type": "culprits", "seconds": CULPRIT_SECONDS, "limit": CULPRIT_LIMIT}
+            )
+        except ConnectionError:
+            pass
+
     def on_unmount(self) -> None:
         """Cleanup on shutdown."""
         self._stopping = True
@@ -1240,6 +1281,11 @@ class RogueHunterApp(App):
         if msg_type == "initial_state":
             return
 
+        if msg_type == "culprits":
+            if screen := self._culprits_screen():
+                screen.update_culprits(data)
+            return
+
         # Regular sample message
         now = time.time()
 
@@ -1269,6 +1315,10 @@ class RogueHunterApp(App):
         except NoMatches:
             pass
 
+        # Keep an open culprits view current
+        if self._culprits_screen():
+            self.request_culprits()
+
         # Refresh event history from database periodically (every 10 samples ≈ 3 seconds)
         if sample_count % 10 == 0:
             try:
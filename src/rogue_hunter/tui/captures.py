@@ -0,0 +1,138 @@
+"""Overlays that show one stored forensic capture at a time.
+
+A CaptureScreen opens on the latest capture over the dashboard; [ and ]
+step to older and newer ones. Subclasses say what to read from a capture
+(analyze(), run in a worker thread since big captures take a second or
+two) and how to draw it at the overlay's size (render_result()).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, ClassVar
+
+from rich.console import RenderableType
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Label, Static
+
+from rogue_hunter.storage import get_adjacent_capture_id, get_connection, get_forensic_capture
+
+
+class CaptureScreen(ModalScreen):
+    """Base overlay: one capture's analysis, stepping through captures."""
+
+    DEFAULT_CSS = """
+    CaptureScreen {
+        align: center middle;
+    }
+
+    CaptureScreen > Vertical {
+        width: 100%;
+        height: 100%;
+        border: solid $primary;
+        border-title-align: left;
+    }
+
+    CaptureScreen #capture-info {
+        height: 1;
+        width: 100%;
+    }
+
+    CaptureScreen #capture-body {
+        height: 1fr;
+        width: 100%;
+    }
+    """
+
+    BINDINGS = [
+        ("escape", "dismiss", "Close"),
+        ("left_square_bracket", "step(False)", "Older"),
+        ("right_square_bracket", "step(True)", "Newer"),
+    ]
+
+    PANEL_TITLE: ClassVar[str] = ""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._capture_id: int | None = None
+        self._result: Any = None
+
+    def analyze(self, conn: sqlite3.Connection, capture_id: int) -> Any:
+        """Read what to show from a capture (in a worker thread)."""
+        raise NotImplementedError
+
+    def summary(self, result: Any) -> str:
+        """A few words about the result for the info line."""
+        return ""
+
+    def render_result(self, result: Any, width: int, height: int) -> RenderableType:
+        """Draw the result at the body's size."""
+        raise NotImplementedError
+
+    def compose(self) -> ComposeResult:
+        """Create the view."""
+        with Vertical():
+            yield Label("Loading...", id="capture-info")
+            yield Static(id="capture-body")
+
+    def on_mount(self) -> None:
+        """Open on the latest capture."""
+        self.query_one(Vertical).border_title = self.PANEL_TITLE
+        self._load(None, newer=False)
+
+    def on_resize(self) -> None:
+        """Draw again for the new size."""
+        self._draw()
+
+    def action_step(self, newer: bool) -> None:
+        """Show the next older (or newer) capture."""
+        if self._capture_id is not None:
+            self._load(self._capture_id, newer)
+
+    @work(thread=True, exclusive=True)
+    def _load(self, capture_id: int | None, newer: bool) -> None:
+        """Read the capture next to capture_id (the latest if None) off the event loop."""
+        db_path = self.app.config.db_path
+        if not db_path.exists():
+            self.app.call_from_thread(self._show, None, None, "No database")
+            return
+        conn = get_connection(db_path)
+        try:
+            next_id = get_adjacent_capture_id(conn, capture_id, newer)
+            if next_id is None:
+                message = "No captures" if capture_id is None else "No more captures"
+                self.app.call_from_thread(self._show, None, None, message)
+                return
+            capture = get_forensic_capture(conn, next_id)
+            result = self.analyze(conn, next_id)
+        finally:
+            conn.close()
+        self.app.call_from_thread(self._show, capture, result, None)
+
+    def _show(self, capture: dict | None, result: Any, message: str | None) -> None:
+        """Switch to a loaded capture, or report why there is none."""
+        info = self.query_one("#capture-info", Label)
+        if capture is None:
+            if self._capture_id is None:
+                info.update(message or "")
+            else:
+                self.notify(message or "", severity="information")
+            return
+        self._capture_id = capture["id"]
+        self._result = result
+        info.update(
+            f"Capture {capture['id']}  event {capture['event_id']}  "
+            f"{capture['command']} [{capture['pid']}]  {capture['trigger']}  "
+            f"{self.summary(result)}  ([ older, ] newer, esc close)"
+        )
+        self._draw()
+
+    def _draw(self) -> None:
+        """Render the current result at the body's size."""
+        if self._capture_id is None:
+            return
+        body = self.query_one("#capture-body", Static)
+        body.update(self.render_result(self._result, body.size.width, body.size.height))
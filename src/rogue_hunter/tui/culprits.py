@@ -0,0 +1,105 @@
+"""Top culprits of the last N seconds, from the daemon's rolling culprit index.
+
+The screen asks the daemon over the socket when it opens and again with
+every sample while it stays open; replies arrive through the app's
+socket read loop, which hands them to update_culprits().
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Label, Static
+
+CULPRIT_SECONDS = 30.0
+CULPRIT_LIMIT = 20
+
+
+def render_culprits(culprits: list[dict], height: int) -> Text:
+    """One line per culprit (peak, time above threshold, max share), cut to height."""
+    lines: list[tuple[str, str]] = [("    PID  PEAK  ABOVE  MAX SHARE  PROCESS", "bold")]
+    for c in culprits:
+        lines.append(
+            (
+                f"{c['pid']:>7}  {c['score']:>4}  {c['seconds_above']:>4.0f}s  "
+                f"{c['max_share']:>9.0%}  {c['command']}",
+                "",
+            )
+        )
+    text = Text(no_wrap=True, overflow="ellipsis")
+    for line, style in lines[:height]:
+        text.append(line + "\n", style=style)
+    return text
+
+
+class CulpritsScreen(ModalScreen):
+    """Top culprits of the last CULPRIT_SECONDS, over the dashboard."""
+
+    DEFAULT_CSS = """
+    CulpritsScreen {
+        align: center middle;
+    }
+
+    CulpritsScreen > Vertical {
+        width: 100%;
+        height: 100%;
+        border: solid $primary;
+        border-title-align: left;
+    }
+
+    CulpritsScreen #culprits-info {
+        height: 1;
+        width: 100%;
+    }
+
+    CulpritsScreen #culprits-body {
+        height: 1fr;
+        width: 100%;
+    }
+    """
+
+    BINDINGS = [
+        ("escape", "dismiss", "Close"),
+        ("c", "dismiss", "Close"),
+    ]
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._culprits: list[dict] | None = None
+
+    def compose(self) -> ComposeResult:
+        """Create the view."""
+        with Vertical():
+            yield Label("Waiting for daemon...", id="culprits-info")
+            yield Static(id="culprits-body")
+
+    def on_mount(self) -> None:
+        """Ask the daemon for culprits."""
+        self.query_one(Vertical).border_title = "TOP CULPRITS"
+        self.app.request_culprits()
+
+    def on_resize(self) -> None:
+        """Draw again for the new size."""
+        self._draw()
+
+    def update_culprits(self, data: dict[str, Any]) -> None:
+        """Show a 'culprits' reply from the daemon."""
+        self._culprits = data.get("culprits", [])
+        self.query_one("#culprits-info", Label).update(
+            f"Last {data.get('seconds', 0):.0f}s  {len(self._culprits)} culprits  (esc close)"
+        )
+        self._draw()
+
+    def _draw(self) -> None:
+        """Render the culprits at the body's size."""
+        if self._culprits is None:
+            return
+        body = self.query_one("#culprits-body", Static)
+        if not self._culprits:
+            body.update("No rogues in the window.")
+            return
+        body.update(render_culprits(self._culprits, body.size.height))
@@ -0,0 +1,64 @@
+"""Flame view of a stored capture's merged tailspin call tree.
+
+An icicle over the dashboard: the capture on the top row, its processes
+below, and each row under them the callees of the row above, as wide as
+their share of samples.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import zlib
+
+from rich.console import RenderableType
+from rich.text import Text
+
+from rogue_hunter.calltree import CallNode, FlameSpan, build_call_tree, flame_rows
+from rogue_hunter.tui.captures import CaptureScreen
+
+# Warm flamegraph.pl-style fills; kernel frames ("_[k]") get the cool ones
+_USER_COLORS = ["#d9532c", "#e0733a", "#e89440", "#eeb149", "#d8692f", "#f0c75a"]
+_KERNEL_COLORS = ["#3f7fbf", "#4a91c9", "#5aa2d3"]
+
+
+def _span_style(node: CallNode) -> str:
+    """Fill for a node, stable per name so a frame keeps its color."""
+    colors = _KERNEL_COLORS if node.name.endswith("_[k]") else _USER_COLORS
+    return f"black on {colors[zlib.crc32(node.name.encode()) % len(colors)]}"
+
+
+def render_flame(rows: list[list[FlameSpan]], width: int) -> Text:
+    """Draw flame_rows() output, one line per row, names clipped to their span."""
+    text = Text(no_wrap=True, overflow="crop")
+    for row in rows:
+        column = 0
+        for span in row:
+            if span.column > column:
+                text.append(" " * (span.column - column))
+            label = span.node.name[: span.width - 1].ljust(span.width - 1) + " "
+            text.append(label if span.width > 1 else " ", style=_span_style(span.node))
+            column = span.column + span.width
+        text.append(" " * max(width - column, 0) + "\n")
+    return text
+
+
+class FlameScreen(CaptureScreen):
+    """Icicle of one capture's call tree over the dashboard."""
+
+    BINDINGS = [("f", "dismiss", "Close")]
+
+    PANEL_TITLE = "FLAME"
+
+    def analyze(self, conn: sqlite3.Connection, capture_id: int) -> CallNode:
+        """The capture's merged call tree."""
+        return build_call_tree(conn, capture_id)
+
+    def summary(self, result: CallNode) -> str:
+        """Samples in the tree."""
+        return f"{result.samples} samples"
+
+    def render_result(self, result: CallNode, width: int, height: int) -> RenderableType:
+        """The tree as an icicle, as deep as fits."""
+        if not result.samples:
+            return "No tailspin frames in this capture."
+        return render_flame(flame_rows(result, width, max_depth=height), width)
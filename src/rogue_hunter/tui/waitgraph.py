@@ -0,0 +1,57 @@
+"""Wait graph view of a stored capture: root blockers, deadlocks, long chains."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from rich.console import RenderableType
+from rich.text import Text
+
+from rogue_hunter.tui.captures import CaptureScreen
+from rogue_hunter.waitgraph import WaitGraph, build_wait_graph
+
+
+def render_wait_graph(graph: WaitGraph, height: int) -> Text:
+    """Root blockers, then cycles, then chains, cut to height lines."""
+    lines: list[tuple[str, str]] = [("ROOT BLOCKERS  threads  samples", "bold")]
+    for root in graph.roots:
+        blocker = ", ".join(graph.label(n) for n in root.nodes)
+        style = "bold red" if len(root.nodes) > 1 else ""
+        lines.append((f"{root.threads:>21}  {root.samples:>7}  {blocker}", style))
+    if graph.cycles:
+        lines.append(("", ""))
+        lines.append(("DEADLOCKS", "bold"))
+        for cycle in graph.cycles:
+            lines.append(("  " + " <-> ".join(graph.label(n) for n in cycle), "red"))
+    if graph.chains:
+        lines.append(("", ""))
+        lines.append(("LONGEST CHAINS  samples", "bold"))
+        for chain in graph.chains:
+            path = " -> ".join(graph.label(n) for n in chain.nodes)
+            lines.append((f"{chain.samples:>23}  {path}", ""))
+    text = Text(no_wrap=True, overflow="ellipsis")
+    for line, style in lines[:height]:
+        text.append(line + "\n", style=style)
+    return text
+
+
+class WaitGraphScreen(CaptureScreen):
+    """Who one capture's blocked threads wait on, over the dashboard."""
+
+    BINDINGS = [("w", "dismiss", "Close")]
+
+    PANEL_TITLE = "WAITS"
+
+    def analyze(self, conn: sqlite3.Connection, capture_id: int) -> WaitGraph:
+        """The capture's wait graph."""
+        return build_wait_graph(conn, capture_id)
+
+    def summary(self, result: WaitGraph) -> str:
+        """Waits and deadlocks found."""
+        return f"{len(result.edges)} waits  {len(result.cycles)} deadlocks"
+
+    def render_result(self, result: WaitGraph, width: int, height: int) -> RenderableType:
+        """Blockers and chains, as many as fit."""
+        if not result.edges:
+            return "No blocked threads with a known owner in this capture."
+        return render_wait_graph(result, height)
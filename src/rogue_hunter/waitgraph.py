@@ -0,0 +1,270 @@
+"""Who is waiting on whom in a forensic capture.
+
+A blocked tailspin frame records what its thread waits on (blocked_on):
+a process for wait4 ("zsh [46454]"), or a turnstile or lock and the
+thread holding it ("turnstile waiting for mds [420] thread 0x3f2a1").
+build_wait_graph() reads a capture's blocked frames in one query, parses
+each distinct blocked_on once, and links waiter threads to their owners:
+
+    make [10] 0x51      --wait4-->      zsh [20]
+    zsh [20] 0x77       --turnstile-->  mds [30] 0x3f2a1
+
+A process owner stands for its blocked threads, so the chain above runs
+make -> zsh -> mds. Strongly connected components of the graph are the
+deadlock cycles; a component nothing leads out of is a root blocker (an
+owner not itself blocked, or a cycle), credited with the blocked samples
+of every thread whose chain ends there.
+"""
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+
+class WaitNode(NamedTuple):
+    """A thread, or a whole process when thread_id is None."""
+
+    pid: int
+    thread_id: str | None = None
+
+
+class BlockedOn(NamedTuple):
+    """A parsed blocked_on: what is waited on and who holds it."""
+
+    resource: str
+    owner: WaitNode
+    owner_name: str | None
+
+
+@dataclass
+class WaitEdge:
+    """Samples a thread spent blocked on one owner's resource."""
+
+    waiter: WaitNode
+    owner: WaitNode
+    resource: str
+    samples: int
+
+
+@dataclass
+class RootBlocker:
+    """An owner (or cycle) at the end of wait chains, and what it holds up."""
+
+    nodes: tuple[WaitNode, ...]  # One owner, or the members of a cycle
+    threads: int  # Blocked threads whose chains end here
+    samples: int  # Their blocked samples
+
+
+@dataclass
+class WaitChain:
+    """The longest path from a thread nobody waits on to its root blocker."""
+
+    nodes: tuple[WaitNode, ...]  # Waiter first
+    samples: int  # The first thread's blocked samples
+
+
+@dataclass
+class WaitGraph:
+    """Result of build_wait_graph()."""
+
+    capture_id: int
+    names: dict[int, str] = field(default_factory=dict)  # pid -> process name
+    edges: list[WaitEdge] = field(default_factory=list)
+    unresolved: dict[str, int] = field(default_factory=dict)  # blocked_on -> samples
+    cycles: list[tuple[WaitNode, ...]] = field(default_factory=list)
+    chains: list[WaitChain] = field(default_factory=list)
+    roots: list[RootBlocker] = field(default_factory=list)
+
+    def label(self, node: WaitNode) -> str:
+        """Display name: "name [pid]", and "thread 0x..." for a thread."""
+        process = f"{self.names.get(node.pid, '?')} [{node.pid}]"
+        return process if node.thread_id is None else f"{process} thread {node.thread_id}"
+
+
+# "[<resource> waiting for|owned by|held by|on ]<name> [<pid>][ thread 0x<tid>]"
+_OWNER_RE = re.compile(
+    r"^(?:(?P<resource>.+?)\s+(?:waiting for|owned by|held by|on)\s+)?"
+    r"(?P<name>.+?)\s*\[(?P<pid>\d+)\](?:\s+thread\s+(?P<tid>0x[0-9a-f]+))?",
+    re.IGNORECASE,
+)
+_PID_RE = re.compile(r"^(?:(?P<resource>.+?)\s+on\s+)?pid:?\s*(?P<pid>\d+)", re.IGNORECASE)
+_PRIORITY_RE = re.compile(r"\s+with priority\s+\d+", re.IGNORECASE)
+
+
+def _thread_key(thread_id: str) -> str:
+    """Canonical thread id, so "0x3F2A1" in a wait matches thread "0x3f2a1"."""
+    try:
+        return f"0x{int(thread_id, 16):x}"
+    except ValueError:
+        return thread_id
+
+
+def parse_blocked_on(text: str) -> BlockedOn | None:
+    """Parse a blocked_on string; None if it names no owner (e.g. "sleep").
+
+    A bare target ("zsh [46454]", "pid:1234") is a wait4, as the parser
+    stores those. Turnstile priorities are dropped from the resource.
+    """
+    if match := _OWNER_RE.match(text):
+        tid = match["tid"]
+        owner = WaitNode(int(match["pid"]), _thread_key(tid) if tid else None)
+        resource = _PRIORITY_RE.sub("", match["resource"] or "wait4")
+        return BlockedOn(resource, owner, match["name"])
+    if match := _PID_RE.match(text):
+        return BlockedOn(match["resource"] or "wait4", WaitNode(int(match["pid"])), None)
+    return None
+
+
+def _components(successors: dict[WaitNode, dict[WaitNode, None]]) -> list[list[WaitNode]]:
+    """Strongly connected components, each after every component it leads to.
+
+    Iterative Tarjan: wait chains can be longer than the recursion limit.
+    """
+    index: dict[WaitNode, int] = {}
+    low: dict[WaitNode, int] = {}
+    stack: list[WaitNode] = []
+    on_stack: set[WaitNode] = set()
+    components: list[list[WaitNode]] = []
+    for start in successors:
+        if start in index:
+            continue
+        work = [(start, iter(successors[start]))]
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def build_wait_graph(
+    conn: sqlite3.Connection, capture_id: int, min_chain: int = 3, limit: int = 10
+) -> WaitGraph:
+    """Link a capture's blocked threads to what they wait on.
+
+    Args:
+        conn: Database connection
+        capture_id: Forensic capture to read
+        min_chain: Shortest chain (in waits) to report
+        limit: Chains to return (all cycles and root blockers are)
+
+    Returns:
+        WaitGraph; roots by samples held up, chains longest first
+    """
+    graph = WaitGraph(capture_id)
+    graph.names = dict(
+        conn.execute("SELECT pid, name FROM tailspin_process WHERE capture_id = ?", (capture_id,))
+    )
+
+    parsed: dict[str, BlockedOn | None] = {}
+    edges: dict[tuple[WaitNode, WaitNode, str], WaitEdge] = {}
+    blocked_samples: dict[WaitNode, int] = {}
+    for pid, thread_id, blocked_on, samples in conn.execute(
+        """SELECT p.pid, t.thread_id, f.blocked_on, f.sample_count
+           FROM tailspin_process p
+           JOIN tailspin_thread t ON t.process_id = p.id
+           JOIN tailspin_frame f ON f.thread_id = t.id
+           WHERE p.capture_id = ? AND f.blocked_on IS NOT NULL""",
+        (capture_id,),
+    ):
+        if blocked_on not in parsed:
+            parsed[blocked_on] = parse_blocked_on(blocked_on)
+        if (wait := parsed[blocked_on]) is None:
+            graph.unresolved[blocked_on] = graph.unresolved.get(blocked_on, 0) + samples
+            continue
+        waiter = WaitNode(pid, _thread_key(thread_id))
+        blocked_samples[waiter] = blocked_samples.get(waiter, 0) + samples
+        if wait.owner_name and wait.owner.pid not in graph.names:
+            graph.names[wait.owner.pid] = wait.owner_name
+        key = (waiter, wait.owner, wait.resource)
+        if edge := edges.get(key):
+            edge.samples += samples
+        else:
+            edges[key] = WaitEdge(waiter, wait.owner, wait.resource, samples)
+    graph.edges = sorted(edges.values(), key=lambda e: -e.samples)
+
+    # Successors in insertion order (dicts as ordered sets), so results
+    # don't vary with string hashing. A process waited on as a whole is
+    # held up by whatever its threads wait on.
+    successors: dict[WaitNode, dict[WaitNode, None]] = {}
+    by_process: dict[int, dict[WaitNode, None]] = {}
+    for edge in graph.edges:
+        successors.setdefault(edge.waiter, {})[edge.owner] = None
+        by_process.setdefault(edge.waiter.pid, {})[edge.owner] = None
+    for edge in graph.edges:
+        if edge.owner not in successors:
+            held_up_by = by_process.get(edge.owner.pid) if edge.owner.thread_id is None else None
+            successors[edge.owner] = held_up_by or {}
+
+    components = _components(successors)
+    component_of = {node: i for i, members in enumerate(components) for node in members}
+    roots: list[set[int]] = []
+    depth: dict[WaitNode, int] = {}
+    next_node: dict[WaitNode, WaitNode] = {}
+    for i, members in enumerate(components):  # Every component after those it leads to
+        leads_to = set()
+        for node in members:
+            depth[node] = 0
+            for owner in successors[node]:
+                if (j := component_of[owner]) == i:
+                    continue
+                leads_to.add(j)
+                if depth[owner] + 1 > depth[node]:
+                    depth[node] = depth[owner] + 1
+                    next_node[node] = owner
+        roots.append(set().union(*(roots[j] for j in leads_to)) if leads_to else {i})
+        if len(members) > 1 or members[0] in successors[members[0]]:
+            graph.cycles.append(tuple(sorted(members, key=_node_order)))
+
+    held_up: dict[int, list[int]] = {}  # Root component -> [threads, samples]
+    for thread, samples in blocked_samples.items():
+        for root in roots[component_of[thread]]:
+            totals = held_up.setdefault(root, [0, 0])
+            totals[0] += 1
+            totals[1] += samples
+    graph.roots = [
+        RootBlocker(tuple(sorted(components[root], key=_node_order)), threads, samples)
+        for root, (threads, samples) in held_up.items()
+    ]
+    graph.roots.sort(key=lambda r: (-r.samples, -r.threads, _node_order(r.nodes[0])))
+
+    # Chains start at blocked threads nothing waits on, directly or via their process
+    waited_on = {edge.owner for edge in graph.edges}
+    for thread, samples in blocked_samples.items():
+        if depth[thread] < min_chain or thread in waited_on or WaitNode(thread.pid) in waited_on:
+            continue
+        nodes = [thread]
+        while nodes[-1] in next_node:
+            nodes.append(next_node[nodes[-1]])
+        graph.chains.append(WaitChain(tuple(nodes), samples))
+    graph.chains.sort(key=lambda c: (-len(c.nodes), -c.samples))
+    del graph.chains[limit:]
+    return graph
+
+
+def _node_order(node: WaitNode) -> tuple[int, str]:
+    return node.pid, node.thread_id or ""
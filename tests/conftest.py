@@ -6,7 +6,12 @@ from pathlib import Path
 import pytest
 
 from rogue_hunter.collector import ProcessScore
-from rogue_hunter.storage import init_database
+from rogue_hunter.storage import (
+    init_database,
+    insert_tailspin_frame,
+    insert_tailspin_process,
+    insert_tailspin_thread,
+)
 
 
 @pytest.fixture
@@ -127,3 +132,34 @@ def make_process_score(
         disproportionality=disproportionality,
         dominant_resource=dominant_resource,
     )
+
+
+def insert_tailspin_stacks(
+    conn, capture_id: int, pid: int, name: str, threads: list[list[tuple]], **process_fields
+) -> None:
+    """Insert a tailspin process with threads of frames given in DFS order.
+
+    Frames are (depth, samples, symbol, is_kernel) or, for a blocked frame,
+    (depth, samples, symbol, is_kernel, blocked_on).
+    """
+    process_id = insert_tailspin_process(conn, capture_id, pid, name, **process_fields)
+    for t, frames in enumerate(threads):
+        thread_id = insert_tailspin_thread(conn, process_id, f"0x{t:x}")
+        parents: list[int] = []
+        for depth, samples, symbol, is_kernel, *blocked_on in frames:
+            del parents[depth:]
+            parents.append(
+                insert_tailspin_frame(
+                    conn,
+                    thread_id,
+                    depth,
+                    samples,
+                    is_kernel,
+                    "0x1000",
+                    parent_frame_id=parents[-1] if parents else None,
+                    symbol_name=symbol,
+                    library_name="libsystem_kernel.dylib",
+                    blocked_on=blocked_on[0] if blocked_on else None,
+                )
+            )
+    conn.commit()
@@ -0,0 +1,226 @@
+"""Tests for weekly event archives."""
+
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from rogue_hunter.archive import (
+    archive_events,
+    archive_path,
+    get_archived_events,
+    get_event_archive,
+    iter_archived_events,
+    merge_event_streams,
+    merge_events,
+    open_archived_event,
+    read_archive_table,
+    remove_archived,
+    week_name,
+    write_archives,
+)
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    get_connection,
+    get_forensic_captures,
+    get_log_entries,
+    get_process_event_detail,
+    get_process_events,
+    get_process_snapshots,
+    get_tailspin_frames,
+    get_tailspin_processes,
+    get_tailspin_threads,
+    insert_process_snapshot,
+    iter_process_events,
+    update_process_event_peak,
+)
+from tests.conftest import make_process_score
+
+DAY = 86400
+
+
+def _add_event(conn: sqlite3.Connection, age_days: float, pid: int = 100) -> int:
+    """Insert a closed event with a snapshot, capture, log entry and tailspin tree."""
+    exit_time = time.time() - age_days * DAY
+    event_id = conn.execute(
+        """INSERT INTO process_events
+           (pid, command, boot_time, entry_time, exit_time, entry_band, peak_band, peak_score)
+           VALUES (?, 'proc', 1, ?, ?, 'high', 'high', 60)""",
+        (pid, exit_time - 60, exit_time),
+    ).lastrowid
+    snapshot_id = insert_process_snapshot(conn, event_id, "entry", make_process_score(pid=pid))
+    update_process_event_peak(conn, event_id, 60, "high", snapshot_id)
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+    conn.execute(
+        """INSERT INTO log_entries (capture_id, timestamp, event_message)
+           VALUES (?, '2026-01-01 00:00:00', ?)""",
+        (capture_id, f"message {pid}"),
+    )
+    process_id = conn.execute(
+        "INSERT INTO tailspin_process (capture_id, pid, name) VALUES (?, ?, 'proc')",
+        (capture_id, pid),
+    ).lastrowid
+    thread_id = conn.execute(
+        "INSERT INTO tailspin_thread (process_id, thread_id, num_samples) VALUES (?, '0x1', 9)",
+        (process_id,),
+    ).lastrowid
+    conn.execute(
+        """INSERT INTO tailspin_frame (thread_id, depth, sample_count, is_kernel, address)
+           VALUES (?, 0, 9, 0, '0x1000')""",
+        (thread_id,),
+    )
+    conn.commit()
+    return event_id
+
+
+def _count(conn: sqlite3.Connection, table: str) -> int:
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.fixture
+def conn(initialized_db: Path):
+    conn = get_connection(initialized_db)
+    yield conn
+    conn.close()
+
+
+def test_archive_moves_events_with_children(conn: sqlite3.Connection, tmp_path: Path):
+    """Old closed events and their rows leave the database for weekly files."""
+    old = [_add_event(conn, 40, pid=i) for i in range(3)]
+    recent = _add_event(conn, 1)
+    archive_dir = tmp_path / "archive"
+
+    result = archive_events(conn, archive_dir, older_than_days=30, batch_size=2)
+
+    assert result.events_archived == 3
+    assert [e["id"] for e in get_process_events(conn)] == [recent]
+    for table in ("process_snapshots", "forensic_captures", "log_entries", "tailspin_frame"):
+        assert _count(conn, table) == 1
+    week = week_name(time.time() - 40 * DAY - 60)
+    assert result.files_written == [archive_path(archive_dir, week).name]
+    name = result.files_written[0]
+    assert [get_event_archive(conn, i) for i in old] == [(name, 0), (name, 0), (name, 1)]
+    assert get_event_archive(conn, recent) is None
+
+
+def test_archived_event_reads_like_live(conn: sqlite3.Connection, tmp_path: Path):
+    """Storage getters return the same rows for an event once archived."""
+    event_id = _add_event(conn, 40)
+    capture_id = get_forensic_captures(conn, event_id)[0]["id"]
+
+    def read(c: sqlite3.Connection) -> list:
+        process = get_tailspin_processes(c, capture_id)[0]
+        thread = get_tailspin_threads(c, process["id"])[0]
+        return [
+            get_process_event_detail(c, event_id),
+            get_process_snapshots(c, event_id),
+            get_forensic_captures(c, event_id),
+            get_log_entries(c, capture_id),
+            process,
+            thread,
+            get_tailspin_frames(c, thread["id"]),
+        ]
+
+    live = read(conn)
+    archive_events(conn, tmp_path, older_than_days=30)
+    assert get_process_event_detail(conn, event_id) is None
+
+    archived = open_archived_event(conn, tmp_path, event_id)
+    assert archived is not None
+    assert read(archived) == live
+    archived.close()
+    assert open_archived_event(conn, tmp_path, event_id + 1) is None
+
+
+def test_history_reads_live_and_archived(conn: sqlite3.Connection, tmp_path: Path):
+    """Archived events merge into history by entry time."""
+    old = _add_event(conn, 40)
+    older = _add_event(conn, 50)
+    recent = _add_event(conn, 1)
+    archive_events(conn, tmp_path, older_than_days=30)
+
+    archived = get_archived_events(tmp_path, time_cutoff=time.time() - 45 * DAY)
+    assert [e["id"] for e in archived] == [old]
+
+    live = get_process_events(conn, limit=10)
+    merged = merge_events(live, get_archived_events(tmp_path, limit=10), limit=10)
+    assert [e["id"] for e in merged] == [recent, old, older]
+    assert merge_events(live, get_archived_events(tmp_path), limit=2)[-1]["id"] == old
+
+
+def test_event_streams_merge_newest_first(conn: sqlite3.Connection, tmp_path: Path):
+    """Live and archived streams interleave by entry time; live copies win."""
+    old = _add_event(conn, 40)
+    older = _add_event(conn, 50)
+    recent = _add_event(conn, 1)
+    write_archives(conn, tmp_path, 30)  # Written but not yet deleted: in both
+
+    merged = list(merge_event_streams(iter_process_events(conn), iter_archived_events(tmp_path)))
+
+    assert [e["id"] for e in merged] == [recent, old, older]
+
+
+def test_interrupted_archive_is_rerun_without_duplicates(conn: sqlite3.Connection, tmp_path: Path):
+    """Events written to a file but not deleted are archived again next run."""
+    event_id = _add_event(conn, 40)
+    with patch("rogue_hunter.archive._delete_batch", side_effect=RuntimeError("crash")):
+        with pytest.raises(RuntimeError):
+            archive_events(conn, tmp_path, older_than_days=30)
+    assert get_process_event_detail(conn, event_id) is not None
+
+    result = archive_events(conn, tmp_path, older_than_days=30)
+
+    assert result.events_archived == 1
+    path = tmp_path / result.files_written[0]
+    assert [row["id"] for row in read_archive_table(path, "process_events")] == [event_id]
+    assert len(read_archive_table(path, "tailspin_frame")) == 1
+
+
+def test_expired_archives_are_deleted(conn: sqlite3.Connection, tmp_path: Path):
+    """Archive files older than keep_days are removed with their index rows."""
+    event_id = _add_event(conn, 400)
+    first = archive_events(conn, tmp_path, older_than_days=30, keep_days=1000)
+    assert (tmp_path / first.files_written[0]).exists()
+
+    result = archive_events(conn, tmp_path, older_than_days=30, keep_days=365)
+
+    assert result.files_expired == 1
+    assert not (tmp_path / first.files_written[0]).exists()
+    assert get_event_archive(conn, event_id) is None
+
+
+def test_write_archives_stops_when_asked(conn: sqlite3.Connection, tmp_path: Path):
+    """should_stop ends writing before the next week."""
+    _add_event(conn, 40)
+    archive_dir = tmp_path / "archive"
+    assert write_archives(conn, archive_dir, 30, should_stop=lambda: True) == {}
+    assert not archive_dir.exists()
+
+
+def test_remove_archived_yields_per_batch(conn: sqlite3.Connection, tmp_path: Path):
+    """Deletes run one batch per step; stopping early leaves the rest live."""
+    for i in range(5):
+        _add_event(conn, 40, pid=i)
+    written = write_archives(conn, tmp_path, 30)
+    assert _count(conn, "process_events") == 5  # Writing only reads
+
+    steps = remove_archived(conn, tmp_path, written, batch_size=2)
+    assert next(steps).events_archived == 1  # Batches start small and adapt
+    steps.close()
+    assert _count(conn, "process_events") == 4
+
+    steps = list(remove_archived(conn, tmp_path, write_archives(conn, tmp_path, 30), batch_size=2))
+    deleted = [step.events_archived for step in steps]
+    assert deleted[-1] == 4
+    assert all(b - a <= 2 for a, b in zip([0] + deleted, deleted))
+    assert _count(conn, "process_events") == 0
+    archived = get_archived_events(tmp_path)
+    assert sorted(e["pid"] for e in archived) == [0, 1, 2, 3, 4]
+
+
+def test_archive_rejects_invalid_days(conn: sqlite3.Connection, tmp_path: Path):
+    """Archiving everything closed up to now is not allowed."""
+    with pytest.raises(ValueError):
+        archive_events(conn, tmp_path, older_than_days=0)
@@ -0,0 +1,108 @@
+"""Tests for merged call trees over stored tailspin frames."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from rogue_hunter.calltree import CallNode, build_call_tree, flame_rows, folded_stacks
+from rogue_hunter.storage import create_forensic_capture, create_process_event, get_connection
+from tests.conftest import insert_tailspin_stacks
+
+
+@pytest.fixture
+def capture_conn(initialized_db: Path):
+    """Connection with capture 1: WindowServer [400] (two threads) and cat [7].
+
+    The threads share start -> main; one runs render, the other idles in
+    mach_msg (kernel frame) and in an unsymbolicated frame.
+    """
+    conn = get_connection(initialized_db)
+    event_id = create_process_event(conn, 400, "WindowServer", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+    insert_tailspin_stacks(
+        conn,
+        capture_id,
+        400,
+        "WindowServer",
+        [
+            [(0, 100, "start", False), (1, 90, "main", False), (2, 60, "render", False)],
+            [
+                (0, 50, "start", False),
+                (1, 50, "main", False),
+                (2, 30, "mach_msg", True),
+                (2, 20, None, False),
+            ],
+        ],
+    )
+    insert_tailspin_stacks(
+        conn, capture_id, 7, "cat", [[(0, 10, "start", False), (1, 10, "read", True)]]
+    )
+    yield conn
+    conn.close()
+
+
+def test_build_call_tree_merges_threads_by_symbol_path(capture_conn):
+    """Threads of a process merge into one tree under "name [pid]"."""
+    root = build_call_tree(capture_conn, 1)
+
+    assert root.name == "capture 1"
+    assert root.samples == 160
+    assert sorted(root.children) == ["WindowServer [400]", "cat [7]"]
+    main = root.children["WindowServer [400]"].children["start"].children["main"]
+    assert main.samples == 140
+    assert {name: c.samples for name, c in main.children.items()} == {
+        "render": 60,
+        "mach_msg_[k]": 30,
+        "??? (libsystem_kernel.dylib)": 20,
+    }
+    assert main.self_samples == 30
+    assert root.children["WindowServer [400]"].children["start"].self_samples == 10
+
+
+def test_build_call_tree_one_process(capture_conn):
+    """pid limits the tree to that process; another capture's frames stay out."""
+    event_id = create_process_event(capture_conn, 9, "other", 1, time.time(), "high", 70, "high")
+    other = create_forensic_capture(capture_conn, event_id, "band_entry_high")
+    insert_tailspin_stacks(capture_conn, other, 7, "cat", [[(0, 5, "start", False)]])
+
+    root = build_call_tree(capture_conn, 1, pid=7)
+
+    assert list(root.children) == ["cat [7]"]
+    assert root.samples == 10
+    assert build_call_tree(capture_conn, other).samples == 5
+    assert build_call_tree(capture_conn, 99).children == {}
+
+
+def test_folded_stacks(capture_conn):
+    """One line per stack with self samples, ";" in names escaped."""
+    root = build_call_tree(capture_conn, 1)
+    root.children["cat [7]"].children["start"].child("a;b").samples = 5
+
+    assert sorted(folded_stacks(root)) == [
+        "WindowServer [400];start 10",
+        "WindowServer [400];start;main 30",
+        "WindowServer [400];start;main;??? (libsystem_kernel.dylib) 20",
+        "WindowServer [400];start;main;mach_msg_[k] 30",
+        "WindowServer [400];start;main;render 60",
+        "cat [7];start;a:b 5",
+        "cat [7];start;read_[k] 10",
+    ]
+
+
+def test_flame_rows_scale_to_width():
+    """Spans are proportional to samples, widest first, under their parent."""
+    root = CallNode("root", 100)
+    a = root.child("a")
+    a.samples = 75
+    a.child("deep").samples = 75
+    root.child("b").samples = 24
+    root.child("tiny").samples = 1
+
+    rows = flame_rows(root, 40)
+
+    assert [(s.column, s.width, s.node.name) for s in rows[0]] == [(0, 40, "root")]
+    assert [(s.column, s.width, s.node.name) for s in rows[1]] == [(0, 30, "a"), (30, 10, "b")]
+    assert [(s.column, s.width, s.node.name) for s in rows[2]] == [(0, 30, "deep")]
+    assert len(flame_rows(root, 40, max_depth=2)) == 2
+    assert flame_rows(CallNode("empty"), 40) == []
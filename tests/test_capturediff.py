@@ -0,0 +1,131 @@
+"""Tests for differences between forensic captures."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from rogue_hunter.calltree import CallNode
+from rogue_hunter.capturediff import diff_call_trees, diff_captures
+from rogue_hunter.storage import create_forensic_capture, create_process_event, get_connection
+from tests.conftest import insert_tailspin_stacks
+
+
+def tree(stacks: dict[tuple[str, ...], int]) -> CallNode:
+    """A call tree from {path: self samples}."""
+    root = CallNode("root")
+    for path, samples in stacks.items():
+        node = root
+        node.samples += samples
+        for name in path:
+            node = node.child(name)
+            node.samples += samples
+    return root
+
+
+@pytest.fixture
+def two_captures(initialized_db: Path):
+    """Connection with captures 1 and 2 of WindowServer [400], mds [90] and cat [7].
+
+    From 1 to 2, WindowServer's render share shrinks and mach_msg grows,
+    its second thread blocks on mds (one thread was already blocked on
+    disk I/O in both), cat exits and WindowServer's CPU time doubles.
+    """
+    conn = get_connection(initialized_db)
+    event_id = create_process_event(conn, 400, "WindowServer", 1, time.time(), "high", 70, "high")
+    first = create_forensic_capture(conn, event_id, "band_entry_high")
+    second = create_forensic_capture(conn, event_id, "band_escalation")
+    disk = [(0, 10, "start", False), (1, 10, "pread", True, "disk I/O")]
+    insert_tailspin_stacks(
+        conn,
+        first,
+        400,
+        "WindowServer",
+        [
+            [(0, 80, "start", False), (1, 80, "main", False), (2, 60, "render", False)],
+            [(0, 10, "start", False), (1, 10, "mach_msg", True)],
+            disk,
+        ],
+        cpu_time_sec=1.0,
+        io_bytes=2_000_000,
+    )
+    insert_tailspin_stacks(conn, first, 7, "cat", [[(0, 100, "read", True)]], cpu_time_sec=0.5)
+    insert_tailspin_stacks(
+        conn,
+        second,
+        400,
+        "WindowServer",
+        [
+            [(0, 40, "start", False), (1, 40, "main", False), (2, 20, "render", False)],
+            [(0, 150, "start", False), (1, 150, "mach_msg", True, "mach_msg on mds [90]")],
+            disk,
+        ],
+        cpu_time_sec=2.0,
+        io_bytes=1_000_000,
+    )
+    insert_tailspin_stacks(conn, second, 90, "mds", [[(0, 0, "idle", False)]], cpu_time_sec=0.0)
+    yield conn
+    conn.close()
+
+
+def test_diff_call_trees_ranks_share_changes():
+    """Stacks are compared by share of samples, so capture length cancels out.
+
+    main's self samples double with the capture's, so it is unchanged.
+    """
+    a = tree({("p", "main", "render"): 60, ("p", "main"): 20, ("p", "idle"): 20})
+    b = tree({("p", "main", "render"): 60, ("p", "main"): 40, ("p", "idle"): 100, ("q",): 0})
+
+    grew, shrank = diff_call_trees(a, b)
+
+    assert [(c.path, round(c.change, 2)) for c in grew] == [(("p", "idle"), 0.3)]
+    assert [(c.path, round(c.change, 2)) for c in shrank] == [(("p", "main", "render"), -0.3)]
+    assert (grew[0].samples_a, grew[0].samples_b) == (20, 100)
+
+
+def test_diff_call_trees_limit_and_one_sided_stacks():
+    """Stacks only in one tree count from or to zero; limit keeps the largest."""
+    a = tree({("gone",): 10, ("kept",): 90})
+    b = tree({("new", "deep"): 30, ("new",): 5, ("kept",): 65, ("small",): 1})
+
+    grew, shrank = diff_call_trees(a, b, limit=1)
+
+    assert [c.path for c in grew] == [("new", "deep")]
+    assert [(c.path, c.share_a, c.share_b) for c in shrank] == [(("kept",), 0.9, 65 / 101)]
+    _, shrank = diff_call_trees(a, b)
+    assert (("gone",), 0.1, 0.0) in [(c.path, c.share_a, c.share_b) for c in shrank]
+
+
+def test_diff_captures(two_captures):
+    """Stack shares, newly blocked threads and process deltas between two captures."""
+    diff = diff_captures(two_captures, 1, 2, limit=2)
+
+    assert (diff.samples_a, diff.samples_b) == (200, 200)
+    assert [c.path for c in diff.grew] == [("WindowServer [400]", "start", "mach_msg_[k]")]
+    assert [c.path for c in diff.shrank] == [
+        ("cat [7]", "read_[k]"),
+        ("WindowServer [400]", "start", "main", "render"),
+    ]
+    [blocked] = diff.newly_blocked
+    assert (blocked.pid, blocked.thread_id, blocked.blocked_on, blocked.samples) == (
+        400,
+        "0x1",
+        "mach_msg on mds [90]",
+        150,
+    )
+    assert [(p.name, p.cpu_a, p.cpu_b, p.cpu_change) for p in diff.processes] == [
+        ("WindowServer", 1.0, 2.0, 1.0),
+        ("cat", 0.5, None, -0.5),
+        ("mds", None, 0.0, 0.0),
+    ]
+    assert diff.processes[0].io_bytes_change == -1_000_000
+
+
+def test_diff_captures_one_process(two_captures):
+    """pid limits every part of the diff to that process."""
+    diff = diff_captures(two_captures, 1, 2, pid=7)
+
+    assert diff.samples_b == 0
+    assert [c.path for c in diff.shrank] == [("cat [7]", "read_[k]")]
+    assert diff.grew == diff.newly_blocked == []
+    assert [p.name for p in diff.processes] == ["cat"]
@@ -93,6 +93,48 @@ class TestEventsCommand:
         assert "test_proc" in result.output
         assert "high" in result.output
 
+    def test_events_export_with_details(self, runner: CliRunner, tmp_path: Path) -> None:
+        """events --format csv streams the boot's events with snapshots inline."""
+        import csv
+        import io
+        import json
+        import sqlite3
+
+        from rogue_hunter.storage import insert_process_snapshot
+        from tests.conftest import make_process_score
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = sqlite3.connect(db_path)
+        for i in range(30):
+            event_id = create_process_event(
+                conn,
+                pid=i,
+                command="test_proc",
+                boot_time=1706000000,
+                entry_time=time.time() - 60 + i,
+                entry_band="elevated",
+                peak_score=50,
+                peak_band="high",
+            )
+            insert_process_snapshot(conn, event_id, "entry", make_process_score(pid=i))
+        conn.close()
+
+        with (
+            patch("rogue_hunter.config.Config.load") as mock_load,
+            patch("rogue_hunter.boottime.get_boot_time", return_value=1706000000),
+        ):
+            mock_config = MagicMock(spec=Config)
+            mock_config.db_path = db_path
+            mock_config.archive_dir = tmp_path / "archive"
+            mock_load.return_value = mock_config
+            result = runner.invoke(main, ["events", "-f", "csv", "--details"])
+
+        assert result.exit_code == 0
+        rows = list(csv.DictReader(io.StringIO(result.output)))
+        assert [int(row["pid"]) for row in rows] == list(range(29, -1, -1))  # Past --limit
+        assert json.loads(rows[0]["snapshots"])[0]["event_id"] == int(rows[0]["id"])
+
     def test_events_show_specific_event(self, runner: CliRunner, tmp_path: Path) -> None:
         """events show <id> shows a specific event."""
         import sqlite3
@@ -333,6 +375,37 @@ class TestHistoryCommand:
         assert "peak_score" in lines[0]
         assert len(lines) == 2  # header + 1 data row
 
+    def test_history_ndjson_streams_every_event(self, runner: CliRunner, tmp_path: Path) -> None:
+        """history exports are not capped at a fixed number of events."""
+        import json
+        import sqlite3
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = sqlite3.connect(db_path)
+        now = time.time()
+        conn.executemany(
+            """INSERT INTO process_events
+               (pid, command, boot_time, entry_time, entry_band, peak_band, peak_score)
+               VALUES (?, 'proc', 1, ?, 'high', 'high', 60)""",
+            [(i, now - i) for i in range(1500)],
+        )
+        conn.commit()
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        mock_config.archive_dir = tmp_path / "archive"
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            result = runner.invoke(main, ["history", "-f", "ndjson"])
+            rejected = runner.invoke(main, ["history", "--details"])
+
+        assert result.exit_code == 0
+        pids = [json.loads(line)["pid"] for line in result.output.splitlines()]
+        assert pids == list(range(1500))
+        assert rejected.exit_code == 2
+        assert "--details needs --format" in rejected.output
+
     def test_history_hours_option(self, runner: CliRunner, tmp_path: Path) -> None:
         """history --hours limits time range."""
         import sqlite3
@@ -444,6 +517,359 @@ class TestPruneCommand:
         assert "Deleted 0 events" in result.output
 
 
+class TestSeriesCommand:
+    """Tests for the series command."""
+
+    def _invoke(self, runner: CliRunner, tmp_path: Path, args: list[str]):
+        from rogue_hunter.storage import get_connection, insert_machine_snapshot
+        from tests.conftest import make_process_score
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = get_connection(db_path)
+        now = time.time()
+        for i in range(3):
+            insert_machine_snapshot(
+                conn,
+                now - 600 + i * 240,
+                [make_process_score(pid=42, command="busy", cpu=10.0 * i, mem=100 + i)],
+            )
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            return runner.invoke(main, ["series", *args])
+
+    def test_series_csv_by_command(self, runner: CliRunner, tmp_path: Path) -> None:
+        """series streams one CSV row per snapshot, oldest first."""
+        result = self._invoke(runner, tmp_path, ["busy", "--since", "1h"])
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert lines[0] == "captured_at,pid,cpu,mem"
+        assert [line.split(",")[1:] for line in lines[1:]] == [
+            ["42", "0.0", "100"],
+            ["42", "10.0", "101"],
+            ["42", "20.0", "102"],
+        ]
+
+    def test_series_json_by_pid(self, runner: CliRunner, tmp_path: Path) -> None:
+        """series --format json returns aligned arrays."""
+        import json
+
+        result = self._invoke(runner, tmp_path, ["42", "-m", "cpu", "-s", "7m", "-f", "json"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["pid"] == [42, 42]
+        assert data["cpu"] == [10.0, 20.0]
+        assert len(data["timestamps"]) == 2
+
+    def test_series_rejects_bad_options(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Unknown metrics and durations are usage errors."""
+        bad_metric = self._invoke(runner, tmp_path, ["busy", "-m", "cpu,bogus"])
+        bad_since = self._invoke(runner, tmp_path, ["busy", "-s", "6x"])
+
+        assert bad_metric.exit_code == 2
+        assert "bogus" in bad_metric.output
+        assert bad_since.exit_code == 2
+
+
+class TestTopOffendersCommand:
+    """Tests for the top-offenders and rebuild-stats commands."""
+
+    def test_top_offenders_from_rollup(self, runner: CliRunner, tmp_path: Path) -> None:
+        """top-offenders ranks commands; rebuild-stats recomputes the same rollup."""
+        import json
+
+        from rogue_hunter.storage import close_process_event, get_connection
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = get_connection(db_path)
+        now = time.time()
+        for command, count in (("hog", 3), ("spiky", 1)):
+            for _ in range(count):
+                event_id = create_process_event(
+                    conn, 1, command, 1, now - 120, "critical", 85, "critical"
+                )
+                close_process_event(conn, event_id, now - 60)
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        mock_config.archive_dir = tmp_path / "archive"
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            table = runner.invoke(main, ["top-offenders"])
+            rebuilt = runner.invoke(main, ["rebuild-stats"])
+            data = runner.invoke(main, ["top-offenders", "-f", "json", "-n", "1"])
+            empty = runner.invoke(main, ["top-offenders", "--band", "low"])
+
+        assert table.exit_code == 0
+        lines = table.output.splitlines()
+        assert lines[2].split()[:3] == ["hog", "3", "3"]
+        assert lines[3].split()[:3] == ["spiky", "1", "1"]
+        assert "Rebuilt command stats from 4 closed events" in rebuilt.output
+        assert [(o["command"], o["median_score"]) for o in json.loads(data.output)] == [("hog", 85)]
+        assert "No low events in the last 30 days" in empty.output
+
+
+class TestSearchCommand:
+    """Tests for the search command."""
+
+    def test_search_logs_and_frames(self, runner: CliRunner, tmp_path: Path) -> None:
+        """search lists matching captures with their event; bad queries are usage errors."""
+        import json
+
+        from rogue_hunter.storage import (
+            create_forensic_capture,
+            get_connection,
+            index_capture_search,
+            insert_log_entry,
+        )
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = get_connection(db_path)
+        event_id = create_process_event(conn, 1, "WindowServer", 1, time.time(), "high", 70, "high")
+        capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+        insert_log_entry(conn, capture_id, "2024-01-15 10:30:00", "watchdog timeout")
+        index_capture_search(conn, capture_id)
+        conn.commit()
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            table = runner.invoke(main, ["search", "watchdog"])
+            data = runner.invoke(main, ["search", "watchdog", "--in", "logs", "-f", "json"])
+            none = runner.invoke(main, ["search", "watchdog", "--in", "frames"])
+            bad = runner.invoke(main, ["search", '"unbalanced'])
+
+        assert table.exit_code == 0
+        assert table.output.splitlines()[2].split()[:3] == [
+            str(capture_id),
+            str(event_id),
+            "WindowServer",
+        ]
+        assert "[watchdog] timeout" in table.output
+        [hit] = json.loads(data.output)
+        assert (hit["event_id"], hit["matches"]) == (event_id, {"logs": 1})
+        assert "No matching captures." in none.output
+        assert bad.exit_code == 2
+        assert "Invalid search query" in bad.output
+
+
+class TestForensicsCommand:
+    """Tests for the forensics commands."""
+
+    def test_flame_tree_and_folded(self, runner: CliRunner, tmp_path: Path) -> None:
+        """flame prints the merged tree or folded stacks; unknown captures fail."""
+        from rogue_hunter.storage import (
+            create_forensic_capture,
+            get_connection,
+            insert_tailspin_frame,
+            insert_tailspin_process,
+            insert_tailspin_thread,
+        )
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = get_connection(db_path)
+        event_id = create_process_event(
+            conn, 400, "WindowServer", 1, time.time(), "high", 70, "high"
+        )
+        capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+        process_id = insert_tailspin_process(conn, capture_id, 400, "WindowServer")
+        thread_id = insert_tailspin_thread(conn, process_id, "0x1")
+        start = insert_tailspin_frame(conn, thread_id, 0, 1000, False, "0x1", symbol_name="start")
+        insert_tailspin_frame(
+            conn, thread_id, 1, 995, False, "0x2", parent_frame_id=start, symbol_name="main"
+        )
+        insert_tailspin_frame(
+            conn, thread_id, 1, 5, False, "0x3", parent_frame_id=start, symbol_name="rare"
+        )
+        conn.commit()
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            tree = runner.invoke(main, ["forensics", "flame", str(capture_id)])
+            everything = runner.invoke(main, ["forensics", "flame", "1", "--min-pct", "0"])
+            folded = runner.invoke(main, ["forensics", "flame", "1", "-f", "folded"])
+            missing = runner.invoke(main, ["forensics", "flame", "99"])
+
+        assert tree.exit_code == 0
+        assert "WindowServer [400], 1000 samples" in tree.output
+        assert [line.split() for line in tree.output.splitlines()[3:]] == [
+            ["100.0%", "1000", "0", "WindowServer", "[400]"],
+            ["100.0%", "1000", "0", "start"],
+            ["99.5%", "995", "995", "main"],
+        ]
+        assert "rare" in everything.output
+        assert folded.output.splitlines() == [
+            "WindowServer [400];start;main 995",
+            "WindowServer [400];start;rare 5",
+        ]
+        assert missing.exit_code == 1
+        assert "Capture 99 not found" in missing.output
+
+    def test_diff(self, runner: CliRunner, tmp_path: Path) -> None:
+        """diff shows stack share changes, newly blocked threads and process deltas."""
+        import json
+
+        from rogue_hunter.storage import create_forensic_capture, get_connection
+        from tests.conftest import insert_tailspin_stacks
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = get_connection(db_path)
+        event_id = create_process_event(
+            conn, 400, "WindowServer", 1, time.time(), "high", 70, "high"
+        )
+        for capture, blocked_on, cpu in ((1, None, 1.0), (2, "wait4 on zsh [46454]", 3.5)):
+            create_forensic_capture(conn, event_id, "band_entry_high")
+            insert_tailspin_stacks(
+                conn,
+                capture,
+                400,
+                "WindowServer",
+                [[(0, 10, "start", False), (1, 5 * capture, "wait", True, blocked_on)]],
+                cpu_time_sec=cpu,
+            )
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            table = runner.invoke(main, ["forensics", "diff", "1", "2"])
+            data = runner.invoke(main, ["forensics", "diff", "1", "2", "-f", "json"])
+            missing = runner.invoke(main, ["forensics", "diff", "1", "99"])
+
+        assert table.exit_code == 0
+        lines = table.output.splitlines()
+        assert lines[lines.index("Stacks that grew:") + 2].split() == [
+            "50.0%",
+            "100.0%",
+            "+50.0%",
+            "WindowServer",
+            "[400]",
+            ">",
+            "start",
+            ">",
+            "wait_[k]",
+        ]
+        assert "0x0 10 wait4 on zsh [46454]" in " ".join(table.output.split())
+        assert "WindowServer [400] 1.00 3.50 +2.50" in " ".join(table.output.split())
+        assert json.loads(data.output)["newly_blocked"][0]["samples"] == 10
+        assert missing.exit_code == 1
+        assert "Capture 99 not found" in missing.output
+
+    def test_waits(self, runner: CliRunner, tmp_path: Path) -> None:
+        """waits ranks root blockers and lists chains and waits."""
+        import json
+
+        from rogue_hunter.storage import create_forensic_capture, get_connection
+        from tests.conftest import insert_tailspin_stacks
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = get_connection(db_path)
+        event_id = create_process_event(conn, 10, "make", 1, time.time(), "high", 70, "high")
+        capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+        for pid, name, blocked_on in [
+            (10, "make", "zsh [20]"),
+            (20, "zsh", "turnstile waiting for mds [30] thread 0x0"),
+        ]:
+            frames = [(0, 40, "wait", True, blocked_on)]
+            insert_tailspin_stacks(conn, capture_id, pid, name, [frames])
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            table = runner.invoke(main, ["forensics", "waits", "1", "--min-chain", "2"])
+            data = runner.invoke(main, ["forensics", "waits", "1", "-f", "json"])
+
+        assert table.exit_code == 0
+        lines = table.output.splitlines()
+        assert lines[lines.index("Root blockers:") + 2].split() == [
+            "2",
+            "80",
+            "mds",
+            "[30]",
+            "thread",
+            "0x0",
+        ]
+        assert "40  make [10] thread 0x0 -> zsh [20] -> mds [30] thread 0x0" in table.output
+        assert "40  turnstile         zsh [20] thread 0x0 -> mds [30] thread 0x0" in table.output
+        assert json.loads(data.output)["chains"] == []
+
+
+class TestArchiveCommand:
+    """Tests for the archive command."""
+
+    def test_archive_then_read_back(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Archived events still show up in history and events show."""
+        import json
+        import sqlite3
+
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+        conn = sqlite3.connect(db_path)
+        entry = time.time() - 40 * 86400
+        event_id = create_process_event(
+            conn,
+            pid=1234,
+            command="old_proc",
+            boot_time=1706000000,
+            entry_time=entry,
+            entry_band="high",
+            peak_score=70,
+            peak_band="high",
+        )
+        conn.execute("UPDATE process_events SET exit_time = ?", (entry + 60,))
+        conn.commit()
+        conn.close()
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        mock_config.archive_dir = tmp_path / "archive"
+        mock_config.retention = RetentionConfig(archive_days=30)
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            dry_run = runner.invoke(main, ["archive", "--dry-run"])
+            archived = runner.invoke(main, ["archive"])
+            history = runner.invoke(main, ["history", "--hours", str(41 * 24), "-f", "json"])
+            show = runner.invoke(main, ["events", "show", str(event_id)])
+
+        assert "Would archive 1 closed events older than 30 days into 1 weekly" in dry_run.output
+        assert "Archived 1 events into 1 weekly files" in archived.output
+        assert [e["id"] for e in json.loads(history.output)] == [event_id]
+        assert show.exit_code == 0
+        assert "old_proc" in show.output
+        assert "Archived:" in show.output
+
+    def test_archive_days_option_overrides_config(self, runner: CliRunner, tmp_path: Path) -> None:
+        """--days runs even with archiving off in config, and --days 0 is rejected."""
+        db_path = tmp_path / "data.db"
+        init_database(db_path)
+
+        mock_config = MagicMock(spec=Config)
+        mock_config.db_path = db_path
+        mock_config.retention = RetentionConfig(archive_days=0)
+        with patch("rogue_hunter.config.Config.load", return_value=mock_config):
+            from_config = runner.invoke(main, ["archive", "--dry-run"])
+            explicit = runner.invoke(main, ["archive", "--dry-run", "--days", "7"])
+            zero = runner.invoke(main, ["archive", "--dry-run", "--days", "0"])
+
+        assert "Archiving is disabled" in from_config.output
+        assert "Would archive 0 closed events older than 7 days" in explicit.output
+        assert zero.exit_code == 2
+        assert "Archive days must be >= 1" in zero.output
+
+
 def _make_path_prop(path: Path):
     """Create a property that returns a fixed path."""
     return property(lambda self: path)
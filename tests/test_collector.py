@@ -970,3 +970,214 @@ class TestCollectorNewScoringIntegration:
             assert "pid" in processes_arg[0]
             assert "cpu" in processes_arg[0]
             assert "mem" in processes_arg[0]
+
+
+# =============================================================================
+# Two-tier collection (SyntheticSource, runs on any platform)
+# =============================================================================
+
+
+class TestTwoTierCollection:
+    """Cheap usage pass for all PIDs, detailed pass for the ones that matter."""
+
+    def _collector(self, full_sweep_samples: int = 15, **source_kwargs):
+        from rogue_hunter.sources import SyntheticSource
+
+        config = Config()
+        config.collection.full_sweep_samples = full_sweep_samples
+        source = SyntheticSource(**{"process_count": 200, "hot_count": 3, **source_kwargs})
+        return LibprocCollector(config, source), source
+
+    def test_first_sample_is_full_sweep(self):
+        """The first sample reads detail for every PID."""
+        collector, _ = self._collector()
+
+        samples = collector._collect_sync()
+
+        assert collector.last_stats.full_sweep
+        assert collector.last_stats.detailed_count == samples.process_count == 200
+
+    def test_non_sweep_sample_details_fewer_pids(self):
+        """Between sweeps only candidates and display rows get detail."""
+        collector, _ = self._collector()
+        collector._collect_sync()
+        full_calls = collector.last_stats.syscalls
+
+        samples = collector._collect_sync()
+
+        stats = collector.last_stats
+        assert not stats.full_sweep
+        assert stats.detailed_count < samples.process_count
+        assert stats.detailed_count >= collector.config.rogue_selection.max_count
+        assert stats.syscalls < full_calls
+        # Every process is still scored and carries a state and name
+        assert samples.process_count == 200
+        assert all(p.state and p.command for p in samples.all_by_pid.values())
+
+    def test_hot_processes_get_detail(self):
+        """Processes scoring above detail_min_score are in the detailed pass."""
+        collector, _ = self._collector()
+        collector.config.collection.detail_min_score = 1
+        collector._collect_sync()
+        import time
+
+        time.sleep(0.02)
+        samples = collector._collect_sync()
+
+        hot = [p for p in samples.all_by_pid.values() if p.command.startswith("hot")]
+        assert hot
+        for proc in hot:
+            assert collector._prev_samples[proc.pid].detail_timestamp == pytest.approx(
+                collector._last_collect_time
+            )
+
+    def test_pinned_pids_get_detail(self):
+        """Tracked PIDs always get the detailed read."""
+        collector, source = self._collector()
+        collector.config.rogue_selection.max_count = 0
+        collector.config.collection.detail_min_score = 1000
+        collector._collect_sync()
+        idle_pid = max(source.list_pids())
+        collector.pinned_pids = frozenset({idle_pid})
+
+        collector._collect_sync()
+
+        assert collector.last_stats.detailed_count == 1
+        assert collector._prev_samples[idle_pid].detail_timestamp == collector._last_collect_time
+
+    def test_full_sweep_every_n_samples(self):
+        """full_sweep_samples schedules periodic full sweeps."""
+        collector, _ = self._collector(full_sweep_samples=3)
+
+        sweeps = []
+        for _ in range(6):
+            collector._collect_sync()
+            sweeps.append(collector.last_stats.full_sweep)
+
+        assert sweeps == [True, False, False, True, False, False]
+
+    def test_new_pids_get_detail(self):
+        """PIDs appearing between sweeps are detailed immediately."""
+        collector, source = self._collector()
+        collector._collect_sync()
+        new_pid = source._spawn("newcomer")
+
+        samples = collector._collect_sync()
+
+        assert samples.all_by_pid[new_pid].command == "newcomer"
+
+    def test_vanished_pid_is_dropped(self):
+        """A PID that exits between the usage and detail reads is excluded."""
+        from unittest.mock import patch
+
+        collector, source = self._collector()
+        victim = source.list_pids()[-1]
+        original = source.read_detail
+
+        def read_detail(pid):
+            if pid == victim:
+                return None
+            return original(pid)
+
+        with patch.object(source, "read_detail", side_effect=read_detail):
+            samples = collector._collect_sync()
+
+        assert victim not in samples.all_by_pid
+        assert victim not in collector._prev_samples
+        assert samples.process_count == 199
+
+    def test_shares_match_full_collection(self):
+        """The cheap tier alone produces the same shares as full collection."""
+        from rogue_hunter.sources import SyntheticSource
+
+        full = LibprocCollector(Config(), SyntheticSource(process_count=100, seed=7))
+        full.config.collection.full_sweep_samples = 1
+        tiered = LibprocCollector(Config(), SyntheticSource(process_count=100, seed=7))
+
+        full._collect_sync()
+        tiered._collect_sync()
+        a = full._collect_sync()
+        b = tiered._collect_sync()
+
+        assert not tiered.last_stats.full_sweep
+        for pid, proc in a.all_by_pid.items():
+            assert b.all_by_pid[pid].mem_share == pytest.approx(proc.mem_share)
+
+
+# =============================================================================
+# Metadata cache
+# =============================================================================
+
+
+class TestMetadataCache:
+    """Names and ppids are resolved once per (pid, start_time)."""
+
+    def _collector(self):
+        from rogue_hunter.sources import SyntheticSource
+
+        config = Config()
+        config.collection.full_sweep_samples = 1  # Detail every PID, every sample
+        source = SyntheticSource(process_count=50, hot_count=2)
+        return LibprocCollector(config, source), source
+
+    def test_names_read_once(self):
+        """Second sample serves every name from the cache."""
+        collector, _ = self._collector()
+        collector._collect_sync()
+        first_calls = collector.last_stats.syscalls
+
+        collector._collect_sync()
+
+        stats = collector.metadata.stats
+        assert stats.hits == 50
+        assert stats.syscalls_avoided == 50
+        assert collector.last_stats.syscalls == first_calls - 50
+        assert stats.hit_rate == pytest.approx(0.5)
+
+    def test_pid_reuse_invalidates(self):
+        """A new start time under the same PID gets a fresh name."""
+        collector, source = self._collector()
+        collector._collect_sync()
+        pid = source.list_pids()[10]
+        source.reuse_pid(pid, "reborn")
+
+        samples = collector._collect_sync()
+
+        assert samples.all_by_pid[pid].command == "reborn"
+        assert collector.metadata.stats.pid_reuses == 1
+
+    def test_pid_reuse_resets_deltas(self):
+        """Counters of a reused PID are not diffed against the old process."""
+        collector, source = self._collector()
+        collector._collect_sync()
+        pid = source.list_pids()[0]  # Hot process with large counters
+        source.reuse_pid(pid, "reborn")
+
+        samples = collector._collect_sync()
+
+        assert samples.all_by_pid[pid].cpu == 0.0
+
+    def test_exec_invalidates(self):
+        """A changed pbi_comm (exec) gets a fresh name."""
+        collector, source = self._collector()
+        collector._collect_sync()
+        pid = source.list_pids()[10]
+        source.exec(pid, "newimage")
+
+        samples = collector._collect_sync()
+
+        assert samples.all_by_pid[pid].command == "newimage"
+        assert collector.metadata.stats.execs == 1
+
+    def test_exited_pids_evicted(self):
+        """Entries are dropped when the PID leaves."""
+        collector, source = self._collector()
+        collector._collect_sync()
+        pid = source.list_pids()[10]
+        del source._procs[pid]
+
+        collector._collect_sync()
+
+        assert collector.metadata.peek(pid) is None
+        assert len(collector.metadata) == 49
+        assert collector.metadata.stats.evictions == 1
@@ -1,10 +1,13 @@
 """Tests for configuration system."""
 
+import pytest
+
 from rogue_hunter.config import (
     BandColors,
     BandsConfig,
     BorderColors,
     CategoryColors,
+    CollectionConfig,
     Config,
     PidColors,
     ProcessStateColors,
@@ -120,6 +123,7 @@ def test_config_loads_system_section(tmp_path):
     config_file.write_text("""
 [system]
 ring_buffer_size = 120
+forensics_log_max_entries = 5000
 
 [bands]
 medium = 15
@@ -130,10 +134,48 @@ critical = 70
 
     config = Config.load(config_file)
     assert config.system.ring_buffer_size == 120
+    assert config.system.forensics_log_max_entries == 5000
+    assert config.system.forensics_log_max_bytes == SystemConfig().forensics_log_max_bytes
     assert config.bands.medium == 15
     assert config.bands.elevated == 30
 
 
+def test_config_rejects_invalid_parse_workers(tmp_path):
+    """forensics_parse_workers must be at least 1."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[system]\nforensics_parse_workers = 0\n")
+
+    with pytest.raises(ValueError, match="forensics_parse_workers must be >= 1"):
+        Config.load(config_file)
+
+
+@pytest.mark.parametrize("key", ["forensics_cpu_budget_sec", "forensics_io_budget_ops"])
+def test_config_rejects_zero_capture_budget(tmp_path, key):
+    """Capture budgets must be positive (the scheduler divides by them)."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(f"[system]\n{key} = 0\n")
+
+    with pytest.raises(ValueError, match=f"{key} must be > 0"):
+        Config.load(config_file)
+
+
+@pytest.mark.parametrize(
+    ("setting", "message"),
+    [
+        ("forensics_shed_fraction = 1.0", "forensics_shed_fraction must be >= 0 and < 1"),
+        ("forensics_shed_fraction = -0.1", "forensics_shed_fraction must be >= 0 and < 1"),
+        ("forensics_coalesce_seconds = -1", "forensics_coalesce_seconds must be >= 0"),
+    ],
+)
+def test_config_rejects_out_of_range_scheduling(tmp_path, setting, message):
+    """Shed fraction must be in [0, 1) and coalescing window non-negative."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text(f"[system]\n{setting}\n")
+
+    with pytest.raises(ValueError, match=message):
+        Config.load(config_file)
+
+
 def test_config_save_includes_system_section(tmp_path):
     """Config.save() writes system and bands sections."""
     config_path = tmp_path / "config.toml"
@@ -773,3 +815,87 @@ elevated_checkpoint_samples = -3
 
     with pytest.raises(ValueError, match="elevated_checkpoint_samples must be >= 1"):
         Config.load(config_file)
+
+
+# =============================================================================
+# Collection config
+# =============================================================================
+
+
+def test_collection_config_defaults():
+    """Two-tier collection is on by default with periodic full sweeps."""
+    collection = CollectionConfig()
+    assert collection.full_sweep_samples > 1
+    assert collection.detail_min_score < BandsConfig().tracking_threshold
+
+
+def test_collection_config_roundtrip(tmp_path):
+    """Config save/load preserves collection settings."""
+    config_path = tmp_path / "config.toml"
+
+    config = Config()
+    config.collection.detail_min_score = 15
+    config.collection.full_sweep_samples = 1
+    config.save(config_path)
+
+    loaded = Config.load(config_path)
+    assert loaded.collection.detail_min_score == 15
+    assert loaded.collection.full_sweep_samples == 1
+
+
+def test_collection_config_rejects_zero_full_sweep(tmp_path):
+    """full_sweep_samples must be at least 1."""
+    import pytest
+
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[collection]\nfull_sweep_samples = 0\n")
+
+    with pytest.raises(ValueError, match="full_sweep_samples"):
+        Config.load(config_file)
+
+
+def test_collection_config_rejects_zero_max_threads(tmp_path):
+    """max_threads must be at least 1; threads = 0 means auto."""
+    import pytest
+
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[collection]\nthreads = 0\nmax_threads = 0\n")
+
+    with pytest.raises(ValueError, match="max_threads"):
+        Config.load(config_file)
+
+
+def test_collection_config_rejects_nonpositive_gpu_interval(tmp_path):
+    """gpu_interval must be positive."""
+    import pytest
+
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[collection]\ngpu_interval = 0\n")
+
+    with pytest.raises(ValueError, match="gpu_interval"):
+        Config.load(config_file)
+
+
+def test_retention_prune_budget_roundtrip(tmp_path):
+    """Config save/load preserves the auto-prune time budget."""
+    config_path = tmp_path / "config.toml"
+
+    config = Config()
+    config.retention.prune_budget_seconds = 2.5
+    config.save(config_path)
+
+    assert Config.load(config_path).retention.prune_budget_seconds == 2.5
+
+
+def test_retention_archive_roundtrip(tmp_path):
+    """Config save/load preserves the archive settings."""
+    config_path = tmp_path / "config.toml"
+
+    config = Config()
+    config.retention.archive_days = 14
+    config.retention.archive_keep_days = 180
+    config.save(config_path)
+
+    loaded = Config.load(config_path).retention
+    assert loaded.archive_days == 14
+    assert loaded.archive_keep_days == 180
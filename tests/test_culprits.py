@@ -0,0 +1,74 @@
+"""Tests for the rolling culprit index."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from rogue_hunter.collector import ProcessSamples
+from rogue_hunter.culprits import CulpritIndex
+from rogue_hunter.forensics import identify_culprits
+from rogue_hunter.ringbuffer import BufferContents, RingBuffer
+from tests.conftest import make_process_score
+
+T0 = datetime(2026, 1, 1)
+
+
+def sample(i: int, *rogues: tuple[int, int]) -> ProcessSamples:
+    """Sample i (one second apart) with (pid, score) rogues."""
+    scores = [make_process_score(pid=pid, command=f"p{pid}", score=s) for pid, s in rogues]
+    return ProcessSamples(
+        timestamp=T0 + timedelta(seconds=i),
+        elapsed_ms=10,
+        process_count=100,
+        max_score=max((s for _, s in rogues), default=0),
+        rogues=scores,
+        all_by_pid={r.pid: r for r in scores},
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_identify_culprits_on_random_traces(seed):
+    """After every push the index agrees with a full walk of the ring."""
+    rng = random.Random(seed)
+    ring = RingBuffer(max_samples=8)
+    for i in range(200):
+        pids = rng.sample(range(1, 15), rng.randint(0, 6))
+        ring.push(sample(i, *((pid, rng.choice([10, 30, 50, 50, 70])) for pid in pids)))
+        frozen = ring.freeze()
+        assert list(frozen.culprits) == identify_culprits(BufferContents(frozen.samples))
+
+
+def test_peak_expires_with_its_sample():
+    """A peak leaving the window falls back to the best of what remains."""
+    index = CulpritIndex(max_samples=3)
+    for i, score in enumerate([90, 40, 60, 20]):
+        index.push(sample(i, (1, score)))
+
+    assert [c["score"] for c in index.culprits()] == [60]
+    for i in range(4, 7):
+        index.push(sample(i))
+    assert index.culprits() == []
+
+
+def test_top_of_last_seconds():
+    """top() reports peak, seconds above threshold and max share over a suffix."""
+    index = CulpritIndex(max_samples=10, threshold=50, interval=1.0)
+    index.push(sample(0, (1, 90), (2, 20)))
+    index.push(sample(1, (1, 60), (2, 40)))
+    index.push(sample(2, (1, 20), (2, 60)))
+    index.push(sample(3, (2, 55)))
+
+    assert [(c["pid"], c["score"], c["seconds_above"]) for c in index.top()] == [
+        (1, 90, 2.0),
+        (2, 60, 2.0),
+    ]
+    assert index.top()[0]["max_share"] == pytest.approx(150 / 265)
+    recent = index.top(seconds=1.5)
+    assert [(c["pid"], c["score"], c["seconds_above"]) for c in recent] == [
+        (2, 60, 2.0),
+        (1, 20, 0.0),
+    ]
+    assert recent[0]["max_share"] == 1.0
+    assert len(index.top(limit=1)) == 1
+    assert index.window_seconds == 4.0
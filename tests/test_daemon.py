@@ -4,6 +4,7 @@ import asyncio
 import os
 import signal
 import sqlite3
+import time
 from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +19,7 @@ from rogue_hunter.collector import (
 )
 from rogue_hunter.config import Config
 from rogue_hunter.daemon import Daemon, DaemonState
+from rogue_hunter.storage import PruneProgress
 
 # Test constants
 TEST_TIMESTAMP = 1706000000.0  # 2024-01-23 UTC
@@ -345,7 +347,7 @@ async def test_daemon_stop_removes_pid_file(tmp_path: Path):
 
 @pytest.mark.asyncio
 async def test_auto_prune_runs_on_timeout(patched_config_paths):
-    """Auto-prune runs prune_old_data when timeout expires."""
+    """Auto-prune runs prune_incremental when timeout expires."""
     from rogue_hunter.storage import init_database
 
     config = Config.load()
@@ -354,13 +356,12 @@ async def test_auto_prune_runs_on_timeout(patched_config_paths):
     init_database(config.db_path)
     daemon._conn = sqlite3.connect(config.db_path)
 
-    # Patch prune_old_data to track calls and signal shutdown after first call
-    # Returns int (events_deleted) - system_samples table was removed
-    with patch("rogue_hunter.daemon.prune_old_data", return_value=0) as mock_prune:
+    # Patch prune_incremental to track calls and signal shutdown after first call
+    with patch("rogue_hunter.daemon.prune_incremental") as mock_prune:
 
         def prune_side_effect(*args, **kwargs):
             daemon._shutdown_event.set()
-            return 0
+            return iter([PruneProgress(started_at=time.time(), complete=True)])
 
         mock_prune.side_effect = prune_side_effect
 
@@ -384,9 +385,93 @@ async def test_auto_prune_runs_on_timeout(patched_config_paths):
         mock_prune.assert_called_once_with(
             daemon._conn,
             events_days=config.retention.events_days,
+            budget_seconds=config.retention.prune_budget_seconds,
         )
 
 
+def _add_old_event(conn: sqlite3.Connection) -> int:
+    """A closed 100-day-old event with a snapshot and a search-indexed capture.
+
+    The capture has a log entry and a tailspin tree.
+    """
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        index_capture_search,
+        insert_log_entries,
+        insert_process_snapshot,
+    )
+    from tests.conftest import insert_tailspin_stacks, make_process_score
+
+    exit_time = time.time() - 100 * 86400
+    event_id = conn.execute(
+        """INSERT INTO process_events
+           (pid, command, boot_time, entry_time, exit_time, entry_band, peak_band, peak_score)
+           VALUES (1, 'proc', 1, ?, ?, 'high', 'high', 60)""",
+        (exit_time - 60, exit_time),
+    ).lastrowid
+    insert_process_snapshot(conn, event_id, "entry", make_process_score(pid=1))
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_critical")
+    insert_log_entries(
+        conn, capture_id, [(exit_time, "watchdog", 0, "", "", "kernel", 0, "Default")]
+    )
+    insert_tailspin_stacks(conn, capture_id, 1, "proc", [[(0, 9, "IOSurface::lock", False)]])
+    index_capture_search(conn, capture_id)
+    conn.commit()
+    return event_id
+
+
+CHILD_TABLES = (
+    "process_snapshots",
+    "forensic_captures",
+    "log_entries",
+    "tailspin_process",
+    "tailspin_thread",
+    "tailspin_frame",
+    "search_indexed_captures",
+)
+
+
+@pytest.mark.asyncio
+async def test_daemon_connection_prune_cascades(patched_config_paths):
+    """Pruning over the daemon's own connection removes an event's child rows."""
+    from rogue_hunter.storage import prune_incremental
+
+    daemon = Daemon(Config.load())
+    await daemon._init_database()
+    conn = daemon._conn
+    _add_old_event(conn)
+
+    list(prune_incremental(conn, events_days=30))
+
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    for table in ("process_events", *CHILD_TABLES):
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0, table
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_daemon_connection_archive_cascades(patched_config_paths):
+    """Archiving over the daemon's own connection leaves no child or search rows."""
+    from rogue_hunter.storage import search_captures
+
+    config = Config.load()
+    config.retention.archive_days = 30
+    daemon = Daemon(config)
+    await daemon._init_database()
+    conn = daemon._conn
+    _add_old_event(conn)
+
+    await daemon._archive_aged_events()
+
+    for table in ("process_events", *CHILD_TABLES):
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0, table
+    assert search_captures(conn, "watchdog") == []
+    assert search_captures(conn, "Surface") == []
+    for table in ("log_search", "frame_search"):
+        conn.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('integrity-check', 1)")
+    conn.close()
+
+
 @pytest.mark.asyncio
 async def test_auto_prune_exits_on_shutdown(patched_config_paths):
     """Auto-prune exits cleanly when shutdown event is set."""
@@ -396,8 +481,8 @@ async def test_auto_prune_exits_on_shutdown(patched_config_paths):
     # Set shutdown event immediately
     daemon._shutdown_event.set()
 
-    # Track that prune_old_data is NOT called
-    with patch("rogue_hunter.daemon.prune_old_data") as mock_prune:
+    # Track that prune_incremental is NOT called
+    with patch("rogue_hunter.daemon.prune_incremental") as mock_prune:
         await daemon._auto_prune()
         mock_prune.assert_not_called()
 
@@ -409,7 +494,7 @@ async def test_auto_prune_skips_if_no_connection(patched_config_paths):
     daemon = Daemon(config)
     daemon._conn = None  # No connection
 
-    with patch("rogue_hunter.daemon.prune_old_data") as mock_prune:
+    with patch("rogue_hunter.daemon.prune_incremental") as mock_prune:
         # Patch wait_for to timeout once, then we set shutdown
 
         async def mock_wait_for_impl(coro, timeout):
@@ -440,13 +525,12 @@ async def test_auto_prune_uses_config_retention_days(patched_config_paths):
     init_database(config.db_path)
     daemon._conn = sqlite3.connect(config.db_path)
 
-    # Patch prune_old_data to track calls and signal shutdown after first call
-    # Returns int (events_deleted) - system_samples table was removed
-    with patch("rogue_hunter.daemon.prune_old_data", return_value=0) as mock_prune:
+    # Patch prune_incremental to track calls and signal shutdown after first call
+    with patch("rogue_hunter.daemon.prune_incremental") as mock_prune:
 
         def prune_side_effect(*args, **kwargs):
             daemon._shutdown_event.set()
-            return 0
+            return iter([PruneProgress(started_at=time.time(), complete=True)])
 
         mock_prune.side_effect = prune_side_effect
 
@@ -470,9 +554,72 @@ async def test_auto_prune_uses_config_retention_days(patched_config_paths):
         mock_prune.assert_called_once_with(
             daemon._conn,
             events_days=14,
+            budget_seconds=config.retention.prune_budget_seconds,
         )
 
 
+@pytest.mark.asyncio
+async def test_auto_prune_resumes_soon_after_budget_stop(patched_config_paths):
+    """A prune run that stops on its budget is resumed after a short wait."""
+    from rogue_hunter.daemon import PRUNE_RESUME_SECONDS
+    from rogue_hunter.storage import init_database
+
+    config = Config.load()
+    daemon = Daemon(config)
+    init_database(config.db_path)
+    daemon._conn = sqlite3.connect(config.db_path)
+
+    timeouts: list[float] = []
+
+    async def mock_wait_for_impl(coro, timeout):
+        coro.close()
+        timeouts.append(timeout)
+        if len(timeouts) == 3:
+            daemon._shutdown_event.set()
+        raise asyncio.TimeoutError()
+
+    runs = iter(
+        [
+            [PruneProgress(started_at=0.0, events_deleted=50, complete=False)],
+            [PruneProgress(started_at=0.0, events_deleted=10, complete=True)],
+            [PruneProgress(started_at=0.0, complete=True)],
+        ]
+    )
+    with (
+        patch("rogue_hunter.daemon.prune_incremental", side_effect=lambda *a, **k: next(runs)),
+        patch("rogue_hunter.daemon.asyncio.wait_for", side_effect=mock_wait_for_impl),
+    ):
+        await daemon._auto_prune()
+
+    interval = config.system.auto_prune_interval_hours * 3600
+    assert timeouts == [interval, PRUNE_RESUME_SECONDS, interval]
+
+
+@pytest.mark.asyncio
+async def test_run_backfills_stops_on_shutdown(patched_config_paths):
+    """Backfills run batch by batch and stop once shutdown is requested."""
+    from rogue_hunter.storage import init_database
+
+    config = Config.load()
+    daemon = Daemon(config)
+    init_database(config.db_path)
+    daemon._conn = sqlite3.connect(config.db_path)
+
+    batches = []
+
+    def fake_backfills(conn):
+        for i in range(5):
+            batches.append(i)
+            if i == 1:
+                daemon._shutdown_event.set()
+            yield 21, 1
+
+    with patch("rogue_hunter.daemon.run_backfills", side_effect=fake_backfills):
+        await daemon._run_backfills()
+
+    assert batches == [0, 1]
+
+
 # === Main Loop Tests ===
 
 
@@ -769,3 +916,43 @@ async def test_daemon_main_loop_updates_tracker(patched_config_paths, monkeypatc
 # Note: Pause detection was removed from the daemon's main loop.
 # The main loop now only: collect → track → buffer → broadcast.
 # Forensics are triggered by ProcessTracker band transitions instead.
+
+
+@pytest.mark.asyncio
+async def test_daemon_run_capture_links_coalesced_events(patched_config_paths, monkeypatch):
+    """One capture runs for the lead event and is listed under the linked ones too."""
+    from rogue_hunter.scheduler import CaptureTrigger
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        create_process_event,
+        get_forensic_captures,
+    )
+
+    monkeypatch.setattr("rogue_hunter.daemon.get_boot_time", lambda: int(TEST_TIMESTAMP))
+    daemon = Daemon(Config.load())
+    await daemon._init_database()
+    conn = daemon._conn
+    lead_event, other_event = (
+        create_process_event(conn, pid, "proc", 1, 1.0, "critical", 90, "critical")
+        for pid in (1, 2)
+    )
+
+    async def capture_and_store(self, contents, trigger):
+        self.store_cpu_seconds = 2.5
+        end = time.process_time() + 0.2  # The daemon's own work is not charged
+        while time.process_time() < end:
+            pass
+        return create_forensic_capture(conn, self.event_id, trigger)
+
+    with patch("rogue_hunter.daemon.ForensicsCapture.capture_and_store", capture_and_store):
+        cost = await daemon._run_capture(
+            CaptureTrigger(lead_event, "peak_escalation_critical", 90, 0.0),
+            [CaptureTrigger(other_event, "band_entry_critical", 80, 0.0)],
+        )
+
+    [capture] = get_forensic_captures(conn, other_event)
+    assert capture["event_id"] == lead_event
+    assert capture["trigger"] == "peak_escalation_critical"
+    assert cost.cpu_seconds == pytest.approx(2.5)
+    conn.close()
+    daemon._conn = None
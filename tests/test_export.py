@@ -0,0 +1,105 @@
+"""Tests for streaming event exporters."""
+
+import csv
+import io
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from rogue_hunter.archive import archive_events
+from rogue_hunter.export import (
+    DETAIL_FIELDS,
+    EVENT_FIELDS,
+    event_record,
+    with_details,
+    write_records,
+)
+from rogue_hunter.storage import (
+    create_forensic_capture,
+    create_process_event,
+    get_connection,
+    insert_process_snapshot,
+    iter_process_events,
+)
+from tests.conftest import make_process_score
+
+
+def _event(conn, entry_time: float, command: str = "proc,with comma") -> int:
+    event_id = create_process_event(
+        conn,
+        pid=42,
+        command=command,
+        boot_time=1,
+        entry_time=entry_time,
+        entry_band="high",
+        peak_score=70,
+        peak_band="high",
+    )
+    conn.execute(
+        "UPDATE process_events SET exit_time = ? WHERE id = ?", (entry_time + 30, event_id)
+    )
+    conn.commit()
+    return event_id
+
+
+@pytest.fixture
+def conn(initialized_db: Path):
+    conn = get_connection(initialized_db)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv", "json"])
+def test_formats_round_trip(conn, fmt: str):
+    """Each format writes every record and parses back to the same values."""
+    for i in range(3):
+        _event(conn, 1000.0 + i)
+    out = io.StringIO()
+
+    count = write_records(map(event_record, iter_process_events(conn)), out, fmt, EVENT_FIELDS)
+
+    assert count == 3
+    text = out.getvalue()
+    if fmt == "ndjson":
+        rows = [json.loads(line) for line in text.splitlines()]
+    elif fmt == "json":
+        rows = json.loads(text)
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+    assert [str(row["peak_score"]) for row in rows] == ["70"] * 3
+    assert {row["command"] for row in rows} == {"proc,with comma"}
+    assert list(rows[0]) == EVENT_FIELDS
+
+
+def test_empty_json_array(conn):
+    """No events still writes a valid JSON array."""
+    out = io.StringIO()
+    assert write_records(iter([]), out, "json", EVENT_FIELDS) == 0
+    assert json.loads(out.getvalue()) == []
+
+
+def test_unknown_format_raises():
+    """Formats outside EXPORT_FORMATS are rejected."""
+    with pytest.raises(ValueError):
+        write_records(iter([]), io.StringIO(), "xml", EVENT_FIELDS)
+
+
+def test_details_inline_for_live_and_archived(conn, tmp_path: Path):
+    """Snapshots and captures come from the archive for archived events."""
+    for entry_time in (time.time() - 40 * 86400, time.time() - 60):
+        event_id = _event(conn, entry_time)
+        insert_process_snapshot(conn, event_id, "entry", make_process_score())
+        create_forensic_capture(conn, event_id, "band_entry_high")
+    records = [event_record(e) for e in iter_process_events(conn)]
+    assert archive_events(conn, tmp_path, older_than_days=30).events_archived == 1
+
+    out = io.StringIO()
+    fields = EVENT_FIELDS + DETAIL_FIELDS
+    assert write_records(with_details(conn, tmp_path, records), out, "ndjson", fields) == 2
+
+    for line in out.getvalue().splitlines():
+        row = json.loads(line)
+        assert [s["event_id"] for s in row["snapshots"]] == [row["id"]]
+        assert [c["trigger"] for c in row["captures"]] == ["band_entry_high"]
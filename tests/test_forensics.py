@@ -1,18 +1,21 @@
 """Tests for forensics capture."""
 
+import asyncio
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from rogue_hunter.collector import ProcessSamples, ProcessScore
 from rogue_hunter.forensics import (
     ForensicsCapture,
+    TailspinFile,
     identify_culprits,
     parse_logs_ndjson,
     parse_tailspin,
+    parse_tailspin_file,
 )
 from rogue_hunter.ringbuffer import BufferContents, RingBuffer, RingSample
 from rogue_hunter.storage import get_connection, init_database
@@ -219,6 +222,99 @@ Process:          test [100]
     assert blocked_frame.blocked_on == "pid:1234"
 
 
+def test_parse_tailspin_frame_blocked_on_turnstile():
+    """Blocked states other than wait4 keep their description, owner included."""
+    text = """
+Process:          test [100]
+
+  Thread 0x1abc    1000 samples (1-1000)    priority 31 (base 31)
+    1000  start + 100 (dyld + 100) [0x100]
+      *1000  wait + 8 (libc + 8) [0x200]  (blocked by turnstile waiting for mds [420] thread 0x3f)
+"""
+    frame = parse_tailspin(text).processes[0].threads[0].frames[1]
+    assert frame.state == "blocked"
+    assert frame.blocked_on == "turnstile waiting for mds [420] thread 0x3f"
+
+
+def test_parse_tailspin_process_metadata_and_binary_images():
+    """Every metadata key, threads, frames and binary images land on the right process."""
+    # fmt: off
+    text = """
+Process:          Safari [500]
+UUID:             6F2A7B90-1C3D-4E5F-8A9B-0C1D2E3F4A5B
+Shared Cache:     11A2B3C4-D5E6-F708-192A-3B4C5D6E7F80 slid base address 0x180000000
+Execed from:      launcher [499]
+RunningBoard Mgd: Yes
+Footprint:        256 KB -> 11.52 MB (+11.27 MB)
+I/O:              12 I/Os (8 KB)
+Time Since Fork:  42s
+End time:         ignored without a start time
+Num samples:      341 (1-341)
+CPU Time:         0.5s (51.3G cycles, 87.4G instructions, 0.59c/i)
+Note:             1 idle work queue thread omitted
+
+  Thread 0x1    Thread name "worker"    341 samples (1-341)
+    341  ??? (WebKit + 4096) [0x1000]
+      *341  ??? [0x2000]
+
+  Binary Images:
+         0x100000000 -        ???  WebKit 620.1 (1)  <ABC-123>  /System/WebKit
+Process:          other [501]
+"""
+    # fmt: on
+    safari, other = parse_tailspin(text).processes
+    assert safari.shared_cache_uuid == "11A2B3C4-D5E6-F708-192A-3B4C5D6E7F80"
+    assert (safari.execed_from_name, safari.execed_from_pid) == ("launcher", 499)
+    assert safari.runningboard_managed is True
+    assert (safari.footprint_mb, safari.footprint_delta_mb) == (0.25, 11.27)
+    assert (safari.io_count, safari.io_bytes) == (12, 8192)
+    assert safari.time_since_fork_sec == 42
+    assert safari.end_time is None
+    assert (safari.num_samples, safari.sample_range_end) == (341, 341)
+    assert (safari.cycles, safari.cpi) == (51_300_000_000, 0.59)
+    assert safari.notes == ["1 idle work queue thread omitted"]
+    [thread] = safari.threads
+    assert thread.thread_name == "worker"
+    assert [(f.depth, f.is_kernel, f.library_name, f.library_offset) for f in thread.frames] == [
+        (1, False, "WebKit", 4096),
+        (2, True, None, None),
+    ]
+    [image] = safari.binary_images
+    assert (image.name, image.version, image.end_address) == ("WebKit", "620.1 (1)", None)
+    assert other.pid == 501 and other.threads == []
+
+
+def test_parse_tailspin_file_parallel_matches_serial(tmp_path: Path):
+    """Chunks split only where the serial parser starts a process, so results match."""
+    blocks = []
+    for pid in range(100, 112):
+        frames = "\n".join(
+            f"{'  ' * (d + 2)}{d + 1}  fn{d} + 1 (lib + 2) [0x{d:x}]" for d in range(5)
+        )
+        blocks.append(
+            f"Process:          proc{pid} [{pid}]\n"
+            f"Footprint:        {pid}.0 MB\n\n"
+            f"  Thread 0x{pid:x}    5 samples (1-5)    priority 31 (base 31)\n{frames}\n\n"
+        )
+    blocks.insert(5, "Process:          not a process header\n  Thread 0x1    1 sample (1-1)\n")
+    text = (
+        "Date/Time:        2024-01-15 10:30:45.123 -0800\nActive cpus:      16\n\n"
+        + "".join(blocks)
+        + "IO Size Histogram:\n   Begin       End     Frequency       CDF\n"
+        "       0      4095          1200      1200\n"
+    )
+    path = tmp_path / "spindump.txt"
+    path.write_text(text)
+
+    serial = parse_tailspin(text)
+    parallel = parse_tailspin_file(path, workers=3, min_parallel_bytes=0)
+
+    assert parallel == serial
+    assert [p.pid for p in parallel.processes] == list(range(100, 112))
+    assert parallel.header.active_cpus == 16
+    assert len(parallel.io_histograms) == 1
+
+
 # --- Log Parsing Tests ---
 
 
@@ -268,6 +364,35 @@ def test_parse_logs_ndjson_handles_invalid_json():
     assert len(entries) == 2
 
 
+@pytest.mark.parametrize("decoder", ["json", "orjson", "msgspec"])
+def test_parse_log_line_decoders_agree(decoder):
+    """Each JSON backend gives the stdlib's entries, bad lines and bad UTF-8 included."""
+    import json
+
+    from rogue_hunter.forensics import parse_log_line
+
+    loads = {
+        "json": lambda: json.loads,
+        "orjson": lambda: pytest.importorskip("orjson").loads,
+        "msgspec": lambda: pytest.importorskip("msgspec").json.Decoder().decode,
+    }[decoder]()
+    lines = [
+        b'{"timestamp":"t","eventMessage":"caf\xe9","machTimestamp":18446744073709551615,'
+        b'"processImagePath":"/usr/libexec/powerd","processID":42,"messageType":"Fault"}',
+        b"[1, 2]",
+        b"not json",
+        b"",
+    ]
+
+    entries = [parse_log_line(line, loads) for line in lines]
+
+    assert entries[0] == parse_log_line(lines[0].decode("utf-8", errors="replace"), json.loads)
+    assert entries[0].event_message == "caf\ufffd"
+    assert entries[0].process_name == "powerd"
+    assert entries[0].mach_timestamp == 2**64 - 1
+    assert entries[1:] == [None, None, None]
+
+
 # --- identify_culprits Tests ---
 
 
@@ -385,6 +510,23 @@ def test_identify_culprits_differentiates_by_pid():
 # --- ForensicsCapture Integration Tests ---
 
 
+def log_stream(data: bytes) -> asyncio.StreamReader:
+    """A finished stdout stream holding data, like log show's."""
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+def log_lines(count: int) -> bytes:
+    """count NDJSON log lines, the last without its newline."""
+    lines = [
+        f'{{"timestamp":"t{i}","eventMessage":"m{i}","processImagePath":"/usr/bin/p{i}"}}'
+        for i in range(count)
+    ]
+    return "\n".join(lines).encode()
+
+
 @pytest.fixture
 def forensics_db(tmp_path: Path):
     """Create initialized database for forensics tests."""
@@ -429,6 +571,7 @@ async def test_forensics_capture_stores_in_database(forensics_db, tmp_path: Path
     with patch("rogue_hunter.forensics.asyncio.create_subprocess_exec") as mock_exec:
         mock_process = AsyncMock()
         mock_process.communicate.return_value = (b"", b"")
+        mock_process.stdout = log_stream(b"")
         mock_process.wait = AsyncMock(return_value=0)
         mock_exec.return_value = mock_process
 
@@ -467,6 +610,7 @@ async def test_forensics_capture_cleans_up_temp_dir(forensics_db, tmp_path: Path
     with patch("rogue_hunter.forensics.asyncio.create_subprocess_exec") as mock_exec:
         mock_process = AsyncMock()
         mock_process.communicate.return_value = (b"", b"")
+        mock_process.stdout = log_stream(b"")
         mock_process.wait = AsyncMock(return_value=0)
         mock_exec.return_value = mock_process
 
@@ -507,6 +651,57 @@ async def test_forensics_capture_handles_failures_gracefully(forensics_db, tmp_p
     assert captures[0]["logs_status"] == "failed"
 
 
+@pytest.mark.asyncio
+async def test_capture_logs_streams_in_batches(forensics_db, tmp_path: Path):
+    """log show output is parsed as read and stored a batch per transaction."""
+    from rogue_hunter import forensics
+    from rogue_hunter.storage import create_forensic_capture, get_log_entries
+
+    conn, event_id = forensics_db
+    capture_id = create_forensic_capture(conn, event_id, "test")
+    capture = ForensicsCapture(conn, event_id, tmp_path)
+    process = AsyncMock(returncode=0)
+    process.stdout = log_stream(log_lines(5).replace(b"\n", b"\nnot json\n", 1))
+
+    with (
+        patch("rogue_hunter.forensics.asyncio.create_subprocess_exec", return_value=process),
+        patch.object(forensics, "_LOG_READ_BYTES", 7),
+        patch.object(forensics, "_LOG_BATCH_ROWS", 2),
+        patch.object(forensics, "insert_log_entries", wraps=forensics.insert_log_entries) as insert,
+    ):
+        result = await capture._capture_logs(capture_id)
+
+    assert result == (5, False)
+    assert capture._logs_status(result) == "success"
+    assert insert.call_count == 3
+    entries = get_log_entries(conn, capture_id)
+    assert sorted(e["event_message"] for e in entries) == ["m0", "m1", "m2", "m3", "m4"]
+    assert {e["process_name"] for e in entries} == {"p0", "p1", "p2", "p3", "p4"}
+    process.wait.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("caps", [{"log_max_entries": 3}, {"log_max_bytes": 200}])
+async def test_capture_logs_caps_entries_and_bytes(forensics_db, tmp_path: Path, caps):
+    """Past a cap, reading stops, log is killed and the capture is marked truncated."""
+    from rogue_hunter.storage import create_forensic_capture, get_log_entries
+
+    conn, event_id = forensics_db
+    capture_id = create_forensic_capture(conn, event_id, "test")
+    capture = ForensicsCapture(conn, event_id, tmp_path, **caps)
+    process = AsyncMock(returncode=None)
+    process.stdout = log_stream(log_lines(10))
+    process.kill = MagicMock()
+
+    with patch("rogue_hunter.forensics.asyncio.create_subprocess_exec", return_value=process):
+        result = await capture._capture_logs(capture_id)
+
+    assert result[1] is True
+    assert 0 < result[0] == len(get_log_entries(conn, capture_id)) <= 3
+    assert capture._logs_status(result) == "truncated"
+    process.kill.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_tailspin_capture_uses_sudo(forensics_db, tmp_path: Path):
     """Tailspin capture uses sudo -n for non-interactive sudo."""
@@ -565,3 +760,141 @@ async def test_tailspin_capture_permission_error(forensics_db, tmp_path: Path):
 
         assert "sudo -n" in str(exc_info.value)
         assert "password is required" in str(exc_info.value)
+
+
+def test_process_tailspin_decodes_to_runtime_file(forensics_db, tmp_path: Path):
+    """spindump writes to a file in runtime_dir, which is stored and then removed."""
+    import subprocess
+
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        get_tailspin_frames,
+        get_tailspin_processes,
+        get_tailspin_threads,
+    )
+
+    conn, event_id = forensics_db
+    capture_id = create_forensic_capture(conn, event_id, "test")
+    capture = ForensicsCapture(conn, event_id, tmp_path)
+    decoded_path = tmp_path / f"capture_{event_id}.spindump"
+
+    def decode(args, stdout, **kwargs):
+        assert Path(stdout.name) == decoded_path
+        stdout.write(
+            b"Date/Time:        2024-01-15 10:30:45.123 -0800\n\n"
+            b"Process:          first [100]\n\n"
+            b"  Thread 0x1    2 samples (1-2)    priority 31 (base 31)\n"
+            b"    2  start + 1 (dyld + 1) [0x100]\n"
+            b"      2  main + 2 (first + 2) [0x200]\n\n"
+            b"Process:          second [200]\n"
+        )
+        return subprocess.CompletedProcess(args, 0)
+
+    with patch("rogue_hunter.forensics.subprocess.run", side_effect=decode):
+        status = capture._process_tailspin(capture_id, tmp_path / "capture.tailspin")
+
+    assert status == "success"
+    processes = get_tailspin_processes(conn, capture_id)
+    assert sorted(p["pid"] for p in processes) == [100, 200]
+    first = next(p for p in processes if p["pid"] == 100)
+    [thread] = get_tailspin_threads(conn, first["id"])
+    frames = get_tailspin_frames(conn, thread["id"])
+    assert [f["symbol_name"] for f in frames] == ["start", "main"]
+    assert frames[1]["parent_frame_id"] == frames[0]["id"]
+    assert not decoded_path.exists()
+
+
+def test_process_tailspin_commits_in_batches(forensics_db, tmp_path: Path):
+    """Tailspin rows are committed a batch at a time, and never held while parsing."""
+    import subprocess
+
+    from rogue_hunter.storage import create_forensic_capture
+
+    conn, event_id = forensics_db
+    capture_id = create_forensic_capture(conn, event_id, "test")
+    capture = ForensicsCapture(conn, event_id, tmp_path)
+    stack = b"".join(b"  " * d + b"  1  f%d + 1 (lib + 1) [0x%x]\n" % (d, d) for d in range(20))
+    report = b"".join(
+        b"Process:          p%d [%d]\n\n  Thread 0x1    1 sample (1-1)\n%s\n" % (pid, pid, stack)
+        for pid in range(1, 151)
+    )
+
+    def decode(args, stdout, **kwargs):
+        stdout.write(report)
+        return subprocess.CompletedProcess(args, 0)
+
+    parse = TailspinFile.processes
+    open_while_parsing = []
+
+    def processes(self, workers=1):
+        for proc in parse(self, workers):
+            open_while_parsing.append(conn.in_transaction)
+            yield proc
+
+    commits = []
+    conn.set_trace_callback(lambda sql: commits.append(sql) if sql == "COMMIT" else None)
+    with (
+        patch("rogue_hunter.forensics.subprocess.run", side_effect=decode),
+        patch.object(TailspinFile, "processes", processes),
+    ):
+        assert capture._process_tailspin(capture_id, tmp_path / "capture.tailspin") == "success"
+    conn.set_trace_callback(None)
+
+    frames = conn.execute("SELECT COUNT(*) FROM tailspin_frame").fetchone()[0]
+    assert frames == 150 * 20
+    assert len(commits) <= 5
+    assert open_while_parsing == [False] * 150
+
+
+async def test_store_and_index_runs_off_the_event_loop(forensics_db, tmp_path: Path):
+    """capture_and_store stores and indexes on a worker thread with its own connection."""
+    import threading
+
+    from rogue_hunter.storage import create_forensic_capture, insert_log_entry, search_captures
+
+    conn, event_id = forensics_db
+    capture_id = create_forensic_capture(conn, event_id, "test")
+    for i in range(5):
+        insert_log_entry(conn, capture_id, "2024-01-15 10:30:00", f"watchdog {i}")
+    capture = ForensicsCapture(conn, event_id, tmp_path)
+    seen = []
+
+    def process(capture_id, result, thread_conn=None):
+        seen.append((threading.get_ident(), thread_conn))
+        return "success"
+
+    with patch.object(capture, "_process_tailspin", side_effect=process):
+        status = await capture._store_and_index(capture_id, tmp_path / "capture.tailspin")
+    assert status == "success"
+
+    [(thread, thread_conn)] = seen
+    assert thread != threading.get_ident()
+    assert thread_conn is not None and thread_conn is not conn
+    [hit] = search_captures(conn, "watchdog")
+    assert hit["matches"]["logs"] == 5
+    assert capture.store_cpu_seconds > 0
+
+
+def test_process_tailspin_parses_with_configured_workers(forensics_db, tmp_path: Path):
+    """The decoded file is parsed with parse_workers, capped at the CPU count."""
+    import subprocess
+
+    from rogue_hunter.forensics import TailspinFile
+    from rogue_hunter.storage import create_forensic_capture
+
+    conn, event_id = forensics_db
+    capture_id = create_forensic_capture(conn, event_id, "test")
+    with patch("rogue_hunter.forensics.os.cpu_count", return_value=2):
+        capture = ForensicsCapture(conn, event_id, tmp_path, parse_workers=8)
+
+    def decode(args, stdout, **kwargs):
+        stdout.write(b"Process:          first [100]\n")
+        return subprocess.CompletedProcess(args, 0)
+
+    with (
+        patch("rogue_hunter.forensics.subprocess.run", side_effect=decode),
+        patch.object(TailspinFile, "processes", return_value=iter([])) as processes,
+    ):
+        assert capture._process_tailspin(capture_id, tmp_path / "capture.tailspin") == "success"
+
+    processes.assert_called_once_with(2)
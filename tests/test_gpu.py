@@ -0,0 +1,150 @@
+"""Tests for the background GPU sampler."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from rogue_hunter.collector import LibprocCollector
+from rogue_hunter.config import Config
+from rogue_hunter.gpu import GpuSampler
+from rogue_hunter.sources import SyntheticSource
+
+
+class FakeIOKit:
+    """GPU provider returning scripted readings after a configurable delay."""
+
+    def __init__(self, readings: list[dict[int, int]], latency: float = 0.0):
+        self.readings = readings
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self) -> dict[int, int]:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        reading = self.readings[min(self.calls, len(self.readings) - 1)]
+        self.calls += 1
+        return dict(reading)
+
+
+def sampler_at(readings: list[tuple[float, dict[int, int]]], interval: float = 2.0) -> GpuSampler:
+    """A sampler whose readings were taken at the given monotonic times."""
+    sampler = GpuSampler(interval, FakeIOKit([r for _, r in readings]))
+    for timestamp, _ in readings:
+        with patch("rogue_hunter.gpu.time.monotonic", return_value=timestamp):
+            sampler.sample()
+    return sampler
+
+
+class TestGpuSampler:
+    """Test GPU rate interpolation."""
+
+    def test_no_readings(self):
+        """Before the first scan nothing is reported."""
+        sampler = GpuSampler(2.0, FakeIOKit([{}]))
+        assert sampler.usage(time.monotonic()) == {}
+
+    def test_single_reading_has_no_rate(self):
+        """One reading gives cumulative time but no rate."""
+        sampler = sampler_at([(100.0, {10: 5_000_000})])
+        assert sampler.usage(101.0) == {10: (5_000_000, 0.0)}
+
+    def test_rate_from_last_two_readings(self):
+        """Rate is the GPU time delta over the time between scans."""
+        sampler = sampler_at([(100.0, {10: 0}), (102.0, {10: 100_000_000})])
+        gpu_time, rate = sampler.usage(102.0)[10]
+        assert gpu_time == 100_000_000
+        assert rate == pytest.approx(50.0)  # 100ms over 2s
+
+    def test_interpolates_between_scans(self):
+        """gpu_time advances at the current rate between scans."""
+        sampler = sampler_at([(100.0, {10: 0}), (102.0, {10: 100_000_000})])
+        gpu_time, rate = sampler.usage(103.0)[10]
+        assert gpu_time == 150_000_000
+        assert rate == pytest.approx(50.0)
+
+    def test_extrapolation_capped_at_interval(self):
+        """A stalled sampler does not extrapolate indefinitely."""
+        sampler = sampler_at([(100.0, {10: 0}), (102.0, {10: 100_000_000})], interval=2.0)
+        assert sampler.usage(110.0)[10][0] == 200_000_000
+
+    def test_new_or_idle_pid_has_zero_rate(self):
+        """PIDs without a GPU time increase report a zero rate."""
+        sampler = sampler_at([(100.0, {10: 50}), (102.0, {10: 50, 20: 70})])
+        usage = sampler.usage(102.5)
+        assert usage[10] == (50, 0.0)
+        assert usage[20] == (70, 0.0)
+
+    def test_stats_report_provider_cost(self):
+        """Provider latency shows up in the stats, which reset when taken."""
+        sampler = GpuSampler(2.0, FakeIOKit([{}], latency=0.02))
+        sampler.sample()
+        sampler.sample()
+
+        stats = sampler.take_stats()
+        assert stats.samples == 2
+        assert stats.mean_ms >= 20
+        assert stats.max_ms >= stats.mean_ms
+        assert sampler.take_stats().samples == 0
+
+    async def test_run_samples_until_stopped(self):
+        """run() scans every interval and exits when stop is set."""
+        provider = FakeIOKit([{10: 0}, {10: 1_000_000}])
+        sampler = GpuSampler(0.01, provider)
+        stop = asyncio.Event()
+        task = asyncio.create_task(sampler.run(stop))
+
+        await asyncio.sleep(0.1)
+        stop.set()
+        await asyncio.wait_for(task, timeout=1.0)
+
+        assert provider.calls >= 2
+        assert 10 in sampler.usage(time.monotonic())
+
+    async def test_run_survives_provider_errors(self):
+        """A provider error is skipped; sampling carries on with the next call."""
+        calls = 0
+
+        def provider() -> dict[int, int]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("IORegistry busy")
+            return {10: calls * 1_000_000}
+
+        sampler = GpuSampler(0.01, provider)
+        stop = asyncio.Event()
+        task = asyncio.create_task(sampler.run(stop))
+
+        while calls < 3 and not task.done():
+            await asyncio.sleep(0.01)
+        stop.set()
+        await asyncio.wait_for(task, timeout=1.0)
+
+        assert sampler.usage(time.monotonic())[10][1] > 0
+
+
+class TestCollectorGpu:
+    """The collector reads GPU data from the sampler, never the provider."""
+
+    def test_slow_provider_not_on_collection_path(self):
+        """A slow IOKit scan does not slow down collection."""
+        source = SyntheticSource(process_count=20)
+        hot_pid = source.list_pids()[0]
+        provider = FakeIOKit([{hot_pid: 0}, {hot_pid: 200_000_000}], latency=0.2)
+        collector = LibprocCollector(Config(), source, gpu_provider=provider)
+
+        collector.gpu.sample()
+        collector.gpu.sample()
+        calls = provider.calls
+
+        start = time.monotonic()
+        collector._collect_sync()
+        samples = collector._collect_sync()
+        elapsed = time.monotonic() - start
+
+        assert provider.calls == calls
+        assert elapsed < 0.2
+        assert samples.all_by_pid[hot_pid].gpu_time_rate > 0
+        collector.close()
@@ -2,10 +2,16 @@
 
 import ctypes
 import os
+import platform
+
+import pytest
 
 from rogue_hunter.libproc import (
+    PROC_PIDTASKINFO,
     MachTimebaseInfo,
     ProcBSDInfo,
+    ProcFunctions,
+    ProcInfoReader,
     ProcTaskInfo,
     RusageInfoV4,
     abs_to_ns,
@@ -18,6 +24,11 @@ from rogue_hunter.libproc import (
     list_all_pids,
 )
 
+# The bindings import everywhere; the live calls need macOS
+requires_libproc = pytest.mark.skipif(
+    platform.system() != "Darwin", reason="libproc is only available on macOS"
+)
+
 
 class TestStructSizes:
     """Test that struct sizes match C definitions."""
@@ -54,12 +65,14 @@ class TestStructSizes:
 class TestTimebase:
     """Test mach timebase conversion."""
 
+    @requires_libproc
     def test_get_timebase_info(self):
         """Should return valid timebase info."""
         info = get_timebase_info()
         assert info.numer > 0
         assert info.denom > 0
 
+    @requires_libproc
     def test_intel_timebase(self):
         """On Intel, timebase is usually (1, 1)."""
         info = get_timebase_info()
@@ -85,6 +98,7 @@ class TestTimebase:
         assert result == 125  # (3 * 125) // 3 = 125 ns
 
 
+@requires_libproc
 class TestPIDListing:
     """Test PID enumeration."""
 
@@ -107,6 +121,7 @@ class TestPIDListing:
         assert all(pid > 0 for pid in pids)
 
 
+@requires_libproc
 class TestRusage:
     """Test rusage retrieval."""
 
@@ -133,6 +148,7 @@ class TestRusage:
         get_rusage(1)
 
 
+@requires_libproc
 class TestTaskInfo:
     """Test task info retrieval."""
 
@@ -151,6 +167,7 @@ class TestTaskInfo:
         assert info is None
 
 
+@requires_libproc
 class TestBSDInfo:
     """Test BSD info retrieval."""
 
@@ -169,6 +186,7 @@ class TestBSDInfo:
         assert info is None
 
 
+@requires_libproc
 class TestProcessName:
     """Test process name lookup."""
 
@@ -201,3 +219,142 @@ class TestStateName:
         assert get_state_name(0) == "unknown"
         assert get_state_name(99) == "unknown"
         assert get_state_name(-1) == "unknown"
+
+
+class FakeLibproc:
+    """In-memory libproc that fills the reader's buffers by address."""
+
+    def __init__(self, pids: list[int]):
+        self.pids = pids
+        self.listallpids_calls: list[int] = []  # Buffer sizes passed
+
+    def functions(self) -> ProcFunctions:
+        return ProcFunctions(
+            proc_pid_rusage=self.proc_pid_rusage,
+            proc_pidinfo=self.proc_pidinfo,
+            proc_listallpids=self.proc_listallpids,
+            proc_name=self.proc_name,
+        )
+
+    def proc_listallpids(self, buffer, size):
+        self.listallpids_calls.append(size)
+        if buffer is None:
+            return len(self.pids)
+        capacity = size // ctypes.sizeof(ctypes.c_int)
+        count = min(capacity, len(self.pids))
+        array = (ctypes.c_int * capacity).from_address(buffer)
+        array[:count] = self.pids[:count]
+        return count
+
+    def proc_pid_rusage(self, pid, flavor, buffer):
+        if pid not in self.pids:
+            return -1
+        r = RusageInfoV4.from_address(buffer)
+        r.ri_user_time = pid * 10
+        r.ri_system_time = pid
+        r.ri_phys_footprint = pid * 1000
+        r.ri_proc_start_abstime = pid + 5
+        return 0
+
+    def proc_pidinfo(self, pid, flavor, arg, buffer, size):
+        if pid not in self.pids:
+            return 0
+        if flavor == PROC_PIDTASKINFO:
+            t = ProcTaskInfo.from_address(buffer)
+            t.pti_csw = pid * 2
+            t.pti_threadnum = 3
+        else:
+            b = ProcBSDInfo.from_address(buffer)
+            b.pbi_status = 2
+            b.pbi_ppid = 1
+            b.pbi_comm = f"proc{pid}".encode()
+        return size
+
+    def proc_name(self, pid, buffer, size):
+        if pid not in self.pids:
+            return 0
+        name = f"process-{pid}".encode()
+        ctypes.memmove(buffer, name + b"\0", len(name) + 1)
+        return len(name)
+
+
+class TestProcInfoReader:
+    """Test the buffer-reusing reader against a fake function table."""
+
+    def test_read_usage(self):
+        """Usage counters come from the rusage struct."""
+        reader = ProcInfoReader(FakeLibproc([10, 20]).functions())
+        usage = reader.read_usage(20)
+        assert usage.cpu_time == 220
+        assert usage.mem == 20000
+        assert usage.start_time == 25
+        assert reader.read_usage(30) is None
+
+    def test_results_do_not_alias_buffers(self):
+        """Earlier results are unaffected by later reads into the same struct."""
+        reader = ProcInfoReader(FakeLibproc([10, 20]).functions())
+        first = reader.read_usage(10)
+        reader.read_usage(20)
+        assert first.cpu_time == 110
+
+    def test_read_detail(self):
+        """Detail counters combine the task and BSD structs."""
+        reader = ProcInfoReader(FakeLibproc([10]).functions())
+        detail = reader.read_detail(10)
+        assert detail.csw == 20
+        assert detail.threads == 3
+        assert detail.status == 2
+        assert detail.comm == b"proc10"
+        assert reader.read_detail(11) is None
+        assert reader.calls == 3  # Task call skipped the BSD call for 11
+
+    def test_read_name(self):
+        """Names are decoded from the reused name buffer."""
+        reader = ProcInfoReader(FakeLibproc([10, 2000]).functions())
+        assert reader.read_name(2000) == "process-2000"
+        assert reader.read_name(10) == "process-10"
+        assert reader.read_name(11) == ""
+
+    def test_list_pids_skips_sizing_call_once_buffer_fits(self):
+        """The sizing call is only made when the buffer is missing or full."""
+        fake = FakeLibproc(list(range(1, 101)))
+        reader = ProcInfoReader(fake.functions())
+
+        assert reader.list_pids() == list(range(1, 101))
+        assert fake.listallpids_calls[0] == 0  # Sizing call
+        fake.listallpids_calls.clear()
+
+        assert reader.list_pids() == list(range(1, 101))
+        assert len(fake.listallpids_calls) == 1
+        assert reader.calls == 3
+
+    def test_list_pids_grows_buffer(self):
+        """A full buffer triggers a resize, and no PIDs are lost."""
+        fake = FakeLibproc(list(range(1, 11)))
+        reader = ProcInfoReader(fake.functions())
+        reader.list_pids()
+        capacity = reader.pid_capacity
+
+        fake.pids = list(range(1, capacity + 50))
+        assert reader.list_pids() == fake.pids
+        assert reader.pid_capacity > capacity
+
+    def test_list_pids_empty(self):
+        """No processes means an empty list."""
+        reader = ProcInfoReader(FakeLibproc([]).functions())
+        assert reader.list_pids() == []
+
+    @pytest.mark.skipif(platform.system() == "Darwin", reason="libproc is available")
+    def test_default_functions_require_macos(self):
+        """Without a function table the reader needs the real library."""
+        with pytest.raises(OSError):
+            ProcInfoReader()
+
+    @requires_libproc
+    def test_live_reads(self):
+        """The default reader reads this process."""
+        reader = ProcInfoReader()
+        pid = os.getpid()
+        assert pid in reader.list_pids()
+        assert reader.read_usage(pid).mem > 0
+        assert reader.read_detail(pid).threads >= 1
@@ -0,0 +1,324 @@
+"""Tests for schema migrations."""
+
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from rogue_hunter.migrations import (
+    MIGRATIONS,
+    MIN_MIGRATABLE_VERSION,
+    Migration,
+    backup_path,
+    can_migrate,
+    get_pending_backfills,
+    run_backfills,
+)
+from rogue_hunter.storage import (
+    _MACHINE_PARTITION_DDL,
+    _MACHINE_PARTITION_INDEX,
+    _MACHINE_PARTITION_SERIES_INDEXES,
+    SCHEMA_VERSION,
+    close_process_event,
+    create_forensic_capture,
+    create_process_event,
+    get_connection,
+    get_machine_partitions,
+    get_machine_snapshot_processes,
+    get_schema_version,
+    get_top_offenders,
+    init_database,
+    insert_log_entries,
+    insert_log_entry,
+    insert_machine_snapshot,
+    search_captures,
+    update_forensic_capture_status,
+)
+from tests.conftest import make_process_score
+
+
+def _make_v20_database(path: Path, snapshots: int, procs: int) -> list[int]:
+    """Build a database in the v20 layout: one machine_snapshot_processes table.
+
+    Returns the machine snapshot ids.
+    """
+    init_database(path)
+    conn = sqlite3.connect(path)
+    for table in get_machine_partitions(conn):
+        conn.execute(f"DROP TABLE {table}")
+    conn.execute(_MACHINE_PARTITION_DDL.format(table="machine_snapshot_processes"))
+    conn.execute(
+        _MACHINE_PARTITION_INDEX.format(table="machine_snapshot_processes").replace(
+            "idx_machine_snapshot_processes_snapshot", "idx_msp_snapshot"
+        )
+    )
+    conn.execute("DROP INDEX idx_process_events_peak_snapshot")
+
+    columns = [
+        row[1]
+        for row in conn.execute("PRAGMA table_info(machine_snapshot_processes)")
+        if row[1] != "id"
+    ]
+    placeholders = ",".join("?" * len(columns))
+    insert = f"INSERT INTO machine_snapshot_processes ({','.join(columns)}) VALUES ({placeholders})"
+
+    start = time.time() - 6 * 3600
+    ids = []
+    for i in range(snapshots):
+        snapshot_id = conn.execute(
+            """INSERT INTO machine_snapshots (captured_at, process_count, max_score)
+               VALUES (?, ?, 0)""",
+            (start + i * 60, procs),
+        ).lastrowid
+        ids.append(snapshot_id)
+        rows = []
+        for pid in range(procs):
+            row = {c: 0 for c in columns}
+            row.update(snapshot_id=snapshot_id, pid=pid, command=f"proc{pid}", score=pid)
+            rows.append([row[c] for c in columns])
+        conn.executemany(insert, rows)
+
+    conn.execute(
+        """INSERT INTO process_events (pid, command, boot_time, entry_time, entry_band,
+                                       peak_score, peak_band)
+           VALUES (1, 'kept', 0, 0, 'high', 80, 'high')"""
+    )
+    conn.execute("UPDATE daemon_state SET value = '20' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def test_migrations_reach_schema_version():
+    """The last registered migration produces SCHEMA_VERSION."""
+    assert MIGRATIONS[-1].version == SCHEMA_VERSION
+    versions = [m.version for m in MIGRATIONS]
+    assert versions == list(range(MIN_MIGRATABLE_VERSION + 1, SCHEMA_VERSION + 1))
+    assert can_migrate(SCHEMA_VERSION - 1)
+    assert not can_migrate(SCHEMA_VERSION)
+    assert not can_migrate(MIN_MIGRATABLE_VERSION - 1)
+
+
+def test_migrates_previous_version_in_place(tmp_path: Path):
+    """A v20 database keeps its data and is backed up before upgrading."""
+    db_path = tmp_path / "data.db"
+    ids = _make_v20_database(db_path, snapshots=120, procs=50)
+
+    start = time.monotonic()
+    init_database(db_path)
+    startup = time.monotonic() - start
+
+    assert startup < 5.0  # Schema steps only; rows move in the background
+    assert backup_path(db_path, 20).exists()
+    conn = get_connection(db_path)
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert get_pending_backfills(conn) == [21, 25, 26]
+    assert conn.execute("SELECT command FROM process_events").fetchone() == ("kept",)
+    index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'idx_process_events_peak_snapshot'"
+    ).fetchone()
+    assert index is not None
+    conn.close()
+
+    backup = sqlite3.connect(backup_path(db_path, 20))
+    assert get_schema_version(backup) == 20
+    assert backup.execute("SELECT COUNT(*) FROM machine_snapshot_processes").fetchone() == (6000,)
+    backup.close()
+
+    # Opening again is a no-op
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    batches = list(run_backfills(conn, batch_size=25))
+    assert len(batches) == 5
+    assert sum(moved for _, moved in batches) == 120
+    assert get_pending_backfills(conn) == []
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert "machine_snapshot_processes_legacy" not in tables
+    assert "idx_msp_snapshot" not in tables
+    processes = get_machine_snapshot_processes(conn, ids[7])
+    assert len(processes) == 50
+    assert processes[0]["pid"] == 49  # Highest score first
+    partition_rows = sum(
+        conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in get_machine_partitions(conn)
+    )
+    assert partition_rows == 6000
+    conn.close()
+
+
+def test_backfill_resumes_after_interruption(tmp_path: Path):
+    """A backfill stopped part way finishes on the next run."""
+    db_path = tmp_path / "data.db"
+    _make_v20_database(db_path, snapshots=10, procs=3)
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    first = run_backfills(conn, batch_size=2)
+    next(first)
+    first.close()
+    assert get_pending_backfills(conn) == [21, 25, 26]
+
+    moved = sum(n for _, n in run_backfills(conn, batch_size=2))
+    assert moved == 8
+    assert get_pending_backfills(conn) == []
+    assert list(run_backfills(conn)) == []
+    conn.close()
+
+
+def test_failed_migration_rolls_back(tmp_path: Path):
+    """A failing schema step leaves the database at its old version."""
+    db_path = tmp_path / "data.db"
+    _make_v20_database(db_path, snapshots=2, procs=2)
+
+    def fail(conn: sqlite3.Connection) -> None:
+        conn.execute("ALTER TABLE machine_snapshot_processes RENAME TO moved")
+        raise RuntimeError("boom")
+
+    broken = [Migration(version=21, description="broken", apply=fail)]
+    with patch("rogue_hunter.migrations.MIGRATIONS", broken):
+        with pytest.raises(RuntimeError):
+            init_database(db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert get_schema_version(conn) == 20
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert "machine_snapshot_processes" in tables
+    assert "moved" not in tables
+    conn.close()
+    assert backup_path(db_path, 20).exists()
+
+
+def test_v21_indexes_replaced(tmp_path: Path):
+    """The v22 step swaps single-column indexes for composites."""
+    db_path = tmp_path / "data.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    insert_machine_snapshot(conn, 7200.0, [make_process_score()])
+    partition = get_machine_partitions(conn)[0]
+    conn.execute(f"DROP INDEX idx_{partition}_snapshot_score")
+    conn.execute(f"CREATE INDEX idx_{partition}_snapshot ON {partition}(snapshot_id)")
+    conn.execute("DROP INDEX idx_process_snapshots_event_time")
+    conn.execute("CREATE INDEX idx_process_snapshots_event ON process_snapshots(event_id)")
+    conn.execute("CREATE INDEX idx_process_snapshots_score ON process_snapshots(score)")
+    conn.execute("UPDATE daemon_state SET value = '21' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert "idx_process_snapshots_event_time" in indexes
+    assert "idx_process_snapshots_event" not in indexes
+    assert "idx_process_snapshots_score" not in indexes
+    assert f"idx_{partition}_snapshot_score" in indexes
+    assert f"idx_{partition}_snapshot" not in indexes
+    assert get_pending_backfills(conn) == [25, 26]  # Only the rollup and search index
+    conn.close()
+
+
+def test_v23_partitions_get_series_indexes(tmp_path: Path):
+    """The v24 step adds command and PID indexes to existing partitions."""
+    db_path = tmp_path / "data.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    insert_machine_snapshot(conn, 7200.0, [make_process_score()])
+    partition = get_machine_partitions(conn)[0]
+    names = [index.split()[5] for index in _MACHINE_PARTITION_SERIES_INDEXES]
+    for name in names:
+        conn.execute(f"DROP INDEX {name.format(table=partition)}")
+    conn.execute("UPDATE daemon_state SET value = '23' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {name.format(table=partition) for name in names} <= indexes
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    conn.close()
+
+
+def test_v24_closed_events_backfill_command_stats(tmp_path: Path):
+    """Events closed before the v25 upgrade are rolled up once, by the backfill."""
+    db_path = tmp_path / "data.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    now = time.time()
+    for i in range(250):
+        event_id = create_process_event(conn, i, "hog", 1, now - 100, "critical", 90, "critical")
+        close_process_event(conn, event_id, now - 50)
+    open_id = create_process_event(conn, 999, "hog", 1, now - 10, "high", 65, "high")
+    conn.execute("DROP TABLE command_stats")
+    conn.execute("UPDATE daemon_state SET value = '24' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    assert get_pending_backfills(conn) == [25, 26]
+    close_process_event(conn, open_id, time.time())  # Closed after the upgrade
+    batches = list(run_backfills(conn, batch_size=1))
+    assert [moved for _, moved in batches] == [1, 1, 1]  # Blocks of 100 events
+    [hog] = get_top_offenders(conn, since=0, band="all")
+    assert (hog["events"], hog["critical_events"], hog["high_events"]) == (251, 250, 1)
+    assert get_pending_backfills(conn) == []
+    conn.close()
+
+
+def _drop_search_schema(conn: sqlite3.Connection) -> None:
+    """Take a database back to v25, before full-text search, and close it."""
+    conn.execute("DROP TRIGGER forensic_captures_search_delete")
+    for table in ("log_search", "frame_search", "search_indexed_captures"):
+        conn.execute(f"DROP TABLE {table}")
+    conn.execute("UPDATE daemon_state SET value = '25' WHERE key = 'schema_version'")
+    conn.commit()
+    conn.close()
+
+
+def test_v25_captures_backfill_search_index(tmp_path: Path):
+    """Captures ingested before the v26 upgrade are indexed by the backfill."""
+    db_path = tmp_path / "data.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    event_id = create_process_event(conn, 1, "hog", 1, time.time(), "high", 70, "high")
+    for status in ("success", None):  # The second is still being ingested
+        capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+        insert_log_entry(conn, capture_id, "2024-01-15 10:30:00", "watchdog fired")
+        update_forensic_capture_status(conn, capture_id, None, status, status)
+    _drop_search_schema(conn)
+
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    assert get_pending_backfills(conn) == [26]
+    assert search_captures(conn, "watchdog") == []
+    assert [moved for _, moved in run_backfills(conn)] == [1]
+    assert [hit["capture_id"] for hit in search_captures(conn, "watchdog")] == [capture_id - 1]
+    assert get_pending_backfills(conn) == []
+    conn.close()
+
+
+def test_v26_backfill_steps_are_bounded_by_rows(tmp_path: Path):
+    """A large capture is indexed over several steps, a bounded number of rows each."""
+    db_path = tmp_path / "data.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    event_id = create_process_event(conn, 1, "hog", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+    rows = [("2024-01-15 10:30:00", "watchdog fired", None, None, None, None, None, None)]
+    insert_log_entries(conn, capture_id, rows * 1000)
+    update_forensic_capture_status(conn, capture_id, None, "success", "success")
+    _drop_search_schema(conn)
+
+    init_database(db_path)
+
+    conn = get_connection(db_path)
+    assert [moved for _, moved in run_backfills(conn, batch_size=1)] == [1, 1, 1]
+    assert search_captures(conn, "watchdog")[0]["matches"]["logs"] == 1000
+    conn.close()
@@ -0,0 +1,213 @@
+"""Query plan regression tests for the storage read paths.
+
+Every public getter is run against an initialized database with SQL tracing
+on, and each statement it issues is checked with EXPLAIN QUERY PLAN: no
+full table scans, no temp B-tree sorts, and the expected index in use.
+The schema's indexes are checked the other way round: each one must be used
+by some catalogued query or support a foreign key.
+"""
+
+import sqlite3
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from rogue_hunter import archive, calltree, capturediff, storage, waitgraph
+from tests.conftest import make_process_score
+
+# (name, call, index the plan must use; None for rowid/autoindex lookups)
+CATALOGUE: list[tuple[str, Callable[[sqlite3.Connection], object], str | None]] = [
+    ("open_events", lambda c: storage.get_open_events(c, 1), "idx_process_events_open"),
+    ("events", lambda c: storage.get_process_events(c), "idx_process_events_entry"),
+    (
+        "events_since",
+        lambda c: storage.get_process_events(c, time_cutoff=5.0),
+        "idx_process_events_entry",
+    ),
+    (
+        "events_boot",
+        lambda c: storage.get_process_events(c, boot_time=1),
+        "idx_process_events_boot_entry",
+    ),
+    (
+        "events_boot_since",
+        lambda c: storage.get_process_events(c, boot_time=1, time_cutoff=5.0),
+        "idx_process_events_boot_entry",
+    ),
+    (
+        "events_stream",
+        lambda c: list(storage.iter_process_events(c, page_size=1)),
+        "idx_process_events_entry",
+    ),
+    (
+        "events_stream_boot",
+        lambda c: list(storage.iter_process_events(c, boot_time=1, time_cutoff=5.0, page_size=1)),
+        "idx_process_events_boot_entry",
+    ),
+    ("event_detail", lambda c: storage.get_process_event_detail(c, 1), None),
+    ("snapshot", lambda c: storage.get_snapshot(c, 1), None),
+    (
+        "process_snapshots",
+        lambda c: storage.get_process_snapshots(c, 1),
+        "idx_process_snapshots_event_time",
+    ),
+    (
+        "forensic_captures",
+        lambda c: storage.get_forensic_captures(c, 1),
+        "idx_forensic_captures_event_time",
+    ),
+    ("forensic_capture", lambda c: storage.get_forensic_capture(c, 1), None),
+    ("latest_capture_id", lambda c: storage.get_adjacent_capture_id(c), None),
+    ("older_capture_id", lambda c: storage.get_adjacent_capture_id(c, 2), None),
+    ("newer_capture_id", lambda c: storage.get_adjacent_capture_id(c, 0, newer=True), None),
+    ("tailspin_header", lambda c: storage.get_tailspin_header(c, 1), None),
+    (
+        "tailspin_processes",
+        lambda c: storage.get_tailspin_processes(c, 1),
+        "idx_tailspin_process_capture_cpu",
+    ),
+    (
+        "tailspin_threads",
+        lambda c: storage.get_tailspin_threads(c, 1),
+        "idx_tailspin_thread_process_samples",
+    ),
+    (
+        "tailspin_frames",
+        lambda c: storage.get_tailspin_frames(c, 1),
+        "idx_tailspin_frame_thread_depth",
+    ),
+    (
+        "tailspin_binary_images",
+        lambda c: storage.get_tailspin_binary_images(c, 1),
+        "idx_tailspin_binary_image_process_address",
+    ),
+    ("log_entries", lambda c: storage.get_log_entries(c, 1), "idx_log_entries_capture_time"),
+    ("buffer_context", lambda c: storage.get_buffer_context(c, 1), "idx_buffer_context_capture"),
+    (
+        "load_event_detail",
+        lambda c: storage.load_event_detail(c, 1).frames(1),
+        "idx_tailspin_thread_process_samples",
+    ),
+    (
+        "call_tree",
+        lambda c: calltree.build_call_tree(c, 1, pid=1),
+        "idx_tailspin_frame_thread_depth",
+    ),
+    (
+        "capture_diff",
+        lambda c: capturediff.diff_captures(c, 1, 1, pid=1),
+        "idx_tailspin_frame_thread_depth",
+    ),
+    (
+        "wait_graph",
+        lambda c: waitgraph.build_wait_graph(c, 1),
+        "idx_tailspin_frame_thread_depth",
+    ),
+    (
+        "machine_snapshot_processes",
+        lambda c: storage.get_machine_snapshot_processes(c, 1),
+        "_snapshot_score",
+    ),
+    (
+        "machine_snapshot_count",
+        lambda c: storage.get_machine_snapshot_count(c),
+        "idx_machine_snapshots_time",
+    ),
+    (
+        "series_command",
+        lambda c: storage.get_process_series(c, ["cpu"], 0.0, command="test_cmd"),
+        "_command_snapshot",
+    ),
+    (
+        "series_pid",
+        lambda c: storage.get_process_series(c, ["cpu"], 0.0, time.time() + 60, pid=123),
+        "_pid_snapshot",
+    ),
+    (
+        "top_offenders",
+        lambda c: storage.get_top_offenders(c, time.time() - 30 * 86400),
+        "idx_command_stats_day",
+    ),
+    ("prune_progress", lambda c: storage.get_prune_progress(c), None),
+    ("event_archive", lambda c: archive.get_event_archive(c, 1), None),
+    (
+        "close_stale_open_events",
+        lambda c: storage.close_stale_open_events(c, time.time()),
+        "idx_process_events_open",
+    ),
+    ("prune_incremental", lambda c: list(storage.prune_incremental(c)), None),
+]
+
+
+@pytest.fixture
+def plan_db(initialized_db: Path):
+    """Connection to a database with one machine snapshot partition and two events.
+
+    The first event has a capture with one tailspin process.
+    """
+    conn = storage.get_connection(initialized_db)
+    storage.insert_machine_snapshot(conn, time.time(), [make_process_score()])
+    for entry_time in (10.0, 20.0):  # Two, so paged getters issue their follow-on queries
+        storage.create_process_event(conn, 1, "proc", 1, entry_time, "high", 60, "high")
+    capture_id = storage.create_forensic_capture(conn, 1, "band_entry_high")
+    storage.insert_tailspin_process(conn, capture_id, 1, "proc")  # So the loader reads threads
+    yield conn
+    conn.close()
+
+
+def _plans(conn: sqlite3.Connection, call: Callable) -> list[tuple[str, list[str]]]:
+    """Run call and return (sql, plan details) for each query it issued."""
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call(conn)
+    finally:
+        conn.set_trace_callback(None)
+    return [
+        (sql, [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)])
+        for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+    ]
+
+
+@pytest.mark.parametrize("name,call,index", CATALOGUE, ids=[c[0] for c in CATALOGUE])
+def test_query_plan(plan_db: sqlite3.Connection, name: str, call: Callable, index: str | None):
+    """Getter queries use an index for both lookup and ordering."""
+    plans = _plans(plan_db, call)
+    assert plans, f"{name} issued no queries"
+
+    details = []
+    for sql, plan in plans:
+        for detail in plan:
+            assert "TEMP B-TREE" not in detail, f"{name} sorts in a temp B-tree: {sql}"
+            # Scanning a subquery's result rows is not a table scan
+            is_scan = detail.startswith("SCAN ") and "USING" not in detail
+            is_scan = is_scan and not detail.startswith("SCAN (subquery")
+            assert not is_scan or detail == "SCAN sqlite_master", f"{name} full scan: {sql}"
+            details.append(detail)
+    if index is not None:
+        assert any(index in detail for detail in details), f"{name} plans: {details}"
+
+
+def test_every_index_is_used(plan_db: sqlite3.Connection):
+    """Each schema index serves a catalogued query or a foreign key."""
+    used = set()
+    for _, call, _ in CATALOGUE:
+        for _, plan in _plans(plan_db, call):
+            used.update(plan)
+
+    unused = []
+    for name, table in plan_db.execute(
+        "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    ):
+        if any(f"INDEX {name} " in detail or detail.endswith(name) for detail in used):
+            continue
+        leading = plan_db.execute(f"PRAGMA index_info({name})").fetchone()[2]
+        fk_columns = {row[3] for row in plan_db.execute(f"PRAGMA foreign_key_list({table})")}
+        if leading in fk_columns:
+            continue  # Keeps cascades and reference checks off full scans
+        unused.append(name)
+
+    assert unused == []
@@ -0,0 +1,198 @@
+"""Tests for the forensics capture scheduler."""
+
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+
+from rogue_hunter.scheduler import (
+    CaptureCost,
+    CaptureScheduler,
+    CaptureTrigger,
+    resource_usage,
+)
+
+
+class FakeClock:
+    """A monotonic clock the test moves by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBackend:
+    """Records the captures asked for; each costs cost."""
+
+    def __init__(self, cost: CaptureCost = CaptureCost(10.0, 100), fail: bool = False):
+        self.cost = cost
+        self.fail = fail
+        self.calls: list[tuple[CaptureTrigger, list[CaptureTrigger]]] = []
+        self.started: list[float] = []
+
+    async def __call__(self, lead: CaptureTrigger, linked: list[CaptureTrigger]) -> CaptureCost:
+        self.calls.append((lead, linked))
+        self.started.append(time.monotonic())
+        if self.fail:
+            raise RuntimeError("capture failed")
+        return self.cost
+
+
+async def drained(scheduler: CaptureScheduler) -> None:
+    """Wait for queued triggers to be captured or shed."""
+    for _ in range(1000):
+        await asyncio.sleep(0)
+        if scheduler._task is None or scheduler._task.done():
+            return
+        await asyncio.sleep(0.001)
+    raise AssertionError("scheduler never drained")
+
+
+def test_trigger_priority_orders_band_then_type_then_score():
+    """Band outranks trigger type, which outranks score."""
+    triggers = [
+        CaptureTrigger(1, "band_entry_high", 99, 0.0),
+        CaptureTrigger(2, "band_entry_critical", 70, 0.0),
+        CaptureTrigger(3, "peak_escalation_critical", 70, 0.0),
+        CaptureTrigger(4, "band_entry_critical", 80, 0.0),
+    ]
+
+    ranked = sorted(triggers, key=lambda t: t.priority, reverse=True)
+
+    assert [t.event_id for t in ranked] == [3, 4, 2, 1]
+    assert triggers[0].band == "high"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_triggers_coalesce_into_one_capture():
+    """Triggers inside the coalescing window share one capture, led by the top priority."""
+    backend = FakeBackend()
+    scheduler = CaptureScheduler(backend, debounce=0, coalesce_seconds=0.01)
+
+    scheduler.submit(1, "band_entry_critical", 75)
+    scheduler.submit(2, "peak_escalation_critical", 72)
+    scheduler.submit(3, "band_entry_high", 90)
+    await drained(scheduler)
+
+    [(lead, linked)] = backend.calls
+    assert lead.event_id == 2
+    assert [t.event_id for t in linked] == [1, 3]
+    assert scheduler.captures == 1
+
+
+@pytest.mark.asyncio
+async def test_debounce_spaces_capture_starts():
+    """A trigger right after a capture waits out the debounce, then runs."""
+    backend = FakeBackend()
+    scheduler = CaptureScheduler(backend, debounce=0.05, coalesce_seconds=0)
+
+    scheduler.submit(1, "band_entry_critical", 75)
+    await drained(scheduler)
+    scheduler.submit(2, "band_entry_critical", 75)
+    await drained(scheduler)
+
+    assert [lead.event_id for lead, _ in backend.calls] == [1, 2]
+    assert backend.started[1] - backend.started[0] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_failed_capture_does_not_stop_the_queue():
+    """A backend error is logged and later triggers still run."""
+    backend = FakeBackend(fail=True)
+    scheduler = CaptureScheduler(backend, debounce=0, coalesce_seconds=0)
+
+    scheduler.submit(1, "band_entry_critical", 75)
+    await drained(scheduler)
+    scheduler.submit(2, "band_entry_critical", 75)
+    await drained(scheduler)
+
+    assert len(backend.calls) == 2
+    assert scheduler.budget_used() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_trigger_storm_sheds_low_scores_then_everything_within_budget():
+    """Under a storm, budget use raises the bar until the hour frees it again.
+
+    Each capture costs a tenth of the CPU budget. Past half of it the lowest
+    lead score that runs climbs 20 points per capture: low-score bursts are
+    shed first, then everything at the full budget.
+    """
+    clock = FakeClock()
+    backend = FakeBackend(CaptureCost(10.0, 0))
+    scheduler = CaptureScheduler(
+        backend,
+        debounce=0,
+        coalesce_seconds=0,
+        cpu_budget=100.0,
+        io_budget=10**9,
+        shed_fraction=0.5,
+        clock=clock,
+    )
+    ran = []
+    for burst in range(14):
+        score = 90 if burst % 2 else 30
+        for pid in range(3):  # Three processes go critical together
+            scheduler.submit(burst * 10 + pid, "band_entry_critical", score + pid)
+        captures = scheduler.captures
+        await drained(scheduler)
+        ran.append(scheduler.captures > captures)
+        clock.now += 60.0
+
+    assert ran == [True] * 8 + [False, True, False, True, False, False]
+    assert all(len(linked) == 2 for _, linked in backend.calls)
+    assert scheduler.shed == 4 * 3
+    assert scheduler.budget_used() == pytest.approx(1.0)
+
+    clock.now += 3600.0  # The storm's captures age out of the hour
+    scheduler.submit(999, "band_entry_critical", 30)
+    await drained(scheduler)
+    assert backend.calls[-1][0].event_id == 999
+
+
+@pytest.mark.asyncio
+async def test_io_budget_counts_too():
+    """Whichever of CPU and I/O is more used sets the budget share."""
+    clock = FakeClock()
+    backend = FakeBackend(CaptureCost(0.0, 600))
+    scheduler = CaptureScheduler(
+        backend, debounce=0, coalesce_seconds=0, cpu_budget=100.0, io_budget=1000, clock=clock
+    )
+
+    scheduler.submit(1, "band_entry_critical", 99)
+    await drained(scheduler)
+    scheduler.submit(2, "band_entry_critical", 10)
+    await drained(scheduler)
+
+    assert scheduler.budget_used() == pytest.approx(0.6)
+    assert [lead.event_id for lead, _ in backend.calls] == [1]
+    assert scheduler.min_score() == pytest.approx(20.0)
+
+
+@pytest.mark.asyncio
+async def test_stop_drops_queued_triggers():
+    """stop() cancels the pending capture."""
+    backend = FakeBackend()
+    scheduler = CaptureScheduler(backend, debounce=0, coalesce_seconds=10.0)
+
+    scheduler.submit(1, "band_entry_critical", 75)
+    await asyncio.sleep(0)
+    await scheduler.stop()
+
+    assert backend.calls == []
+
+
+def test_resource_usage_counts_children_not_the_daemon():
+    """Work in this process is left out; reaped children count."""
+    before = resource_usage()
+    end = time.thread_time() + 0.2
+    while time.thread_time() < end:
+        pass
+    assert (resource_usage() - before).cpu_seconds == 0
+
+    subprocess.run([sys.executable, "-c", "sum(range(3 * 10**7))"], check=True)
+    assert (resource_usage() - before).cpu_seconds > 0.1
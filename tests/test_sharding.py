@@ -0,0 +1,122 @@
+"""Tests for sharded per-PID reads."""
+
+from rogue_hunter.collector import LibprocCollector
+from rogue_hunter.config import Config
+from rogue_hunter.sharding import ShardedReader, ShardTuner
+from rogue_hunter.sources import SyntheticSource
+
+
+class TestShardTuner:
+    """Test shard count auto-tuning."""
+
+    def test_candidates_are_powers_of_two_up_to_max(self):
+        """Candidates double up to max_threads, which is always included."""
+        assert ShardTuner(8).candidates == [1, 2, 4, 8]
+        assert ShardTuner(6).candidates == [1, 2, 4, 6]
+        assert ShardTuner(1).candidates == [1]
+
+    def test_trial_schedule(self):
+        """Each candidate is tried for trial_samples samples in order."""
+        tuner = ShardTuner(4, trial_samples=2)
+        counts = []
+        for _ in range(6):
+            count = tuner.next_count()
+            counts.append(count)
+            tuner.record(count, 1.0)
+        assert counts == [1, 1, 2, 2, 4, 4]
+        assert not tuner.tuning
+
+    def test_picks_fastest_median(self):
+        """After the trial the fastest candidate is used."""
+        tuner = ShardTuner(4, trial_samples=3)
+        timings = {1: 0.10, 2: 0.04, 4: 0.06}
+        while tuner.tuning:
+            count = tuner.next_count()
+            tuner.record(count, timings[count])
+        assert tuner.best == 2
+        assert tuner.next_count() == 2
+
+    def test_retunes_periodically(self):
+        """The trial restarts after retune_samples samples."""
+        tuner = ShardTuner(2, trial_samples=1, retune_samples=3)
+        while tuner.tuning:
+            tuner.record(tuner.next_count(), 0.01)
+        for _ in range(3):
+            tuner.record(tuner.next_count(), 0.01)
+        assert tuner.tuning
+        assert tuner.next_count() == 1
+
+
+class TestShardedReader:
+    """Test sharded reads."""
+
+    def test_results_match_serial_order(self):
+        """Sharded reads merge back in PID-list order."""
+        source = SyntheticSource(process_count=100)
+        pids = source.list_pids()
+
+        serial = ShardedReader(source, threads=1, max_threads=1)
+        serial.begin_sample()
+        expected = serial.read_usage(pids)
+
+        sharded = ShardedReader(source, threads=4, max_threads=4)
+        sharded.begin_sample()
+        result = sharded.read_usage(pids)
+        sharded.close()
+
+        assert [pid for pid, _ in result] == pids
+        assert result == expected
+
+    def test_each_shard_has_own_source(self):
+        """Workers get independent sources; calls are summed across them."""
+        source = SyntheticSource(process_count=100)
+        pids = source.list_pids()
+        reader = ShardedReader(source, threads=4, max_threads=4)
+        reader.begin_sample()
+        before = reader.calls
+
+        reader.read_detail(pids)
+        reader.close()
+
+        assert len({id(s) for s in reader._sources}) == 4
+        assert reader.calls - before == 200  # Two calls per detail read
+        assert all(s.calls > 0 for s in reader._sources)
+
+    def test_vanished_pids(self):
+        """Usage drops vanished PIDs; detail reports them as None."""
+        source = SyntheticSource(process_count=10)
+        reader = ShardedReader(source, threads=2, max_threads=2)
+        reader.begin_sample()
+
+        assert reader.read_usage([1, 2]) == []
+        assert reader.read_detail([1]) == [(1, None)]
+        reader.close()
+
+    def test_tuner_gets_read_time(self):
+        """Auto mode records each sample's read time with the tuner."""
+        source = SyntheticSource(process_count=10)
+        reader = ShardedReader(source, threads=0, max_threads=2)
+        reader.begin_sample()
+        reader.read_usage(source.list_pids())
+        assert reader.end_sample() > 0
+        assert reader.tuner._timings[1]
+        reader.close()
+
+
+class TestShardedCollection:
+    """Collector output does not depend on the shard count."""
+
+    def test_same_processes_and_commands(self):
+        """Four reader threads produce the same processes as one."""
+        results = []
+        for threads in (1, 4):
+            config = Config()
+            config.collection.threads = threads
+            collector = LibprocCollector(config, SyntheticSource(process_count=200, seed=3))
+            collector._collect_sync()
+            samples = collector._collect_sync()
+            assert collector.last_stats.shards == threads
+            results.append({pid: p.command for pid, p in samples.all_by_pid.items()})
+            collector.close()
+
+        assert results[0] == results[1]
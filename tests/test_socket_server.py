@@ -328,3 +328,39 @@ async def test_socket_server_multiple_clients(short_tmp_path):
         await writer2.wait_closed()
     finally:
         await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_socket_server_answers_culprits_request(short_tmp_path):
+    """A 'culprits' request is answered with the ring buffer's top culprits."""
+    socket_path = short_tmp_path / "test.sock"
+    buffer = RingBuffer(max_samples=10, culprit_threshold=50, sample_interval=0.5)
+    for score in (80, 40):
+        buffer.push(
+            make_test_samples(
+                max_score=score,
+                rogues=[make_test_process_score(pid=456, command="busy", score=score)],
+            )
+        )
+
+    server = SocketServer(socket_path=socket_path, ring_buffer=buffer)
+    await server.start()
+
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        await asyncio.wait_for(reader.readline(), timeout=2.0)  # initial_state
+
+        writer.write(b'{"type": "culprits", "limit": 5}\n')
+        await writer.drain()
+        message = json.loads(await asyncio.wait_for(reader.readline(), timeout=2.0))
+
+        assert message["type"] == "culprits"
+        assert message["seconds"] == 1.0
+        [culprit] = message["culprits"]
+        assert (culprit["pid"], culprit["score"], culprit["seconds_above"]) == (456, 80, 0.5)
+        assert culprit["max_share"] == 1.0
+
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        await server.stop()
@@ -0,0 +1,87 @@
+"""Tests for process data sources."""
+
+import time
+
+from rogue_hunter.libproc import SZOMB, DetailCounters, UsageCounters
+from rogue_hunter.sources import LibprocSource, SyntheticSource
+from tests.test_libproc import FakeLibproc
+
+
+class TestSyntheticSource:
+    """Test the synthetic process table."""
+
+    def test_lists_requested_process_count(self):
+        """list_pids returns one PID per simulated process."""
+        source = SyntheticSource(process_count=50)
+        assert len(source.list_pids()) == 50
+
+    def test_reads_return_counter_tuples(self):
+        """Usage and detail reads return the libproc counter tuples."""
+        source = SyntheticSource(process_count=5)
+        pid = source.list_pids()[0]
+
+        assert isinstance(source.read_usage(pid), UsageCounters)
+        assert isinstance(source.read_detail(pid), DetailCounters)
+        assert source.read_name(pid) == "hot0"
+
+    def test_missing_pid_returns_none(self):
+        """Reads for unknown PIDs behave like a vanished process."""
+        source = SyntheticSource(process_count=5)
+        assert source.read_usage(1) is None
+        assert source.read_detail(1) is None
+        assert source.read_name(1) == ""
+
+    def test_counts_calls(self):
+        """Each simulated syscall is counted (detail costs two)."""
+        source = SyntheticSource(process_count=5)
+        pid = source.list_pids()[0]
+        source.read_usage(pid)
+        source.read_detail(pid)
+        source.read_name(pid)
+        assert source.calls == 2 + 1 + 2 + 1
+
+    def test_hot_counters_advance_with_time(self):
+        """Hot processes accumulate CPU time between samples."""
+        source = SyntheticSource(process_count=5, hot_count=1)
+        pid = source.list_pids()[0]
+        before = source.read_usage(pid).cpu_time
+        time.sleep(0.01)
+        source.list_pids()
+        assert source.read_usage(pid).cpu_time > before
+
+    def test_zombies(self):
+        """zombie_count processes report the zombie status."""
+        source = SyntheticSource(process_count=10, hot_count=0, zombie_count=2)
+        statuses = [source.read_detail(pid).status for pid in source.list_pids()]
+        assert statuses.count(SZOMB) == 2
+
+    def test_churn_replaces_idle_pids(self):
+        """churn retires idle PIDs and spawns new ones."""
+        source = SyntheticSource(process_count=100, hot_count=2, churn=0.1)
+        first = set(source.list_pids())
+        second = set(source.list_pids())
+        assert len(second) == 100
+        assert first != second
+
+
+class TestLibprocSource:
+    """Test the libproc source against a fake function table."""
+
+    def test_reads_through_reader(self):
+        """Reads and call counts come from the underlying ProcInfoReader."""
+        source = LibprocSource(FakeLibproc([10, 20]).functions())
+        assert source.list_pids() == [10, 20]
+        assert source.read_usage(10).cpu_time == 110
+        assert source.read_detail(20).ppid == 1
+        assert source.read_name(10) == "process-10"
+        assert source.calls == 6
+
+    def test_worker_has_own_buffers(self):
+        """A worker reads the same functions with a separate reader."""
+        source = LibprocSource(FakeLibproc([10, 20]).functions())
+        worker = source.worker()
+        first = source.read_usage(10)
+        assert worker.read_usage(20).cpu_time == 220
+        assert first.cpu_time == 110
+        assert worker.calls == 1
+        assert source.calls == 1
@@ -69,7 +69,7 @@ def test_init_database_sets_schema_version(tmp_path: Path):
 
 
 def test_init_database_recreates_on_version_mismatch(tmp_path: Path):
-    """init_database deletes and recreates DB when schema version differs."""
+    """init_database sets aside and recreates a DB too old to migrate."""
     db_path = tmp_path / "test.db"
 
     # Create DB with old schema version
@@ -98,6 +98,11 @@ def test_init_database_recreates_on_version_mismatch(tmp_path: Path):
     assert "process_events" in table_names
     conn.close()
 
+    # The old database is kept as a backup
+    backup = sqlite3.connect(tmp_path / "test.v1.bak")
+    assert backup.execute("SELECT id FROM old_table").fetchall() == [(42,)]
+    backup.close()
+
 
 def test_init_database_preserves_matching_schema(tmp_path: Path):
     """init_database keeps existing data when schema version matches."""
@@ -231,6 +236,566 @@ def test_prune_preserves_open_events(initialized_db: Path):
     assert remaining == 1
 
 
+def _add_closed_events(conn, count: int, age_days: float) -> None:
+    """Insert closed events (each with a snapshot and capture) of a given age."""
+    from rogue_hunter.storage import create_forensic_capture, insert_process_snapshot
+    from tests.conftest import make_process_score
+
+    exit_time = time.time() - age_days * 86400
+    for i in range(count):
+        cursor = conn.execute(
+            """INSERT INTO process_events
+               (pid, command, boot_time, entry_time, exit_time, entry_band, peak_band, peak_score)
+               VALUES (?, 'proc', 1, ?, ?, 'high', 'high', 60)""",
+            (1000 + i, exit_time - 60, exit_time),
+        )
+        event_id = cursor.lastrowid
+        insert_process_snapshot(conn, event_id, "entry", make_process_score(pid=1000 + i))
+        create_forensic_capture(conn, event_id, "band_entry_critical")
+    conn.commit()
+
+
+def test_prune_incremental_deletes_in_batches(initialized_db: Path):
+    """prune_incremental yields once per batch and cascades to child rows."""
+    from rogue_hunter.storage import get_connection, get_prune_progress, prune_incremental
+
+    conn = get_connection(initialized_db)
+    _add_closed_events(conn, 25, age_days=100)
+    _add_closed_events(conn, 3, age_days=1)
+
+    steps = list(prune_incremental(conn, events_days=30, event_batch=10))
+    final = steps[-1]
+
+    assert final.complete
+    assert final.events_deleted == 25
+    deleted = [s.events_deleted for s in steps]
+    batch_sizes = [b - a for a, b in zip([0] + deleted, deleted) if b > a]
+    assert len(batch_sizes) > 1
+    assert max(batch_sizes) <= 10
+    assert conn.execute("SELECT COUNT(*) FROM process_events").fetchone()[0] == 3
+    assert conn.execute("SELECT COUNT(*) FROM process_snapshots").fetchone()[0] == 3
+    assert conn.execute("SELECT COUNT(*) FROM forensic_captures").fetchone()[0] == 3
+    assert get_prune_progress(conn).complete
+    conn.close()
+
+
+def test_prune_incremental_resumes_after_budget(initialized_db: Path):
+    """A run stopped by its budget records a cursor the next run resumes from."""
+    from rogue_hunter.storage import get_connection, get_prune_progress, prune_incremental
+
+    conn = get_connection(initialized_db)
+    _add_closed_events(conn, 20, age_days=100)
+
+    stopped = list(prune_incremental(conn, events_days=30, event_batch=5, budget_seconds=0))[-1]
+    assert not stopped.complete
+    assert stopped.events_deleted == 0
+
+    first = prune_incremental(conn, events_days=30, event_batch=5)
+    next(first)  # One batch, then abandon the run (e.g. shutdown)
+    first.close()
+    saved = get_prune_progress(conn)
+    assert not saved.complete
+    assert saved.events_deleted > 0
+    assert saved.event_cursor > 0
+
+    final = list(prune_incremental(conn, events_days=30, event_batch=5))[-1]
+    assert final.complete
+    assert final.events_deleted == 20 - saved.events_deleted
+    assert final.event_cursor == 0
+    assert conn.execute("SELECT COUNT(*) FROM process_events").fetchone()[0] == 0
+    conn.close()
+
+
+def test_prune_incremental_machine_snapshots(initialized_db: Path):
+    """Old machine snapshots are pruned by dropping their hourly partitions."""
+    from rogue_hunter.storage import (
+        get_connection,
+        get_machine_partitions,
+        get_machine_snapshot_count,
+        insert_machine_snapshot,
+        machine_partition_table,
+        prune_incremental,
+    )
+    from tests.conftest import make_process_score
+
+    conn = get_connection(initialized_db)
+    now = time.time()
+    hour_start = now // 3600 * 3600
+    for hours in (20, 21, 22):
+        for i in range(2):
+            insert_machine_snapshot(
+                conn, hour_start - hours * 3600 + i, [make_process_score(pid=i)]
+            )
+    insert_machine_snapshot(conn, now, [make_process_score()])
+    assert len(get_machine_partitions(conn)) == 4
+
+    final = list(prune_incremental(conn, snapshots_hours=12.0))[-1]
+
+    assert final.snapshots_deleted == 6
+    assert final.batches >= 3  # One partition per step
+    assert get_machine_snapshot_count(conn) == 1
+    assert get_machine_partitions(conn) == [machine_partition_table(now)]
+    conn.close()
+
+
+def test_machine_snapshot_processes_in_hourly_partition(initialized_db: Path):
+    """Snapshot rows go to the partition of their hour and read back by snapshot."""
+    from rogue_hunter.storage import (
+        get_connection,
+        get_machine_partitions,
+        get_machine_snapshot_processes,
+        insert_machine_snapshot,
+        machine_partition_table,
+    )
+    from tests.conftest import make_process_score
+
+    conn = get_connection(initialized_db)
+    first = insert_machine_snapshot(
+        conn, 7200.0, [make_process_score(pid=1, score=10), make_process_score(pid=2, score=40)]
+    )
+    second = insert_machine_snapshot(conn, 10799.0, [make_process_score(pid=3)])
+    third = insert_machine_snapshot(conn, 10800.0, [make_process_score(pid=4)])
+
+    assert get_machine_partitions(conn) == [
+        machine_partition_table(7200.0),
+        machine_partition_table(10800.0),
+    ]
+    assert [p["pid"] for p in get_machine_snapshot_processes(conn, first)] == [2, 1]
+    assert [p["pid"] for p in get_machine_snapshot_processes(conn, second)] == [3]
+    assert [p["pid"] for p in get_machine_snapshot_processes(conn, third)] == [4]
+    assert get_machine_snapshot_processes(conn, 999) == []
+    conn.close()
+
+
+def test_iter_process_events_pages_through_ties(initialized_db: Path):
+    """Keyset pages neither skip nor repeat events that share an entry time."""
+    from rogue_hunter.storage import get_connection, get_process_events, iter_process_events
+
+    conn = get_connection(initialized_db)
+    for i in range(25):
+        conn.execute(
+            """INSERT INTO process_events
+               (pid, command, boot_time, entry_time, entry_band, peak_band, peak_score)
+               VALUES (?, 'proc', ?, ?, 'high', 'high', 60)""",
+            (i, i % 2, float(i // 4)),
+        )
+    conn.commit()
+
+    streamed = list(iter_process_events(conn, page_size=4))
+    assert len({e["id"] for e in streamed}) == 25
+    assert streamed == sorted(streamed, key=lambda e: (e["entry_time"], e["id"]), reverse=True)
+    assert streamed[:10] == get_process_events(conn, limit=10)
+    odd = list(iter_process_events(conn, boot_time=1, time_cutoff=2.0, page_size=3))
+    assert [e["pid"] for e in odd] == [23, 21, 19, 17, 15, 13, 11, 9]
+    conn.close()
+
+
+def _closed_event(conn, command: str, score: int, band: str, exit_time: float) -> int:
+    from rogue_hunter.storage import close_process_event, create_process_event
+
+    event_id = create_process_event(conn, 1, command, 1, exit_time - 10, band, score, band)
+    close_process_event(conn, event_id, exit_time)
+    return event_id
+
+
+def test_command_stats_ranks_and_percentiles(initialized_db: Path):
+    """Top offenders sum days in the window and rank by events in a band."""
+    from rogue_hunter.storage import get_connection, get_top_offenders
+
+    conn = get_connection(initialized_db)
+    now = time.time()
+    for score in (72, 80, 95, 75):
+        _closed_event(conn, "hog", score, "critical", now)
+    _closed_event(conn, "hog", 65, "high", now - 86400)
+    _closed_event(conn, "hog", 99, "critical", now - 40 * 86400)  # Outside the window
+    for _ in range(3):
+        _closed_event(conn, "chatty", 62, "high", now)
+
+    critical = get_top_offenders(conn, since=now - 7 * 86400)
+    assert [o["command"] for o in critical] == ["hog"]
+    hog = critical[0]
+    assert (hog["events"], hog["critical_events"], hog["high_events"]) == (5, 4, 1)
+    assert (hog["median_score"], hog["p95_score"], hog["peak_score"]) == (75, 95, 95)
+    assert hog["total_duration"] == 50.0
+    assert hog["last_seen"] == now
+
+    assert [o["command"] for o in get_top_offenders(conn, now - 7 * 86400, "high")] == [
+        "chatty",
+        "hog",
+    ]
+    assert get_top_offenders(conn, since=0, band="all", limit=1)[0]["events"] == 6
+    with pytest.raises(ValueError):
+        get_top_offenders(conn, since=0, band="severe")
+    conn.close()
+
+
+def test_command_stats_stale_close_and_rebuild(initialized_db: Path):
+    """Stale closes are rolled up once; a rebuild matches and adds archived events."""
+    from rogue_hunter.storage import (
+        close_process_event,
+        close_stale_open_events,
+        create_process_event,
+        get_connection,
+        get_top_offenders,
+        rebuild_command_stats,
+    )
+
+    conn = get_connection(initialized_db)
+    now = time.time()
+    event_id = _closed_event(conn, "hog", 90, "critical", now)
+    close_process_event(conn, event_id, now + 5)  # Already closed: not counted again
+    create_process_event(conn, 2, "hog", 1, now - 30, "high", 65, "high")
+    assert close_stale_open_events(conn, now) == 1
+    incremental = get_top_offenders(conn, since=0, band="all")
+    assert incremental[0]["events"] == 2
+
+    archived = [
+        {
+            "command": "old",
+            "peak_band": "critical",
+            "peak_score": 88,
+            "entry_time": now - 60,
+            "exit_time": now - 50,
+        }
+    ]
+    conn.execute(
+        "INSERT INTO daemon_state (key, value, updated_at) VALUES (?, '{}', 0)",
+        ("command_stats_backfill",),
+    )
+    conn.commit()
+    assert rebuild_command_stats(conn) == 2
+    assert get_top_offenders(conn, since=0, band="all") == incremental
+    assert rebuild_command_stats(conn, archived) == 3
+    assert [o["command"] for o in get_top_offenders(conn, since=0)] == ["hog", "old"]
+    assert (
+        conn.execute("SELECT 1 FROM daemon_state WHERE key = 'command_stats_backfill'").fetchone()
+        is None
+    )
+    conn.close()
+
+
+def test_process_series_across_partitions(initialized_db: Path):
+    """A series reads a command or PID across hours, oldest first, within range."""
+    from rogue_hunter.storage import (
+        get_connection,
+        get_process_series,
+        insert_machine_snapshot,
+        iter_process_series,
+    )
+    from tests.conftest import make_process_score
+
+    conn = get_connection(initialized_db)
+    for i, captured_at in enumerate([3600.0, 5400.0, 7200.0, 9000.0]):
+        insert_machine_snapshot(
+            conn,
+            captured_at,
+            [
+                make_process_score(pid=10 + i % 2, command="worker", cpu=float(i)),
+                make_process_score(pid=99, command="other", cpu=50.0),
+            ],
+        )
+
+    series = get_process_series(conn, ["cpu", "score"], since=5400.0, command="worker")
+    assert series.timestamps == [5400.0, 7200.0, 9000.0]
+    assert series.pids == [11, 10, 11]
+    assert series.values["cpu"] == [1.0, 2.0, 3.0]
+    assert len(series.values["score"]) == 3
+
+    rows = list(iter_process_series(conn, ["cpu"], since=0.0, until=7200.0, pid=99))
+    assert rows == [(3600.0, 99, 50.0), (5400.0, 99, 50.0)]
+    conn.close()
+
+
+def test_process_series_rejects_bad_arguments(initialized_db: Path):
+    """Unknown metrics and a missing or doubled selector raise ValueError."""
+    from rogue_hunter.storage import get_connection, get_process_series
+
+    conn = get_connection(initialized_db)
+    with pytest.raises(ValueError, match="Unknown metric"):
+        get_process_series(conn, ["cpu; DROP TABLE x"], since=0.0, pid=1)
+    with pytest.raises(ValueError):
+        get_process_series(conn, ["cpu"], since=0.0)
+    with pytest.raises(ValueError):
+        get_process_series(conn, ["cpu"], since=0.0, pid=1, command="x")
+    conn.close()
+
+
+def test_load_event_detail_matches_getters(initialized_db: Path):
+    """The bulk loader returns what the per-row getters return, in the same order."""
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        create_process_event,
+        get_buffer_context,
+        get_connection,
+        get_forensic_captures,
+        get_log_entries,
+        get_process_event_detail,
+        get_process_snapshots,
+        get_tailspin_frames,
+        get_tailspin_processes,
+        get_tailspin_threads,
+        insert_buffer_context,
+        insert_log_entry,
+        insert_process_snapshot,
+        insert_tailspin_frame,
+        insert_tailspin_process,
+        insert_tailspin_thread,
+        load_event_detail,
+        update_process_event_peak,
+    )
+    from tests.conftest import make_process_score
+
+    conn = get_connection(initialized_db)
+    event_id = create_process_event(conn, 1, "proc", 1, 1000.0, "high", 70, "high")
+    insert_process_snapshot(conn, event_id, "entry", make_process_score(score=70))
+    peak_id = insert_process_snapshot(conn, event_id, "checkpoint", make_process_score(score=90))
+    update_process_event_peak(conn, event_id, 90, "critical", peak_id)
+    for c in range(2):
+        capture_id = create_forensic_capture(conn, event_id, trigger=f"capture{c}")
+        insert_buffer_context(conn, capture_id, sample_count=30, peak_score=90, culprits="[]")
+        for i in range(4):
+            insert_log_entry(conn, capture_id, f"2024-01-15 10:30:0{3 - i}", f"message {i}")
+        for p in range(3):
+            proc_id = insert_tailspin_process(conn, capture_id, 100 + p, f"p{p}", cpu_time_sec=p)
+            for t in range(2):
+                thread_id = insert_tailspin_thread(conn, proc_id, f"0x{t}", num_samples=t * 10 + p)
+                for depth in (1, 0):
+                    insert_tailspin_frame(conn, thread_id, depth, 5, False, f"0x{depth}")
+
+    detail = load_event_detail(conn, event_id, log_limit=3, process_limit=2)
+
+    assert detail.event == get_process_event_detail(conn, event_id)
+    assert detail.snapshots == get_process_snapshots(conn, event_id)
+    assert detail.captures == get_forensic_captures(conn, event_id)
+    for capture in detail.captures:
+        capture_id = capture["id"]
+        assert detail.buffer_context[capture_id] == get_buffer_context(conn, capture_id)
+        assert detail.log_entries[capture_id] == get_log_entries(conn, capture_id, limit=3)
+        procs = get_tailspin_processes(conn, capture_id)[:2]
+        assert detail.tailspin_processes[capture_id] == procs
+        assert detail.tailspin_process_counts[capture_id] == 3
+        for proc in procs:
+            threads = get_tailspin_threads(conn, proc["id"])
+            assert detail.tailspin_threads[proc["id"]] == threads
+            for thread in threads:
+                assert detail.frames(thread["id"]) == get_tailspin_frames(conn, thread["id"])
+        assert len(detail.tailspin_threads) == 4
+
+    assert load_event_detail(conn, event_id + 1) is None
+    conn.close()
+
+
+def _capture_with_text(conn, command: str, messages: list[str], frames: list[tuple]) -> int:
+    """An event and capture with log messages and (process, symbol, blocked_on) frames."""
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        create_process_event,
+        index_capture_search,
+        insert_log_entry,
+        insert_tailspin_frame,
+        insert_tailspin_process,
+        insert_tailspin_thread,
+    )
+
+    event_id = create_process_event(conn, 1, command, 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+    for message in messages:
+        insert_log_entry(conn, capture_id, "2024-01-15 10:30:00", message, process_name=command)
+    for depth, (process, symbol, blocked_on) in enumerate(frames):
+        proc_id = insert_tailspin_process(conn, capture_id, 100 + depth, process)
+        thread_id = insert_tailspin_thread(conn, proc_id, "0x1")
+        insert_tailspin_frame(
+            conn, thread_id, 0, 1, False, "0x1", symbol_name=symbol, blocked_on=blocked_on
+        )
+    index_capture_search(conn, capture_id)
+    conn.commit()
+    return capture_id
+
+
+def test_search_captures_logs_and_frames(initialized_db: Path):
+    """Searches rank captures by match and filter by source and process."""
+    from rogue_hunter.storage import get_connection, index_capture_search, search_captures
+
+    conn = get_connection(initialized_db)
+    watchdog = _capture_with_text(
+        conn, "WindowServer", ["watchdog timeout", "watchdog fired again", "ok"], []
+    )
+    surface = _capture_with_text(
+        conn,
+        "kernel_task",
+        ["all quiet"],
+        [
+            ("kernel_task", "IOSurfaceClient::lock", "IOSurface 0x1234"),
+            ("Safari", "-[WKWebView draw]", "IOSurfaceRoot lock"),
+            ("kernel_task", None, None),
+        ],
+    )
+    assert not index_capture_search(conn, surface)  # Already indexed
+
+    [hit] = search_captures(conn, "watchdog")
+    assert (hit["capture_id"], hit["command"]) == (watchdog, "WindowServer")
+    assert hit["matches"] == {"logs": 2, "frames": 0}
+    assert "[watchdog]" in hit["snippet"]
+
+    [hit] = search_captures(conn, "blocked_on: IOSurface", ["frames"], process="kernel_task")
+    assert (hit["capture_id"], hit["matches"]) == (surface, {"frames": 1})
+    assert search_captures(conn, "Surf", ["frames"])[0]["matches"]["frames"] == 2  # Substring
+    assert search_captures(conn, "watchdog", process="kernel_task") == []
+
+    with pytest.raises(ValueError, match="Invalid search query"):
+        search_captures(conn, '"unbalanced')
+    with pytest.raises(ValueError, match="Unknown search source"):
+        search_captures(conn, "x", ["stacks"])
+    conn.close()
+
+
+def test_search_captures_ranks_each_source_on_its_own_scale(initialized_db: Path):
+    """Scores are relative to each source's best, and counts cover every source."""
+    from rogue_hunter.storage import get_connection, search_captures
+
+    conn = get_connection(initialized_db)
+    logs = _capture_with_text(
+        conn, "a", ["watchdog fired"] * 5, [("a", "watchdog_fire_with_a_long_symbol_name", None)]
+    )
+    frames = _capture_with_text(conn, "b", [], [("b", "watchdog", None)])
+
+    assert [(h["capture_id"], h["score"]) for h in search_captures(conn, "watchdog")] == [
+        (logs, 1.0),
+        (frames, 1.0),
+    ]
+    [hit] = search_captures(conn, "watchdog", limit=1)  # Outside the frames top 1
+    assert hit["matches"] == {"logs": 5, "frames": 1}
+    ranked = search_captures(conn, "watchdog", ["frames"])
+    assert [h["capture_id"] for h in ranked] == [frames, logs]
+    assert 0 < ranked[1]["score"] < 1
+    conn.close()
+
+
+def test_search_index_follows_deleted_captures(initialized_db: Path):
+    """Deleting an event's captures removes their rows from the search index."""
+    from rogue_hunter.storage import get_connection, search_captures
+
+    conn = get_connection(initialized_db)
+    kept = _capture_with_text(conn, "a", ["watchdog"], [("a", "IOSurface::lock", None)])
+    gone = _capture_with_text(conn, "b", ["watchdog"], [("b", "IOSurface::lock", None)])
+    conn.execute(
+        """DELETE FROM process_events
+           WHERE id = (SELECT event_id FROM forensic_captures WHERE id = ?)""",
+        (gone,),
+    )
+    conn.commit()
+
+    assert [h["capture_id"] for h in search_captures(conn, "watchdog")] == [kept]
+    assert [h["capture_id"] for h in search_captures(conn, "Surface")] == [kept]
+    for table in ("log_search", "frame_search"):
+        conn.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('integrity-check', 1)")
+    conn.close()
+
+
+def test_index_capture_search_in_bounded_batches(initialized_db: Path):
+    """Captures are indexed max_rows at a time; a partly indexed one deletes cleanly."""
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        create_process_event,
+        get_connection,
+        index_capture_search,
+        insert_log_entry,
+        insert_tailspin_frame,
+        insert_tailspin_process,
+        insert_tailspin_thread,
+        search_captures,
+    )
+
+    conn = get_connection(initialized_db)
+    event_id = create_process_event(conn, 1, "hog", 1, time.time(), "high", 70, "high")
+    whole, partial = (create_forensic_capture(conn, event_id, "band_entry_high") for _ in "ab")
+    for i in range(7):  # The two captures' rows interleave
+        for capture_id in (whole, partial):
+            insert_log_entry(conn, capture_id, "2024-01-15 10:30:00", f"watchdog {i}")
+    thread_id = insert_tailspin_thread(
+        conn, insert_tailspin_process(conn, whole, 100, "hog"), "0x1"
+    )
+    for depth in range(4):
+        insert_tailspin_frame(
+            conn, thread_id, depth, 1, False, "0x1", symbol_name="IOSurface::lock"
+        )
+
+    # 7 log entries, then 4 frames
+    assert [index_capture_search(conn, whole, max_rows=3) for _ in range(5)] == [3, 3, 3, 2, 0]
+    assert index_capture_search(conn, partial, max_rows=3) == 3
+    conn.commit()
+
+    hits = {h["capture_id"]: h["matches"] for h in search_captures(conn, "watchdog")}
+    assert hits == {whole: {"logs": 7, "frames": 0}, partial: {"logs": 3, "frames": 0}}
+    assert search_captures(conn, "Surface", ["frames"])[0]["matches"] == {"frames": 4}
+
+    conn.execute("DELETE FROM forensic_captures WHERE id = ?", (partial,))
+    conn.commit()
+    assert [h["capture_id"] for h in search_captures(conn, "watchdog")] == [whole]
+    for table in ("log_search", "frame_search"):
+        conn.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('integrity-check', 1)")
+    conn.close()
+
+
+def test_prune_machine_snapshots_drops_whole_hours(initialized_db: Path):
+    """Only partitions whose whole hour is past the cutoff are dropped."""
+    from rogue_hunter.storage import (
+        get_connection,
+        get_machine_partitions,
+        get_machine_snapshot_count,
+        insert_machine_snapshot,
+        machine_partition_table,
+        prune_machine_snapshots,
+    )
+    from tests.conftest import make_process_score
+
+    conn = get_connection(initialized_db)
+    cutoff = time.time() - 12 * 3600
+    expired = cutoff // 3600 * 3600 - 1  # Last second of the hour before the cutoff's
+    straddling = cutoff - 1  # Older than the cutoff, but its hour is not over
+    insert_machine_snapshot(conn, expired, [make_process_score()])
+    insert_machine_snapshot(conn, expired - 3600, [])
+    insert_machine_snapshot(conn, straddling, [make_process_score()])
+
+    assert prune_machine_snapshots(conn, max_age_hours=12.0) == 2
+    assert get_machine_snapshot_count(conn) == 1
+    assert get_machine_partitions(conn) == [machine_partition_table(straddling)]
+    conn.close()
+
+
+def test_prune_incremental_vacuums_free_pages(initialized_db: Path):
+    """New databases use incremental auto-vacuum and pruning releases pages."""
+    from rogue_hunter.storage import get_connection, prune_incremental
+
+    conn = get_connection(initialized_db)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    _add_closed_events(conn, 200, age_days=100)
+
+    steps = list(prune_incremental(conn, events_days=30, vacuum_pages=4))
+    final = steps[-1]
+
+    assert final.pages_vacuumed > 0
+    released = [b.pages_vacuumed - a.pages_vacuumed for a, b in zip(steps, steps[1:])]
+    assert 4 in released  # Each vacuum step releases vacuum_pages, not one page
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
+
+
+def test_incremental_vacuum_releases_requested_pages(initialized_db: Path):
+    """One call shrinks the freelist by the pages asked for, not by one."""
+    from rogue_hunter.storage import get_connection, incremental_vacuum, prune_old_data
+
+    conn = get_connection(initialized_db)
+    _add_closed_events(conn, 200, age_days=100)
+    prune_old_data(conn, events_days=30)
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    assert free > 4
+
+    assert incremental_vacuum(conn, 4) == 4
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == free - 4
+    conn.close()
+
+
 # --- Daemon State Tests ---
 
 
@@ -304,11 +869,11 @@ def test_schema_has_process_snapshots_table(tmp_path):
     conn.close()
 
 
-def test_schema_version_is_20():
-    """Schema version is 20 for comprehensive tailspin data."""
+def test_schema_version_is_27():
+    """Schema version is 27 for coalesced capture links."""
     from rogue_hunter.storage import SCHEMA_VERSION
 
-    assert SCHEMA_VERSION == 20
+    assert SCHEMA_VERSION == 27
 
 
 def test_process_snapshots_has_resource_shares():
@@ -590,6 +1155,38 @@ def test_get_forensic_captures(tmp_path):
     conn.close()
 
 
+def test_get_forensic_captures_includes_linked(tmp_path):
+    """A capture coalescing several events' triggers is listed under each of them."""
+    from rogue_hunter.storage import (
+        create_forensic_capture,
+        create_process_event,
+        get_connection,
+        get_forensic_captures,
+        init_database,
+        link_capture_events,
+    )
+
+    db_path = tmp_path / "test.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    first, second = (
+        create_process_event(conn, pid, "test", 1706000000, time.time(), "high", 85, "high")
+        for pid in (1, 2)
+    )
+    own = create_forensic_capture(conn, second, trigger="own")
+    shared = create_forensic_capture(conn, first, trigger="shared")
+    link_capture_events(conn, shared, [second])
+
+    assert [c["id"] for c in get_forensic_captures(conn, first)] == [shared]
+    assert [(c["id"], c["event_id"]) for c in get_forensic_captures(conn, second)] == [
+        (own, second),
+        (shared, first),
+    ]
+    conn.execute("DELETE FROM forensic_captures WHERE id = ?", (shared,))
+    assert conn.execute("SELECT COUNT(*) FROM forensic_capture_events").fetchone() == (0,)
+    conn.close()
+
+
 def test_insert_and_get_tailspin_process(tmp_path):
     """insert_tailspin_process and get_tailspin_processes work correctly."""
     from rogue_hunter.storage import (
@@ -132,6 +132,28 @@ def test_tracker_closes_event_when_score_drops(tmp_path):
     conn.close()
 
 
+def test_tracker_rolls_up_closed_events(tmp_path):
+    """Closing an event adds it to command_stats for its command."""
+    from rogue_hunter.config import BandsConfig
+    from rogue_hunter.storage import get_connection, get_top_offenders, init_database
+    from rogue_hunter.tracker import ProcessTracker
+
+    db_path = tmp_path / "test.db"
+    init_database(db_path)
+    conn = get_connection(db_path)
+    tracker = ProcessTracker(conn, BandsConfig(tracking_band="elevated"), boot_time=1706000000)
+
+    tracker.update([make_score(pid=123, command="hog", score=85, captured_at=1706000100.0)])
+    assert get_top_offenders(conn, since=0, band="all") == []  # Open events are not counted
+    tracker.update([make_score(pid=123, command="hog", score=30, captured_at=1706000160.0)])
+
+    [hog] = get_top_offenders(conn, since=0)
+    assert hog["command"] == "hog"
+    assert (hog["events"], hog["critical_events"], hog["peak_score"]) == (1, 1, 85)
+    assert hog["total_duration"] == 60.0
+    conn.close()
+
+
 def test_tracker_writes_exit_snapshot_on_score_drop(tmp_path):
     """ProcessTracker writes exit snapshot with final metrics when score drops below threshold."""
     from rogue_hunter.config import BandsConfig
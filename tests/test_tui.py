@@ -68,3 +68,56 @@ def test_tui_no_category_references():
         content = py_file.read_text()
         for old_field in old_fields:
             assert old_field not in content, f"Found '{old_field}' in {py_file.name}"
+
+
+def test_render_flame_clips_names_to_spans():
+    """render_flame draws each span at its column, name clipped to its width."""
+    from rogue_hunter.calltree import CallNode, flame_rows
+    from rogue_hunter.tui.flame import render_flame
+
+    root = CallNode("capture 1", 10)
+    root.child("a_long_name").samples = 5
+    root.child("b").samples = 3
+
+    lines = render_flame(flame_rows(root, 20), 20).plain.splitlines()
+
+    assert lines == ["capture 1           ", "a_long_na b         "]
+
+
+def test_render_culprits_lines():
+    """render_culprits shows peak, seconds above and max share per culprit, cut to height."""
+    from rogue_hunter.tui.culprits import render_culprits
+
+    culprits = [
+        {"pid": 42, "command": "mds", "score": 80, "seconds_above": 12.0, "max_share": 0.75},
+        {"pid": 7, "command": "zsh", "score": 30, "seconds_above": 0.0, "max_share": 0.25},
+    ]
+
+    lines = render_culprits(culprits, 20).plain.splitlines()
+
+    assert lines[1].split() == ["42", "80", "12s", "75%", "mds"]
+    assert lines[2].split() == ["7", "30", "0s", "25%", "zsh"]
+    assert len(render_culprits(culprits, 2).plain.splitlines()) == 2
+
+
+def test_render_wait_graph_sections():
+    """render_wait_graph lists root blockers, deadlocks and chains, cut to height."""
+    from rogue_hunter.tui.waitgraph import render_wait_graph
+    from rogue_hunter.waitgraph import RootBlocker, WaitChain, WaitGraph, WaitNode
+
+    a, b, c = WaitNode(1, "0x0"), WaitNode(2, "0x0"), WaitNode(3)
+    graph = WaitGraph(
+        capture_id=1,
+        names={1: "a", 2: "b", 3: "c"},
+        roots=[RootBlocker((a, b), 2, 30)],
+        cycles=[(a, b)],
+        chains=[WaitChain((c, a, b), 7)],
+    )
+
+    lines = render_wait_graph(graph, 20).plain.splitlines()
+
+    assert lines[1].split()[:2] == ["2", "30"]
+    assert lines[1].endswith("a [1] thread 0x0, b [2] thread 0x0")
+    assert lines[4] == "  a [1] thread 0x0 <-> b [2] thread 0x0"
+    assert lines[-1].split()[:3] == ["7", "c", "[3]"]
+    assert len(render_wait_graph(graph, 2).plain.splitlines()) == 2
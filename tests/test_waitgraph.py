@@ -0,0 +1,99 @@
+"""Tests for wait graphs over blocked tailspin frames."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from rogue_hunter.storage import create_forensic_capture, create_process_event, get_connection
+from rogue_hunter.waitgraph import BlockedOn, WaitNode, build_wait_graph, parse_blocked_on
+from tests.conftest import insert_tailspin_stacks
+
+
+@pytest.fixture
+def waits_conn(initialized_db: Path):
+    """Connection with capture 1, each process's one thread being 0x0.
+
+    make waits for zsh, whose thread waits on mds's, which waits on
+    launchd's (not in the capture); a and b deadlock; c sleeps.
+    """
+    conn = get_connection(initialized_db)
+    event_id = create_process_event(conn, 10, "make", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+    for pid, name, samples, blocked_on in [
+        (10, "make", 100, "zsh [20]"),
+        (20, "zsh", 50, "turnstile waiting for mds [30] thread 0x0"),
+        (30, "mds", 40, "turnstile with priority 4 waiting for launchd [1] thread 0x0"),
+        (40, "a", 30, "turnstile waiting for b [41] thread 0x0"),
+        (41, "b", 20, "pthread mutex owned by a [40] thread 0x0"),
+        (42, "c", 5, "sleep"),
+    ]:
+        frames = [(0, samples, "start", False), (1, samples, "wait", True, blocked_on)]
+        insert_tailspin_stacks(conn, capture_id, pid, name, [frames])
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("zsh [46454]", BlockedOn("wait4", WaitNode(46454), "zsh")),
+        ("wait4 on zsh [46454]", BlockedOn("wait4", WaitNode(46454), "zsh")),
+        ("pid:1234", BlockedOn("wait4", WaitNode(1234), None)),
+        (
+            "turnstile with priority 47 waiting for WindowServer [400] thread 0x2C5F",
+            BlockedOn("turnstile", WaitNode(400, "0x2c5f"), "WindowServer"),
+        ),
+        (
+            "pthread mutex owned by mds_stores [484] thread 0x3f2a1",
+            BlockedOn("pthread mutex", WaitNode(484, "0x3f2a1"), "mds_stores"),
+        ),
+        ("semaphore", None),
+    ],
+)
+def test_parse_blocked_on(text, expected):
+    """wait4 targets, turnstile and lock owners parse; ownerless waits don't."""
+    assert parse_blocked_on(text) == expected
+
+
+def test_build_wait_graph(waits_conn):
+    """Edges, the deadlock, the long chain and root blockers by samples held up."""
+    graph = build_wait_graph(waits_conn, 1)
+
+    assert [(e.waiter, e.owner, e.resource, e.samples) for e in graph.edges[:2]] == [
+        (WaitNode(10, "0x0"), WaitNode(20), "wait4", 100),
+        (WaitNode(20, "0x0"), WaitNode(30, "0x0"), "turnstile", 50),
+    ]
+    assert graph.unresolved == {"sleep": 5}
+    assert graph.cycles == [(WaitNode(40, "0x0"), WaitNode(41, "0x0"))]
+    [chain] = graph.chains
+    assert chain.nodes == (
+        WaitNode(10, "0x0"),
+        WaitNode(20),
+        WaitNode(30, "0x0"),
+        WaitNode(1, "0x0"),
+    )
+    assert chain.samples == 100
+    assert [(r.nodes, r.threads, r.samples) for r in graph.roots] == [
+        ((WaitNode(1, "0x0"),), 3, 190),
+        ((WaitNode(40, "0x0"), WaitNode(41, "0x0")), 2, 50),
+    ]
+    assert graph.label(WaitNode(1, "0x0")) == "launchd [1] thread 0x0"
+    assert graph.label(WaitNode(20)) == "zsh [20]"
+
+
+def test_build_wait_graph_min_chain_and_long_chains(initialized_db: Path):
+    """Chains longer than the recursion limit are followed; short ones are left out."""
+    conn = get_connection(initialized_db)
+    event_id = create_process_event(conn, 1, "p", 1, time.time(), "high", 70, "high")
+    capture_id = create_forensic_capture(conn, event_id, "band_entry_high")
+    for pid in range(1, 1502):
+        frames = [(0, 1, "wait", True, f"turnstile waiting for p [{pid + 1}] thread 0x0")]
+        insert_tailspin_stacks(conn, capture_id, pid, "p", [frames])
+
+    graph = build_wait_graph(conn, capture_id, min_chain=3)
+
+    assert len(graph.chains[0].nodes) == 1502
+    assert [(r.nodes, r.threads) for r in graph.roots] == [((WaitNode(1502, "0x0"),), 1501)]
+    assert build_wait_graph(conn, capture_id, min_chain=2000).chains == []
+    conn.close()